@@ -3,45 +3,47 @@ Analyze a competitor's LinkedIn post using Claude API.
 Extracts hook, classifies post type, and writes analysis notes.
 """
 import json
-import os
 
-from anthropic import Anthropic
 from draft_storage import POST_TYPES
+from llm_gateway import call_llm, call_llm_async
+from prompt_builder import PromptSection, assemble_prompt, estimate_tokens
 
+SYSTEM_PROMPT = "You are a LinkedIn content analyst. Respond ONLY with valid JSON, no markdown fences."
 
-def analyze_post(post_content: str) -> dict:
-    """
-    Analyze a competitor post and extract structured data.
+# Token budget for the analysis prompt; very long posts are truncated to fit
+PROMPT_TOKEN_BUDGET = 3000
 
-    Returns:
-        dict with keys: hook, post_type, notes
-    """
-    client = Anthropic(api_key=os.getenv("ANTHROPIC_API_KEY"))
 
+def build_analysis_request(post_content: str) -> dict:
+    """Build the call_llm() arguments for a post analysis (shared by sync and async paths)."""
     type_list = ", ".join(POST_TYPES)
 
-    response = client.messages.create(
-        model="claude-sonnet-4-20250514",
-        max_tokens=1000,
-        system="You are a LinkedIn content analyst. Respond ONLY with valid JSON, no markdown fences.",
-        messages=[{
-            "role": "user",
-            "content": f"""Analyze this LinkedIn post and return JSON with exactly these keys:
+    prompt = assemble_prompt([
+        PromptSection("task", f"""Analyze this LinkedIn post and return JSON with exactly these keys:
 
 - "hook": The verbatim opening line(s) that grab attention (copy exactly from the post)
 - "post_type": Classify into ONE of: {type_list}
 - "notes": 2-3 sentences on what makes this post effective (writing technique, structure, emotional triggers)
 
 Post to analyze:
----
-{post_content}
----
+---""", required=True),
+        PromptSection("post", post_content, priority=10),
+        PromptSection("instructions", "---\n\nReturn JSON only.", required=True),
+    ], PROMPT_TOKEN_BUDGET, separator="\n")
 
-Return JSON only."""
-        }]
+    return dict(
+        name="analyze_post",
+        estimated_input_tokens=prompt.tokens + estimate_tokens(SYSTEM_PROMPT),
+        model="claude-sonnet-4-20250514",
+        max_tokens=1000,
+        system=SYSTEM_PROMPT,
+        messages=[{"role": "user", "content": prompt.text}]
     )
 
-    text = response.content[0].text.strip()
+
+def parse_analysis(text: str) -> dict:
+    """Parse the JSON analysis, tolerating markdown fences."""
+    text = text.strip()
     # Strip markdown fences if present
     if text.startswith("```"):
         text = text.split("\n", 1)[1] if "\n" in text else text[3:]
@@ -59,3 +61,20 @@ Return JSON only."""
         "post_type": result.get("post_type", ""),
         "notes": result.get("notes", ""),
     }
+
+
+def analyze_post(post_content: str) -> dict:
+    """
+    Analyze a competitor post and extract structured data.
+
+    Returns:
+        dict with keys: hook, post_type, notes
+    """
+    response = call_llm(**build_analysis_request(post_content))
+    return parse_analysis(response.content[0].text)
+
+
+async def analyze_post_async(post_content: str) -> dict:
+    """Async variant of analyze_post() for use inside the event loop."""
+    response = await call_llm_async(**build_analysis_request(post_content))
+    return parse_analysis(response.content[0].text)
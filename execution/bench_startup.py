@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Startup benchmark for the web UI.
+
+Each run starts a fresh interpreter, imports web_ui and loads every template
+(what a new uvicorn worker pays before serving its first pages), then
+reports the median over several runs - once compiling templates in memory
+and once loading bytecode precompiled with precompile_templates().
+
+Usage:
+    python bench_startup.py
+    python bench_startup.py --runs 10
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+EXECUTION_DIR = Path(__file__).parent
+
+
+def measure_once() -> dict:
+    """Timings for this process (run in a child interpreter)."""
+    started = time.perf_counter()
+    import web_ui
+    imported = time.perf_counter()
+    for name in web_ui.TEMPLATE_SOURCES:
+        web_ui.templates.get_template(name)
+    loaded = time.perf_counter()
+    return {
+        "import_ms": (imported - started) * 1000,
+        "templates_ms": (loaded - imported) * 1000,
+        "total_ms": (loaded - started) * 1000,
+    }
+
+
+def run_child(cache_dir: str = "") -> dict:
+    env = dict(os.environ, TEMPLATE_CACHE_DIR=cache_dir, JOB_WORKERS="0")
+    out = subprocess.run(
+        [sys.executable, __file__, "--child"],
+        cwd=EXECUTION_DIR, env=env, capture_output=True, text=True, check=True,
+    ).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def summarize(label: str, samples: list[dict]):
+    print(f"{label}:")
+    for key in ("import_ms", "templates_ms", "total_ms"):
+        values = [s[key] for s in samples]
+        print(f"  {key:<13} median {statistics.median(values):8.1f}   min {min(values):8.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark web UI worker startup")
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters per mode (default: 5)")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        sys.path.insert(0, str(EXECUTION_DIR))
+        print(json.dumps(measure_once()))
+        return
+
+    sys.path.insert(0, str(EXECUTION_DIR))
+    from web_ui import precompile_templates
+
+    run_child()  # warm the OS file cache and .pyc files before timing
+    summarize("In-memory compile", [run_child() for _ in range(args.runs)])
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        count = precompile_templates(cache_dir)
+        summarize(f"Precompiled bytecode ({count} templates)", [run_child(cache_dir) for _ in range(args.runs)])
+
+
+if __name__ == "__main__":
+    main()
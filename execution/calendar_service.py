@@ -0,0 +1,198 @@
+"""
+Calendar views of scheduled and posted drafts.
+
+A view is one or more month grids, or a single week. Every draft it shows
+comes from one range query over the indexed scheduled_time / posted_at
+columns covering the whole visible span (including the neighbouring
+months' days at the grid edges), bucketed by day in a single pass. Building
+a view is O(drafts + days), and the selected day's posts are read from the
+same buckets instead of a second query.
+
+Used by the /calendar page and the /api/calendar JSON feed. Views are
+coroutines reading through draft_storage_async, so the routes await them on
+the event loop rather than holding a storage thread.
+"""
+import calendar as cal
+from datetime import date, datetime, timedelta
+from typing import Optional
+
+from draft_storage_async import list_drafts_between, get_drafts_for_date
+
+FIRST_WEEKDAY = cal.SUNDAY
+VIEWS = ["month", "week"]
+MAX_MONTHS = 12
+
+_grid = cal.Calendar(firstweekday=FIRST_WEEKDAY)
+
+
+def parse_month(value: Optional[str], today: date) -> tuple[int, int]:
+    """(year, month) from YYYY-MM, or today's month if missing or malformed."""
+    try:
+        year, month = (int(p) for p in value.split("-"))
+        date(year, month, 1)
+        return year, month
+    except (AttributeError, TypeError, ValueError):
+        return today.year, today.month
+
+
+def parse_day(value: Optional[str]) -> Optional[date]:
+    """A YYYY-MM-DD date, or None if missing or malformed."""
+    try:
+        return date.fromisoformat(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def shift_month(year: int, month: int, delta: int) -> tuple[int, int]:
+    year, index = divmod(year * 12 + month - 1 + delta, 12)
+    return year, index + 1
+
+
+def month_key(year: int, month: int) -> str:
+    return f"{year}-{month:02d}"
+
+
+def week_start(day: date) -> date:
+    return day - timedelta(days=(day.weekday() - FIRST_WEEKDAY) % 7)
+
+
+def post_label(draft: dict) -> str:
+    """Short calendar label: the selected hook, else the first line of the post."""
+    hooks, selected = draft.get("hooks"), draft.get("selected_hook")
+    if selected is not None and hooks and 0 <= selected < len(hooks):
+        return hooks[selected][:80]
+    return draft["content"].split("\n")[0][:80]
+
+
+def bucket_by_day(drafts: list[dict]) -> dict[str, list[dict]]:
+    """
+    Group drafts by YYYY-MM-DD in one pass.
+
+    A draft scheduled on one day and posted on another appears on both;
+    each bucket keeps the input order.
+    """
+    buckets = {}
+    for draft in drafts:
+        for day in {ts[:10] for ts in (draft.get("scheduled_time"), draft.get("posted_at")) if ts}:
+            buckets.setdefault(day, []).append(draft)
+    return buckets
+
+
+async def load_buckets(first: date, last: date) -> dict[str, list[dict]]:
+    """Drafts scheduled or posted from first to last (inclusive), bucketed by day."""
+    start = datetime.combine(first, datetime.min.time())
+    return bucket_by_day(await list_drafts_between(start, start + timedelta(days=(last - first).days + 1)))
+
+
+def _days(first: date, last: date, buckets: dict, today: date, month: int = None) -> list[dict]:
+    days = []
+    for offset in range((last - first).days + 1):
+        day = first + timedelta(days=offset)
+        key = day.isoformat()
+        days.append({
+            "day": day.day,
+            "date": key,
+            "current_month": month is None or day.month == month,
+            "is_today": day == today,
+            "posts": buckets.get(key, []),
+        })
+    return days
+
+
+async def month_view(year: int, month: int, months: int = 1, today: date = None) -> dict:
+    """
+    Consecutive month grids starting at year-month (at most MAX_MONTHS).
+
+    Returns:
+        {"view", "first", "last", "prev", "next", "months", "calendars": [
+            {"key", "title", "year", "month", "days": [...]}]}
+        prev/next are the YYYY-MM a page of `months` grids earlier/later.
+    """
+    today = today or date.today()
+    months = max(1, min(int(months or 1), MAX_MONTHS))
+    shown = [shift_month(year, month, i) for i in range(months)]
+    grids = [_grid.monthdatescalendar(y, m) for y, m in shown]
+    first, last = grids[0][0][0], grids[-1][-1][-1]
+    buckets = await load_buckets(first, last)
+
+    calendars = [
+        {
+            "key": month_key(y, m),
+            "title": f"{cal.month_name[m]} {y}",
+            "year": y,
+            "month": m,
+            "days": _days(weeks[0][0], weeks[-1][-1], buckets, today, m),
+        }
+        for (y, m), weeks in zip(shown, grids)
+    ]
+    return {
+        "view": "month",
+        "first": first.isoformat(),
+        "last": last.isoformat(),
+        "prev": month_key(*shift_month(year, month, -months)),
+        "next": month_key(*shift_month(year, month, months)),
+        "months": months,
+        "calendars": calendars,
+        "buckets": buckets,
+    }
+
+
+async def week_view(day: date, today: date = None) -> dict:
+    """The week containing day; prev/next are the neighbouring weeks' first days."""
+    today = today or date.today()
+    first = week_start(day)
+    last = first + timedelta(days=6)
+    buckets = await load_buckets(first, last)
+    title = f"{first.strftime('%b')} {first.day} - {last.strftime('%b')} {last.day}, {last.year}"
+    return {
+        "view": "week",
+        "first": first.isoformat(),
+        "last": last.isoformat(),
+        "prev": (first - timedelta(days=7)).isoformat(),
+        "next": (first + timedelta(days=7)).isoformat(),
+        "months": 1,
+        "calendars": [{"key": first.isoformat(), "title": title, "year": first.year, "month": first.month,
+                       "days": _days(first, last, buckets, today)}],
+        "buckets": buckets,
+    }
+
+
+async def build_view(view: str = "month", month: str = None, months: int = 1, day: str = None,
+               today: date = None) -> dict:
+    """A month or week view from request parameters (unknown or malformed values fall back to today)."""
+    today = today or date.today()
+    if view == "week":
+        return await week_view(parse_day(day) or today, today)
+    if not month and parse_day(day):
+        month = day[:7]
+    return await month_view(*parse_month(month, today), months=months, today=today)
+
+
+async def posts_for_day(view: dict, day: str) -> list[dict]:
+    """Drafts on a day, from the view's buckets when it's in range (one query otherwise)."""
+    if view["first"] <= day <= view["last"]:
+        return view["buckets"].get(day, [])
+    return await get_drafts_for_date(day)
+
+
+def feed(view: dict) -> dict:
+    """JSON-ready view with compact posts (for client-side navigation)."""
+    return {
+        **{key: value for key, value in view.items() if key not in ("calendars", "buckets")},
+        "calendars": [
+            {**calendar, "days": [{**day, "posts": [_feed_post(p) for p in day["posts"]]} for day in calendar["days"]]}
+            for calendar in view["calendars"]
+        ],
+    }
+
+
+def _feed_post(draft: dict) -> dict:
+    return {
+        "id": draft["id"],
+        "status": draft["status"],
+        "label": post_label(draft),
+        "title": draft["content"][:150],
+        "scheduled_time": draft["scheduled_time"],
+        "posted_at": draft["posted_at"],
+        "metrics": draft.get("metrics"),
+    }
@@ -1,21 +1,327 @@
+import asyncio
 import json
 import os
+import threading
+import time
 from datetime import datetime
 from pathlib import Path
-
-from sqlalchemy import create_engine, Column, String, Text, Integer, DateTime, JSON
-from sqlalchemy.orm import sessionmaker, declarative_base
+from typing import Optional
+
+from sqlalchemy import (
+    bindparam, column, create_engine, event, func, inspect, insert, select, table, text, update,
+    Column, String, Text, Integer, DateTime, JSON, Index, ForeignKey,
+)
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.orm import sessionmaker, declarative_base, relationship
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool, QueuePool
 from dotenv import load_dotenv
 
 load_dotenv()
 
 DATABASE_URL = os.getenv("DATABASE_URL")
 
-engine = create_engine(DATABASE_URL)
+
+def _env_flag(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    return default if value is None else value.lower() in ("1", "true", "yes")
+
+
+# Connection pool settings (env vars). Size the pool for JOB_WORKERS x
+# LLM_MAX_CONCURRENCY job items plus concurrent web requests.
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "5"))
+# The async engine (draft_storage_async reads) has a pool of its own. Together
+# a process opens at most DB_POOL_SIZE + DB_MAX_OVERFLOW + DB_ASYNC_POOL_SIZE +
+# DB_ASYNC_MAX_OVERFLOW connections (20 by default); budget that per worker.
+DB_ASYNC_POOL_SIZE = int(os.getenv("DB_ASYNC_POOL_SIZE", "5"))
+DB_ASYNC_MAX_OVERFLOW = int(os.getenv("DB_ASYNC_MAX_OVERFLOW", "0"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))      # seconds; below Railway's idle cutoff
+DB_POOL_PRE_PING = _env_flag("DB_POOL_PRE_PING", True)
+DB_STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "30000"))  # PostgreSQL only, 0 disables
+DB_NULL_POOL = _env_flag("DB_NULL_POOL", False)                  # one connection per checkout (CLI one-shots)
+
+
+# =============================================================================
+# ENGINE
+# =============================================================================
+
+class PoolStats:
+    """Thread-safe counters for connection checkouts, waits and failures."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._zero()
+
+    def _zero(self) -> None:
+        self.checkouts = 0
+        self.checkins = 0
+        self.connects = 0
+        self.invalidations = 0
+        self.timeouts = 0
+        self.total_wait_ms = 0.0
+        self.max_wait_ms = 0.0
+
+    def reset(self) -> None:
+        with self._lock:
+            self._zero()
+
+    def record_wait(self, wait_ms: float, timed_out: bool = False) -> None:
+        with self._lock:
+            self.total_wait_ms += wait_ms
+            self.max_wait_ms = max(self.max_wait_ms, wait_ms)
+            self.timeouts += 1 if timed_out else 0
+
+    def increment(self, counter: str) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "checkouts": self.checkouts,
+                "checkins": self.checkins,
+                "connects": self.connects,
+                "invalidations": self.invalidations,
+                "timeouts": self.timeouts,
+                "total_wait_ms": round(self.total_wait_ms, 1),
+                "avg_wait_ms": round(self.total_wait_ms / self.checkouts, 2) if self.checkouts else 0,
+                "max_wait_ms": round(self.max_wait_ms, 1),
+            }
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that times how long each checkout waits for a free connection."""
+
+    stats: PoolStats = None
+
+    def _do_get(self):
+        start = time.perf_counter()
+        timed_out = False
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            timed_out = True
+            raise
+        finally:
+            if self.stats is not None:
+                self.stats.record_wait((time.perf_counter() - start) * 1000, timed_out)
+
+
+class InstrumentedAsyncQueuePool(InstrumentedQueuePool, AsyncAdaptedQueuePool):
+    """InstrumentedQueuePool for the async engine (waits on an asyncio queue)."""
+
+
+def _count_pool_events(sync_engine, stats: PoolStats) -> None:
+    event.listen(sync_engine, "connect", lambda *a: stats.increment("connects"))
+    event.listen(sync_engine, "checkout", lambda *a: stats.increment("checkouts"))
+    event.listen(sync_engine, "checkin", lambda *a: stats.increment("checkins"))
+    event.listen(sync_engine, "invalidate", lambda *a: stats.increment("invalidations"))
+
+
+def _enable_sqlite_foreign_keys(dbapi_conn, record):
+    # SQLite only enforces foreign keys (and ON DELETE CASCADE) when asked, per connection
+    cursor = dbapi_conn.cursor()
+    cursor.execute("PRAGMA foreign_keys=ON")
+    cursor.close()
+
+
+def make_engine(url: str = None, null_pool: bool = None, stats: PoolStats = None):
+    """
+    Create an engine configured from the DB_* settings.
+
+    Args:
+        url: Database URL (default DATABASE_URL)
+        null_pool: Open a fresh connection per checkout instead of pooling
+                   (default DB_NULL_POOL); meant for CLI one-shots
+        stats: PoolStats to record checkout/wait counters into
+
+    Returns:
+        The SQLAlchemy engine
+    """
+    url = make_url(url or DATABASE_URL)
+    null_pool = DB_NULL_POOL if null_pool is None else null_pool
+    kwargs = {"pool_pre_ping": DB_POOL_PRE_PING}
+    connect_args = {}
+
+    if url.get_backend_name() == "postgresql" and DB_STATEMENT_TIMEOUT_MS:
+        connect_args["options"] = f"-c statement_timeout={DB_STATEMENT_TIMEOUT_MS}"
+
+    if null_pool:
+        kwargs["poolclass"] = NullPool
+    elif url.get_backend_name() != "sqlite" or url.database not in (None, "", ":memory:"):
+        pool_class = type("EnginePool", (InstrumentedQueuePool,), {"stats": stats})
+        kwargs.update(
+            poolclass=pool_class,
+            pool_size=DB_POOL_SIZE,
+            max_overflow=DB_MAX_OVERFLOW,
+            pool_timeout=DB_POOL_TIMEOUT,
+            pool_recycle=DB_POOL_RECYCLE,
+        )
+    new_engine = create_engine(url, connect_args=connect_args, **kwargs)
+
+    if url.get_backend_name() == "sqlite":
+        event.listen(new_engine, "connect", _enable_sqlite_foreign_keys)
+
+    if stats is not None:
+        _count_pool_events(new_engine, stats)
+    return new_engine
+
+
+pool_stats = PoolStats()
+engine = make_engine(stats=pool_stats)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
 
+# asyncio drivers swapped in for the async engine, by backend
+ASYNC_DRIVERS = {"postgresql": "postgresql+asyncpg", "sqlite": "sqlite+aiosqlite"}
+
+
+def make_async_engine(url: str = None, null_pool: bool = None, stats: PoolStats = None):
+    """
+    Async twin of make_engine() for AsyncSession users (draft_storage_async).
+
+    The URL's driver is replaced by its asyncio counterpart (asyncpg for
+    PostgreSQL, aiosqlite for SQLite). The pool is sized by DB_ASYNC_POOL_SIZE
+    and DB_ASYNC_MAX_OVERFLOW; the other DB_* settings are shared.
+    """
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    url = make_url(url or DATABASE_URL)
+    backend = url.get_backend_name()
+    url = url.set(drivername=ASYNC_DRIVERS.get(backend, url.drivername))
+    null_pool = DB_NULL_POOL if null_pool is None else null_pool
+    kwargs = {"pool_pre_ping": DB_POOL_PRE_PING}
+    connect_args = {}
+
+    if backend == "postgresql" and DB_STATEMENT_TIMEOUT_MS:
+        connect_args["server_settings"] = {"statement_timeout": str(DB_STATEMENT_TIMEOUT_MS)}
+
+    if null_pool:
+        kwargs["poolclass"] = NullPool
+    elif backend != "sqlite" or url.database not in (None, "", ":memory:"):
+        kwargs.update(
+            poolclass=type("AsyncEnginePool", (InstrumentedAsyncQueuePool,), {"stats": stats}),
+            pool_size=DB_ASYNC_POOL_SIZE,
+            max_overflow=DB_ASYNC_MAX_OVERFLOW,
+            pool_timeout=DB_POOL_TIMEOUT,
+            pool_recycle=DB_POOL_RECYCLE,
+        )
+    new_engine = create_async_engine(url, connect_args=connect_args, **kwargs)
+
+    if backend == "sqlite":
+        event.listen(new_engine.sync_engine, "connect", _enable_sqlite_foreign_keys)
+    if stats is not None:
+        _count_pool_events(new_engine.sync_engine, stats)
+    return new_engine
+
+
+# Shared by every loop's async engine
+async_pool_stats = PoolStats()
+
+
+# One async engine per event loop: asyncio connections can't be shared across
+# loops (tests and asyncio.run() each start a new one). Created on first use,
+# so the async drivers are only needed by code that uses them, and disposed
+# when the loop shuts down (see _dispose_on_shutdown).
+_async_engines = {}
+_async_lock = threading.Lock()
+
+
+def _async_entry() -> tuple:
+    """(engine, sessionmaker, shutdown task) for the running event loop."""
+    loop = asyncio.get_running_loop()
+    with _async_lock:
+        entry = _async_engines.get(loop)
+        if entry is None:
+            from sqlalchemy.ext.asyncio import async_sessionmaker
+
+            async_engine = make_async_engine(stats=async_pool_stats)
+            # Keep loaded attributes after commit; nothing may lazy-load outside an await
+            sessions = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+            # The loop only keeps weak references to tasks, so the entry holds this one
+            watcher = loop.create_task(_dispose_on_shutdown(), name="dispose_async_engine")
+            entry = _async_engines[loop] = (async_engine, sessions, watcher)
+        return entry
+
+
+async def _dispose_on_shutdown():
+    """
+    Wait until cancelled, then dispose the loop's engine.
+
+    asyncio.run() (and uvicorn) cancel every pending task before closing the
+    loop. The engine's connections hold the loop, so without this the entry,
+    the pool and aiosqlite's worker threads would outlive it.
+    """
+    try:
+        await asyncio.get_running_loop().create_future()
+    finally:
+        await dispose_async_engine()
+
+
+def get_async_engine():
+    """The async engine for the running event loop (see make_async_engine)."""
+    return _async_entry()[0]
+
+
+def AsyncSessionLocal():
+    """New AsyncSession on the async engine: `async with AsyncSessionLocal() as db:`."""
+    return _async_entry()[1]()
+
+
+async def dispose_async_engine():
+    """Close the running loop's async pool now (app shutdown; otherwise it happens when the loop shuts down)."""
+    with _async_lock:
+        entry = _async_engines.pop(asyncio.get_running_loop(), None)
+    if entry is not None:
+        async_engine, _, watcher = entry
+        if watcher is not asyncio.current_task():
+            watcher.cancel()
+        await async_engine.dispose()
+
+
+def get_pool_stats() -> dict:
+    """
+    Pool configuration, current occupancy and checkout/wait counters (for diagnostics).
+
+    The async engine's pool is reported under "async"; its occupancy is summed
+    over the engines of event loops still running.
+    """
+    pool = engine.pool
+    status = {
+        "pool_class": type(pool).__name__,
+        "pre_ping": DB_POOL_PRE_PING,
+        "statement_timeout_ms": DB_STATEMENT_TIMEOUT_MS if engine.dialect.name == "postgresql" else None,
+    }
+    if isinstance(pool, QueuePool):
+        status.update({
+            "pool_size": pool.size(),
+            "max_overflow": DB_MAX_OVERFLOW,
+            "timeout_seconds": DB_POOL_TIMEOUT,
+            "recycle_seconds": DB_POOL_RECYCLE,
+            "checked_out": pool.checkedout(),
+            "checked_in": pool.checkedin(),
+            "overflow": pool.overflow(),
+        })
+    status.update(pool_stats.snapshot())
+
+    with _async_lock:
+        async_pools = [entry[0].sync_engine.pool for entry in _async_engines.values()]
+    queue_pools = [p for p in async_pools if isinstance(p, QueuePool)]
+    status["async"] = {
+        "engines": len(async_pools),
+        "pool_size": DB_ASYNC_POOL_SIZE,
+        "max_overflow": DB_ASYNC_MAX_OVERFLOW,
+        "checked_out": sum(p.checkedout() for p in queue_pools),
+        "checked_in": sum(p.checkedin() for p in queue_pools),
+        "overflow": sum(max(p.overflow(), 0) for p in queue_pools),
+        **async_pool_stats.snapshot(),
+    }
+    return status
+
+
 # =============================================================================
 # MODELS
 # =============================================================================
@@ -30,12 +336,23 @@ class Draft(Base):
     template_used = Column(String, nullable=True)
     topic = Column(String, nullable=True)
     status = Column(String, nullable=False, default="draft")
-    scheduled_time = Column(String, nullable=True)
-    posted_at = Column(String, nullable=True)
-    images = Column(JSON, default=list)
+    scheduled_time = Column(DateTime, nullable=True, index=True)
+    posted_at = Column(DateTime, nullable=True, index=True)
     metrics = Column(JSON, default=dict)
-    created_at = Column(String, nullable=False)
+    created_at = Column(DateTime, nullable=False)
     updated_at = Column(String, nullable=False)
+    version = Column(Integer, nullable=False, default=1, server_default="1")  # bumped on every update
+
+    __table_args__ = (
+        Index("ix_drafts_status_created_at", "status", "created_at"),
+        Index("ix_drafts_created_at_id", "created_at", "id"),
+    )
+
+    # Attached library images in display order, loaded with one extra query per list of drafts
+    image_links = relationship(
+        "DraftImage", order_by="DraftImage.position", lazy="selectin",
+        cascade="all, delete-orphan", passive_deletes=True,
+    )
 
 
 class Hook(Base):
@@ -47,6 +364,11 @@ class Hook(Base):
     created_at = Column(String, nullable=False)
     used_count = Column(Integer, default=0)
 
+    __table_args__ = (
+        Index("ix_hooks_created_at_id", "created_at", "id"),
+        Index("ix_hooks_used_count_created_at_id", "used_count", "created_at", "id"),
+    )
+
 
 class Idea(Base):
     __tablename__ = "ideas"
@@ -58,6 +380,11 @@ class Idea(Base):
     created_at = Column(String, nullable=False)
     used_count = Column(Integer, default=0)
 
+    __table_args__ = (
+        Index("ix_ideas_created_at_id", "created_at", "id"),
+        Index("ix_ideas_used_count_created_at_id", "used_count", "created_at", "id"),
+    )
+
 
 class Insight(Base):
     __tablename__ = "insights"
@@ -68,6 +395,11 @@ class Insight(Base):
     category = Column(String, nullable=True)
     created_at = Column(String, nullable=False)
     updated_at = Column(String, nullable=False)
+    version = Column(Integer, nullable=False, default=1, server_default="1")
+
+    __table_args__ = (
+        Index("ix_insights_created_at_id", "created_at", "id"),
+    )
 
 
 class Image(Base):
@@ -79,6 +411,24 @@ class Image(Base):
     url = Column(String, nullable=False)
     uploaded_at = Column(String, nullable=False)
 
+    __table_args__ = (
+        Index("ix_images_uploaded_at_id", "uploaded_at", "id"),
+    )
+
+
+class DraftImage(Base):
+    """Library image attached to a draft; rows go when either side is deleted."""
+    __tablename__ = "draft_images"
+
+    draft_id = Column(String, ForeignKey("drafts.id", ondelete="CASCADE"), primary_key=True)
+    image_id = Column(String, ForeignKey("images.id", ondelete="CASCADE"), primary_key=True)
+    position = Column(Integer, nullable=False, default=0)
+    attached_at = Column(String, nullable=False)
+
+    __table_args__ = (
+        Index("ix_draft_images_image_id", "image_id"),
+    )
+
 
 class SocialProof(Base):
     __tablename__ = "social_proof"
@@ -91,6 +441,11 @@ class SocialProof(Base):
     category = Column(String, nullable=True)
     created_at = Column(String, nullable=False)
     updated_at = Column(String, nullable=False)
+    version = Column(Integer, nullable=False, default=1, server_default="1")
+
+    __table_args__ = (
+        Index("ix_social_proof_created_at_id", "created_at", "id"),
+    )
 
 
 class CompetitorPost(Base):
@@ -111,6 +466,11 @@ class CompetitorPost(Base):
     notes = Column(Text, nullable=True)
     created_at = Column(String, nullable=False)
     updated_at = Column(String, nullable=False)
+    version = Column(Integer, nullable=False, default=1, server_default="1")
+
+    __table_args__ = (
+        Index("ix_competitor_posts_created_at_id", "created_at", "id"),
+    )
 
 
 class TrendingTopic(Base):
@@ -129,6 +489,54 @@ class TrendingTopic(Base):
     created_at = Column(String, nullable=False)
     updated_at = Column(String, nullable=False)
     notes = Column(Text)
+    version = Column(Integer, nullable=False, default=1, server_default="1")
+
+    __table_args__ = (
+        Index("ix_trending_topics_created_at_id", "created_at", "id"),
+    )
+
+
+class Job(Base):
+    __tablename__ = "jobs"
+
+    id = Column(String, primary_key=True)
+    kind = Column(String, nullable=False)             # hooks_from_ideas / create_drafts / trend_scout
+    status = Column(String, nullable=False, default="queued", index=True)  # queued/running/completed/failed
+    payload = Column(JSON, default=dict)
+    item_results = Column(JSON, default=dict)         # item index -> result, kept across restarts
+    progress_done = Column(Integer, default=0)
+    progress_total = Column(Integer, default=0)
+    result = Column(JSON, nullable=True)
+    error = Column(Text, nullable=True)
+    attempts = Column(Integer, default=0)
+    worker_id = Column(String, nullable=True)
+    heartbeat_at = Column(String, nullable=True)
+    created_at = Column(String, nullable=False)
+    updated_at = Column(String, nullable=False)
+    started_at = Column(String, nullable=True)
+    finished_at = Column(String, nullable=True)
+
+
+class LLMCacheEntry(Base):
+    __tablename__ = "llm_cache"
+
+    key = Column(String, primary_key=True)            # sha256 of model + system + messages + params
+    name = Column(String, nullable=True)              # call name, e.g. "generate_hooks"
+    model = Column(String, nullable=True)
+    response = Column(JSON, nullable=False)           # {"text", "stop_reason", "usage"}
+    size_bytes = Column(Integer, default=0)
+    hits = Column(Integer, default=0)
+    created_at = Column(String, nullable=False)
+    last_used_at = Column(String, nullable=False, index=True)
+    expires_at = Column(String, nullable=False)
+
+
+class SchemaVersion(Base):
+    __tablename__ = "schema_version"
+
+    version = Column(Integer, primary_key=True)       # one row per applied migration
+    name = Column(String, nullable=False)
+    applied_at = Column(String, nullable=False)
 
 
 # =============================================================================
@@ -149,8 +557,161 @@ def create_tables():
     Base.metadata.create_all(bind=engine)
 
 
+def parse_timestamp(value) -> Optional[datetime]:
+    """Parse an ISO timestamp string (or pass through a datetime); empty values become None."""
+    if value is None or isinstance(value, datetime):
+        return value
+    value = str(value).strip()
+    if not value:
+        return None
+    parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    # Timestamps are stored naive, in server local time
+    return parsed.astimezone().replace(tzinfo=None) if parsed.tzinfo else parsed
+
+
+DRAFT_TIMESTAMP_COLUMNS = ("scheduled_time", "posted_at", "created_at")
+
+# How SQLAlchemy stores DateTime values in SQLite
+SQLITE_DATETIME_GLOB = "[0-9][0-9][0-9][0-9]-[0-9][0-9]-[0-9][0-9] [0-9][0-9]:[0-9][0-9]:[0-9][0-9].[0-9][0-9][0-9][0-9][0-9][0-9]"
+
+
+def count_rows(db, model) -> int:
+    """Row count that doesn't select the model's columns (safe before later migrations add theirs)."""
+    return db.execute(select(func.count()).select_from(table(model.__tablename__))).scalar()
+
+
+def insert_rows(db, model, rows: list[dict]):
+    """
+    Insert rows writing only the columns they name.
+
+    Unlike insert(model), columns added by later migrations (and their
+    Python-side defaults) are left out, so data and seed migrations work on
+    databases that haven't reached the current schema yet.
+    """
+    if rows:
+        columns = table(model.__tablename__, *(column(name, model.__table__.c[name].type) for name in rows[0]))
+        db.execute(insert(columns), rows)
+
+
+KEYSET_MODELS = [Draft, Hook, Idea, Insight, Image, SocialProof, CompetitorPost, TrendingTopic]
+
+
+def create_keyset_indexes():
+    """Create the (created_at, id) indexes behind keyset pagination on existing tables."""
+    for model in KEYSET_MODELS:
+        for index in model.__table__.indexes:
+            index.create(bind=engine, checkfirst=True)
+
+
+VERSIONED_MODELS = [Draft, Insight, SocialProof, CompetitorPost, TrendingTopic]
+
+
+def add_version_columns():
+    """Add the optimistic-concurrency version column to tables created before it existed."""
+    inspector = inspect(engine)
+    existing = set(inspector.get_table_names())
+    with engine.begin() as conn:
+        for model in VERSIONED_MODELS:
+            table = model.__tablename__
+            if table not in existing:
+                continue
+            if "version" not in {c["name"] for c in inspector.get_columns(table)}:
+                conn.execute(text(f"ALTER TABLE {table} ADD COLUMN version INTEGER NOT NULL DEFAULT 1"))
+
+
+def migrate_usage_counts():
+    """Backfill NULL used_count values (the "most used" sort compares them) and index the sort key."""
+    with engine.begin() as conn:
+        for model in (Hook, Idea):
+            table = model.__table__
+            conn.execute(update(table).where(table.c.used_count.is_(None)).values(used_count=0))
+            for index in table.indexes:
+                index.create(bind=conn, checkfirst=True)
+
+
+def migrate_draft_timestamps():
+    """
+    Convert legacy ISO-string draft timestamps to DateTime and add the drafts indexes.
+
+    Every legacy value goes through parse_timestamp() on both backends, so
+    "T" or space separators and UTC offsets are handled the same way.
+
+    Safe to run repeatedly: columns already typed as timestamps and values
+    already in the DateTime storage format are left alone.
+    """
+    inspector = inspect(engine)
+    if "drafts" not in inspector.get_table_names():
+        return
+
+    with engine.begin() as conn:
+        for name in DRAFT_TIMESTAMP_COLUMNS:
+            if engine.dialect.name == "postgresql":
+                column_types = {c["name"]: c["type"] for c in inspector.get_columns("drafts")}
+                if isinstance(column_types[name], DateTime):
+                    continue
+                # Read the strings first: a ::timestamp cast silently drops UTC offsets
+                legacy = conn.execute(text(f"SELECT id, {name} FROM drafts WHERE {name} IS NOT NULL")).all()
+                conn.execute(text(
+                    f"ALTER TABLE drafts ALTER COLUMN {name} TYPE TIMESTAMP "
+                    f"USING NULLIF({name}, '')::timestamp"
+                ))
+            else:
+                # SQLite keeps the declared column type, so rewrite anything not
+                # already in the DateTime storage format ("2024-01-01 12:00:00.000000")
+                legacy = conn.execute(
+                    text(f"SELECT id, {name} FROM drafts WHERE {name} = '' OR NOT {name} GLOB :stored"),
+                    {"stored": SQLITE_DATETIME_GLOB},
+                ).all()
+            if legacy:
+                drafts = Draft.__table__
+                conn.execute(
+                    update(drafts).where(drafts.c.id == bindparam("draft_id")).values({name: bindparam("value")}),
+                    [{"draft_id": draft_id, "value": parse_timestamp(value)} for draft_id, value in legacy],
+                )
+
+        for index in Draft.__table__.indexes:
+            index.create(bind=conn, checkfirst=True)
+
+
+def _draft_image_links(draft_id: str, refs, known_images: set) -> list[dict]:
+    """draft_images rows for a legacy images JSON list, skipping duplicates and deleted images."""
+    if isinstance(refs, str):
+        refs = json.loads(refs)
+    links, seen = [], set()
+    now = datetime.now().isoformat()
+    for ref in refs or []:
+        image_id = ref.get("id") if isinstance(ref, dict) else ref
+        if image_id in known_images and image_id not in seen:
+            seen.add(image_id)
+            links.append({"draft_id": draft_id, "image_id": image_id, "position": len(links), "attached_at": now})
+    return links
+
+
+def migrate_draft_images():
+    """Move the legacy drafts.images JSON column into the draft_images table, then drop it."""
+    DraftImage.__table__.create(bind=engine, checkfirst=True)
+    inspector = inspect(engine)
+    if "images" not in {c["name"] for c in inspector.get_columns("drafts")}:
+        return
+
+    with engine.begin() as conn:
+        known_images = set(conn.scalars(select(Image.id)))
+        links = [
+            link
+            for draft_id, refs in conn.execute(text("SELECT id, images FROM drafts WHERE images IS NOT NULL"))
+            for link in _draft_image_links(draft_id, refs, known_images)
+        ]
+        if links:
+            conn.execute(insert(DraftImage), links)
+        conn.execute(text("ALTER TABLE drafts DROP COLUMN images"))
+
+
 def migrate_json_to_db():
-    """One-time migration: import existing JSON data into DB tables (skips if table has data)."""
+    """
+    One-time migration: import existing JSON data into DB tables (skips if table has data).
+
+    Rows are written with insert_rows(), so this runs on schemas older than the models.
+    """
     base_dir = Path(__file__).parent.parent
 
     drafts_file = base_dir / ".drafts.json"
@@ -159,83 +720,105 @@ def migrate_json_to_db():
     insights_file = base_dir / ".insights_bank.json"
     images_file = base_dir / ".image_library.json"
 
+    draft_image_refs = {}
     with SessionLocal() as db:
         # Drafts
-        if drafts_file.exists() and db.query(Draft).count() == 0:
+        if drafts_file.exists() and count_rows(db, Draft) == 0:
             with open(drafts_file, "r", encoding="utf-8") as f:
                 data = json.load(f)
+            rows = []
             for d in data.get("drafts", []):
-                db.add(Draft(
-                    id=d["id"],
-                    content=d.get("content", ""),
-                    hooks=d.get("hooks", []),
-                    selected_hook=d.get("selected_hook"),
-                    template_used=d.get("template_used"),
-                    topic=d.get("topic"),
-                    status=d.get("status", "draft"),
-                    scheduled_time=d.get("scheduled_time"),
-                    posted_at=d.get("posted_at"),
-                    images=d.get("images", []),
-                    metrics=d.get("metrics", {"impressions": None, "likes": None, "comments": None}),
-                    created_at=d.get("created_at", datetime.now().isoformat()),
-                    updated_at=d.get("updated_at", datetime.now().isoformat()),
-                ))
+                draft_image_refs[d["id"]] = d.get("images", [])
+                rows.append({
+                    "id": d["id"],
+                    "content": d.get("content", ""),
+                    "hooks": d.get("hooks", []),
+                    "selected_hook": d.get("selected_hook"),
+                    "template_used": d.get("template_used"),
+                    "topic": d.get("topic"),
+                    "status": d.get("status", "draft"),
+                    "scheduled_time": parse_timestamp(d.get("scheduled_time")),
+                    "posted_at": parse_timestamp(d.get("posted_at")),
+                    "metrics": d.get("metrics", {"impressions": None, "likes": None, "comments": None}),
+                    "created_at": parse_timestamp(d.get("created_at")) or datetime.now(),
+                    "updated_at": d.get("updated_at", datetime.now().isoformat()),
+                })
+            insert_rows(db, Draft, rows)
             db.commit()
 
         # Hooks
-        if hooks_file.exists() and db.query(Hook).count() == 0:
+        if hooks_file.exists() and count_rows(db, Hook) == 0:
             with open(hooks_file, "r", encoding="utf-8") as f:
                 data = json.load(f)
-            for h in data.get("hooks", []):
-                db.add(Hook(
-                    id=h["id"],
-                    hook=h["hook"],
-                    topic=h.get("topic"),
-                    created_at=h.get("created_at", datetime.now().isoformat()),
-                    used_count=h.get("used_count", 0),
-                ))
+            insert_rows(db, Hook, [
+                {
+                    "id": h["id"],
+                    "hook": h["hook"],
+                    "topic": h.get("topic"),
+                    "created_at": h.get("created_at", datetime.now().isoformat()),
+                    "used_count": h.get("used_count", 0),
+                }
+                for h in data.get("hooks", [])
+            ])
             db.commit()
 
         # Ideas
-        if ideas_file.exists() and db.query(Idea).count() == 0:
+        if ideas_file.exists() and count_rows(db, Idea) == 0:
             with open(ideas_file, "r", encoding="utf-8") as f:
                 data = json.load(f)
-            for i in data.get("ideas", []):
-                db.add(Idea(
-                    id=i["id"],
-                    idea=i["idea"],
-                    topic=i.get("topic"),
-                    angle=i.get("angle"),
-                    created_at=i.get("created_at", datetime.now().isoformat()),
-                    used_count=i.get("used_count", 0),
-                ))
+            insert_rows(db, Idea, [
+                {
+                    "id": i["id"],
+                    "idea": i["idea"],
+                    "topic": i.get("topic"),
+                    "angle": i.get("angle"),
+                    "created_at": i.get("created_at", datetime.now().isoformat()),
+                    "used_count": i.get("used_count", 0),
+                }
+                for i in data.get("ideas", [])
+            ])
             db.commit()
 
         # Insights
-        if insights_file.exists() and db.query(Insight).count() == 0:
+        if insights_file.exists() and count_rows(db, Insight) == 0:
             with open(insights_file, "r", encoding="utf-8") as f:
                 data = json.load(f)
-            for i in data.get("insights", []):
-                db.add(Insight(
-                    id=i["id"],
-                    title=i["title"],
-                    content=i["content"],
-                    category=i.get("category"),
-                    created_at=i.get("created_at", datetime.now().isoformat()),
-                    updated_at=i.get("updated_at", datetime.now().isoformat()),
-                ))
+            insert_rows(db, Insight, [
+                {
+                    "id": i["id"],
+                    "title": i["title"],
+                    "content": i["content"],
+                    "category": i.get("category"),
+                    "created_at": i.get("created_at", datetime.now().isoformat()),
+                    "updated_at": i.get("updated_at", datetime.now().isoformat()),
+                }
+                for i in data.get("insights", [])
+            ])
             db.commit()
 
         # Images
-        if images_file.exists() and db.query(Image).count() == 0:
+        if images_file.exists() and count_rows(db, Image) == 0:
             with open(images_file, "r", encoding="utf-8") as f:
                 data = json.load(f)
-            for img in data.get("images", []):
-                db.add(Image(
-                    id=img["id"],
-                    original_name=img["original_name"],
-                    s3_key=img["s3_key"],
-                    url=img["url"],
-                    uploaded_at=img.get("uploaded_at", datetime.now().isoformat()),
-                ))
+            insert_rows(db, Image, [
+                {
+                    "id": img["id"],
+                    "original_name": img["original_name"],
+                    "s3_key": img["s3_key"],
+                    "url": img["url"],
+                    "uploaded_at": img.get("uploaded_at", datetime.now().isoformat()),
+                }
+                for img in data.get("images", [])
+            ])
+            db.commit()
+
+        # Draft attachments, once both drafts and images exist
+        known_images = set(db.scalars(select(Image.id)))
+        links = [
+            link
+            for draft_id, refs in draft_image_refs.items()
+            for link in _draft_image_links(draft_id, refs, known_images)
+        ]
+        if links:
+            db.execute(insert(DraftImage), links)
             db.commit()
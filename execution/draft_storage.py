@@ -1,17 +1,160 @@
 """
 Draft storage system - PostgreSQL-backed storage for LinkedIn post drafts, hooks, ideas, and insights.
+
+Statements and row builders are shared with draft_storage_async, which
+runs the same queries on an AsyncSession.
 """
-from datetime import datetime
-from typing import Optional
+from collections import Counter
+from datetime import date, datetime, timedelta
+from typing import Callable, Iterable, Optional
 import uuid
 
-from database import SessionLocal, Draft, Hook, Idea, Insight, SocialProof, CompetitorPost, TrendingTopic
+from sqlalchemy import delete, func, insert, select, update
+from sqlalchemy.exc import IntegrityError
+
+from database import (
+    SessionLocal, Draft, DraftImage, Hook, Idea, Insight, SocialProof, CompetitorPost, TrendingTopic,
+    count_rows, insert_rows, parse_timestamp,
+)
+from pagination import apply_keyset
+
+
+class ConflictError(Exception):
+    """An update's expected_version no longer matches: someone else saved the row first."""
+
+    def __init__(self, row_id: str, expected_version: int, current_version: int):
+        super().__init__(
+            f"{row_id} was modified by another save (expected version {expected_version}, now {current_version})"
+        )
+        self.row_id = row_id
+        self.expected_version = expected_version
+        self.current_version = current_version
 
 
 # =============================================================================
 # HELPERS
 # =============================================================================
 
+def _iso(value: Optional[datetime]) -> Optional[str]:
+    """DateTime column value as the ISO string callers and templates expect."""
+    return value.isoformat() if value else None
+
+
+def _avg(value, digits: int = 1) -> Optional[float]:
+    """Round a SQL AVG() result (Decimal on PostgreSQL, None on no rows)."""
+    return round(float(value), digits) if value is not None else None
+
+
+def _top_group_select(column):
+    """Most frequent non-null value of a column (ties broken alphabetically)."""
+    return select(column).where(column.isnot(None)).group_by(column).order_by(func.count().desc(), column).limit(1)
+
+
+def _top_group(db, column) -> Optional[str]:
+    return db.scalar(_top_group_select(column))
+
+
+def _categories_select(column):
+    """Distinct non-empty values of a category column, sorted."""
+    return select(column).where(column.isnot(None), column != "").distinct().order_by(column)
+
+
+def _increment_usage(key_column, keys: Iterable[str]) -> int:
+    """
+    Add one use per occurrence of each key with set-based UPDATEs.
+
+    used_count is incremented in the database, so concurrent callers never
+    lose counts. Keys used the same number of times share one statement.
+
+    Returns:
+        Number of rows updated
+    """
+    updated = 0
+    with SessionLocal() as db:
+        for stmt in _usage_statements(key_column, keys):
+            updated += db.execute(stmt).rowcount
+        db.commit()
+    return updated
+
+
+def _usage_statements(key_column, keys: Iterable[str]) -> list:
+    """One UPDATE per distinct use count (see _increment_usage)."""
+    by_times = {}
+    for key, times in Counter(k for k in keys if k).items():
+        by_times.setdefault(times, []).append(key)
+
+    model = key_column.class_
+    return [
+        update(model)
+        .where(key_column.in_(batch))
+        .values(used_count=func.coalesce(model.used_count, 0) + times)
+        .execution_options(synchronize_session=False)
+        for times, batch in by_times.items()
+    ]
+
+
+def _new_id() -> str:
+    return str(uuid.uuid4())[:8]
+
+
+def _insert_returning(model, rows: list[dict], to_dict: Callable) -> list[dict]:
+    """
+    Insert rows with a multi-row INSERT ... RETURNING in a single transaction.
+
+    Either every row is saved or none is. Results are in input order.
+    """
+    if not rows:
+        return []
+    with SessionLocal() as db:
+        created = db.scalars(insert(model).returning(model, sort_by_parameter_order=True), rows).all()
+        # Convert before commit: committing expires the objects
+        results = [to_dict(row) for row in created]
+        db.commit()
+        return results
+
+
+def _update_returning(model, row_id: str, updates: dict, allowed_fields: set, to_dict: Callable,
+                      expected_version: int = None) -> Optional[dict]:
+    """
+    Apply updates with a single UPDATE ... RETURNING, bumping the row's version.
+
+    With expected_version, the UPDATE only matches if the row hasn't been
+    saved since that version was read; otherwise ConflictError is raised
+    instead of silently overwriting the other save.
+
+    Returns:
+        The updated row as a dict, or None if it doesn't exist
+    """
+    with SessionLocal() as db:
+        row = db.scalars(_update_statement(model, row_id, updates, allowed_fields, expected_version)).first()
+        if row is None:
+            # Missing row or lost race: only the failure path pays for the extra read
+            current = db.scalar(select(model.version).where(model.id == row_id))
+            _raise_if_conflict(model, row_id, expected_version, current)
+            return None
+        result = to_dict(row)
+        db.commit()
+        return result
+
+
+def _update_statement(model, row_id: str, updates: dict, allowed_fields: set, expected_version: int = None):
+    """UPDATE ... RETURNING for _update_returning(), bumping version (and matching it, if given)."""
+    values = {key: value for key, value in updates.items() if key in allowed_fields}
+    values["updated_at"] = datetime.now().isoformat()
+    values["version"] = model.version + 1
+
+    stmt = update(model).where(model.id == row_id)
+    if expected_version is not None:
+        stmt = stmt.where(model.version == expected_version)
+    return stmt.values(values).returning(model)
+
+
+def _raise_if_conflict(model, row_id: str, expected_version: Optional[int], current_version: Optional[int]):
+    """After an UPDATE matched nothing: a stale expected_version is a conflict, a missing row is not."""
+    if current_version is not None and expected_version is not None:
+        raise ConflictError(row_id, expected_version, current_version)
+
+
 def _draft_to_dict(row: Draft) -> dict:
     """Convert a Draft ORM object to dict matching the original JSON structure."""
     return {
@@ -22,12 +165,13 @@ def _draft_to_dict(row: Draft) -> dict:
         "template_used": row.template_used,
         "topic": row.topic,
         "status": row.status or "draft",
-        "scheduled_time": row.scheduled_time,
-        "posted_at": row.posted_at,
-        "images": row.images or [],
+        "scheduled_time": _iso(row.scheduled_time),
+        "posted_at": _iso(row.posted_at),
+        "images": [{"id": link.image_id} for link in row.image_links],
         "metrics": row.metrics or {"impressions": None, "likes": None, "comments": None},
-        "created_at": row.created_at,
+        "created_at": _iso(row.created_at),
         "updated_at": row.updated_at,
+        "version": row.version,
     }
 
 
@@ -60,6 +204,7 @@ def _insight_to_dict(row: Insight) -> dict:
         "category": row.category,
         "created_at": row.created_at,
         "updated_at": row.updated_at,
+        "version": row.version,
     }
 
 
@@ -72,7 +217,8 @@ def create_draft(
     hooks: list[str] = None,
     template_used: str = None,
     topic: str = None,
-    selected_hook: int = None
+    selected_hook: int = None,
+    draft_id: str = None,
 ) -> dict:
     """
     Create a new draft post.
@@ -82,59 +228,112 @@ def create_draft(
         hooks: List of hook options (optional)
         template_used: Which template was used to generate (optional)
         topic: Topic/theme of the post (optional)
+        draft_id: ID to use instead of a random one (IntegrityError if taken)
 
     Returns:
         The created draft dict with id
     """
-    now = datetime.now().isoformat()
-    draft = Draft(
-        id=str(uuid.uuid4())[:8],
-        content=content,
-        hooks=hooks or [],
-        selected_hook=selected_hook,
-        template_used=template_used,
-        topic=topic,
-        status="draft",
-        scheduled_time=None,
-        posted_at=None,
-        images=[],
-        metrics={"impressions": None, "likes": None, "comments": None},
-        created_at=now,
-        updated_at=now,
-    )
+    row = _draft_row(content, hooks, template_used, topic, selected_hook)
+    if draft_id:
+        row["id"] = draft_id
+    return _insert_returning(Draft, [row], _draft_to_dict)[0]
 
-    with SessionLocal() as db:
-        db.add(draft)
-        db.commit()
-        db.refresh(draft)
-        return _draft_to_dict(draft)
+
+def _draft_row(content: str, hooks: list[str] = None, template_used: str = None, topic: str = None,
+               selected_hook: int = None, now: datetime = None) -> dict:
+    """Column values for a new draft."""
+    now = now or datetime.now()
+    return {
+        "id": _new_id(),
+        "content": content,
+        "hooks": hooks or [],
+        "selected_hook": selected_hook,
+        "template_used": template_used,
+        "topic": topic,
+        "status": "draft",
+        "scheduled_time": None,
+        "posted_at": None,
+        "metrics": {"impressions": None, "likes": None, "comments": None},
+        "created_at": now,
+        "updated_at": now.isoformat(),
+    }
+
+
+def create_drafts_bulk(drafts: list[dict]) -> list[dict]:
+    """
+    Create many drafts in one transaction.
+
+    Args:
+        drafts: Dicts with create_draft()'s arguments (content required;
+                hooks, template_used, topic, selected_hook optional)
+
+    Returns:
+        The created draft dicts, in input order
+    """
+    now = datetime.now()
+    rows = [
+        _draft_row(d["content"], d.get("hooks"), d.get("template_used"), d.get("topic"), d.get("selected_hook"), now)
+        for d in drafts
+    ]
+    return _insert_returning(Draft, rows, _draft_to_dict)
 
 
 def get_draft(draft_id: str) -> Optional[dict]:
     """Get a specific draft by ID."""
     with SessionLocal() as db:
-        row = db.query(Draft).filter(Draft.id == draft_id).first()
+        row = db.get(Draft, draft_id)
         return _draft_to_dict(row) if row else None
 
 
-def list_drafts(status: str = None, limit: int = None) -> list[dict]:
+def list_drafts(status: str = None, limit: int = None, cursor: str = None) -> list[dict]:
     """
-    List all drafts, optionally filtered by status.
+    List drafts newest first, optionally filtered by status.
 
     Args:
         status: Filter by status (draft, scheduled, posted)
         limit: Maximum number of drafts to return
+        cursor: Return drafts after this position (see pagination.py)
 
     Returns:
         List of draft dicts
     """
     with SessionLocal() as db:
-        query = db.query(Draft).order_by(Draft.created_at.desc())
-        if status:
-            query = query.filter(Draft.status == status)
-        if limit:
-            query = query.limit(limit)
-        return [_draft_to_dict(r) for r in query.all()]
+        return [_draft_to_dict(r) for r in db.scalars(_drafts_select(status, limit, cursor))]
+
+
+def _drafts_select(status: str = None, limit: int = None, cursor: str = None):
+    query = select(Draft)
+    if status:
+        query = query.where(Draft.status == status)
+    return apply_keyset(query, Draft.created_at, Draft.id, cursor, limit)
+
+
+def _scheduled_or_posted_between(start: datetime, end: datetime):
+    """Range predicate on the indexed timestamp columns: [start, end)."""
+    return (
+        ((Draft.scheduled_time >= start) & (Draft.scheduled_time < end)) |
+        ((Draft.posted_at >= start) & (Draft.posted_at < end))
+    )
+
+
+def _between_select(start: datetime, end: datetime):
+    """Drafts scheduled or posted in [start, end), in calendar order."""
+    return (
+        select(Draft)
+        .where(_scheduled_or_posted_between(start, end))
+        .order_by(func.coalesce(Draft.scheduled_time, Draft.posted_at), Draft.id)
+    )
+
+
+def _month_select(year: int, month: int):
+    start = datetime(year, month, 1)
+    end = datetime(year + 1, 1, 1) if month == 12 else datetime(year, month + 1, 1)
+    return _between_select(start, end)
+
+
+def _day_select(date_str: str):
+    start = datetime.combine(date.fromisoformat(date_str), datetime.min.time())
+    return _between_select(start, start + timedelta(days=1))
 
 
 def list_drafts_by_date(year: int, month: int) -> list[dict]:
@@ -148,13 +347,8 @@ def list_drafts_by_date(year: int, month: int) -> list[dict]:
     Returns:
         List of draft dicts with their scheduled/posted dates
     """
-    prefix = f"{year}-{month:02d}"
     with SessionLocal() as db:
-        rows = db.query(Draft).filter(
-            (Draft.scheduled_time.ilike(f"{prefix}%")) |
-            (Draft.posted_at.ilike(f"{prefix}%"))
-        ).all()
-        return [_draft_to_dict(r) for r in rows]
+        return [_draft_to_dict(r) for r in db.scalars(_month_select(year, month))]
 
 
 def get_drafts_for_date(date_str: str) -> list[dict]:
@@ -168,40 +362,75 @@ def get_drafts_for_date(date_str: str) -> list[dict]:
         List of draft dicts
     """
     with SessionLocal() as db:
-        rows = db.query(Draft).filter(
-            (Draft.scheduled_time.ilike(f"{date_str}%")) |
-            (Draft.posted_at.ilike(f"{date_str}%"))
-        ).all()
-        return [_draft_to_dict(r) for r in rows]
+        return [_draft_to_dict(r) for r in db.scalars(_day_select(date_str))]
 
 
-def update_draft(draft_id: str, **updates) -> Optional[dict]:
+def update_draft(draft_id: str, expected_version: int = None, **updates) -> Optional[dict]:
     """
     Update a draft.
 
     Args:
         draft_id: The draft ID
-        **updates: Fields to update (content, hooks, selected_hook, status, scheduled_time, posted_at, images)
+        expected_version: Version the caller read; a newer save raises ConflictError
+        **updates: Fields to update (content, hooks, selected_hook, status, scheduled_time, posted_at)
 
     Returns:
         Updated draft dict or None if not found
     """
+    return _update_returning(Draft, draft_id, _draft_updates(updates), DRAFT_FIELDS, _draft_to_dict, expected_version)
+
+
+DRAFT_FIELDS = {
+    "content", "hooks", "selected_hook", "template_used", "topic",
+    "status", "scheduled_time", "posted_at", "metrics"
+}
+
+
+def _draft_updates(updates: dict) -> dict:
+    """Draft updates with timestamp strings parsed (ValueError if malformed)."""
+    for key in ("scheduled_time", "posted_at"):
+        if key in updates:
+            updates[key] = parse_timestamp(updates[key])
+    return updates
+
+
+def attach_draft_image(draft_id: str, image_id: str) -> Optional[dict]:
+    """
+    Attach a library image after the draft's existing ones (no-op if already
+    attached, or if the image isn't in the library).
+
+    Returns:
+        The draft, or None if it doesn't exist
+    """
     with SessionLocal() as db:
-        row = db.query(Draft).filter(Draft.id == draft_id).first()
-        if not row:
-            return None
+        try:
+            db.execute(_attach_image_statement(draft_id, image_id))
+            db.commit()
+        except IntegrityError:
+            # Already attached, or a foreign key miss on the draft or image
+            db.rollback()
+    return get_draft(draft_id)
+
+
+def _attach_image_statement(draft_id: str, image_id: str):
+    """INSERT of a draft_images link positioned after the draft's existing images."""
+    next_position = (
+        select(func.coalesce(func.max(DraftImage.position), -1) + 1)
+        .where(DraftImage.draft_id == draft_id)
+        .scalar_subquery()
+    )
+    return insert(DraftImage).values(
+        draft_id=draft_id, image_id=image_id,
+        position=next_position, attached_at=datetime.now().isoformat(),
+    )
 
-        allowed_fields = {
-            "content", "hooks", "selected_hook", "template_used", "topic",
-            "status", "scheduled_time", "posted_at", "images", "metrics"
-        }
-        for key, value in updates.items():
-            if key in allowed_fields:
-                setattr(row, key, value)
-        row.updated_at = datetime.now().isoformat()
+
+def detach_draft_image(draft_id: str, image_id: str) -> Optional[dict]:
+    """Detach a library image from a draft. None if the draft doesn't exist."""
+    with SessionLocal() as db:
+        db.execute(delete(DraftImage).where(DraftImage.draft_id == draft_id, DraftImage.image_id == image_id))
         db.commit()
-        db.refresh(row)
-        return _draft_to_dict(row)
+    return get_draft(draft_id)
 
 
 def delete_draft(draft_id: str) -> bool:
@@ -223,9 +452,10 @@ def get_final_post(draft_id: str) -> Optional[str]:
     or just the content if no hook is selected.
     """
     draft = get_draft(draft_id)
-    if not draft:
-        return None
+    return _final_post(draft) if draft else None
 
+
+def _final_post(draft: dict) -> str:
     content = draft["content"]
 
     if draft["selected_hook"] is not None and draft["hooks"]:
@@ -241,6 +471,24 @@ def get_final_post(draft_id: str) -> Optional[str]:
 # HOOKS BANK FUNCTIONS
 # =============================================================================
 
+BANK_SORTS = ["newest", "most_used"]
+
+
+def _bank_rank(model, sort: str):
+    """Leading keyset column for a hooks/ideas bank sort."""
+    if sort not in BANK_SORTS:
+        raise ValueError(f"Unknown sort: {sort!r}")
+    return model.used_count if sort == "most_used" else None
+
+
+def _bank_select(model, topic: str = None, cursor: str = None, limit: int = None, sort: str = "newest"):
+    """Hooks or ideas bank page (see get_hooks_bank)."""
+    query = select(model)
+    if topic:
+        query = query.where(model.topic.ilike(f"%{topic}%"))
+    return apply_keyset(query, model.created_at, model.id, cursor, limit, rank_col=_bank_rank(model, sort))
+
+
 def save_hook_to_bank(hook: str, topic: str = None) -> dict:
     """
     Save a hook to the hooks bank for future use.
@@ -252,36 +500,39 @@ def save_hook_to_bank(hook: str, topic: str = None) -> dict:
     Returns:
         The saved hook entry
     """
-    entry = Hook(
-        id=str(uuid.uuid4())[:8],
-        hook=hook,
-        topic=topic,
-        created_at=datetime.now().isoformat(),
-        used_count=0,
-    )
+    return _insert_returning(Hook, [_hook_row(hook, topic)], _hook_to_dict)[0]
 
-    with SessionLocal() as db:
-        db.add(entry)
-        db.commit()
-        db.refresh(entry)
-        return _hook_to_dict(entry)
+
+def _hook_row(hook: str, topic: str = None, now: str = None) -> dict:
+    return {"id": _new_id(), "hook": hook, "topic": topic, "created_at": now or datetime.now().isoformat(), "used_count": 0}
 
 
-def get_hooks_bank(topic: str = None) -> list[dict]:
+def save_hooks_bulk(hooks: list[str], topic: str = None) -> list[dict]:
     """
-    Get all saved hooks, optionally filtered by topic.
+    Save a batch of hooks to the bank in one transaction.
+
+    Returns:
+        The saved hook entries, in input order
+    """
+    now = datetime.now().isoformat()
+    return _insert_returning(Hook, [_hook_row(hook, topic, now) for hook in hooks], _hook_to_dict)
+
+
+def get_hooks_bank(topic: str = None, cursor: str = None, limit: int = None, sort: str = "newest") -> list[dict]:
+    """
+    Get saved hooks newest (or most used) first, optionally filtered by topic.
 
     Args:
         topic: Filter by topic (partial match)
+        cursor: Return entries after this position (see pagination.py)
+        limit: Maximum number of entries to return
+        sort: "newest" (default) or "most_used"
 
     Returns:
         List of hook entries
     """
     with SessionLocal() as db:
-        query = db.query(Hook).order_by(Hook.created_at.desc())
-        if topic:
-            query = query.filter(Hook.topic.ilike(f"%{topic}%"))
-        return [_hook_to_dict(r) for r in query.all()]
+        return [_hook_to_dict(r) for r in db.scalars(_bank_select(Hook, topic, cursor, limit, sort))]
 
 
 def delete_hook_from_bank(hook_id: str) -> bool:
@@ -295,13 +546,9 @@ def delete_hook_from_bank(hook_id: str) -> bool:
         return True
 
 
-def increment_hook_usage(hook_id: str) -> None:
-    """Increment the usage count for a hook."""
-    with SessionLocal() as db:
-        row = db.query(Hook).filter(Hook.id == hook_id).first()
-        if row:
-            row.used_count = (row.used_count or 0) + 1
-            db.commit()
+def increment_hook_usage(hook_ids: Iterable[str]) -> int:
+    """Add one use to each hook ID (repeated IDs count each time). Returns rows updated."""
+    return _increment_usage(Hook.id, [hook_ids] if isinstance(hook_ids, str) else hook_ids)
 
 
 # =============================================================================
@@ -320,37 +567,50 @@ def save_idea_to_bank(idea: str, topic: str = None, angle: str = None) -> dict:
     Returns:
         The saved idea entry
     """
-    entry = Idea(
-        id=str(uuid.uuid4())[:8],
-        idea=idea,
-        topic=topic,
-        angle=angle,
-        created_at=datetime.now().isoformat(),
-        used_count=0,
-    )
+    return _insert_returning(Idea, [_idea_row(idea, topic, angle)], _idea_to_dict)[0]
 
-    with SessionLocal() as db:
-        db.add(entry)
-        db.commit()
-        db.refresh(entry)
-        return _idea_to_dict(entry)
 
+def _idea_row(idea: str, topic: str = None, angle: str = None, now: str = None) -> dict:
+    return {
+        "id": _new_id(),
+        "idea": idea,
+        "topic": topic,
+        "angle": angle,
+        "created_at": now or datetime.now().isoformat(),
+        "used_count": 0,
+    }
 
-def get_ideas_bank(topic: str = None) -> list[dict]:
+
+def save_ideas_bulk(ideas: list[dict], topic: str = None) -> list[dict]:
     """
-    Get all saved ideas, optionally filtered by topic.
+    Save a batch of ideas to the bank in one transaction.
+
+    Args:
+        ideas: Dicts with 'idea' and optional 'angle' (as returned by generate_ideas)
+        topic: Original topic they relate to
+
+    Returns:
+        The saved idea entries, in input order
+    """
+    now = datetime.now().isoformat()
+    return _insert_returning(Idea, [_idea_row(i["idea"], topic, i.get("angle"), now) for i in ideas], _idea_to_dict)
+
+
+def get_ideas_bank(topic: str = None, cursor: str = None, limit: int = None, sort: str = "newest") -> list[dict]:
+    """
+    Get saved ideas newest (or most used) first, optionally filtered by topic.
 
     Args:
         topic: Filter by topic (partial match)
+        cursor: Return entries after this position (see pagination.py)
+        limit: Maximum number of entries to return
+        sort: "newest" (default) or "most_used"
 
     Returns:
         List of idea entries
     """
     with SessionLocal() as db:
-        query = db.query(Idea).order_by(Idea.created_at.desc())
-        if topic:
-            query = query.filter(Idea.topic.ilike(f"%{topic}%"))
-        return [_idea_to_dict(r) for r in query.all()]
+        return [_idea_to_dict(r) for r in db.scalars(_bank_select(Idea, topic, cursor, limit, sort))]
 
 
 def delete_idea_from_bank(idea_id: str) -> bool:
@@ -364,36 +624,64 @@ def delete_idea_from_bank(idea_id: str) -> bool:
         return True
 
 
+def increment_idea_usage(idea_ids: Iterable[str]) -> int:
+    """Add one use to each idea ID (repeated IDs count each time). Returns rows updated."""
+    return _increment_usage(Idea.id, [idea_ids] if isinstance(idea_ids, str) else idea_ids)
+
+
+def record_bank_usage(hooks: Iterable[str] = (), ideas: Iterable[str] = ()) -> dict:
+    """
+    Count bank hooks and ideas that were just used in drafts.
+
+    Generated drafts carry hook and idea text rather than bank IDs, so bank
+    entries are matched on their exact text. Call once per batch of drafts.
+
+    Returns:
+        {"hooks": rows updated, "ideas": rows updated}
+    """
+    return {
+        "hooks": _increment_usage(Hook.hook, _usage_texts(hooks)),
+        "ideas": _increment_usage(Idea.idea, _usage_texts(ideas)),
+    }
+
+
+def _usage_texts(texts: Iterable[str]) -> list[str]:
+    return [t.strip() for t in texts if t]
+
+
 # =============================================================================
 # INSIGHTS BANK FUNCTIONS
 # =============================================================================
 
 def save_insight_to_bank(title: str, content: str, category: str = None) -> dict:
     """Save an insight to the bank."""
+    return _insert_returning(Insight, [_insight_row(title, content, category)], _insight_to_dict)[0]
+
+
+def _insight_row(title: str, content: str, category: str = None) -> dict:
     now = datetime.now().isoformat()
-    entry = Insight(
-        id=str(uuid.uuid4())[:8],
-        title=title,
-        content=content,
-        category=category,
-        created_at=now,
-        updated_at=now,
-    )
+    return {"id": _new_id(), "title": title, "content": content, "category": category,
+            "created_at": now, "updated_at": now}
+
+
+def _category_select(model, category: str = None, cursor: str = None, limit: int = None):
+    """Insights or social proof page, optionally filtered by category (partial match)."""
+    query = select(model)
+    if category:
+        query = query.where(model.category.ilike(f"%{category}%"))
+    return apply_keyset(query, model.created_at, model.id, cursor, limit)
 
+
+def get_insights_bank(category: str = None, cursor: str = None, limit: int = None) -> list[dict]:
+    """Get saved insights, optionally filtered by category, newest first (cursor/limit page through them)."""
     with SessionLocal() as db:
-        db.add(entry)
-        db.commit()
-        db.refresh(entry)
-        return _insight_to_dict(entry)
+        return [_insight_to_dict(r) for r in db.scalars(_category_select(Insight, category, cursor, limit))]
 
 
-def get_insights_bank(category: str = None) -> list[dict]:
-    """Get all saved insights, optionally filtered by category."""
+def get_insight_categories() -> list[str]:
+    """Distinct non-empty categories, sorted."""
     with SessionLocal() as db:
-        query = db.query(Insight).order_by(Insight.created_at.desc())
-        if category:
-            query = query.filter(Insight.category.ilike(f"%{category}%"))
-        return [_insight_to_dict(r) for r in query.all()]
+        return list(db.scalars(_categories_select(Insight.category)))
 
 
 def get_insight(insight_id: str) -> Optional[dict]:
@@ -403,21 +691,12 @@ def get_insight(insight_id: str) -> Optional[dict]:
         return _insight_to_dict(row) if row else None
 
 
-def update_insight(insight_id: str, **updates) -> Optional[dict]:
-    """Update an insight by ID."""
-    with SessionLocal() as db:
-        row = db.query(Insight).filter(Insight.id == insight_id).first()
-        if not row:
-            return None
+def update_insight(insight_id: str, expected_version: int = None, **updates) -> Optional[dict]:
+    """Update an insight by ID (ConflictError if expected_version is stale)."""
+    return _update_returning(Insight, insight_id, updates, INSIGHT_FIELDS, _insight_to_dict, expected_version)
 
-        allowed_fields = {"title", "content", "category"}
-        for key, value in updates.items():
-            if key in allowed_fields:
-                setattr(row, key, value)
-        row.updated_at = datetime.now().isoformat()
-        db.commit()
-        db.refresh(row)
-        return _insight_to_dict(row)
+
+INSIGHT_FIELDS = {"title", "content", "category"}
 
 
 def delete_insight_from_bank(insight_id: str) -> bool:
@@ -432,9 +711,13 @@ def delete_insight_from_bank(insight_id: str) -> bool:
 
 
 def seed_insights_if_empty() -> int:
-    """Seed insights bank with initial data if empty. Returns count of seeded items."""
+    """
+    Seed insights bank with initial data if empty. Returns count of seeded items.
+
+    Runs as migration 4, so it only writes the columns that existed then.
+    """
     with SessionLocal() as db:
-        if db.query(Insight).count() > 0:
+        if count_rows(db, Insight) > 0:
             return 0
 
     seeds = [
@@ -570,9 +853,9 @@ The extra headspace lets me test messaging angles side by side and make decision
         },
     ]
 
-    for seed in seeds:
-        save_insight_to_bank(seed["title"], seed["content"], seed["category"])
-
+    with SessionLocal() as db:
+        insert_rows(db, Insight, [_insight_row(s["title"], s["content"], s["category"]) for s in seeds])
+        db.commit()
     return len(seeds)
 
 
@@ -590,36 +873,32 @@ def _social_proof_to_dict(row: SocialProof) -> dict:
         "category": row.category,
         "created_at": row.created_at,
         "updated_at": row.updated_at,
+        "version": row.version,
     }
 
 
 def save_social_proof(metric: str, value: str, context: str = None, source: str = None, category: str = None) -> dict:
     """Save a social proof entry."""
+    row = _social_proof_row(metric, value, context, source, category)
+    return _insert_returning(SocialProof, [row], _social_proof_to_dict)[0]
+
+
+def _social_proof_row(metric: str, value: str, context: str = None, source: str = None, category: str = None) -> dict:
     now = datetime.now().isoformat()
-    entry = SocialProof(
-        id=str(uuid.uuid4())[:8],
-        metric=metric,
-        value=value,
-        context=context,
-        source=source,
-        category=category,
-        created_at=now,
-        updated_at=now,
-    )
+    return {"id": _new_id(), "metric": metric, "value": value, "context": context, "source": source,
+            "category": category, "created_at": now, "updated_at": now}
+
+
+def get_social_proof_bank(category: str = None, cursor: str = None, limit: int = None) -> list[dict]:
+    """Get social proof entries, optionally filtered by category, newest first (cursor/limit page through them)."""
     with SessionLocal() as db:
-        db.add(entry)
-        db.commit()
-        db.refresh(entry)
-        return _social_proof_to_dict(entry)
+        return [_social_proof_to_dict(r) for r in db.scalars(_category_select(SocialProof, category, cursor, limit))]
 
 
-def get_social_proof_bank(category: str = None) -> list[dict]:
-    """Get all social proof entries, optionally filtered by category."""
+def get_social_proof_categories() -> list[str]:
+    """Distinct non-empty categories, sorted."""
     with SessionLocal() as db:
-        query = db.query(SocialProof).order_by(SocialProof.created_at.desc())
-        if category:
-            query = query.filter(SocialProof.category.ilike(f"%{category}%"))
-        return [_social_proof_to_dict(r) for r in query.all()]
+        return list(db.scalars(_categories_select(SocialProof.category)))
 
 
 def get_social_proof(proof_id: str) -> Optional[dict]:
@@ -629,20 +908,12 @@ def get_social_proof(proof_id: str) -> Optional[dict]:
         return _social_proof_to_dict(row) if row else None
 
 
-def update_social_proof(proof_id: str, **updates) -> Optional[dict]:
-    """Update a social proof entry."""
-    with SessionLocal() as db:
-        row = db.query(SocialProof).filter(SocialProof.id == proof_id).first()
-        if not row:
-            return None
-        allowed_fields = {"metric", "value", "context", "source", "category"}
-        for key, value in updates.items():
-            if key in allowed_fields:
-                setattr(row, key, value)
-        row.updated_at = datetime.now().isoformat()
-        db.commit()
-        db.refresh(row)
-        return _social_proof_to_dict(row)
+def update_social_proof(proof_id: str, expected_version: int = None, **updates) -> Optional[dict]:
+    """Update a social proof entry (ConflictError if expected_version is stale)."""
+    return _update_returning(SocialProof, proof_id, updates, SOCIAL_PROOF_FIELDS, _social_proof_to_dict, expected_version)
+
+
+SOCIAL_PROOF_FIELDS = {"metric", "value", "context", "source", "category"}
 
 
 def delete_social_proof(proof_id: str) -> bool:
@@ -657,9 +928,13 @@ def delete_social_proof(proof_id: str) -> bool:
 
 
 def seed_social_proof_if_empty() -> int:
-    """Seed social proof bank with results from knowledge base if empty."""
+    """
+    Seed social proof bank with results from knowledge base if empty.
+
+    Runs as migration 4, so it only writes the columns that existed then.
+    """
     with SessionLocal() as db:
-        if db.query(SocialProof).count() > 0:
+        if count_rows(db, SocialProof) > 0:
             return 0
 
     seeds = [
@@ -710,9 +985,9 @@ def seed_social_proof_if_empty() -> int:
         },
     ]
 
-    for seed in seeds:
-        save_social_proof(**seed)
-
+    with SessionLocal() as db:
+        insert_rows(db, SocialProof, [_social_proof_row(**seed) for seed in seeds])
+        db.commit()
     return len(seeds)
 
 
@@ -752,6 +1027,7 @@ def _competitor_post_to_dict(row: CompetitorPost) -> dict:
         "notes": row.notes,
         "created_at": row.created_at,
         "updated_at": row.updated_at,
+        "version": row.version,
     }
 
 
@@ -769,6 +1045,12 @@ def save_competitor_post(
     notes: str = None,
 ) -> dict:
     """Save a competitor post."""
+    row = _competitor_post_row(**locals())
+    return _insert_returning(CompetitorPost, [row], _competitor_post_to_dict)[0]
+
+
+def _competitor_post_row(competitor_name: str, **fields) -> dict:
+    """Column values for a new competitor post (fields as for save_competitor_post)."""
     now = datetime.now().isoformat()
     # Look up LinkedIn URL from COMPETITORS list
     linkedin_url = None
@@ -776,65 +1058,51 @@ def save_competitor_post(
         if c["name"] == competitor_name:
             linkedin_url = c["linkedin_url"]
             break
-
-    entry = CompetitorPost(
-        id=str(uuid.uuid4())[:8],
-        competitor_name=competitor_name,
-        competitor_linkedin_url=linkedin_url,
-        post_content=post_content,
-        hook=hook,
-        post_type=post_type,
-        post_url=post_url,
-        likes=likes,
-        comments=comments,
-        reposts=reposts,
-        performance=performance,
-        date_posted=date_posted,
-        notes=notes,
-        created_at=now,
-        updated_at=now,
-    )
-    with SessionLocal() as db:
-        db.add(entry)
-        db.commit()
-        db.refresh(entry)
-        return _competitor_post_to_dict(entry)
+    return {
+        "id": _new_id(),
+        "competitor_name": competitor_name,
+        "competitor_linkedin_url": linkedin_url,
+        **fields,
+        "created_at": now,
+        "updated_at": now,
+    }
 
 
 def get_competitor_posts(
     competitor_name: str = None,
     post_type: str = None,
     performance: str = None,
+    cursor: str = None,
+    limit: int = None,
 ) -> list[dict]:
-    """Get competitor posts with optional filters."""
+    """Get competitor posts newest first with optional filters (cursor/limit page through them)."""
+    stmt = _competitor_posts_select(competitor_name, post_type, performance, cursor, limit)
     with SessionLocal() as db:
-        query = db.query(CompetitorPost).order_by(CompetitorPost.created_at.desc())
-        if competitor_name:
-            query = query.filter(CompetitorPost.competitor_name == competitor_name)
-        if post_type:
-            query = query.filter(CompetitorPost.post_type == post_type)
-        if performance:
-            query = query.filter(CompetitorPost.performance == performance)
-        return [_competitor_post_to_dict(r) for r in query.all()]
-
-
-def update_competitor_post(post_id: str, **updates) -> Optional[dict]:
-    """Update a competitor post."""
-    with SessionLocal() as db:
-        row = db.query(CompetitorPost).filter(CompetitorPost.id == post_id).first()
-        if not row:
-            return None
-        allowed_fields = {
-            "competitor_name", "post_content", "hook", "post_type", "post_url",
-            "likes", "comments", "reposts", "performance", "date_posted", "notes",
-        }
-        for key, value in updates.items():
-            if key in allowed_fields:
-                setattr(row, key, value)
-        row.updated_at = datetime.now().isoformat()
-        db.commit()
-        db.refresh(row)
-        return _competitor_post_to_dict(row)
+        return [_competitor_post_to_dict(r) for r in db.scalars(stmt)]
+
+
+def _competitor_posts_select(competitor_name: str = None, post_type: str = None, performance: str = None,
+                             cursor: str = None, limit: int = None):
+    query = select(CompetitorPost)
+    if competitor_name:
+        query = query.where(CompetitorPost.competitor_name == competitor_name)
+    if post_type:
+        query = query.where(CompetitorPost.post_type == post_type)
+    if performance:
+        query = query.where(CompetitorPost.performance == performance)
+    return apply_keyset(query, CompetitorPost.created_at, CompetitorPost.id, cursor, limit)
+
+
+def update_competitor_post(post_id: str, expected_version: int = None, **updates) -> Optional[dict]:
+    """Update a competitor post (ConflictError if expected_version is stale)."""
+    return _update_returning(CompetitorPost, post_id, updates, COMPETITOR_POST_FIELDS, _competitor_post_to_dict,
+                             expected_version)
+
+
+COMPETITOR_POST_FIELDS = {
+    "competitor_name", "post_content", "hook", "post_type", "post_url",
+    "likes", "comments", "reposts", "performance", "date_posted", "notes",
+}
 
 
 def delete_competitor_post(post_id: str) -> bool:
@@ -855,28 +1123,61 @@ def get_competitor_names() -> list[str]:
 
 def get_competitor_stats() -> dict:
     """Get summary stats across all competitor posts."""
-    posts = get_competitor_posts()
-    if not posts:
-        return {"total": 0, "top_performer": None, "most_common_type": None}
-
-    # Count posts per competitor
-    name_counts = {}
-    for p in posts:
-        name_counts[p["competitor_name"]] = name_counts.get(p["competitor_name"], 0) + 1
-    top_performer = max(name_counts, key=name_counts.get) if name_counts else None
-
-    # Count post types
-    type_counts = {}
-    for p in posts:
-        if p.get("post_type"):
-            type_counts[p["post_type"]] = type_counts.get(p["post_type"], 0) + 1
-    most_common_type = max(type_counts, key=type_counts.get) if type_counts else None
+    with SessionLocal() as db:
+        total = db.scalar(select(func.count(CompetitorPost.id)))
+        if not total:
+            return _competitor_stats(0, None, None)
+        return _competitor_stats(
+            total, _top_group(db, CompetitorPost.competitor_name), _top_group(db, CompetitorPost.post_type)
+        )
+
+
+def _competitor_stats(total: int, top_performer: Optional[str], most_common_type: Optional[str]) -> dict:
+    return {"total": total, "top_performer": top_performer, "most_common_type": most_common_type}
+
+
+def get_competitor_breakdown() -> list[dict]:
+    """
+    Per-competitor engagement aggregates, most posts first.
+
+    Returns:
+        List of dicts with competitor_name, posts, avg_likes, avg_comments,
+        avg_reposts and a count of posts at each performance level
+    """
+    with SessionLocal() as db:
+        rows = db.execute(_competitor_breakdown_select()).all()
+    return _competitor_breakdown(rows)
+
+
+def _competitor_breakdown_select():
+    return (
+        select(
+            CompetitorPost.competitor_name,
+            func.count(CompetitorPost.id),
+            func.avg(CompetitorPost.likes),
+            func.avg(CompetitorPost.comments),
+            func.avg(CompetitorPost.reposts),
+            func.count(CompetitorPost.id).filter(CompetitorPost.performance == "high"),
+            func.count(CompetitorPost.id).filter(CompetitorPost.performance == "medium"),
+            func.count(CompetitorPost.id).filter(CompetitorPost.performance == "low"),
+        )
+        .group_by(CompetitorPost.competitor_name)
+        .order_by(func.count(CompetitorPost.id).desc(), CompetitorPost.competitor_name)
+    )
 
-    return {
-        "total": len(posts),
-        "top_performer": top_performer,
-        "most_common_type": most_common_type,
-    }
+
+def _competitor_breakdown(rows) -> list[dict]:
+    return [
+        {
+            "competitor_name": name,
+            "posts": posts,
+            "avg_likes": _avg(likes),
+            "avg_comments": _avg(comments),
+            "avg_reposts": _avg(reposts),
+            "performance": {"high": high, "medium": medium, "low": low},
+        }
+        for name, posts, likes, comments, reposts, high, medium, low in rows
+    ]
 
 
 # =============================================================================
@@ -902,6 +1203,7 @@ def _trending_topic_to_dict(row: TrendingTopic) -> dict:
         "created_at": row.created_at,
         "updated_at": row.updated_at,
         "notes": row.notes,
+        "version": row.version,
     }
 
 
@@ -917,27 +1219,43 @@ def save_trending_topic(
     notes: str = None,
 ) -> dict:
     """Save a trending topic."""
+    return _insert_returning(TrendingTopic, [_trending_topic_row(locals())], _trending_topic_to_dict)[0]
+
+
+def _trending_topic_row(t: dict, batch_id: str = None, now: str = None) -> dict:
+    """Column values for a new trending topic from save_trending_topic()'s arguments."""
+    now = now or datetime.now().isoformat()
+    return {
+        "id": _new_id(),
+        "topic": t["topic"],
+        "summary": t.get("summary"),
+        "source_urls": t.get("source_urls") or [],
+        "relevance_score": t.get("relevance_score"),
+        "content_angles": t.get("content_angles") or [],
+        "search_query": t.get("search_query"),
+        "batch_id": batch_id or t.get("batch_id"),
+        "status": "new",
+        "source_platform": t.get("source_platform"),
+        "created_at": now,
+        "updated_at": now,
+        "notes": t.get("notes"),
+    }
+
+
+def save_trending_topics_bulk(topics: list[dict], batch_id: str = None) -> list[dict]:
+    """
+    Save a batch of trending topics in one transaction.
+
+    Args:
+        topics: Dicts with save_trending_topic()'s arguments (topic required)
+        batch_id: Scan batch applied to every topic (overrides per-topic batch_id)
+
+    Returns:
+        The saved topic dicts, in input order
+    """
     now = datetime.now().isoformat()
-    entry = TrendingTopic(
-        id=str(uuid.uuid4())[:8],
-        topic=topic,
-        summary=summary,
-        source_urls=source_urls or [],
-        relevance_score=relevance_score,
-        content_angles=content_angles or [],
-        search_query=search_query,
-        batch_id=batch_id,
-        status="new",
-        source_platform=source_platform,
-        created_at=now,
-        updated_at=now,
-        notes=notes,
-    )
-    with SessionLocal() as db:
-        db.add(entry)
-        db.commit()
-        db.refresh(entry)
-        return _trending_topic_to_dict(entry)
+    rows = [_trending_topic_row(t, batch_id, now) for t in topics]
+    return _insert_returning(TrendingTopic, rows, _trending_topic_to_dict)
 
 
 def get_trending_topics(
@@ -945,19 +1263,27 @@ def get_trending_topics(
     source_platform: str = None,
     min_relevance: int = None,
     batch_id: str = None,
+    cursor: str = None,
+    limit: int = None,
 ) -> list[dict]:
-    """Get trending topics with optional filters."""
+    """Get trending topics newest first with optional filters (cursor/limit page through them)."""
+    stmt = _trending_topics_select(status, source_platform, min_relevance, batch_id, cursor, limit)
     with SessionLocal() as db:
-        query = db.query(TrendingTopic).order_by(TrendingTopic.created_at.desc())
-        if status:
-            query = query.filter(TrendingTopic.status == status)
-        if source_platform:
-            query = query.filter(TrendingTopic.source_platform == source_platform)
-        if min_relevance is not None:
-            query = query.filter(TrendingTopic.relevance_score >= min_relevance)
-        if batch_id:
-            query = query.filter(TrendingTopic.batch_id == batch_id)
-        return [_trending_topic_to_dict(r) for r in query.all()]
+        return [_trending_topic_to_dict(r) for r in db.scalars(stmt)]
+
+
+def _trending_topics_select(status: str = None, source_platform: str = None, min_relevance: int = None,
+                            batch_id: str = None, cursor: str = None, limit: int = None):
+    query = select(TrendingTopic)
+    if status:
+        query = query.where(TrendingTopic.status == status)
+    if source_platform:
+        query = query.where(TrendingTopic.source_platform == source_platform)
+    if min_relevance is not None:
+        query = query.where(TrendingTopic.relevance_score >= min_relevance)
+    if batch_id:
+        query = query.where(TrendingTopic.batch_id == batch_id)
+    return apply_keyset(query, TrendingTopic.created_at, TrendingTopic.id, cursor, limit)
 
 
 def get_trending_topic(topic_id: str) -> Optional[dict]:
@@ -967,24 +1293,17 @@ def get_trending_topic(topic_id: str) -> Optional[dict]:
         return _trending_topic_to_dict(row) if row else None
 
 
-def update_trending_topic(topic_id: str, **updates) -> Optional[dict]:
-    """Update a trending topic."""
-    with SessionLocal() as db:
-        row = db.query(TrendingTopic).filter(TrendingTopic.id == topic_id).first()
-        if not row:
-            return None
-        allowed_fields = {
-            "topic", "summary", "source_urls", "relevance_score",
-            "content_angles", "search_query", "batch_id", "status",
-            "source_platform", "notes",
-        }
-        for key, value in updates.items():
-            if key in allowed_fields:
-                setattr(row, key, value)
-        row.updated_at = datetime.now().isoformat()
-        db.commit()
-        db.refresh(row)
-        return _trending_topic_to_dict(row)
+def update_trending_topic(topic_id: str, expected_version: int = None, **updates) -> Optional[dict]:
+    """Update a trending topic (ConflictError if expected_version is stale)."""
+    return _update_returning(TrendingTopic, topic_id, updates, TRENDING_TOPIC_FIELDS, _trending_topic_to_dict,
+                             expected_version)
+
+
+TRENDING_TOPIC_FIELDS = {
+    "topic", "summary", "source_urls", "relevance_score",
+    "content_angles", "search_query", "batch_id", "status",
+    "source_platform", "notes",
+}
 
 
 def delete_trending_topic(topic_id: str) -> bool:
@@ -1000,47 +1319,105 @@ def delete_trending_topic(topic_id: str) -> bool:
 
 def get_trending_stats() -> dict:
     """Get summary stats for trending topics."""
-    topics = get_trending_topics()
-    if not topics:
-        return {"total": 0, "new_count": 0, "avg_relevance": 0, "top_platform": None}
+    with SessionLocal() as db:
+        totals = db.execute(_trending_totals_select()).one()
+        top_platform = _top_group(db, TrendingTopic.source_platform) if totals[0] else None
+    return _trending_stats(totals, top_platform)
 
-    new_count = sum(1 for t in topics if t["status"] == "new")
-    scores = [t["relevance_score"] for t in topics if t["relevance_score"] is not None]
-    avg_relevance = round(sum(scores) / len(scores), 1) if scores else 0
 
-    platform_counts = {}
-    for t in topics:
-        if t.get("source_platform"):
-            platform_counts[t["source_platform"]] = platform_counts.get(t["source_platform"], 0) + 1
-    top_platform = max(platform_counts, key=platform_counts.get) if platform_counts else None
+def _trending_totals_select():
+    return select(
+        func.count(TrendingTopic.id),
+        func.count(TrendingTopic.id).filter(TrendingTopic.status == "new"),
+        func.avg(TrendingTopic.relevance_score),
+    )
+
 
+def _trending_stats(totals, top_platform: Optional[str]) -> dict:
+    total, new_count, avg_relevance = totals
+    if not total:
+        return {"total": 0, "new_count": 0, "avg_relevance": 0, "top_platform": None}
     return {
-        "total": len(topics),
+        "total": total,
         "new_count": new_count,
-        "avg_relevance": avg_relevance,
+        "avg_relevance": _avg(avg_relevance) or 0,
         "top_platform": top_platform,
     }
 
 
+def get_trending_breakdown() -> list[dict]:
+    """
+    Per-platform trending topic aggregates with a relevance score histogram.
+
+    Returns:
+        List of dicts with source_platform, total, new_count, avg_relevance and
+        relevance_histogram ({score: count}, unscored topics excluded)
+    """
+    with SessionLocal() as db:
+        platforms = db.execute(_trending_platforms_select()).all()
+        histogram_rows = db.execute(_trending_histogram_select()).all()
+    return _trending_breakdown(platforms, histogram_rows)
+
+
+def _trending_platforms_select():
+    return (
+        select(
+            TrendingTopic.source_platform,
+            func.count(TrendingTopic.id),
+            func.count(TrendingTopic.id).filter(TrendingTopic.status == "new"),
+            func.avg(TrendingTopic.relevance_score),
+        )
+        .group_by(TrendingTopic.source_platform)
+        .order_by(func.count(TrendingTopic.id).desc())
+    )
+
+
+def _trending_histogram_select():
+    return (
+        select(TrendingTopic.source_platform, TrendingTopic.relevance_score, func.count(TrendingTopic.id))
+        .where(TrendingTopic.relevance_score.isnot(None))
+        .group_by(TrendingTopic.source_platform, TrendingTopic.relevance_score)
+    )
+
+
+def _trending_breakdown(platforms, histogram_rows) -> list[dict]:
+    histograms = {}
+    for platform, score, count in histogram_rows:
+        histograms.setdefault(platform, {})[score] = count
+    return [
+        {
+            "source_platform": platform,
+            "total": total,
+            "new_count": new_count,
+            "avg_relevance": _avg(avg_relevance),
+            "relevance_histogram": dict(sorted(histograms.get(platform, {}).items())),
+        }
+        for platform, total, new_count, avg_relevance in platforms
+    ]
+
+
 def convert_trend_to_idea(topic_id: str) -> Optional[dict]:
     """Convert a trending topic into an Idea and mark the trend as 'used'."""
     trend = get_trending_topic(topic_id)
     if not trend:
         return None
 
-    angles = trend.get("content_angles", [])
-    angle_text = angles[0] if angles else None
-
-    idea = save_idea_to_bank(
-        idea=trend["topic"],
-        topic=f"Trending: {trend.get('source_platform', 'web')}",
-        angle=angle_text,
-    )
+    idea = save_idea_to_bank(**_trend_idea(trend))
 
     update_trending_topic(topic_id, status="used")
     return idea
 
 
+def _trend_idea(trend: dict) -> dict:
+    """save_idea_to_bank() arguments for a trending topic."""
+    angles = trend.get("content_angles", [])
+    return {
+        "idea": trend["topic"],
+        "topic": f"Trending: {trend.get('source_platform', 'web')}",
+        "angle": angles[0] if angles else None,
+    }
+
+
 if __name__ == "__main__":
     # Test the storage
     print("Testing draft storage...")
@@ -0,0 +1,154 @@
+"""
+Async twin of draft_storage's reads, on SQLAlchemy's AsyncSession.
+
+Same function names, arguments and return values as draft_storage, but each
+call is a coroutine awaiting the database over an asyncio driver (asyncpg,
+or aiosqlite for SQLite) instead of holding a thread for the length of the
+query. Statements and dict converters are draft_storage's own, so the two
+modules can't drift apart.
+
+Covers the reads of the route families that gather several queries per
+request (single draft pages, calendar, competitors, trending); those routes
+await these on the event loop without going through the storage thread pool:
+
+    from draft_storage_async import get_competitor_stats, get_competitor_breakdown
+    stats, breakdown = await asyncio.gather(get_competitor_stats(), get_competitor_breakdown())
+
+Writes, and the list pages of the other families, stay on draft_storage via
+run_storage.
+"""
+from datetime import datetime
+from typing import Callable, Optional
+
+from sqlalchemy import func, select
+
+from database import AsyncSessionLocal, Draft, CompetitorPost, TrendingTopic
+from draft_storage import (
+    _between_select,
+    _competitor_breakdown,
+    _competitor_breakdown_select,
+    _competitor_post_to_dict,
+    _competitor_posts_select,
+    _competitor_stats,
+    _day_select,
+    _draft_to_dict,
+    _final_post,
+    _top_group_select,
+    _trending_breakdown,
+    _trending_histogram_select,
+    _trending_platforms_select,
+    _trending_stats,
+    _trending_topic_to_dict,
+    _trending_topics_select,
+    _trending_totals_select,
+)
+
+
+# ============================================================================
+# Shared helpers
+# ============================================================================
+
+async def _get(model, row_id: str, to_dict: Callable) -> Optional[dict]:
+    async with AsyncSessionLocal() as db:
+        row = await db.get(model, row_id)
+        return to_dict(row) if row else None
+
+
+async def _list(stmt, to_dict: Callable) -> list[dict]:
+    async with AsyncSessionLocal() as db:
+        return [to_dict(r) for r in await db.scalars(stmt)]
+
+
+# ============================================================================
+# Drafts
+# ============================================================================
+
+async def get_draft(draft_id: str) -> Optional[dict]:
+    """Get a draft by ID."""
+    return await _get(Draft, draft_id, _draft_to_dict)
+
+
+async def list_drafts_between(start: datetime, end: datetime) -> list[dict]:
+    """
+    Drafts scheduled or posted in [start, end) - one range query however
+    many days it spans. Ordered by scheduled (else posted) time.
+    """
+    return await _list(_between_select(start, end), _draft_to_dict)
+
+
+async def get_drafts_for_date(date_str: str) -> list[dict]:
+    """Drafts scheduled or posted on a YYYY-MM-DD date."""
+    return await _list(_day_select(date_str), _draft_to_dict)
+
+
+async def get_final_post(draft_id: str) -> Optional[str]:
+    """Draft content with its selected hook prepended."""
+    draft = await get_draft(draft_id)
+    return _final_post(draft) if draft else None
+
+
+# ============================================================================
+# Competitor posts
+# ============================================================================
+
+async def get_competitor_posts(
+    competitor_name: str = None,
+    post_type: str = None,
+    performance: str = None,
+    cursor: str = None,
+    limit: int = None,
+) -> list[dict]:
+    stmt = _competitor_posts_select(competitor_name, post_type, performance, cursor, limit)
+    return await _list(stmt, _competitor_post_to_dict)
+
+
+async def get_competitor_stats() -> dict:
+    """Total posts, most active competitor and most common post type."""
+    async with AsyncSessionLocal() as db:
+        total = await db.scalar(select(func.count(CompetitorPost.id)))
+        if not total:
+            return _competitor_stats(0, None, None)
+        return _competitor_stats(
+            total,
+            await db.scalar(_top_group_select(CompetitorPost.competitor_name)),
+            await db.scalar(_top_group_select(CompetitorPost.post_type)),
+        )
+
+
+async def get_competitor_breakdown() -> list[dict]:
+    """Per-competitor post counts, engagement averages and performance mix."""
+    async with AsyncSessionLocal() as db:
+        rows = (await db.execute(_competitor_breakdown_select())).all()
+    return _competitor_breakdown(rows)
+
+
+# ============================================================================
+# Trending topics
+# ============================================================================
+
+async def get_trending_topics(
+    status: str = None,
+    source_platform: str = None,
+    min_relevance: int = None,
+    batch_id: str = None,
+    cursor: str = None,
+    limit: int = None,
+) -> list[dict]:
+    stmt = _trending_topics_select(status, source_platform, min_relevance, batch_id, cursor, limit)
+    return await _list(stmt, _trending_topic_to_dict)
+
+
+async def get_trending_stats() -> dict:
+    """Total and new topic counts, average relevance and top platform."""
+    async with AsyncSessionLocal() as db:
+        totals = (await db.execute(_trending_totals_select())).one()
+        top_platform = await db.scalar(_top_group_select(TrendingTopic.source_platform)) if totals[0] else None
+    return _trending_stats(totals, top_platform)
+
+
+async def get_trending_breakdown() -> list[dict]:
+    """Per-platform counts, average relevance and relevance histogram."""
+    async with AsyncSessionLocal() as db:
+        platforms = (await db.execute(_trending_platforms_select())).all()
+        histogram_rows = (await db.execute(_trending_histogram_select())).all()
+    return _trending_breakdown(platforms, histogram_rows)
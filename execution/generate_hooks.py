@@ -2,14 +2,17 @@
 Generate hook options for a LinkedIn post using Claude API.
 Hooks are generated FIRST from a topic, then the post body is written based on the selected hook.
 """
-import os
 from pathlib import Path
-from anthropic import Anthropic
 from prompts import HOOK_GENERATOR_SYSTEM
+from llm_gateway import call_llm, call_llm_async, stream_llm_async
+from prompt_builder import PromptSection, assemble_prompt, cached_blocks, estimate_tokens
 
 HOOKS_CONDENSED_PATH = Path(__file__).parent.parent / "knowledge_bases" / "Hooks" / "hooks_condensed.txt"
 HOOKS_CSV_PATH = Path(__file__).parent.parent / "knowledge_bases" / "Hooks" / "Creator Hooks - Sheet1.csv"
 
+# Budget for the system prompt (instructions + creator hooks reference)
+SYSTEM_TOKEN_BUDGET = 8000
+
 
 def load_hooks_knowledge_base(max_examples: int = 100) -> str:
     """
@@ -46,27 +49,19 @@ def load_hooks_knowledge_base(max_examples: int = 100) -> str:
     return ""
 
 
-def generate_hooks(topic: str, context: str = "", num_hooks: int = 30) -> list[str]:
-    """
-    Generate hook options for a topic/idea.
-
-    Args:
-        topic: The topic/idea for the post
-        context: Optional additional context
-        num_hooks: Number of hooks to generate (default 5)
-
-    Returns:
-        List of hook strings
-    """
-    client = Anthropic(api_key=os.getenv("ANTHROPIC_API_KEY"))
-
+def build_hooks_request(topic: str, context: str = "", num_hooks: int = 30) -> dict:
+    """Build the call_llm() arguments for a hooks request (shared by sync and async paths)."""
     # Load hooks knowledge base
     hooks_kb = load_hooks_knowledge_base()
 
-    # Build system prompt with knowledge base
-    system_prompt = HOOK_GENERATOR_SYSTEM
-    if hooks_kb:
-        system_prompt += f"\n\n--- CREATOR HOOKS REFERENCE (higher hook scores = better performance) ---\n{hooks_kb}"
+    # Build system prompt with knowledge base, trimmed to the token budget.
+    # It is identical on every call, so it is sent as a cached prefix and only
+    # the topic-specific user prompt below varies.
+    system = assemble_prompt([
+        PromptSection("system", HOOK_GENERATOR_SYSTEM.rstrip("\n"), required=True),
+        PromptSection("hooks_reference", hooks_kb, priority=10,
+                      header="--- CREATOR HOOKS REFERENCE (higher hook scores = better performance) ---"),
+    ], SYSTEM_TOKEN_BUDGET)
 
     # Build user prompt
     user_prompt = f"""Generate {num_hooks} different opening hooks for a LinkedIn post about: {topic}"""
@@ -84,15 +79,18 @@ Format each hook on its own line, numbered 1-{num_hooks}:
 ...
 {num_hooks}. [hook]"""
 
-    response = client.messages.create(
+    return dict(
+        name="generate_hooks",
+        estimated_input_tokens=system.tokens + estimate_tokens(user_prompt),
         model="claude-sonnet-4-20250514",
         max_tokens=4000,
-        system=system_prompt,
+        system=cached_blocks(system.text),
         messages=[{"role": "user", "content": user_prompt}]
     )
 
-    # Parse response into list of hooks
-    content = response.content[0].text
+
+def parse_hooks(content: str, num_hooks: int) -> list[str]:
+    """Parse a numbered list of hooks from the model response."""
     hooks = []
     for line in content.strip().split("\n"):
         line = line.strip()
@@ -111,6 +109,41 @@ Format each hook on its own line, numbered 1-{num_hooks}:
     return hooks[:num_hooks]
 
 
+def generate_hooks(topic: str, context: str = "", num_hooks: int = 30, fresh: bool = False) -> list[str]:
+    """
+    Generate hook options for a topic/idea.
+
+    Args:
+        topic: The topic/idea for the post
+        context: Optional additional context
+        num_hooks: Number of hooks to generate (default 5)
+        fresh: Skip the response cache to get new variations
+
+    Returns:
+        List of hook strings
+    """
+    response = call_llm(**build_hooks_request(topic, context, num_hooks), use_cache=False if fresh else None)
+    return parse_hooks(response.content[0].text, num_hooks)
+
+
+async def generate_hooks_async(topic: str, context: str = "", num_hooks: int = 30, fresh: bool = False) -> list[str]:
+    """Async variant of generate_hooks() for use inside the event loop."""
+    response = await call_llm_async(**build_hooks_request(topic, context, num_hooks),
+                                    use_cache=False if fresh else None)
+    return parse_hooks(response.content[0].text, num_hooks)
+
+
+async def stream_hooks(topic: str, context: str = "", num_hooks: int = 30, fresh: bool = False):
+    """
+    Stream the raw numbered hook list as it is generated.
+
+    Yields text chunks; pass the joined text to parse_hooks() for the final list.
+    """
+    request = build_hooks_request(topic, context, num_hooks)
+    async for text in stream_llm_async(**request, use_cache=False if fresh else None):
+        yield text
+
+
 if __name__ == "__main__":
     import sys
     from dotenv import load_dotenv
@@ -2,43 +2,32 @@
 Generate content ideas/angles from a topic using the knowledge base.
 This is the first step: Topic → Ideas → Hooks → Drafts
 """
-import os
-from pathlib import Path
-from anthropic import Anthropic
+import asyncio
 from dotenv import load_dotenv
+from knowledge_base import get_knowledge_base, IDEAS_DOCUMENTS
+from kb_retrieval import retrieve_context
+from llm_gateway import call_llm, call_llm_async
+from prompt_builder import PromptSection, assemble_prompt, cached_blocks
 
 load_dotenv()
 
-KNOWLEDGE_BASE_PATH = Path(__file__).parent.parent / "knowledge_bases"
-
 
 def load_knowledge_base_for_ideas(client_name: str = "Smiths") -> dict:
-    """Load knowledge base content for idea generation."""
-    kb_path = KNOWLEDGE_BASE_PATH / client_name / "Written Posts"
-
-    content = {
-        "origin_story": "",
-        "ip_extraction": "",
-        "best_posts": "",
-    }
-
-    # Load origin story
-    origin_file = kb_path / "Ian Origin Story 2.0.md"
-    if origin_file.exists():
-        content["origin_story"] = origin_file.read_text(encoding="utf-8")
+    """Load knowledge base content for idea generation (cached per process)."""
+    return get_knowledge_base(client_name, IDEAS_DOCUMENTS)
 
-    # Load IP extraction (pre-extracted text file for performance)
-    ip_file = kb_path / "Ian Shaw IP Extraction (2).txt"
-    if ip_file.exists():
-        content["ip_extraction"] = ip_file.read_text(encoding="utf-8")
 
-    # Load best posts
-    best_posts_file = kb_path / "Smiths Ian Best Performing Posts.md"
-    if best_posts_file.exists():
-        content["best_posts"] = best_posts_file.read_text(encoding="utf-8")
+# Token budget per knowledge base section; the most relevant chunks are selected to fill each
+KB_TOKEN_BUDGETS = {
+    "ip_extraction": 1500,
+    "origin_story": 1000,
+}
 
-    return content
+# Overall budget for the user prompt (KB excerpts + topic and instructions)
+PROMPT_TOKEN_BUDGET = 3500
 
+# Budget for the cached system prefix (instructions + best posts reference)
+SYSTEM_TOKEN_BUDGET = 2500
 
 SYSTEM_PROMPT = """You are a content strategist helping to generate LinkedIn post ideas.
 
@@ -57,41 +46,21 @@ Generate ideas across the content pillars:
 """
 
 
-def generate_ideas(topic: str, context: str = "", num_ideas: int = 15) -> list[dict]:
-    """
-    Generate content ideas/angles for a topic using the knowledge base.
-
-    Args:
-        topic: The topic/idea to explore
-        context: Optional additional context
-        num_ideas: Number of ideas to generate
-
-    Returns:
-        List of dicts with 'idea' and 'angle' keys
-    """
-    client = Anthropic(api_key=os.getenv("ANTHROPIC_API_KEY"))
-
-    kb = load_knowledge_base_for_ideas()
-
-    user_prompt = f"""Generate {num_ideas} content ideas/angles for a LinkedIn post about: {topic}
-
-KNOWLEDGE BASE:
-
---- IP EXTRACTION (expertise, knowledge, frameworks) ---
-{kb['ip_extraction'][:6000]}
-
---- ORIGIN STORY (personal experiences, journey) ---
-{kb['origin_story'][:4000]}
-
---- BEST PERFORMING POSTS (what resonates) ---
-{kb['best_posts'][:3000]}
-"""
-
-    if context:
-        user_prompt += f"\n--- ADDITIONAL CONTEXT ---\n{context}\n"
-
-    user_prompt += f"""
-Generate {num_ideas} unique content ideas that connect the topic to the knowledge base.
+def build_ideas_request(topic: str, context: str, num_ideas: int, kb: dict) -> dict:
+    """Build the call_llm() arguments for an ideas request (shared by sync and async paths)."""
+    query = f"{topic} {context}".strip()
+    excerpts = retrieve_context(query, kb, KB_TOKEN_BUDGETS)
+
+    sections = [
+        PromptSection("kb_heading", "KNOWLEDGE BASE (excerpts relevant to this topic):", required=True),
+        PromptSection("ip_extraction", excerpts['ip_extraction'], priority=30,
+                      header="--- IP EXTRACTION (expertise, knowledge, frameworks) ---"),
+        PromptSection("origin_story", excerpts['origin_story'], priority=20,
+                      header="--- ORIGIN STORY (personal experiences, journey) ---"),
+        PromptSection("additional_context", context, priority=40,
+                      header="--- ADDITIONAL CONTEXT ---"),
+        PromptSection("task", f"""Generate {num_ideas} content ideas/angles for a LinkedIn post about: {topic}""", required=True),
+        PromptSection("instructions", f"""Generate {num_ideas} unique content ideas that connect the topic to the knowledge base.
 Each idea should be a specific angle or story that could become a post.
 
 Format each idea on its own line:
@@ -104,18 +73,29 @@ Where PILLAR is one of: Personal, Expertise, Social Proof, Opinion, Trending
 Example format:
 1. [Personal] Share the story of when I struggled with X and how it taught me Y
 2. [Expertise] Break down my 3-step framework for handling Z
-3. [Opinion] Challenge the common belief that A leads to B
-"""
-
-    response = client.messages.create(
+3. [Opinion] Challenge the common belief that A leads to B""", required=True),
+    ]
+    prompt = assemble_prompt(sections, PROMPT_TOKEN_BUDGET)
+
+    # Invariant prefix (instructions + best posts) is cached across calls
+    system = assemble_prompt([
+        PromptSection("system", SYSTEM_PROMPT.rstrip("\n"), required=True),
+        PromptSection("best_posts", kb.get('best_posts', ''), priority=10,
+                      header="--- BEST PERFORMING POSTS (what resonates) ---"),
+    ], SYSTEM_TOKEN_BUDGET)
+
+    return dict(
+        name="generate_ideas",
+        estimated_input_tokens=prompt.tokens + system.tokens,
         model="claude-sonnet-4-20250514",
         max_tokens=3000,
-        system=SYSTEM_PROMPT,
-        messages=[{"role": "user", "content": user_prompt}]
+        system=cached_blocks(system.text),
+        messages=[{"role": "user", "content": prompt.text}]
     )
 
-    # Parse response into list of ideas
-    content = response.content[0].text
+
+def parse_ideas(content: str, num_ideas: int) -> list[dict]:
+    """Parse numbered "[PILLAR] idea" lines from the model response."""
     ideas = []
 
     for line in content.strip().split("\n"):
@@ -150,6 +130,33 @@ Example format:
     return ideas[:num_ideas]
 
 
+def generate_ideas(topic: str, context: str = "", num_ideas: int = 15, fresh: bool = False) -> list[dict]:
+    """
+    Generate content ideas/angles for a topic using the knowledge base.
+
+    Args:
+        topic: The topic/idea to explore
+        context: Optional additional context
+        num_ideas: Number of ideas to generate
+        fresh: Skip the response cache to get new variations
+
+    Returns:
+        List of dicts with 'idea' and 'angle' keys
+    """
+    kb = load_knowledge_base_for_ideas()
+    response = call_llm(**build_ideas_request(topic, context, num_ideas, kb), use_cache=False if fresh else None)
+    return parse_ideas(response.content[0].text, num_ideas)
+
+
+async def generate_ideas_async(topic: str, context: str = "", num_ideas: int = 15, fresh: bool = False) -> list[dict]:
+    """Async variant of generate_ideas() for use inside the event loop."""
+    # First load may extract the IP PDF, and retrieval scores the KB; keep both off the event loop
+    kb = await asyncio.to_thread(load_knowledge_base_for_ideas)
+    request = await asyncio.to_thread(build_ideas_request, topic, context, num_ideas, kb)
+    response = await call_llm_async(**request, use_cache=False if fresh else None)
+    return parse_ideas(response.content[0].text, num_ideas)
+
+
 if __name__ == "__main__":
     import sys
 
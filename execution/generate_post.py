@@ -1,34 +1,20 @@
 """
 AI Post Generator - Creates LinkedIn posts using knowledge base content.
 """
-import os
-from pathlib import Path
-from anthropic import Anthropic
+import asyncio
 from dotenv import load_dotenv
 from prompts import POST_GENERATOR_SYSTEM
+from knowledge_base import get_knowledge_base, POST_DOCUMENTS
+from kb_retrieval import retrieve_context
+from llm_gateway import call_llm, call_llm_async, stream_llm_async
+from prompt_builder import PromptSection, assemble_prompt, cached_blocks
 
 load_dotenv()
 
-KNOWLEDGE_BASE_PATH = Path(__file__).parent.parent / "knowledge_bases"
-
-
-def load_pdf_text(pdf_path: Path) -> str:
-    """Extract text from a PDF file."""
-    try:
-        from pypdf import PdfReader
-        reader = PdfReader(str(pdf_path))
-        text = ""
-        for page in reader.pages:
-            text += page.extract_text() + "\n"
-        return text
-    except Exception as e:
-        print(f"Warning: Could not read PDF {pdf_path}: {e}")
-        return ""
-
 
 def load_knowledge_base(client_name: str = "Smiths") -> dict:
     """
-    Load knowledge base content for a client.
+    Load knowledge base content for a client (cached per process).
 
     Returns dict with:
         - origin_story: The client's origin story
@@ -36,39 +22,84 @@ def load_knowledge_base(client_name: str = "Smiths") -> dict:
         - best_posts: Examples of high-performing posts
         - templates: Post templates
     """
-    kb_path = KNOWLEDGE_BASE_PATH / client_name / "Written Posts"
+    return get_knowledge_base(client_name, POST_DOCUMENTS)
 
-    content = {
-        "origin_story": "",
-        "ip_extraction": "",
-        "best_posts": "",
-        "templates": "",
-    }
 
-    # Load origin story
-    origin_file = kb_path / "Ian Origin Story 2.0.md"
-    if origin_file.exists():
-        content["origin_story"] = origin_file.read_text(encoding="utf-8")
+SYSTEM_PROMPT = POST_GENERATOR_SYSTEM
 
-    # Load IP extraction (PDF)
-    ip_file = kb_path / "Ian Shaw IP Extraction (2).pdf"
-    if ip_file.exists():
-        content["ip_extraction"] = load_pdf_text(ip_file)
+# Budget for the cached system prefix (instructions + best posts style reference)
+SYSTEM_TOKEN_BUDGET = 3000
 
-    # Load best posts
-    best_posts_file = kb_path / "Smiths Ian Best Performing Posts.md"
-    if best_posts_file.exists():
-        content["best_posts"] = best_posts_file.read_text(encoding="utf-8")
+# Token budget per knowledge base section; the most relevant chunks are selected to fill each
+KB_TOKEN_BUDGETS = {
+    "ip_extraction": 1000,
+    "origin_story": 750,
+    "templates": 500,
+}
 
-    # Load templates
-    templates_file = kb_path / "LI Content Templates.md"
-    if templates_file.exists():
-        content["templates"] = templates_file.read_text(encoding="utf-8")
+# Overall budget for the user prompt (KB excerpts + topic, hook and instructions)
+PROMPT_TOKEN_BUDGET = 3500
 
-    return content
 
+def build_system_prompt(knowledge_base: dict):
+    """
+    Build the invariant system prefix: instructions plus the best posts style reference.
 
-SYSTEM_PROMPT = POST_GENERATOR_SYSTEM
+    This is identical for every post generated for a client, so it is sent as a
+    cacheable block and topic-specific content goes in the user message after it.
+    """
+    return assemble_prompt([
+        PromptSection("system", SYSTEM_PROMPT.rstrip("\n"), required=True),
+        PromptSection("best_posts", knowledge_base.get('best_posts', ''), priority=10,
+                      header="--- BEST PERFORMING POSTS (match this style) ---"),
+    ], SYSTEM_TOKEN_BUDGET)
+
+
+def build_post_request(
+    topic: str,
+    hook: str,
+    knowledge_base: dict,
+    additional_context: str = None
+) -> dict:
+    """Build the call_llm() arguments for a post body request (shared by sync and async paths)."""
+    # Select the knowledge base excerpts most relevant to this topic and hook
+    query = " ".join(filter(None, [topic, hook, additional_context]))
+    excerpts = retrieve_context(query, knowledge_base, KB_TOKEN_BUDGETS)
+
+    sections = [
+        PromptSection("kb_heading", "KNOWLEDGE BASE (excerpts relevant to this topic):", required=True),
+        PromptSection("ip_extraction", excerpts['ip_extraction'], priority=40,
+                      header="--- IP EXTRACTION (expertise and knowledge) ---"),
+        PromptSection("origin_story", excerpts['origin_story'], priority=20,
+                      header="--- ORIGIN STORY (for personal context) ---"),
+        PromptSection("templates", excerpts['templates'], priority=10,
+                      header="--- CONTENT TEMPLATES ---"),
+        PromptSection("additional_context", additional_context or "", priority=50,
+                      header="--- ADDITIONAL CONTEXT ---"),
+        PromptSection("task", f"""Create a LinkedIn post body for this topic and hook:
+
+TOPIC: {topic}
+
+HOOK (already written - build the post body to follow this):
+{hook}""", required=True),
+        PromptSection("instructions", """Write the POST BODY that follows the hook above. Include:
+- Content that delivers on the hook's promise
+- Bullet points where appropriate
+- A strong closing/CTA
+
+Return ONLY the body content (the hook will be prepended separately).""", required=True),
+    ]
+    prompt = assemble_prompt(sections, PROMPT_TOKEN_BUDGET)
+    system = build_system_prompt(knowledge_base)
+
+    return dict(
+        name="generate_post_body",
+        estimated_input_tokens=prompt.tokens + system.tokens,
+        model="claude-sonnet-4-20250514",
+        max_tokens=2000,
+        system=cached_blocks(system.text),
+        messages=[{"role": "user", "content": prompt.text}]
+    )
 
 
 def generate_post_body(
@@ -94,51 +125,45 @@ def generate_post_body(
     if knowledge_base is None:
         knowledge_base = load_knowledge_base()
 
-    client = Anthropic(api_key=os.getenv("ANTHROPIC_API_KEY"))
-
-    # Build the user prompt
-    ip_content = knowledge_base.get('ip_extraction', '')[:4000]
-    user_prompt = f"""Create a LinkedIn post body for this topic and hook:
-
-TOPIC: {topic}
-
-HOOK (already written - build the post body to follow this):
-{hook}
-
-KNOWLEDGE BASE:
-
---- IP EXTRACTION (expertise and knowledge) ---
-{ip_content}
-
---- BEST PERFORMING POSTS (match this style) ---
-{knowledge_base['best_posts'][:4000]}
+    response = call_llm(**build_post_request(topic, hook, knowledge_base, additional_context))
+    return response.content[0].text.strip()
 
---- ORIGIN STORY (for personal context) ---
-{knowledge_base['origin_story'][:3000]}
 
---- CONTENT TEMPLATES ---
-{knowledge_base.get('templates', '')[:2000]}
-"""
+async def generate_post_body_async(
+    topic: str,
+    hook: str,
+    knowledge_base: dict = None,
+    additional_context: str = None
+) -> str:
+    """Async variant of generate_post_body() for use inside the event loop."""
+    if knowledge_base is None:
+        # First load may extract the IP PDF; keep it off the event loop
+        knowledge_base = await asyncio.to_thread(load_knowledge_base)
 
-    if additional_context:
-        user_prompt += f"\n--- ADDITIONAL CONTEXT ---\n{additional_context}\n"
+    # Retrieval hashes and scores the KB (and may rewrite its index file); keep it off the loop too
+    request = await asyncio.to_thread(build_post_request, topic, hook, knowledge_base, additional_context)
+    response = await call_llm_async(**request)
+    return response.content[0].text.strip()
 
-    user_prompt += """
-Write the POST BODY that follows the hook above. Include:
-- Content that delivers on the hook's promise
-- Bullet points where appropriate
-- A strong closing/CTA
 
-Return ONLY the body content (the hook will be prepended separately)."""
+async def stream_post_body(
+    topic: str,
+    hook: str,
+    knowledge_base: dict = None,
+    additional_context: str = None
+):
+    """
+    Stream a post body as it is generated.
 
-    response = client.messages.create(
-        model="claude-sonnet-4-20250514",
-        max_tokens=2000,
-        system=SYSTEM_PROMPT,
-        messages=[{"role": "user", "content": user_prompt}]
-    )
+    Yields text chunks from the streaming API; join and strip them for the
+    same result generate_post_body() returns.
+    """
+    if knowledge_base is None:
+        knowledge_base = await asyncio.to_thread(load_knowledge_base)
 
-    return response.content[0].text.strip()
+    request = await asyncio.to_thread(build_post_request, topic, hook, knowledge_base, additional_context)
+    async for text in stream_llm_async(**request):
+        yield text
 
 
 def list_templates() -> list[str]:
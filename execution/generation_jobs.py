@@ -0,0 +1,136 @@
+"""
+Job handlers for the long-running generation batches.
+
+Registers with job_queue:
+    hooks_from_ideas - 30 hooks per selected idea (one item per idea)
+    create_drafts    - a post body + saved draft per selected hook (one item per hook)
+    trend_scout      - a full trend scan (single item)
+
+Import this module wherever jobs are enqueued or processed.
+"""
+import uuid
+
+from sqlalchemy.exc import IntegrityError
+
+from job_queue import JobHandler, register_handler
+from llm_gateway import MAX_CONCURRENCY
+
+
+# =============================================================================
+# HOOKS FROM IDEAS
+# =============================================================================
+
+def _hook_ideas(payload: dict) -> list:
+    return payload.get("ideas", [])
+
+
+def _generate_hooks_for_idea(payload: dict, idea: dict) -> dict:
+    from generate_hooks import generate_hooks
+    hooks = generate_hooks(payload.get("topic", ""), context=idea["idea"], num_hooks=payload.get("num_hooks", 30),
+                           fresh=payload.get("fresh", False))
+    return {"idea": idea["idea"], "angle": idea.get("angle", ""), "hooks": hooks}
+
+
+def _finalize_hook_groups(payload: dict, results: list) -> dict:
+    hook_groups = []
+    for idea, result in zip(payload.get("ideas", []), results):
+        if "error" in result:
+            hook_groups.append({"idea": idea["idea"], "angle": idea.get("angle", ""),
+                                "hooks": [], "error": result["error"]})
+        else:
+            hook_groups.append(result)
+    return {
+        "topic": payload.get("topic", ""),
+        "hook_groups": hook_groups,
+        "total_hooks": sum(len(g["hooks"]) for g in hook_groups),
+    }
+
+
+# =============================================================================
+# CREATE DRAFTS
+# =============================================================================
+
+def _draft_items(payload: dict) -> list:
+    return payload.get("items", [])
+
+
+def _item_draft_id(key: str) -> str:
+    """
+    Draft ID for a create_drafts item, the same on every run of that item.
+
+    The full UUID, so it can't collide with the short random IDs other drafts get.
+    """
+    return str(uuid.uuid5(uuid.NAMESPACE_URL, f"create_drafts:{key}"))
+
+
+def _create_draft_for_hook(payload: dict, item: dict, key: str) -> dict:
+    """
+    Generate and save one draft. A re-run item (retry, or a job re-claimed
+    after a crash) finds the draft it already saved and does nothing.
+    """
+    from draft_storage import create_draft, get_draft, record_bank_usage
+    from generate_post import generate_post_body, load_knowledge_base
+
+    draft_id = _item_draft_id(key)
+    if get_draft(draft_id):
+        return {"draft_id": draft_id}
+
+    topic = payload.get("topic", "")
+    context = f"Idea/angle: {item['idea']}" if item.get('idea') else None
+    body = generate_post_body(topic, item['hook'], load_knowledge_base(), additional_context=context)
+    try:
+        create_draft(
+            content=body,
+            hooks=[item['hook']],
+            selected_hook=0,
+            topic=f"{topic} - {item['idea'][:50]}..." if item.get('idea') else topic,
+            draft_id=draft_id,
+        )
+    except IntegrityError:
+        # Saved by a concurrent run of the same item, which also counted the usage
+        return {"draft_id": draft_id}
+    # Counted with the draft that used them, so only once per saved draft
+    record_bank_usage(hooks=[item["hook"]], ideas=[item.get("idea")])
+    return {"draft_id": draft_id}
+
+
+def _finalize_drafts(payload: dict, results: list) -> dict:
+    draft_ids = [r["draft_id"] for r in results if "draft_id" in r]
+    return {
+        "created": len(draft_ids),
+        "failed": len(results) - len(draft_ids),
+        "draft_ids": draft_ids,
+        "errors": [r["error"] for r in results if "error" in r],
+    }
+
+
+# =============================================================================
+# TREND SCOUT
+# =============================================================================
+
+def _run_trend_scout(payload: dict, item) -> dict:
+    from trend_scout import run_trend_scout
+    return run_trend_scout(payload.get("queries"))
+
+
+register_handler("hooks_from_ideas", JobHandler(
+    items=_hook_ideas,
+    run_item=_generate_hooks_for_idea,
+    finalize=_finalize_hook_groups,
+    item_concurrency=MAX_CONCURRENCY,
+))
+
+register_handler("create_drafts", JobHandler(
+    items=_draft_items,
+    run_item=_create_draft_for_hook,
+    finalize=_finalize_drafts,
+    item_concurrency=MAX_CONCURRENCY,
+    keyed=True,
+))
+
+register_handler("trend_scout", JobHandler(
+    items=lambda payload: ["scan"],
+    run_item=_run_trend_scout,
+    finalize=lambda payload, results: results[0],
+    fail_fast=True,
+))
@@ -1,15 +1,18 @@
 """
 Image library - S3-backed shared image pool.
 Images are stored in S3 and tracked via PostgreSQL metadata.
-Drafts reference library images by ID (attach/detach).
+Drafts reference library images through the draft_images table (attach/detach).
 """
 import uuid
 from datetime import datetime
 from pathlib import Path
 from typing import Optional
 
+from sqlalchemy import select
+
 from s3_storage import upload_bytes, delete_object, ensure_bucket
-from database import SessionLocal, Image
+from database import SessionLocal, Draft, DraftImage, Image
+from pagination import apply_keyset
 
 ALLOWED_EXTENSIONS = {".jpg", ".jpeg", ".png", ".gif", ".webp"}
 CONTENT_TYPES = {
@@ -69,7 +72,7 @@ def save_image(file_content: bytes, original_filename: str) -> dict:
 
 
 def delete_image(image_id: str) -> bool:
-    """Delete an image from S3 and library."""
+    """Delete an image from S3 and library (detaching it from any drafts)."""
     with SessionLocal() as db:
         row = db.query(Image).filter(Image.id == image_id).first()
         if not row:
@@ -80,20 +83,57 @@ def delete_image(image_id: str) -> bool:
         return True
 
 
-def list_images() -> list[dict]:
-    """Return all library images."""
+def list_images(cursor: str = None, limit: int = None) -> list[dict]:
+    """Return library images, newest first (cursor/limit page through them)."""
     with SessionLocal() as db:
-        rows = db.query(Image).order_by(Image.uploaded_at.desc()).all()
-        return [_image_to_dict(r) for r in rows]
+        return [_image_to_dict(r) for r in db.scalars(_images_select(cursor, limit))]
+
+
+def _images_select(cursor: str = None, limit: int = None):
+    return apply_keyset(select(Image), Image.uploaded_at, Image.id, cursor, limit)
 
 
 def get_image(image_id: str) -> Optional[dict]:
     """Get a single image by ID."""
     with SessionLocal() as db:
-        row = db.query(Image).filter(Image.id == image_id).first()
+        row = db.get(Image, image_id)
         return _image_to_dict(row) if row else None
 
 
+def get_draft_images(draft_id: str) -> list[dict]:
+    """Images attached to a draft, in attachment order."""
+    with SessionLocal() as db:
+        return [_image_to_dict(r) for r in db.scalars(_draft_images_select(draft_id))]
+
+
+def _draft_images_select(draft_id: str):
+    return (
+        select(Image)
+        .join(DraftImage, DraftImage.image_id == Image.id)
+        .where(DraftImage.draft_id == draft_id)
+        .order_by(DraftImage.position)
+    )
+
+
+def get_image_drafts(image_id: str) -> list[dict]:
+    """Drafts an image is attached to: {"id", "status", "content"} newest first."""
+    with SessionLocal() as db:
+        return [_image_draft_to_dict(r) for r in db.execute(_image_drafts_select(image_id))]
+
+
+def _image_drafts_select(image_id: str):
+    return (
+        select(Draft.id, Draft.status, Draft.content)
+        .join(DraftImage, DraftImage.draft_id == Draft.id)
+        .where(DraftImage.image_id == image_id)
+        .order_by(Draft.created_at.desc(), Draft.id.desc())
+    )
+
+
+def _image_draft_to_dict(row) -> dict:
+    return {"id": row.id, "status": row.status, "content": row.content}
+
+
 def get_image_url(image_id: str) -> Optional[str]:
     """Get the S3 URL for an image."""
     img = get_image(image_id)
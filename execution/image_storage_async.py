@@ -0,0 +1,34 @@
+"""
+Async twin of image_storage's database reads, on SQLAlchemy's AsyncSession.
+
+Same function names, arguments and return values as image_storage; the
+statements and dict converters are image_storage's own. Uploads and deletes
+talk to S3 as well, so they stay sync and go through the storage thread pool
+(run_storage).
+"""
+from typing import Optional
+
+from database import AsyncSessionLocal, Image
+from draft_storage_async import _get, _list
+from image_storage import _draft_images_select, _image_draft_to_dict, _image_drafts_select, _image_to_dict, _images_select
+
+
+async def list_images(cursor: str = None, limit: int = None) -> list[dict]:
+    """Return library images, newest first (cursor/limit page through them)."""
+    return await _list(_images_select(cursor, limit), _image_to_dict)
+
+
+async def get_image(image_id: str) -> Optional[dict]:
+    """Get a single image by ID."""
+    return await _get(Image, image_id, _image_to_dict)
+
+
+async def get_draft_images(draft_id: str) -> list[dict]:
+    """Images attached to a draft, in attachment order."""
+    return await _list(_draft_images_select(draft_id), _image_to_dict)
+
+
+async def get_image_drafts(image_id: str) -> list[dict]:
+    """Drafts an image is attached to: {"id", "status", "content"} newest first."""
+    async with AsyncSessionLocal() as db:
+        return [_image_draft_to_dict(r) for r in await db.execute(_image_drafts_select(image_id))]
@@ -0,0 +1,401 @@
+"""
+Durable background job queue backed by the jobs table.
+
+Long-running generation batches are enqueued as jobs and processed by a
+worker pool instead of inside the HTTP request. A job is split into items
+(one idea, one hook, one scan...); each item's result is written to the
+jobs table as soon as it finishes, so a job interrupted by a restart or
+reload resumes with only its unfinished items.
+
+Handlers are registered per job kind with register_handler(). Items are
+processed at least once: an item that was running when the process died
+is run again on resume. Handlers with side effects set keyed=True and use
+the item key to make a re-run a no-op.
+
+Configuration (env vars):
+    JOB_WORKERS         - worker threads started by the web UI (default 2, 0 disables)
+    JOB_STALE_SECONDS   - a running job with no heartbeat for this long is requeued (default 120)
+"""
+import os
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Callable, Optional
+
+from database import SessionLocal, Job
+
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "2"))
+JOB_STALE_SECONDS = int(os.getenv("JOB_STALE_SECONDS", "120"))
+HEARTBEAT_SECONDS = 15
+POLL_SECONDS = 1.0
+
+JOB_STATUSES = ["queued", "running", "completed", "failed"]
+
+
+@dataclass
+class JobHandler:
+    """
+    How to run one kind of job.
+
+    Args:
+        items: payload -> list of work items (must be deterministic so resumes line up)
+        run_item: (payload, item) -> JSON-serialisable result, run in a worker thread
+        finalize: (payload, results) -> final job result; results are in item order
+        fail_fast: If True, an item error fails the job; otherwise it is recorded
+                   as {"error": ...} for that item and the job carries on
+        item_concurrency: Max items of one job run at the same time
+        keyed: If True, run_item also gets a key "<job id>:<item index>" that is
+               the same every time the item is run (for idempotent side effects)
+    """
+    items: Callable[[dict], list]
+    run_item: Callable[[dict, object], object]
+    finalize: Optional[Callable[[dict, list], dict]] = None
+    fail_fast: bool = False
+    item_concurrency: int = 4
+    keyed: bool = False
+
+
+_handlers: dict[str, JobHandler] = {}
+
+
+def register_handler(kind: str, handler: JobHandler) -> None:
+    """Register the handler for a job kind."""
+    _handlers[kind] = handler
+
+
+def get_handler(kind: str) -> Optional[JobHandler]:
+    return _handlers.get(kind)
+
+
+# =============================================================================
+# STORAGE
+# =============================================================================
+
+def _job_to_dict(row: Job) -> dict:
+    return {
+        "id": row.id,
+        "kind": row.kind,
+        "status": row.status,
+        "payload": row.payload or {},
+        "progress": {"done": row.progress_done or 0, "total": row.progress_total or 0},
+        "result": row.result,
+        "error": row.error,
+        "attempts": row.attempts or 0,
+        "created_at": row.created_at,
+        "updated_at": row.updated_at,
+        "started_at": row.started_at,
+        "finished_at": row.finished_at,
+    }
+
+
+def enqueue_job(kind: str, payload: dict = None) -> dict:
+    """
+    Add a job to the queue.
+
+    Returns:
+        The created job dict (status "queued")
+    """
+    if kind not in _handlers:
+        raise ValueError(f"Unknown job kind: {kind}")
+    payload = payload or {}
+    now = datetime.now().isoformat()
+    job = Job(
+        id=str(uuid.uuid4())[:8],
+        kind=kind,
+        status="queued",
+        payload=payload,
+        item_results={},
+        progress_done=0,
+        progress_total=len(_handlers[kind].items(payload)),
+        attempts=0,
+        created_at=now,
+        updated_at=now,
+    )
+    with SessionLocal() as db:
+        db.add(job)
+        db.commit()
+        db.refresh(job)
+        return _job_to_dict(job)
+
+
+def get_job(job_id: str) -> Optional[dict]:
+    """Get a job by ID."""
+    with SessionLocal() as db:
+        row = db.get(Job, job_id)
+        return _job_to_dict(row) if row else None
+
+
+def list_jobs(status: str = None, kind: str = None, limit: int = 50) -> list[dict]:
+    """List jobs, newest first."""
+    with SessionLocal() as db:
+        q = db.query(Job)
+        if status:
+            q = q.filter(Job.status == status)
+        if kind:
+            q = q.filter(Job.kind == kind)
+        rows = q.order_by(Job.created_at.desc()).limit(limit).all()
+        return [_job_to_dict(r) for r in rows]
+
+
+def claim_next_job(worker_id: str) -> Optional[dict]:
+    """
+    Atomically move the oldest queued job to "running" for this worker.
+
+    Uses a conditional UPDATE so two workers (threads or processes) never
+    claim the same job.
+    """
+    with SessionLocal() as db:
+        candidates = (
+            db.query(Job.id)
+            .filter(Job.status == "queued")
+            .order_by(Job.created_at)
+            .limit(5)
+            .all()
+        )
+        for (job_id,) in candidates:
+            now = datetime.now().isoformat()
+            claimed = (
+                db.query(Job)
+                .filter(Job.id == job_id, Job.status == "queued")
+                .update({
+                    Job.status: "running",
+                    Job.worker_id: worker_id,
+                    Job.heartbeat_at: now,
+                    Job.started_at: now,
+                    Job.updated_at: now,
+                    Job.attempts: Job.attempts + 1,
+                }, synchronize_session=False)
+            )
+            db.commit()
+            if claimed:
+                return _job_to_dict(db.get(Job, job_id))
+    return None
+
+
+def _update_job(job_id: str, **values) -> None:
+    values["updated_at"] = datetime.now().isoformat()
+    with SessionLocal() as db:
+        db.query(Job).filter(Job.id == job_id).update(
+            {getattr(Job, k): v for k, v in values.items()}, synchronize_session=False
+        )
+        db.commit()
+
+
+def _load_item_results(job_id: str) -> dict:
+    with SessionLocal() as db:
+        row = db.get(Job, job_id)
+        return dict(row.item_results or {}) if row else {}
+
+
+def heartbeat(job_ids: list[str]) -> None:
+    """Mark running jobs as alive."""
+    if not job_ids:
+        return
+    now = datetime.now().isoformat()
+    with SessionLocal() as db:
+        db.query(Job).filter(Job.id.in_(job_ids), Job.status == "running").update(
+            {Job.heartbeat_at: now}, synchronize_session=False
+        )
+        db.commit()
+
+
+def recover_stale_jobs(stale_after: int = JOB_STALE_SECONDS) -> int:
+    """
+    Requeue running jobs whose worker stopped heartbeating (crash, restart, reload).
+
+    Returns:
+        Number of jobs requeued
+    """
+    cutoff = (datetime.now() - timedelta(seconds=stale_after)).isoformat()
+    with SessionLocal() as db:
+        count = (
+            db.query(Job)
+            .filter(Job.status == "running", Job.heartbeat_at < cutoff)
+            .update({
+                Job.status: "queued",
+                Job.worker_id: None,
+                Job.updated_at: datetime.now().isoformat(),
+            }, synchronize_session=False)
+        )
+        db.commit()
+    return count
+
+
+# =============================================================================
+# EXECUTION
+# =============================================================================
+
+def run_job(job: dict, should_stop: Callable[[], bool] = None) -> str:
+    """
+    Run a claimed job's unfinished items and record the outcome.
+
+    Item results are persisted one by one. If should_stop() becomes true the
+    job is put back in the queue with its finished items kept.
+
+    Returns:
+        Final status: "completed", "failed" or "queued" (stopped early)
+    """
+    job_id = job["id"]
+    handler = get_handler(job["kind"])
+    if handler is None:
+        _update_job(job_id, status="failed", error=f"No handler for job kind: {job['kind']}",
+                    finished_at=datetime.now().isoformat())
+        return "failed"
+
+    payload = job["payload"]
+    try:
+        items = handler.items(payload)
+    except Exception as e:
+        _update_job(job_id, status="failed", error=str(e), finished_at=datetime.now().isoformat())
+        return "failed"
+
+    results = _load_item_results(job_id)
+    pending = [i for i in range(len(items)) if str(i) not in results]
+    lock = threading.Lock()
+    failures = []
+
+    def run_one(index):
+        # Skip items not yet started once stopping or after a fail-fast error
+        if failures or (should_stop and should_stop()):
+            return index, None
+        try:
+            args = (payload, items[index], f"{job_id}:{index}") if handler.keyed else (payload, items[index])
+            return index, {"ok": True, "value": handler.run_item(*args)}
+        except Exception as e:
+            return index, {"ok": False, "error": str(e)}
+
+    if pending:
+        workers = max(1, min(len(pending), handler.item_concurrency))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(run_one, index) for index in pending]
+            for future in as_completed(futures):
+                index, outcome = future.result()
+                if outcome is None:
+                    continue
+                if not outcome["ok"] and handler.fail_fast:
+                    failures.append(outcome["error"])
+                    continue
+                with lock:
+                    results[str(index)] = (
+                        outcome["value"] if outcome["ok"] else {"error": outcome["error"]}
+                    )
+                    _update_job(job_id, item_results=dict(results), progress_done=len(results),
+                                heartbeat_at=datetime.now().isoformat())
+
+    if failures:
+        _update_job(job_id, status="failed", error=failures[0], finished_at=datetime.now().isoformat())
+        return "failed"
+
+    if len(results) < len(items):
+        # Stopped before finishing: hand the job back to the queue to resume later
+        _update_job(job_id, status="queued", worker_id=None)
+        return "queued"
+
+    ordered = [results[str(i)] for i in range(len(items))]
+    try:
+        final = handler.finalize(payload, ordered) if handler.finalize else {"items": ordered}
+    except Exception as e:
+        _update_job(job_id, status="failed", error=str(e), finished_at=datetime.now().isoformat())
+        return "failed"
+
+    _update_job(job_id, status="completed", result=final, error=None,
+                progress_done=len(items), finished_at=datetime.now().isoformat())
+    return "completed"
+
+
+def run_pending_jobs(worker_id: str = "inline", max_jobs: int = None) -> int:
+    """
+    Process queued jobs in the calling thread until the queue is empty.
+
+    Used by tests and `workflow.py worker --once`.
+
+    Returns:
+        Number of jobs processed
+    """
+    processed = 0
+    while max_jobs is None or processed < max_jobs:
+        job = claim_next_job(worker_id)
+        if job is None:
+            break
+        run_job(job)
+        processed += 1
+    return processed
+
+
+class JobWorkerPool:
+    """
+    Background threads that claim and run queued jobs.
+
+    A heartbeat thread keeps this pool's running jobs alive and requeues
+    jobs abandoned by other (crashed) processes.
+    """
+
+    def __init__(self, num_workers: int = JOB_WORKERS, poll_interval: float = POLL_SECONDS):
+        self.num_workers = num_workers
+        self.poll_interval = poll_interval
+        self.pool_id = f"{os.getpid()}-{uuid.uuid4().hex[:6]}"
+        self._stop = threading.Event()
+        self._threads: list[threading.Thread] = []
+        self._running: set[str] = set()
+        self._running_lock = threading.Lock()
+
+    @property
+    def running(self) -> bool:
+        return any(t.is_alive() for t in self._threads)
+
+    def start(self) -> None:
+        if self.running or self.num_workers <= 0:
+            return
+        self._stop.clear()
+        recovered = recover_stale_jobs()
+        if recovered:
+            print(f"Job queue: requeued {recovered} interrupted job(s)")
+        self._threads = [
+            threading.Thread(target=self._worker_loop, args=(f"{self.pool_id}-{i}",),
+                             name=f"job-worker-{i}", daemon=True)
+            for i in range(self.num_workers)
+        ]
+        self._threads.append(threading.Thread(target=self._heartbeat_loop, name="job-heartbeat", daemon=True))
+        for thread in self._threads:
+            thread.start()
+
+    def stop(self, timeout: float = 30) -> None:
+        """Stop claiming jobs; running jobs finish their in-flight items and are requeued."""
+        self._stop.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def _worker_loop(self, worker_id: str) -> None:
+        while not self._stop.is_set():
+            try:
+                job = claim_next_job(worker_id)
+            except Exception as e:
+                print(f"Job queue: claim failed: {e}")
+                job = None
+            if job is None:
+                self._stop.wait(self.poll_interval)
+                continue
+            with self._running_lock:
+                self._running.add(job["id"])
+            try:
+                run_job(job, should_stop=self._stop.is_set)
+            except Exception as e:
+                print(f"Job queue: job {job['id']} crashed: {e}")
+                _update_job(job["id"], status="failed", error=str(e),
+                            finished_at=datetime.now().isoformat())
+            finally:
+                with self._running_lock:
+                    self._running.discard(job["id"])
+
+    def _heartbeat_loop(self) -> None:
+        while not self._stop.wait(HEARTBEAT_SECONDS):
+            try:
+                with self._running_lock:
+                    running = list(self._running)
+                heartbeat(running)
+                recover_stale_jobs()
+            except Exception as e:
+                print(f"Job queue: heartbeat failed: {e}")
@@ -0,0 +1,268 @@
+"""
+Knowledge base retrieval - local BM25 index over knowledge base chunks.
+
+Documents are split into paragraph-sized chunks and scored against the
+topic/hook with Okapi BM25, so prompts carry the most relevant parts of the
+knowledge base instead of the same leading characters every time.
+
+The index is persisted to knowledge_bases/.index/<client>.json and updated
+per document: only documents whose content hash changed are re-chunked.
+"""
+import hashlib
+import json
+import math
+import os
+import re
+import threading
+from collections import Counter
+from pathlib import Path
+
+from prompt_builder import estimate_tokens
+
+KNOWLEDGE_BASE_PATH = Path(__file__).parent.parent / "knowledge_bases"
+INDEX_PATH = KNOWLEDGE_BASE_PATH / ".index"
+INDEX_VERSION = 2
+
+CHUNK_CHARS = 1000
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "but", "by", "for", "from", "has",
+    "have", "i", "if", "in", "into", "is", "it", "its", "me", "my", "of", "on",
+    "or", "so", "that", "the", "their", "them", "they", "this", "to", "was",
+    "we", "were", "what", "when", "which", "who", "will", "with", "you", "your",
+}
+
+
+def tokenize(text: str) -> list[str]:
+    """Lowercase word tokens with stopwords removed."""
+    return [t for t in re.findall(r"[a-z0-9']+", text.lower()) if t not in STOPWORDS and len(t) > 1]
+
+
+def normalize_text(text: str) -> str:
+    """
+    Clean up extracted text before chunking.
+
+    pypdf output for the IP extraction separates every word with "\\n \\n" and
+    paragraphs with longer runs of it; collapse those back to spaces and blank lines.
+    """
+    text = text.replace("\r\n", "\n")
+    text = re.sub(r"\n(?: \n){2,}", "\n\n", text)
+    text = text.replace("\n \n", " ")
+    text = re.sub(r"[ \t]+", " ", text)
+    text = re.sub(r"\n{3,}", "\n\n", text)
+    return text.strip()
+
+
+def chunk_text(text: str, max_chars: int = CHUNK_CHARS) -> list[str]:
+    """Split text into chunks of whole paragraphs, each at most ~max_chars."""
+    paragraphs = [p.strip() for p in normalize_text(text).split("\n\n") if p.strip()]
+    chunks = []
+    current = ""
+
+    for para in paragraphs:
+        # Break oversized paragraphs on sentence boundaries
+        pieces = [para]
+        if len(para) > max_chars:
+            pieces = []
+            piece = ""
+            for sentence in re.split(r"(?<=[.!?])\s+", para):
+                if piece and len(piece) + len(sentence) + 1 > max_chars:
+                    pieces.append(piece)
+                    piece = ""
+                piece = f"{piece} {sentence}".strip()
+            if piece:
+                pieces.append(piece)
+
+        for piece in pieces:
+            if current and len(current) + len(piece) + 2 > max_chars:
+                chunks.append(current)
+                current = ""
+            current = f"{current}\n\n{piece}" if current else piece
+
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def _content_hash(text: str) -> str:
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+class KnowledgeBaseIndex:
+    """BM25 index over chunked knowledge base documents, persisted as JSON."""
+
+    def __init__(self, path: Path = None, chunk_chars: int = CHUNK_CHARS):
+        self.path = Path(path) if path else None
+        self.chunk_chars = chunk_chars
+        # source -> {"hash": str, "chunks": [{"text", "tf", "length", "tokens"}]}
+        self.documents: dict[str, dict] = {}
+        self._lock = threading.Lock()
+        if self.path and self.path.exists():
+            self._load()
+
+    def _load(self) -> None:
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            return
+        if data.get("version") == INDEX_VERSION:
+            self.documents = data.get("documents", {})
+
+    def save(self) -> None:
+        if not self.path:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(json.dumps({"version": INDEX_VERSION, "documents": self.documents}), encoding="utf-8")
+        os.replace(tmp, self.path)
+
+    def update(self, documents: dict) -> list[str]:
+        """
+        Re-chunk any document whose content changed.
+
+        Args:
+            documents: Mapping of source key -> document text
+
+        Returns:
+            List of source keys that were (re)indexed
+        """
+        changed = []
+        with self._lock:
+            for source, text in documents.items():
+                text = text or ""
+                digest = _content_hash(text)
+                existing = self.documents.get(source)
+                if existing and existing["hash"] == digest:
+                    continue
+                chunks = []
+                for chunk in chunk_text(text, self.chunk_chars):
+                    terms = tokenize(chunk)
+                    chunks.append({
+                        "text": chunk,
+                        "tf": dict(Counter(terms)),
+                        "length": len(terms),
+                        "tokens": estimate_tokens(chunk),
+                    })
+                self.documents[source] = {"hash": digest, "chunks": chunks}
+                changed.append(source)
+            if changed:
+                self.save()
+        return changed
+
+    def search(self, query: str, sources: list[str] = None, k: int = None) -> list[dict]:
+        """
+        Rank chunks against a query with BM25.
+
+        Args:
+            query: Free text (topic, hook, idea...)
+            sources: Restrict to these source keys (default: all)
+            k: Maximum number of results
+
+        Returns:
+            List of chunk dicts (source, position, text, tokens, score), best first
+        """
+        with self._lock:
+            candidates = [
+                (source, position, chunk)
+                for source, doc in self.documents.items()
+                if sources is None or source in sources
+                for position, chunk in enumerate(doc["chunks"])
+            ]
+        if not candidates:
+            return []
+
+        query_terms = set(tokenize(query))
+        n = len(candidates)
+        avg_length = sum(c["length"] for _, _, c in candidates) / n or 1
+        doc_freq = Counter()
+        for _, _, chunk in candidates:
+            for term in query_terms.intersection(chunk["tf"]):
+                doc_freq[term] += 1
+
+        results = []
+        for source, position, chunk in candidates:
+            score = 0.0
+            for term in query_terms:
+                tf = chunk["tf"].get(term)
+                if not tf:
+                    continue
+                idf = math.log(1 + (n - doc_freq[term] + 0.5) / (doc_freq[term] + 0.5))
+                norm = tf + BM25_K1 * (1 - BM25_B + BM25_B * chunk["length"] / avg_length)
+                score += idf * tf * (BM25_K1 + 1) / norm
+            results.append({
+                "source": source,
+                "position": position,
+                "text": chunk["text"],
+                "tokens": chunk["tokens"],
+                "score": score,
+            })
+
+        # Highest score first; ties keep document order so leading context wins
+        results.sort(key=lambda r: (-r["score"], r["source"], r["position"]))
+        return results[:k] if k else results
+
+
+_indexes: dict[str, KnowledgeBaseIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_index(client_name: str = "Smiths", documents: dict = None) -> KnowledgeBaseIndex:
+    """
+    Return the process-wide index for a client, loading it from disk on first use.
+
+    If documents are given, any that changed since they were indexed are re-chunked.
+    """
+    with _indexes_lock:
+        index = _indexes.get(client_name)
+        if index is None:
+            index = KnowledgeBaseIndex(INDEX_PATH / f"{client_name}.json")
+            _indexes[client_name] = index
+    if documents:
+        index.update(documents)
+    return index
+
+
+def select_chunks(index: KnowledgeBaseIndex, query: str, source: str, budget_tokens: int) -> str:
+    """
+    Pick the best-ranked chunks of one source that fit within a token budget.
+
+    Selected chunks are returned in document order, joined by blank lines.
+    """
+    selected = []
+    used = 0
+    for chunk in index.search(query, sources=[source]):
+        if used + chunk["tokens"] > budget_tokens:
+            continue
+        selected.append(chunk)
+        used += chunk["tokens"]
+        if used >= budget_tokens:
+            break
+    selected.sort(key=lambda c: c["position"])
+    return "\n\n".join(c["text"] for c in selected)
+
+
+def retrieve_context(
+    query: str,
+    knowledge_base: dict,
+    budgets: dict,
+    client_name: str = "Smiths",
+) -> dict:
+    """
+    Select topic-relevant excerpts from each knowledge base section.
+
+    Args:
+        query: Text to rank against (e.g. topic + hook)
+        knowledge_base: Mapping of section key -> full document text
+        budgets: Mapping of section key -> token budget for that section
+        client_name: Client whose persisted index to use
+
+    Returns:
+        Mapping of section key -> selected excerpt text
+    """
+    index = get_index(client_name, {key: knowledge_base.get(key, "") for key in budgets})
+    return {
+        key: select_chunks(index, query, key, budget)
+        for key, budget in budgets.items()
+    }
@@ -0,0 +1,137 @@
+"""
+Knowledge base cache - process-wide, per-client cache of knowledge base documents.
+
+Documents are re-read only when their file mtime or size changes, so repeated
+generation calls (web UI batches, CLI runs) don't re-parse the IP extraction PDF.
+"""
+import threading
+from pathlib import Path
+from typing import Optional
+
+from pdf_text_store import get_pdf_text
+
+KNOWLEDGE_BASE_PATH = Path(__file__).parent.parent / "knowledge_bases"
+
+# Document key -> filename, relative to knowledge_bases/<client>/Written Posts/
+POST_DOCUMENTS = {
+    "origin_story": "Ian Origin Story 2.0.md",
+    "ip_extraction": "Ian Shaw IP Extraction (2).pdf",
+    "best_posts": "Smiths Ian Best Performing Posts.md",
+    "templates": "LI Content Templates.md",
+}
+
+IDEAS_DOCUMENTS = {
+    "origin_story": "Ian Origin Story 2.0.md",
+    "ip_extraction": "Ian Shaw IP Extraction (2).pdf",
+    "best_posts": "Smiths Ian Best Performing Posts.md",
+}
+
+
+def load_pdf_text(pdf_path: Path) -> str:
+    """Extract text from a PDF file via the content-hashed text store."""
+    try:
+        return get_pdf_text(pdf_path)
+    except Exception as e:
+        print(f"Warning: Could not read PDF {pdf_path}: {e}")
+        return ""
+
+
+def _read_document(path: Path) -> str:
+    if path.suffix.lower() == ".pdf":
+        return load_pdf_text(path)
+    return path.read_text(encoding="utf-8")
+
+
+def _file_signature(path: Path) -> Optional[tuple]:
+    """Return (mtime_ns, size) for a file, or None if it doesn't exist."""
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+class KnowledgeBaseCache:
+    """
+    Thread-safe cache of knowledge base documents keyed by client name.
+
+    Each document is stored with the (mtime, size) signature it was read at.
+    On every lookup the files are stat'ed and only changed documents are re-read.
+    """
+
+    def __init__(self, root: Path = KNOWLEDGE_BASE_PATH):
+        self.root = Path(root)
+        self._lock = threading.Lock()
+        # client_name -> {filename: (signature, text)}
+        self._clients: dict[str, dict[str, tuple]] = {}
+        self.reads = 0
+        self.hits = 0
+
+    def client_path(self, client_name: str) -> Path:
+        return self.root / client_name / "Written Posts"
+
+    def get_document(self, client_name: str, filename: str) -> str:
+        """Return a document's text, re-reading it only if the file changed."""
+        path = self.client_path(client_name) / filename
+        signature = _file_signature(path)
+
+        with self._lock:
+            docs = self._clients.setdefault(client_name, {})
+            cached = docs.get(filename)
+            if cached and cached[0] == signature:
+                self.hits += 1
+                return cached[1]
+
+        text = _read_document(path) if signature else ""
+
+        with self._lock:
+            self._clients.setdefault(client_name, {})[filename] = (signature, text)
+            self.reads += 1
+        return text
+
+    def get(self, client_name: str = "Smiths", documents: dict = None) -> dict:
+        """
+        Return a knowledge base dict for a client.
+
+        Args:
+            client_name: Client folder under knowledge_bases/
+            documents: Mapping of key -> filename (defaults to POST_DOCUMENTS)
+
+        Returns:
+            Dict of key -> document text ("" for missing files)
+        """
+        documents = documents or POST_DOCUMENTS
+        return {
+            key: self.get_document(client_name, filename)
+            for key, filename in documents.items()
+        }
+
+    def invalidate(self, client_name: str = None) -> None:
+        """Drop cached documents for one client, or for all clients."""
+        with self._lock:
+            if client_name is None:
+                self._clients.clear()
+            else:
+                self._clients.pop(client_name, None)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "clients": sorted(self._clients),
+                "documents": sum(len(d) for d in self._clients.values()),
+                "reads": self.reads,
+                "hits": self.hits,
+            }
+
+
+_cache = KnowledgeBaseCache()
+
+
+def get_knowledge_base(client_name: str = "Smiths", documents: dict = None) -> dict:
+    """Load a client's knowledge base through the process-wide cache."""
+    return _cache.get(client_name, documents)
+
+
+def get_cache() -> KnowledgeBaseCache:
+    """Return the process-wide knowledge base cache."""
+    return _cache
@@ -0,0 +1,150 @@
+"""
+LLM response cache - content-addressed, database-backed, opt-in.
+
+Responses are keyed by a sha256 of the model, system prompt, messages and
+all other request parameters, so an identical request is answered from the
+llm_cache table instead of a new completion. Entries expire after a TTL and
+the least recently used entries are evicted beyond a size limit.
+
+Callers that want fresh variations pass use_cache=False to the gateway
+(exposed as fresh=True on the generators).
+
+Configuration (env vars):
+    LLM_CACHE_ENABLED      - "1"/"true" to cache by default (default off)
+    LLM_CACHE_TTL_SECONDS  - entry lifetime (default 7 days)
+    LLM_CACHE_MAX_ENTRIES  - LRU size limit (default 1000)
+"""
+import hashlib
+import json
+import os
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from typing import Optional
+
+from sqlalchemy import func
+
+from database import SessionLocal, LLMCacheEntry
+
+CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "").lower() in ("1", "true", "yes")
+CACHE_TTL_SECONDS = int(os.getenv("LLM_CACHE_TTL_SECONDS", str(7 * 24 * 3600)))
+CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "1000"))
+
+# Request parameters that don't affect the completion
+_IGNORED_PARAMS = {"stream", "timeout", "extra_headers"}
+
+
+class CachedResponse:
+    """Stand-in for an Anthropic Message rebuilt from a cache entry."""
+
+    cached = True
+
+    def __init__(self, data: dict, model: str = None):
+        self.model = model
+        self.content = [SimpleNamespace(type="text", text=data.get("text", ""))]
+        self.stop_reason = data.get("stop_reason")
+        # No tokens were billed for this response
+        self.usage = SimpleNamespace(input_tokens=0, output_tokens=0,
+                                     cache_creation_input_tokens=0, cache_read_input_tokens=0)
+        self.original_usage = data.get("usage", {})
+
+
+def is_enabled(use_cache: bool = None) -> bool:
+    """Resolve a per-call override against the global setting."""
+    return CACHE_ENABLED if use_cache is None else use_cache
+
+
+def cache_key(params: dict) -> str:
+    """Content hash of a messages.create request."""
+    relevant = {k: v for k, v in params.items() if k not in _IGNORED_PARAMS}
+    encoded = json.dumps(relevant, sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def response_text(response) -> str:
+    """Concatenated text blocks of a response."""
+    return "".join(getattr(block, "text", "") for block in getattr(response, "content", []) or [])
+
+
+def get(key: str) -> Optional[CachedResponse]:
+    """Return the cached response for a key, or None if missing or expired."""
+    now = datetime.now().isoformat()
+    with SessionLocal() as db:
+        row = db.get(LLMCacheEntry, key)
+        if row is None:
+            return None
+        if row.expires_at <= now:
+            db.delete(row)
+            db.commit()
+            return None
+        row.hits = (row.hits or 0) + 1
+        row.last_used_at = now
+        db.commit()
+        return CachedResponse(row.response, row.model)
+
+
+def put(key: str, name: str, model: str, text: str, stop_reason: str = None, usage: dict = None) -> None:
+    """Store a response and evict expired / least recently used entries."""
+    now = datetime.now()
+    data = {"text": text, "stop_reason": stop_reason, "usage": usage or {}}
+    with SessionLocal() as db:
+        db.merge(LLMCacheEntry(
+            key=key,
+            name=name,
+            model=model,
+            response=data,
+            size_bytes=len(text.encode("utf-8")),
+            hits=0,
+            created_at=now.isoformat(),
+            last_used_at=now.isoformat(),
+            expires_at=(now + timedelta(seconds=CACHE_TTL_SECONDS)).isoformat(),
+        ))
+        db.commit()
+    evict()
+
+
+def evict(max_entries: int = None) -> int:
+    """
+    Delete expired entries, then the least recently used beyond max_entries.
+
+    Returns:
+        Number of entries deleted
+    """
+    max_entries = CACHE_MAX_ENTRIES if max_entries is None else max_entries
+    now = datetime.now().isoformat()
+    with SessionLocal() as db:
+        deleted = db.query(LLMCacheEntry).filter(LLMCacheEntry.expires_at <= now).delete(synchronize_session=False)
+        overflow = [
+            key for (key,) in db.query(LLMCacheEntry.key)
+            .order_by(LLMCacheEntry.last_used_at.desc())
+            .offset(max_entries)
+            .all()
+        ]
+        if overflow:
+            deleted += db.query(LLMCacheEntry).filter(LLMCacheEntry.key.in_(overflow)).delete(synchronize_session=False)
+        db.commit()
+    return deleted
+
+
+def clear() -> int:
+    """Delete every cache entry."""
+    with SessionLocal() as db:
+        deleted = db.query(LLMCacheEntry).delete(synchronize_session=False)
+        db.commit()
+    return deleted
+
+
+def stats() -> dict:
+    with SessionLocal() as db:
+        entries, hits, size_bytes = db.query(
+            func.count(LLMCacheEntry.key),
+            func.coalesce(func.sum(LLMCacheEntry.hits), 0),
+            func.coalesce(func.sum(LLMCacheEntry.size_bytes), 0),
+        ).one()
+    return {
+        "enabled": CACHE_ENABLED,
+        "entries": entries,
+        "hits": int(hits),
+        "size_bytes": int(size_bytes),
+        "ttl_seconds": CACHE_TTL_SECONDS,
+        "max_entries": CACHE_MAX_ENTRIES,
+    }
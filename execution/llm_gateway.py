@@ -0,0 +1,338 @@
+"""
+LLM gateway - the single path from the generators to the Claude API.
+
+Provides:
+- One process-wide Anthropic client (connection pooling across calls)
+- Token-bucket limits on requests and input tokens per minute
+- A bounded semaphore capping in-flight requests
+- Exponential backoff with full jitter on 429/529/5xx and connection errors
+
+Large batches (e.g. hooks for 10+ ideas) queue behind the limits and retry
+instead of failing partway through.
+
+call_llm_async() is the asyncio twin used by the web routes: it uses an
+AsyncAnthropic client and an asyncio.Semaphore per event loop, and shares
+the same rate-limit buckets as the sync path. stream_llm_async() yields text
+deltas from the streaming API under the same limits.
+
+All three accept use_cache: when the response cache is on (LLM_CACHE_ENABLED
+or use_cache=True) an identical earlier request is answered from llm_cache
+without touching the limits or the API; use_cache=False always calls the API.
+
+Configuration (env vars):
+    LLM_MAX_CONCURRENCY      - max concurrent requests (default 4)
+    LLM_REQUESTS_PER_MINUTE  - request rate limit (default 50)
+    LLM_TOKENS_PER_MINUTE    - input token rate limit (default 40000)
+    LLM_MAX_RETRIES          - retries per call after the first attempt (default 5)
+"""
+import asyncio
+import os
+import random
+import threading
+import time
+import weakref
+
+import llm_cache
+from anthropic import Anthropic, AsyncAnthropic, APIConnectionError, APIStatusError
+from llm_metrics import acreate_message, astream_message, create_message, record_call, usage_from_response
+
+MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "4"))
+REQUESTS_PER_MINUTE = int(os.getenv("LLM_REQUESTS_PER_MINUTE", "50"))
+TOKENS_PER_MINUTE = int(os.getenv("LLM_TOKENS_PER_MINUTE", "40000"))
+MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "5"))
+
+BACKOFF_BASE_SECONDS = 1.0
+BACKOFF_MAX_SECONDS = 30.0
+
+# 429 rate limited, 529 overloaded, plus transient server errors
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504, 529}
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket refilled continuously at rate_per_minute.
+
+    acquire() blocks until enough tokens are available. Requests larger than
+    the bucket capacity are clamped to it so they can still proceed.
+    """
+
+    def __init__(self, rate_per_minute: float, capacity: float = None):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity or rate_per_minute
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def try_acquire(self, amount: float = 1) -> float:
+        """Take tokens if available; otherwise return seconds to wait (0.0 on success)."""
+        amount = min(amount, self.capacity)
+        with self._lock:
+            self._refill()
+            if self.tokens >= amount:
+                self.tokens -= amount
+                return 0.0
+            return (amount - self.tokens) / self.rate
+
+    def acquire(self, amount: float = 1) -> float:
+        """Block until tokens are taken. Returns total seconds waited."""
+        waited = 0.0
+        while True:
+            wait = self.try_acquire(amount)
+            if not wait:
+                return waited
+            time.sleep(wait)
+            waited += wait
+
+    async def acquire_async(self, amount: float = 1) -> float:
+        """Like acquire(), but yields to the event loop while waiting."""
+        waited = 0.0
+        while True:
+            wait = self.try_acquire(amount)
+            if not wait:
+                return waited
+            await asyncio.sleep(wait)
+            waited += wait
+
+
+_client = None
+_client_lock = threading.Lock()
+_semaphore = threading.BoundedSemaphore(MAX_CONCURRENCY)
+_request_bucket = TokenBucket(REQUESTS_PER_MINUTE)
+_token_bucket = TokenBucket(TOKENS_PER_MINUTE)
+
+# Async clients and semaphores are bound to the event loop they were created on
+_async_clients: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+_async_semaphores: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+_async_client_override = None
+
+
+def get_client() -> Anthropic:
+    """Return the process-wide Anthropic client, creating it on first use."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            # Retries are handled here so they respect the shared limits
+            _client = Anthropic(api_key=os.getenv("ANTHROPIC_API_KEY"), max_retries=0)
+        return _client
+
+
+def set_client(client) -> None:
+    """Replace the process-wide client (e.g. with a stub in tests)."""
+    global _client
+    with _client_lock:
+        _client = client
+
+
+def reset_client() -> None:
+    """Drop the process-wide client so the next call creates a fresh one."""
+    set_client(None)
+
+
+def get_async_client() -> AsyncAnthropic:
+    """Return the AsyncAnthropic client for the running event loop."""
+    if _async_client_override is not None:
+        return _async_client_override
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None:
+        client = AsyncAnthropic(api_key=os.getenv("ANTHROPIC_API_KEY"), max_retries=0)
+        _async_clients[loop] = client
+    return client
+
+
+def set_async_client(client) -> None:
+    """Use one async client on every event loop (e.g. a stub in tests); None restores the default."""
+    global _async_client_override
+    _async_client_override = client
+
+
+def get_async_semaphore() -> asyncio.Semaphore:
+    """Return the in-flight request semaphore for the running event loop."""
+    loop = asyncio.get_running_loop()
+    semaphore = _async_semaphores.get(loop)
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(MAX_CONCURRENCY)
+        _async_semaphores[loop] = semaphore
+    return semaphore
+
+
+def is_retryable(error: Exception) -> bool:
+    """True for rate limits, overload, transient server errors and connection failures."""
+    if isinstance(error, APIConnectionError):
+        return True
+    return isinstance(error, APIStatusError) and error.status_code in RETRY_STATUS_CODES
+
+
+def backoff_delay(attempt: int, error: Exception = None) -> float:
+    """
+    Seconds to wait before retry number `attempt` (0-based).
+
+    Uses the server's retry-after header when present, otherwise exponential
+    backoff with full jitter.
+    """
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    try:
+        retry_after = float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        retry_after = None
+    if retry_after is not None:
+        return min(retry_after, BACKOFF_MAX_SECONDS)
+    return random.uniform(0, min(BACKOFF_MAX_SECONDS, BACKOFF_BASE_SECONDS * 2 ** attempt))
+
+
+def _cache_key(use_cache: bool, kwargs: dict):
+    return llm_cache.cache_key(kwargs) if llm_cache.is_enabled(use_cache) else None
+
+
+def _cache_hit(name: str, estimated_input_tokens: int, kwargs: dict, cached):
+    record_call(name, kwargs.get("model"), usage_from_response(cached), 0.0,
+                estimated_input_tokens, response_cached=True)
+    return cached
+
+
+def _cache_store(key: str, name: str, kwargs: dict, text: str, stop_reason: str = None, usage: dict = None) -> None:
+    # A cache write failure must never fail the call that produced the response
+    try:
+        llm_cache.put(key, name, kwargs.get("model"), text, stop_reason, usage)
+    except Exception as e:
+        print(f"{name}: response cache write failed: {e}")
+
+
+def call_llm(name: str, estimated_input_tokens: int = None, max_retries: int = None,
+             use_cache: bool = None, **kwargs):
+    """
+    Send a messages.create request through the shared limits.
+
+    Args:
+        name: Call name for usage accounting (e.g. "generate_hooks")
+        estimated_input_tokens: Prompt size, charged against the tokens-per-minute bucket
+        max_retries: Override LLM_MAX_RETRIES for this call
+        use_cache: True/False to force or bypass the response cache; None follows LLM_CACHE_ENABLED
+        **kwargs: Passed to client.messages.create
+
+    Returns:
+        The API response (or a llm_cache.CachedResponse on a cache hit)
+
+    Raises:
+        The last API error once retries are exhausted, or immediately for
+        non-retryable errors (bad request, auth, ...)
+    """
+    key = _cache_key(use_cache, kwargs)
+    if key:
+        cached = llm_cache.get(key)
+        if cached is not None:
+            return _cache_hit(name, estimated_input_tokens, kwargs, cached)
+
+    retries = MAX_RETRIES if max_retries is None else max_retries
+    for attempt in range(retries + 1):
+        _request_bucket.acquire(1)
+        _token_bucket.acquire(estimated_input_tokens or 0)
+        try:
+            with _semaphore:
+                response = create_message(get_client(), name, estimated_input_tokens, **kwargs)
+            break
+        except Exception as e:
+            if attempt >= retries or not is_retryable(e):
+                raise
+            delay = backoff_delay(attempt, e)
+            print(f"{name}: {type(e).__name__}, retrying in {delay:.1f}s ({attempt + 1}/{retries})")
+            time.sleep(delay)
+
+    if key:
+        _cache_store(key, name, kwargs, llm_cache.response_text(response),
+                     getattr(response, "stop_reason", None), usage_from_response(response))
+    return response
+
+
+async def call_llm_async(name: str, estimated_input_tokens: int = None, max_retries: int = None,
+                         use_cache: bool = None, **kwargs):
+    """
+    Async twin of call_llm().
+
+    Callers can fan out freely with asyncio.gather: the shared semaphore
+    keeps at most LLM_MAX_CONCURRENCY requests in flight on this loop.
+    """
+    key = _cache_key(use_cache, kwargs)
+    if key:
+        cached = await asyncio.to_thread(llm_cache.get, key)
+        if cached is not None:
+            return _cache_hit(name, estimated_input_tokens, kwargs, cached)
+
+    retries = MAX_RETRIES if max_retries is None else max_retries
+    for attempt in range(retries + 1):
+        await _request_bucket.acquire_async(1)
+        await _token_bucket.acquire_async(estimated_input_tokens or 0)
+        try:
+            async with get_async_semaphore():
+                response = await acreate_message(get_async_client(), name, estimated_input_tokens, **kwargs)
+            break
+        except Exception as e:
+            if attempt >= retries or not is_retryable(e):
+                raise
+            delay = backoff_delay(attempt, e)
+            print(f"{name}: {type(e).__name__}, retrying in {delay:.1f}s ({attempt + 1}/{retries})")
+            await asyncio.sleep(delay)
+
+    if key:
+        await asyncio.to_thread(_cache_store, key, name, kwargs, llm_cache.response_text(response),
+                                getattr(response, "stop_reason", None), usage_from_response(response))
+    return response
+
+
+async def stream_llm_async(name: str, estimated_input_tokens: int = None, max_retries: int = None,
+                           use_cache: bool = None, **kwargs):
+    """
+    Stream a response through the shared limits, yielding text deltas.
+
+    The concurrency slot is held for the whole stream. Retryable errors are
+    retried only before any text has been yielded; a stream that fails
+    partway through raises to the caller. A cache hit is yielded as one chunk.
+    """
+    key = _cache_key(use_cache, kwargs)
+    if key:
+        cached = await asyncio.to_thread(llm_cache.get, key)
+        if cached is not None:
+            _cache_hit(name, estimated_input_tokens, kwargs, cached)
+            yield llm_cache.response_text(cached)
+            return
+
+    retries = MAX_RETRIES if max_retries is None else max_retries
+    chunks = []
+    for attempt in range(retries + 1):
+        await _request_bucket.acquire_async(1)
+        await _token_bucket.acquire_async(estimated_input_tokens or 0)
+        started_output = False
+        try:
+            async with get_async_semaphore():
+                async for text in astream_message(get_async_client(), name, estimated_input_tokens, **kwargs):
+                    started_output = True
+                    chunks.append(text)
+                    yield text
+            break
+        except Exception as e:
+            if started_output or attempt >= retries or not is_retryable(e):
+                raise
+            delay = backoff_delay(attempt, e)
+            print(f"{name}: {type(e).__name__}, retrying in {delay:.1f}s ({attempt + 1}/{retries})")
+            await asyncio.sleep(delay)
+
+    if key:
+        await asyncio.to_thread(_cache_store, key, name, kwargs, "".join(chunks))
+
+
+def get_limits() -> dict:
+    """Current limiter configuration and state (for diagnostics)."""
+    return {
+        "max_concurrency": MAX_CONCURRENCY,
+        "requests_per_minute": REQUESTS_PER_MINUTE,
+        "tokens_per_minute": TOKENS_PER_MINUTE,
+        "max_retries": MAX_RETRIES,
+        "request_tokens_available": round(_request_bucket.tokens, 1),
+        "input_tokens_available": round(_token_bucket.tokens, 1),
+    }
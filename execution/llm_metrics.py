@@ -0,0 +1,229 @@
+"""
+LLM usage accounting - records token counts and latency for every Claude call.
+
+Each call is recorded under a name (e.g. "generate_hooks") with the estimated
+prompt tokens, the input/output tokens reported by the API, prompt cache
+reads/writes, and wall-clock latency. Totals and recent calls are exposed for
+cost and latency tracking.
+"""
+import threading
+import time
+from collections import deque
+from datetime import datetime
+
+# USD per million tokens: (input, output)
+MODEL_PRICING = {
+    "claude-sonnet-4-20250514": (3.0, 15.0),
+}
+
+# Prompt cache pricing relative to the base input price
+CACHE_WRITE_MULTIPLIER = 1.25
+CACHE_READ_MULTIPLIER = 0.1
+
+MAX_RECENT_CALLS = 500
+
+_lock = threading.Lock()
+_recent: deque = deque(maxlen=MAX_RECENT_CALLS)
+_totals: dict[str, dict] = {}
+
+
+def _as_int(value) -> int:
+    return value if isinstance(value, int) else 0
+
+
+def usage_from_response(response) -> dict:
+    """Extract token usage from an Anthropic response (0 for anything missing)."""
+    usage = getattr(response, "usage", None)
+    return {
+        "input_tokens": _as_int(getattr(usage, "input_tokens", 0)),
+        "output_tokens": _as_int(getattr(usage, "output_tokens", 0)),
+        "cache_creation_input_tokens": _as_int(getattr(usage, "cache_creation_input_tokens", 0)),
+        "cache_read_input_tokens": _as_int(getattr(usage, "cache_read_input_tokens", 0)),
+    }
+
+
+def estimate_cost(
+    model: str,
+    input_tokens: int,
+    output_tokens: int,
+    cache_creation_input_tokens: int = 0,
+    cache_read_input_tokens: int = 0,
+) -> float:
+    """Estimated USD cost of a call, or 0.0 for unknown models."""
+    input_price, output_price = MODEL_PRICING.get(model, (0.0, 0.0))
+    return (
+        input_tokens * input_price
+        + cache_creation_input_tokens * input_price * CACHE_WRITE_MULTIPLIER
+        + cache_read_input_tokens * input_price * CACHE_READ_MULTIPLIER
+        + output_tokens * output_price
+    ) / 1_000_000
+
+
+def record_call(
+    name: str,
+    model: str,
+    usage: dict,
+    latency_ms: float,
+    estimated_input_tokens: int = None,
+    error: str = None,
+    first_token_ms: float = None,
+    response_cached: bool = False,
+) -> dict:
+    """
+    Record a single LLM call and fold it into the per-name totals.
+
+    response_cached marks a call answered from the local response cache
+    (llm_cache) without reaching the API.
+    """
+    input_tokens = usage.get("input_tokens", 0)
+    output_tokens = usage.get("output_tokens", 0)
+    cache_write = usage.get("cache_creation_input_tokens", 0)
+    cache_read = usage.get("cache_read_input_tokens", 0)
+    entry = {
+        "name": name,
+        "model": model,
+        "input_tokens": input_tokens,
+        "output_tokens": output_tokens,
+        "cache_creation_input_tokens": cache_write,
+        "cache_read_input_tokens": cache_read,
+        "cache_hit": cache_read > 0,
+        "response_cached": response_cached,
+        "estimated_input_tokens": estimated_input_tokens,
+        "latency_ms": round(latency_ms, 1),
+        "first_token_ms": round(first_token_ms, 1) if first_token_ms is not None else None,
+        "cost_usd": estimate_cost(model, input_tokens, output_tokens, cache_write, cache_read),
+        "error": error,
+        "timestamp": datetime.now().isoformat(),
+    }
+
+    with _lock:
+        _recent.append(entry)
+        totals = _totals.setdefault(name, {
+            "calls": 0,
+            "errors": 0,
+            "input_tokens": 0,
+            "output_tokens": 0,
+            "cache_creation_input_tokens": 0,
+            "cache_read_input_tokens": 0,
+            "cache_hits": 0,
+            "response_cache_hits": 0,
+            "estimated_input_tokens": 0,
+            "latency_ms": 0.0,
+            "cost_usd": 0.0,
+        })
+        totals["calls"] += 1
+        totals["errors"] += 1 if error else 0
+        totals["input_tokens"] += entry["input_tokens"]
+        totals["output_tokens"] += entry["output_tokens"]
+        totals["cache_creation_input_tokens"] += cache_write
+        totals["cache_read_input_tokens"] += cache_read
+        totals["cache_hits"] += 1 if cache_read else 0
+        totals["response_cache_hits"] += 1 if response_cached else 0
+        totals["estimated_input_tokens"] += estimated_input_tokens or 0
+        totals["latency_ms"] += latency_ms
+        totals["cost_usd"] += entry["cost_usd"]
+
+    return entry
+
+
+def create_message(client, name: str, estimated_input_tokens: int = None, **kwargs):
+    """
+    Call client.messages.create(**kwargs) and record usage and latency.
+
+    Failed calls are recorded with their error and re-raised.
+    """
+    started = time.perf_counter()
+    try:
+        response = client.messages.create(**kwargs)
+    except Exception as e:
+        record_call(name, kwargs.get("model", ""), {}, (time.perf_counter() - started) * 1000,
+                    estimated_input_tokens, error=str(e))
+        raise
+    record_call(name, kwargs.get("model", ""), usage_from_response(response),
+                (time.perf_counter() - started) * 1000, estimated_input_tokens)
+    return response
+
+
+async def acreate_message(client, name: str, estimated_input_tokens: int = None, **kwargs):
+    """Async twin of create_message for AsyncAnthropic clients."""
+    started = time.perf_counter()
+    try:
+        response = await client.messages.create(**kwargs)
+    except Exception as e:
+        record_call(name, kwargs.get("model", ""), {}, (time.perf_counter() - started) * 1000,
+                    estimated_input_tokens, error=str(e))
+        raise
+    record_call(name, kwargs.get("model", ""), usage_from_response(response),
+                (time.perf_counter() - started) * 1000, estimated_input_tokens)
+    return response
+
+
+async def astream_message(client, name: str, estimated_input_tokens: int = None, **kwargs):
+    """
+    Stream a message with client.messages.create(stream=True), yielding text deltas.
+
+    Usage (from the message_start/message_delta events), total latency and
+    time to first token are recorded when the stream finishes or fails.
+    """
+    model = kwargs.get("model", "")
+    started = time.perf_counter()
+    first_token_ms = None
+    usage = {}
+    error = None
+    try:
+        stream = await client.messages.create(stream=True, **kwargs)
+        async for event in stream:
+            event_type = getattr(event, "type", None)
+            if event_type == "message_start":
+                usage.update(usage_from_response(event.message))
+            elif event_type == "content_block_delta" and getattr(event.delta, "type", None) == "text_delta":
+                if first_token_ms is None:
+                    first_token_ms = (time.perf_counter() - started) * 1000
+                yield event.delta.text
+            elif event_type == "message_delta":
+                output_tokens = getattr(getattr(event, "usage", None), "output_tokens", None)
+                if isinstance(output_tokens, int):
+                    usage["output_tokens"] = output_tokens
+    except Exception as e:
+        error = str(e)
+        raise
+    finally:
+        record_call(name, model, usage, (time.perf_counter() - started) * 1000,
+                    estimated_input_tokens, error=error, first_token_ms=first_token_ms)
+
+
+def get_usage_summary() -> dict:
+    """Per-name totals with average latency, plus an overall total."""
+    with _lock:
+        by_name = {}
+        for name, totals in _totals.items():
+            summary = dict(totals)
+            summary["cache_hit_rate"] = round(totals["cache_hits"] / totals["calls"], 3) if totals["calls"] else 0
+            summary["avg_latency_ms"] = round(totals["latency_ms"] / totals["calls"], 1) if totals["calls"] else 0
+            summary["latency_ms"] = round(totals["latency_ms"], 1)
+            by_name[name] = summary
+
+    overall = {
+        "calls": sum(s["calls"] for s in by_name.values()),
+        "input_tokens": sum(s["input_tokens"] for s in by_name.values()),
+        "output_tokens": sum(s["output_tokens"] for s in by_name.values()),
+        "cache_creation_input_tokens": sum(s["cache_creation_input_tokens"] for s in by_name.values()),
+        "cache_read_input_tokens": sum(s["cache_read_input_tokens"] for s in by_name.values()),
+        "cache_hits": sum(s["cache_hits"] for s in by_name.values()),
+        "response_cache_hits": sum(s["response_cache_hits"] for s in by_name.values()),
+        "cost_usd": round(sum(s["cost_usd"] for s in by_name.values()), 6),
+    }
+    return {"total": overall, "by_name": by_name}
+
+
+def get_recent_calls(limit: int = 50) -> list[dict]:
+    """Most recent calls, newest first."""
+    with _lock:
+        return list(_recent)[-limit:][::-1]
+
+
+def reset_metrics() -> None:
+    """Clear all recorded calls (used by tests)."""
+    with _lock:
+        _recent.clear()
+        _totals.clear()
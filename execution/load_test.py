@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Load test for the production web server.
+
+Starts `workflow.py serve` once per worker count, drives it with concurrent
+keep-alive clients for a fixed time, then stops it with SIGTERM (the same
+graceful shutdown a deploy uses) and prints throughput and latency.
+
+Usage:
+    python load_test.py                            # 1, 2 and 4 workers
+    python load_test.py --workers 1,8 --clients 64 --duration 20
+    python load_test.py --url http://localhost:5000   # an already running server
+"""
+
+import argparse
+import os
+import signal
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+import requests
+
+EXECUTION_DIR = Path(__file__).parent
+DEFAULT_PATHS = ["/", "/drafts", "/hooks-bank", "/api/drafts?limit=20"]
+
+
+def wait_until_up(url: str, timeout: float = 60) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            requests.get(url, timeout=2)
+            return
+        except requests.ConnectionError:
+            time.sleep(0.25)
+    raise RuntimeError(f"Server at {url} did not start within {timeout:.0f}s")
+
+
+def run_load(base_url: str, paths: list[str], clients: int, duration: float) -> dict:
+    """Each client thread loops over paths on its own keep-alive session until time is up."""
+    latencies, errors = [], [0]
+    lock = threading.Lock()
+    stop_at = time.monotonic() + duration
+
+    def client(offset: int):
+        session = requests.Session()
+        mine, failed, i = [], 0, offset
+        while time.monotonic() < stop_at:
+            started = time.perf_counter()
+            try:
+                ok = session.get(base_url + paths[i % len(paths)], timeout=30).status_code < 500
+            except requests.RequestException:
+                ok = False
+            mine.append((time.perf_counter() - started) * 1000)
+            failed += not ok
+            i += 1
+        with lock:
+            latencies.extend(mine)
+            errors[0] += failed
+
+    threads = [threading.Thread(target=client, args=(n,)) for n in range(clients)]
+    started = time.monotonic()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.monotonic() - started
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": errors[0],
+        "rps": len(latencies) / elapsed,
+        "p50_ms": statistics.median(latencies) if latencies else 0,
+        "p95_ms": latencies[int(len(latencies) * 0.95)] if latencies else 0,
+    }
+
+
+def serve(workers: int, port: int) -> subprocess.Popen:
+    env = dict(os.environ, JOB_WORKERS="0")
+    return subprocess.Popen(
+        [sys.executable, str(EXECUTION_DIR / "workflow.py"), "serve",
+         "--workers", str(workers), "--port", str(port), "--host", "127.0.0.1", "--no-access-log",
+         "--log-level", "warning"],
+        env=env,
+    )
+
+
+def print_row(label: str, result: dict):
+    print(f"{label:<12} {result['requests']:>9} {result['errors']:>7} {result['rps']:>9.1f} "
+          f"{result['p50_ms']:>9.1f} {result['p95_ms']:>9.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure web UI throughput across worker counts")
+    parser.add_argument("--workers", default="1,2,4", help="Comma-separated worker counts to compare")
+    parser.add_argument("--clients", type=int, default=32, help="Concurrent client connections")
+    parser.add_argument("--duration", type=float, default=10, help="Seconds of load per run")
+    parser.add_argument("--port", type=int, default=5055, help="Port for the servers started here")
+    parser.add_argument("--path", action="append", dest="paths",
+                        help=f"Path to request (repeatable, default: {' '.join(DEFAULT_PATHS)})")
+    parser.add_argument("--url", help="Test an already running server instead of starting one")
+    args = parser.parse_args()
+    paths = args.paths or DEFAULT_PATHS
+
+    print(f"{args.clients} clients, {args.duration:.0f}s per run, paths: {' '.join(paths)}\n")
+    print(f"{'workers':<12} {'requests':>9} {'errors':>7} {'req/s':>9} {'p50 ms':>9} {'p95 ms':>9}")
+
+    if args.url:
+        wait_until_up(args.url)
+        print_row("external", run_load(args.url.rstrip("/"), paths, args.clients, args.duration))
+        return
+
+    base_url = f"http://127.0.0.1:{args.port}"
+    for workers in (int(w) for w in args.workers.split(",")):
+        server = serve(workers, args.port)
+        try:
+            wait_until_up(base_url)
+            run_load(base_url, paths, args.clients, min(2.0, args.duration))  # warm-up
+            print_row(str(workers), run_load(base_url, paths, args.clients, args.duration))
+        finally:
+            server.send_signal(signal.SIGTERM)
+            server.wait(timeout=60)
+
+
+if __name__ == "__main__":
+    main()
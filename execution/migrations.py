@@ -0,0 +1,161 @@
+"""
+Versioned schema migrations.
+
+Each migration has an increasing version number and an upgrade function.
+Applied versions are recorded in the schema_version table, so startup only
+needs one query to know whether the database is current.
+
+To change the schema, append a Migration to MIGRATIONS - never edit or
+reorder one that has shipped. Upgrades must be safe on databases that
+already have the change (tables predating this framework were created by
+create_tables()).
+
+Usage:
+    python workflow.py migrate            # apply pending migrations
+    python workflow.py migrate --status   # show applied/pending
+
+Configuration (env vars):
+    DB_AUTO_MIGRATE - "0" makes startup fail on a stale schema instead of
+                      migrating it (default on)
+"""
+import os
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Optional
+
+from sqlalchemy import inspect, text
+
+from search import create_search_index
+from database import (
+    SessionLocal, SchemaVersion, engine,
+    add_version_columns, create_tables, create_keyset_indexes,
+    migrate_draft_images, migrate_draft_timestamps, migrate_json_to_db, migrate_usage_counts,
+)
+
+AUTO_MIGRATE = os.getenv("DB_AUTO_MIGRATE", "1").lower() not in ("0", "false", "no")
+
+# Arbitrary key for pg_advisory_lock, so concurrent workers migrate one at a time
+_PG_LOCK_KEY = 72_450_001
+
+
+@dataclass
+class Migration:
+    version: int
+    name: str
+    upgrade: Callable[[], None]
+
+
+# =============================================================================
+# MIGRATIONS
+# =============================================================================
+
+def _initial_schema():
+    create_tables()
+
+
+def _seed_banks():
+    from draft_storage import seed_insights_if_empty, seed_social_proof_if_empty
+    seed_insights_if_empty()
+    seed_social_proof_if_empty()
+
+
+MIGRATIONS: list[Migration] = [
+    Migration(1, "initial_schema", _initial_schema),
+    Migration(2, "draft_timestamp_columns", migrate_draft_timestamps),
+    Migration(3, "import_json_data", migrate_json_to_db),
+    Migration(4, "seed_insights_and_social_proof", _seed_banks),
+    Migration(5, "keyset_pagination_indexes", create_keyset_indexes),
+    Migration(6, "optimistic_lock_versions", add_version_columns),
+    Migration(7, "usage_count_sort_indexes", migrate_usage_counts),
+    Migration(8, "full_text_search", create_search_index),
+    Migration(9, "draft_images_table", migrate_draft_images),
+]
+
+LATEST_VERSION = MIGRATIONS[-1].version
+
+
+# =============================================================================
+# RUNNER
+# =============================================================================
+
+def current_version() -> int:
+    """Highest applied migration version (0 for a fresh database)."""
+    try:
+        with engine.connect() as conn:
+            return conn.execute(text("SELECT MAX(version) FROM schema_version")).scalar() or 0
+    except Exception:
+        # schema_version doesn't exist yet
+        return 0
+
+
+def pending_migrations() -> list[Migration]:
+    version = current_version()
+    return [m for m in MIGRATIONS if m.version > version]
+
+
+def migrate(target: Optional[int] = None) -> list[Migration]:
+    """
+    Apply pending migrations in order, up to target (default: latest).
+
+    Returns:
+        The migrations that were applied
+    """
+    lock_conn = engine.connect() if engine.dialect.name == "postgresql" else None
+    try:
+        if lock_conn is not None:
+            lock_conn.execute(text("SELECT pg_advisory_lock(:key)"), {"key": _PG_LOCK_KEY})
+
+        # Read the version after taking the lock: another worker may have just migrated
+        SchemaVersion.__table__.create(bind=engine, checkfirst=True)
+        applied = []
+        for migration in pending_migrations():
+            if target is not None and migration.version > target:
+                break
+            migration.upgrade()
+            with SessionLocal() as db:
+                db.add(SchemaVersion(
+                    version=migration.version,
+                    name=migration.name,
+                    applied_at=datetime.now().isoformat(),
+                ))
+                db.commit()
+            applied.append(migration)
+        return applied
+    finally:
+        if lock_conn is not None:
+            lock_conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": _PG_LOCK_KEY})
+            lock_conn.close()
+
+
+def migration_status() -> list[dict]:
+    """Every known migration with its applied timestamp (None if pending)."""
+    applied = {}
+    if inspect(engine).has_table("schema_version"):
+        with SessionLocal() as db:
+            applied = {row.version: row.applied_at for row in db.query(SchemaVersion).all()}
+    return [
+        {"version": m.version, "name": m.name, "applied_at": applied.get(m.version)}
+        for m in MIGRATIONS
+    ]
+
+
+def ensure_schema() -> int:
+    """
+    Startup check: one version query when the schema is current.
+
+    Migrates a stale database unless DB_AUTO_MIGRATE=0, in which case it
+    raises so deployments run `workflow.py migrate` explicitly.
+
+    Returns:
+        The schema version in use
+    """
+    version = current_version()
+    if version >= LATEST_VERSION:
+        return version
+    if not AUTO_MIGRATE:
+        raise RuntimeError(
+            f"Database schema is at version {version}, expected {LATEST_VERSION}. "
+            f"Run `python execution/workflow.py migrate`."
+        )
+    migrate()
+    return LATEST_VERSION
@@ -0,0 +1,113 @@
+"""
+Keyset (cursor) pagination on (created_at, id).
+
+List functions take an opaque cursor - the position of the last row of the
+previous page - and return rows strictly after it in (created_at DESC,
+id DESC) order. Unlike OFFSET, each page is an index range scan, so page
+latency stays flat however large the table gets.
+
+A rank column (e.g. used_count for "most used") can lead the sort key; the
+cursor then carries three values instead of two.
+"""
+import base64
+import json
+from typing import Awaitable, Callable, Optional
+
+from sqlalchemy import DateTime, tuple_
+
+from database import parse_timestamp
+
+PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+def encode_cursor(*key) -> str:
+    """Opaque cursor for the row at sort key ([rank,] created_at, id)."""
+    key = [v.isoformat() if hasattr(v, "isoformat") else v for v in key]
+    raw = json.dumps(key, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int = 2) -> tuple:
+    """
+    Inverse of encode_cursor().
+
+    Args:
+        size: Expected key length (2, or 3 with a rank column)
+
+    Raises:
+        ValueError: If the cursor is malformed or has the wrong length
+    """
+    try:
+        key = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except Exception:
+        raise ValueError(f"Invalid cursor: {cursor!r}")
+    if not isinstance(key, list) or len(key) != size or not all(isinstance(v, str) for v in key[-2:]):
+        raise ValueError(f"Invalid cursor: {cursor!r}")
+    return tuple(key)
+
+
+def clamp_limit(limit: Optional[int]) -> int:
+    """Page size bounded to 1..MAX_PAGE_SIZE (default PAGE_SIZE)."""
+    if not limit:
+        return PAGE_SIZE
+    return max(1, min(int(limit), MAX_PAGE_SIZE))
+
+
+def apply_keyset(query, created_col, id_col, cursor: str = None, limit: int = None, rank_col=None):
+    """
+    Order a query newest first and restrict it to the page after cursor.
+
+    Args:
+        query: SQLAlchemy query over the model
+        created_col: Timestamp column (String ISO or DateTime)
+        id_col: Primary key column, the tie-breaker
+        cursor: Position of the last row already shown (None for the first page)
+        limit: Rows to return (None for no limit)
+        rank_col: Optional non-null column sorted on ahead of created_col
+    """
+    columns = [created_col, id_col] if rank_col is None else [rank_col, created_col, id_col]
+    query = query.order_by(*(c.desc() for c in columns))
+    if cursor:
+        key = list(decode_cursor(cursor, size=len(columns)))
+        if isinstance(created_col.type, DateTime):
+            key[-2] = parse_timestamp(key[-2])
+        query = query.filter(tuple_(*columns) < tuple_(*key))
+    if limit:
+        query = query.limit(limit)
+    return query
+
+
+def fetch_page(fetch: Callable[..., list], cursor: str = None, limit: int = None,
+               created_key: str = "created_at", rank_key: str = None, **filters) -> dict:
+    """
+    Fetch one page from a cursor-aware list function.
+
+    One extra row is requested to tell whether another page exists, so
+    next_cursor is None exactly when this is the last page. rank_key names
+    the item field behind the fetch's rank_col, if it sorts by one.
+
+    Returns:
+        {"items": [...], "next_cursor": str | None}
+    """
+    limit = clamp_limit(limit)
+    rows = fetch(cursor=cursor, limit=limit + 1, **filters)
+    return _page(rows, limit, created_key, rank_key)
+
+
+async def fetch_page_async(fetch: Callable[..., Awaitable[list]], cursor: str = None, limit: int = None,
+                           created_key: str = "created_at", rank_key: str = None, **filters) -> dict:
+    """fetch_page() for an async list function (draft_storage_async)."""
+    limit = clamp_limit(limit)
+    rows = await fetch(cursor=cursor, limit=limit + 1, **filters)
+    return _page(rows, limit, created_key, rank_key)
+
+
+def _page(rows: list, limit: int, created_key: str, rank_key: Optional[str]) -> dict:
+    items = rows[:limit]
+    next_cursor = None
+    if len(rows) > limit:
+        last = items[-1]
+        key = [last[created_key], last["id"]]
+        next_cursor = encode_cursor(*([last[rank_key]] + key if rank_key else key))
+    return {"items": items, "next_cursor": next_cursor}
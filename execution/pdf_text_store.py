@@ -0,0 +1,149 @@
+"""
+PDF text store - extracts knowledge base PDFs once into content-hashed text artifacts.
+
+Each PDF is hashed (SHA-256) and its text written to knowledge_bases/.extracted/
+as <hash>.txt, with a <hash>.json sidecar recording the source file and per-page
+character offsets. Later loads reuse the artifact while the PDF hash is unchanged,
+so pypdf only runs when a PDF is added or edited.
+"""
+import hashlib
+import json
+import os
+import tempfile
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Iterator, Optional, TextIO
+
+KNOWLEDGE_BASE_PATH = Path(__file__).parent.parent / "knowledge_bases"
+STORE_PATH = KNOWLEDGE_BASE_PATH / ".extracted"
+
+
+def hash_file(path: Path, chunk_size: int = 1024 * 1024) -> str:
+    """Return the SHA-256 hex digest of a file, read in chunks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def iter_pdf_pages(pdf_path: Path) -> Iterator[str]:
+    """Yield the extracted text of each page of a PDF."""
+    from pypdf import PdfReader
+    reader = PdfReader(str(pdf_path))
+    for page in reader.pages:
+        yield page.extract_text() or ""
+
+
+def _artifact_paths(sha256: str, store_dir: Path) -> tuple[Path, Path]:
+    return store_dir / f"{sha256}.txt", store_dir / f"{sha256}.json"
+
+
+@contextmanager
+def _atomic_open(path: Path) -> Iterator[TextIO]:
+    """
+    Open a temp file next to path for writing; it replaces path only once the
+    block completes, so readers (and a crash mid-write) never see a partial file.
+    """
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8", newline="") as out:
+            yield out
+        os.replace(tmp_name, path)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+
+
+def _load_meta(meta_path: Path) -> Optional[dict]:
+    try:
+        return json.loads(meta_path.read_text(encoding="utf-8"))
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+
+def extract_pdf(pdf_path: Path, store_dir: Path = STORE_PATH, force: bool = False) -> dict:
+    """
+    Extract a PDF into the text store, reusing an existing artifact when the hash matches.
+
+    Pages are streamed straight to disk, so memory use doesn't grow with the PDF.
+
+    Args:
+        pdf_path: Path to the PDF
+        store_dir: Directory holding extracted artifacts
+        force: Re-extract even if an artifact for this hash exists
+
+    Returns:
+        Artifact metadata dict with source, sha256, text_path, pages (list of
+        [start, end] character offsets), page_count, extracted_at and reused
+    """
+    pdf_path = Path(pdf_path)
+    store_dir = Path(store_dir)
+    sha256 = hash_file(pdf_path)
+    text_path, meta_path = _artifact_paths(sha256, store_dir)
+
+    meta = _load_meta(meta_path)
+    if meta and text_path.exists() and not force:
+        meta["reused"] = True
+        return meta
+
+    store_dir.mkdir(parents=True, exist_ok=True)
+    pages = []
+    offset = 0
+    with _atomic_open(text_path) as out:
+        for page_text in iter_pdf_pages(pdf_path):
+            chunk = page_text + "\n"
+            out.write(chunk)
+            pages.append([offset, offset + len(page_text)])
+            offset += len(chunk)
+
+    meta = {
+        "source": str(pdf_path),
+        "sha256": sha256,
+        "text_path": str(text_path),
+        "pages": pages,
+        "page_count": len(pages),
+        "extracted_at": datetime.now().isoformat(),
+    }
+    # The meta file is what marks an artifact complete, so it is written last
+    with _atomic_open(meta_path) as out:
+        json.dump(meta, out, indent=2)
+    meta["reused"] = False
+    return meta
+
+
+def read_artifact_text(meta: dict) -> str:
+    """Return the full extracted text for an artifact."""
+    return Path(meta["text_path"]).read_text(encoding="utf-8")
+
+
+def read_artifact_page(meta: dict, page_number: int) -> str:
+    """Return the text of a single page (0-based) using the stored offsets."""
+    start, end = meta["pages"][page_number]
+    with open(meta["text_path"], "r", encoding="utf-8", newline="") as f:
+        f.read(start)
+        return f.read(end - start)
+
+
+def get_pdf_text(pdf_path: Path, store_dir: Path = STORE_PATH) -> str:
+    """Return a PDF's text, extracting it into the store on first use."""
+    return read_artifact_text(extract_pdf(pdf_path, store_dir))
+
+
+def extract_client_pdfs(client_name: str, store_dir: Path = STORE_PATH, force: bool = False) -> list[dict]:
+    """Extract every PDF under knowledge_bases/<client>/ into the store."""
+    client_path = KNOWLEDGE_BASE_PATH / client_name
+    return [
+        extract_pdf(pdf, store_dir, force=force)
+        for pdf in sorted(client_path.rglob("*.pdf"))
+    ]
+
+
+if __name__ == "__main__":
+    import sys
+
+    client = sys.argv[1] if len(sys.argv) > 1 else "Smiths"
+    for artifact in extract_client_pdfs(client):
+        status = "reused" if artifact["reused"] else "extracted"
+        print(f"{status}: {Path(artifact['source']).name} ({artifact['page_count']} pages) -> {artifact['sha256'][:12]}")
@@ -0,0 +1,179 @@
+"""
+Prompt assembly - packs prompt sections into a token budget by priority.
+
+Uses a local approximate tokenizer (no network) so generators can size prompts
+by estimated tokens rather than raw characters. Sections are kept whole when
+they fit, truncated at a line/sentence boundary when they don't, and dropped
+last-priority-first when the budget is exhausted.
+
+Invariant prefixes (system prompt + static knowledge base) are sent as
+content blocks marked for Anthropic prompt caching, so fan-out calls that
+share a prefix only pay for it once per cache lifetime.
+"""
+import math
+import os
+import re
+from dataclasses import dataclass, field
+
+DEFAULT_TOKEN_BUDGET = int(os.getenv("PROMPT_TOKEN_BUDGET", "8000"))
+
+# Words, numbers, and individual punctuation marks
+_TOKEN_RE = re.compile(r"\w+|[^\w\s]|\n")
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Approximate the number of Claude tokens in a piece of text.
+
+    Short words and punctuation count as one token each; longer words are
+    split roughly every 6 characters, matching BPE behaviour on English text.
+    """
+    if not text:
+        return 0
+    total = 0
+    for match in _TOKEN_RE.finditer(text):
+        length = match.end() - match.start()
+        total += 1 if length <= 6 else math.ceil(length / 6)
+    return total
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """
+    Truncate text to at most max_tokens, preferring a line or sentence boundary.
+
+    Returns the text unchanged if it already fits.
+    """
+    if max_tokens <= 0:
+        return ""
+    total = 0
+    cut = None
+    for match in _TOKEN_RE.finditer(text):
+        length = match.end() - match.start()
+        total += 1 if length <= 6 else math.ceil(length / 6)
+        if total > max_tokens:
+            cut = match.start()
+            break
+    if cut is None:
+        return text
+
+    head = text[:cut]
+    # Back off to the last newline or sentence end if it doesn't lose too much
+    boundary = max(head.rfind("\n"), head.rfind(". "))
+    if boundary > len(head) * 0.6:
+        head = head[:boundary + 1]
+    return head.rstrip()
+
+
+@dataclass
+class PromptSection:
+    """
+    One part of a prompt.
+
+    Args:
+        name: Identifier used in the assembly report
+        text: Section body
+        priority: Higher priority sections are packed first
+        required: Required sections are never truncated or dropped
+        header: Optional heading line, omitted if the body ends up empty
+    """
+    name: str
+    text: str
+    priority: int = 0
+    required: bool = False
+    header: str = None
+
+    def render(self, text: str = None) -> str:
+        body = self.text if text is None else text
+        return f"{self.header}\n{body}" if self.header else body
+
+
+@dataclass
+class AssembledPrompt:
+    """Result of packing sections into a budget."""
+    text: str
+    tokens: int
+    budget: int
+    included: list = field(default_factory=list)
+    truncated: list = field(default_factory=list)
+    dropped: list = field(default_factory=list)
+
+
+def assemble_prompt(
+    sections: list[PromptSection],
+    budget_tokens: int = DEFAULT_TOKEN_BUDGET,
+    separator: str = "\n\n",
+) -> AssembledPrompt:
+    """
+    Pack sections into a token budget.
+
+    Sections are allocated budget in priority order (required first), then
+    rendered in their original order so the prompt still reads top to bottom.
+
+    Args:
+        sections: Prompt sections in display order
+        budget_tokens: Maximum estimated tokens for the whole prompt
+        separator: String placed between rendered sections
+
+    Returns:
+        AssembledPrompt with the final text and a report of what was cut
+    """
+    separator_tokens = estimate_tokens(separator)
+    allocation_order = sorted(
+        range(len(sections)),
+        key=lambda i: (not sections[i].required, -sections[i].priority, i),
+    )
+
+    remaining = budget_tokens
+    rendered = {}
+    truncated = []
+    dropped = []
+
+    for i in allocation_order:
+        section = sections[i]
+        if not section.text:
+            continue
+        full = section.render()
+        cost = estimate_tokens(full) + separator_tokens
+        if section.required or cost <= remaining:
+            rendered[i] = full
+            remaining -= cost
+            continue
+
+        header_cost = estimate_tokens(section.header or "") + separator_tokens + 1
+        body = truncate_to_tokens(section.text, remaining - header_cost)
+        if body:
+            rendered[i] = section.render(body)
+            remaining -= estimate_tokens(rendered[i]) + separator_tokens
+            truncated.append(section.name)
+        else:
+            dropped.append(section.name)
+
+    text = separator.join(rendered[i] for i in sorted(rendered))
+    return AssembledPrompt(
+        text=text,
+        tokens=estimate_tokens(text),
+        budget=budget_tokens,
+        included=[sections[i].name for i in sorted(rendered)],
+        truncated=truncated,
+        dropped=dropped,
+    )
+
+
+def cached_blocks(*texts: str) -> list[dict]:
+    """
+    Build text content blocks with a prompt-caching breakpoint on the last one.
+
+    Everything up to and including the marked block is cached as a prefix,
+    so pass only content that is identical across calls. Empty texts are skipped.
+    """
+    blocks = [{"type": "text", "text": text} for text in texts if text]
+    if blocks:
+        blocks[-1]["cache_control"] = {"type": "ephemeral"}
+    return blocks
+
+
+def blocks_text(content) -> str:
+    """Flatten a string or list of content blocks to plain text."""
+    if isinstance(content, str):
+        return content
+    return "\n\n".join(block.get("text", "") for block in content)
@@ -0,0 +1,191 @@
+"""
+Full-text search across drafts, hooks, ideas, insights and competitor posts.
+
+PostgreSQL: each searchable table gets a generated tsvector column
+(search_vector) with a GIN index, queried with websearch_to_tsquery and
+ranked by ts_rank_cd.
+
+SQLite (local development and tests): an external-content FTS5 table per
+source table (<table>_fts), kept in sync by triggers and ranked by bm25.
+
+Both are created by create_search_index() (schema migration 8); the search
+columns are not mapped on the ORM models.
+
+Usage:
+    from search import search
+    results = search("cold outreach", kinds=["hook", "draft"], limit=20)
+"""
+import html
+from dataclasses import dataclass
+from typing import Iterable
+
+from sqlalchemy import inspect, text
+
+from database import engine
+
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 100
+
+# Highlight markers: private-use characters that never occur in real text,
+# swapped for <mark> tags after the snippet has been HTML-escaped
+_START, _STOP = "\ue000", "\ue001"
+
+
+@dataclass
+class SearchSource:
+    table: str
+    columns: list[str]  # text columns searched, most important first
+    url: str            # link to the row, formatted with its id
+
+
+SOURCES = {
+    "draft": SearchSource("drafts", ["content"], "/edit/{id}"),
+    "hook": SearchSource("hooks", ["hook"], "/hooks-bank"),
+    "idea": SearchSource("ideas", ["idea"], "/ideas-bank"),
+    "insight": SearchSource("insights", ["title", "content"], "/insights#insight-{id}"),
+    "competitor_post": SearchSource("competitor_posts", ["post_content"], "/competitors#post-{id}"),
+}
+
+
+# =============================================================================
+# INDEX SETUP
+# =============================================================================
+
+def _pg_document(source: SearchSource) -> str:
+    # Earlier columns rank higher (title over content)
+    weights = "ABCD"
+    return " || ".join(
+        f"setweight(to_tsvector('english', coalesce({col}, '')), '{weights[i]}')"
+        for i, col in enumerate(source.columns)
+    )
+
+
+def _create_pg_index(conn, source: SearchSource):
+    conn.execute(text(
+        f"ALTER TABLE {source.table} ADD COLUMN IF NOT EXISTS search_vector tsvector "
+        f"GENERATED ALWAYS AS ({_pg_document(source)}) STORED"
+    ))
+    conn.execute(text(
+        f"CREATE INDEX IF NOT EXISTS ix_{source.table}_search_vector "
+        f"ON {source.table} USING GIN (search_vector)"
+    ))
+
+
+def _create_sqlite_index(conn, source: SearchSource):
+    fts = f"{source.table}_fts"
+    cols = ", ".join(source.columns)
+    new_values = ", ".join(f"new.{c}" for c in source.columns)
+    old_values = ", ".join(f"old.{c}" for c in source.columns)
+    conn.execute(text(
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5({cols}, "
+        f"content='{source.table}', content_rowid='rowid')"
+    ))
+    conn.execute(text(
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {source.table} BEGIN "
+        f"INSERT INTO {fts}(rowid, {cols}) VALUES (new.rowid, {new_values}); END"
+    ))
+    conn.execute(text(
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {source.table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.rowid, {old_values}); END"
+    ))
+    conn.execute(text(
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF {cols} ON {source.table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.rowid, {old_values}); "
+        f"INSERT INTO {fts}(rowid, {cols}) VALUES (new.rowid, {new_values}); END"
+    ))
+    # Index rows that existed before the triggers
+    conn.execute(text(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')"))
+
+
+def create_search_index():
+    """Create the full-text search columns/tables and indexes. Safe to run repeatedly."""
+    existing = set(inspect(engine).get_table_names())
+    create = _create_pg_index if engine.dialect.name == "postgresql" else _create_sqlite_index
+    with engine.begin() as conn:
+        for source in SOURCES.values():
+            if source.table in existing:
+                create(conn, source)
+
+
+# =============================================================================
+# QUERIES
+# =============================================================================
+
+def _pg_search(conn, query: str, kinds: list[str], limit: int):
+    branches = [
+        f"SELECT '{kind}' AS kind, id, concat_ws(' ', {', '.join(SOURCES[kind].columns)}) AS body, "
+        f"ts_rank_cd(search_vector, q) AS rank "
+        f"FROM {SOURCES[kind].table}, websearch_to_tsquery('english', :query) q "
+        f"WHERE search_vector @@ q"
+        for kind in kinds
+    ]
+    # Headlines are computed only for the rows that survive the LIMIT
+    sql = (
+        "SELECT kind, id, rank, ts_headline('english', body, websearch_to_tsquery('english', :query), :options) AS snippet "
+        f"FROM ({' UNION ALL '.join(branches)} ORDER BY rank DESC LIMIT :limit) top "
+        "ORDER BY rank DESC"
+    )
+    options = f'StartSel="{_START}", StopSel="{_STOP}", MaxWords=30, MinWords=10'
+    return conn.execute(text(sql), {"query": query, "limit": limit, "options": options}).all()
+
+
+def _fts5_query(query: str) -> str:
+    """User input as an FTS5 AND of quoted terms, so operators and punctuation can't break the syntax."""
+    terms = [t.replace('"', '""') for t in query.split()]
+    return " ".join(f'"{t}"' for t in terms if t)
+
+
+def _sqlite_search(conn, query: str, kinds: list[str], limit: int):
+    branches = [
+        f"SELECT '{kind}' AS kind, {src.table}.id AS id, -bm25({src.table}_fts) AS rank, "
+        f"snippet({src.table}_fts, -1, '{_START}', '{_STOP}', '…', 30) AS snippet "
+        f"FROM {src.table}_fts JOIN {src.table} ON {src.table}.rowid = {src.table}_fts.rowid "
+        f"WHERE {src.table}_fts MATCH :query"
+        for kind, src in ((k, SOURCES[k]) for k in kinds)
+    ]
+    sql = f"SELECT kind, id, rank, snippet FROM ({' UNION ALL '.join(branches)}) ORDER BY rank DESC LIMIT :limit"
+    return conn.execute(text(sql), {"query": _fts5_query(query), "limit": limit}).all()
+
+
+def _highlight(snippet: str) -> str:
+    """HTML-escape a snippet and turn the match markers into <mark> tags."""
+    return html.escape(snippet or "").replace(_START, "<mark>").replace(_STOP, "</mark>")
+
+
+def search(query: str, kinds: Iterable[str] = None, limit: int = DEFAULT_LIMIT) -> list[dict]:
+    """
+    Ranked full-text search.
+
+    Args:
+        query: Search terms (web-search syntax on PostgreSQL: "quoted phrases", -exclude, or)
+        kinds: Subset of SOURCES keys to search (default: all)
+        limit: Maximum results across all kinds (capped at MAX_LIMIT)
+
+    Returns:
+        Best matches first: {"kind", "id", "rank", "snippet", "url"}. The
+        snippet is HTML-escaped with matches wrapped in <mark>.
+
+    Raises:
+        ValueError: For an unknown kind
+    """
+    kinds = list(kinds) if kinds else list(SOURCES)
+    unknown = [k for k in kinds if k not in SOURCES]
+    if unknown:
+        raise ValueError(f"Unknown search kind(s): {', '.join(unknown)}")
+    if not query or not query.strip():
+        return []
+    limit = max(1, min(limit, MAX_LIMIT))
+
+    run = _pg_search if engine.dialect.name == "postgresql" else _sqlite_search
+    with engine.connect() as conn:
+        rows = run(conn, query.strip(), kinds, limit)
+    return [
+        {
+            "kind": row.kind,
+            "id": row.id,
+            "rank": round(float(row.rank), 4),
+            "snippet": _highlight(row.snippet),
+            "url": SOURCES[row.kind].url.format(id=row.id),
+        }
+        for row in rows
+    ]
@@ -0,0 +1,80 @@
+"""
+Bounded thread pool for blocking storage calls made from async routes.
+
+draft_storage / image_storage are synchronous (SQLAlchemy sessions, S3
+uploads). Called directly from an `async def` route they block the event
+loop, so one slow query stalls every other request. Routes await
+run_storage() instead, which runs the call on a dedicated pool sized to the
+database connection pool: more threads would only queue on connections,
+and LLM streaming or other to_thread work can't starve storage of threads.
+
+Configuration (env vars):
+    STORAGE_THREADS - threads for storage calls (default DB_POOL_SIZE)
+
+Usage:
+    from storage_executor import run_storage
+    drafts = await run_storage(list_drafts, status="draft")
+"""
+import asyncio
+import contextvars
+import functools
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional
+
+from database import DB_POOL_SIZE
+
+STORAGE_THREADS = int(os.getenv("STORAGE_THREADS", str(DB_POOL_SIZE)))
+
+_executor: Optional[ThreadPoolExecutor] = None
+_lock = threading.Lock()
+_stats = {"calls": 0, "active": 0, "max_active": 0}
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """The shared storage pool, created on first use (and again after shutdown)."""
+    global _executor
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=STORAGE_THREADS, thread_name_prefix="storage")
+        return _executor
+
+
+def _tracked(call: Callable):
+    with _lock:
+        _stats["calls"] += 1
+        _stats["active"] += 1
+        _stats["max_active"] = max(_stats["max_active"], _stats["active"])
+    try:
+        return call()
+    finally:
+        with _lock:
+            _stats["active"] -= 1
+
+
+async def run_storage(fn: Callable, *args, **kwargs):
+    """
+    Await fn(*args, **kwargs) run on the storage pool.
+
+    Context variables are copied into the worker thread, as with
+    asyncio.to_thread(); exceptions propagate to the awaiting route.
+    """
+    loop = asyncio.get_running_loop()
+    call = functools.partial(contextvars.copy_context().run, fn, *args, **kwargs)
+    return await loop.run_in_executor(get_executor(), _tracked, call)
+
+
+def shutdown_storage_executor(wait: bool = True):
+    """Stop the pool (app shutdown). The next run_storage() starts a new one."""
+    global _executor
+    with _lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=wait)
+
+
+def get_storage_stats() -> dict:
+    """Pool size plus call counters (for diagnostics)."""
+    with _lock:
+        return {"threads": STORAGE_THREADS, **_stats}
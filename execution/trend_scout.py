@@ -14,14 +14,19 @@ from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 
 import requests
-from anthropic import Anthropic
 from dotenv import load_dotenv
 
+from llm_gateway import call_llm
+from prompt_builder import PromptSection, assemble_prompt
+
 load_dotenv()
 
 PERPLEXITY_API_KEY = os.getenv("PERPLEXITY_API_KEY")
 PERPLEXITY_BASE_URL = "https://api.perplexity.ai"
 
+# Token budget for the ICP scoring prompt; later search results are trimmed first
+PROMPT_TOKEN_BUDGET = 10000
+
 # Pre-built ICP-relevant search queries
 SEARCH_QUERIES = [
     {
@@ -137,26 +142,27 @@ def score_and_extract_topics(search_results: list[dict]) -> list[dict]:
     Returns:
         List of scored topic dicts ready for DB insertion.
     """
-    combined_text = ""
+    source_sections = []
     for r in search_results:
-        if r.get("error"):
+        if r.get("error") or not r.get("content", "").strip():
             continue
-        combined_text += f"\n\n--- Source: {r['platform']} (Query: {r['query']}) ---\n"
-        combined_text += r["content"]
+        body = r["content"]
         if r.get("citations"):
-            combined_text += "\nURLs: " + ", ".join(r["citations"])
-
-    if not combined_text.strip():
+            body += "\nURLs: " + ", ".join(r["citations"])
+        source_sections.append(PromptSection(
+            f"source_{len(source_sections)}",
+            body,
+            header=f"--- Source: {r['platform']} (Query: {r['query']}) ---",
+        ))
+
+    if not source_sections:
         return []
 
-    client = Anthropic()
-
-    prompt = f"""Analyze these search results and extract distinct trending topics relevant to our ICP: B2B founders, coaches, and consultants who sell high-ticket services ($5k-$50k+).
+    intro = PromptSection("task", """Analyze these search results and extract distinct trending topics relevant to our ICP: B2B founders, coaches, and consultants who sell high-ticket services ($5k-$50k+).
 
-SEARCH RESULTS:
-{combined_text}
+SEARCH RESULTS:""", required=True)
 
-For each unique topic, provide:
+    instructions = PromptSection("instructions", """For each unique topic, provide:
 1. topic: A concise topic title (max 10 words)
 2. summary: 2-3 sentence summary of why this is trending
 3. source_urls: Any relevant URLs from the citations
@@ -171,14 +177,18 @@ Rules:
 - Prefer specific, timely topics over generic evergreen advice
 
 Return as JSON array:
-[{{"topic": "...", "summary": "...", "source_urls": [...], "relevance_score": N, "content_angles": [...], "source_platform": "..."}}]
+[{"topic": "...", "summary": "...", "source_urls": [...], "relevance_score": N, "content_angles": [...], "source_platform": "..."}]
 
-Return ONLY the JSON array, no other text."""
+Return ONLY the JSON array, no other text.""", required=True)
 
-    response = client.messages.create(
+    prompt = assemble_prompt([intro, *source_sections, instructions], PROMPT_TOKEN_BUDGET)
+
+    response = call_llm(
+        "score_and_extract_topics",
+        estimated_input_tokens=prompt.tokens,
         model="claude-sonnet-4-20250514",
         max_tokens=4096,
-        messages=[{"role": "user", "content": prompt}],
+        messages=[{"role": "user", "content": prompt.text}],
     )
 
     text = response.content[0].text.strip()
@@ -211,7 +221,7 @@ def run_trend_scout(custom_queries: list[dict] = None) -> dict:
     Returns:
         Summary dict with batch_id, topic count, and saved topics.
     """
-    from draft_storage import save_trending_topic
+    from draft_storage import save_trending_topics_bulk
 
     batch_id = str(uuid.uuid4())[:8]
 
@@ -230,27 +240,24 @@ def run_trend_scout(custom_queries: list[dict] = None) -> dict:
     scored_topics = score_and_extract_topics(search_results)
     print(f"  {len(scored_topics)} topics extracted (above relevance threshold)")
 
-    # Phase 3: Save to DB
-    saved = []
-    for t in scored_topics:
-        # Find which query produced this result
-        search_query = None
-        for r in search_results:
-            if r["platform"] == t.get("source_platform"):
-                search_query = r["query"]
-                break
-
-        topic = save_trending_topic(
-            topic=t["topic"],
-            summary=t.get("summary"),
-            source_urls=t.get("source_urls", []),
-            relevance_score=t.get("relevance_score"),
-            content_angles=t.get("content_angles", []),
-            search_query=search_query,
-            batch_id=batch_id,
-            source_platform=t.get("source_platform"),
-        )
-        saved.append(topic)
+    # Phase 3: Save to DB in one transaction
+    query_by_platform = {}
+    for r in search_results:
+        query_by_platform.setdefault(r["platform"], r["query"])
+
+    saved = save_trending_topics_bulk([
+        {
+            "topic": t["topic"],
+            "summary": t.get("summary"),
+            "source_urls": t.get("source_urls", []),
+            "relevance_score": t.get("relevance_score"),
+            "content_angles": t.get("content_angles", []),
+            # Query that produced this result
+            "search_query": query_by_platform.get(t.get("source_platform")),
+            "source_platform": t.get("source_platform"),
+        }
+        for t in scored_topics
+    ], batch_id=batch_id)
 
     print(f"  {len(saved)} topics saved to DB (batch: {batch_id})")
 
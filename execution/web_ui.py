@@ -15,43 +15,57 @@ from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent))
 
-from fastapi import FastAPI, Request, Form, HTTPException, UploadFile, File
-from fastapi.responses import HTMLResponse, RedirectResponse, JSONResponse, Response
+from fastapi import FastAPI, Request, Form, HTTPException, UploadFile, File, Query
+from fastapi.responses import HTMLResponse, RedirectResponse, JSONResponse, Response, StreamingResponse
 from fastapi.templating import Jinja2Templates
 import calendar as cal
 from datetime import datetime as dt
 from dotenv import load_dotenv
+import jinja2
 import uvicorn
+import asyncio
 import json
 
 from draft_storage import (
-    list_drafts, get_draft, create_draft, update_draft,
-    delete_draft, get_final_post, save_hook_to_bank, get_hooks_bank,
+    list_drafts, create_draft, update_draft, attach_draft_image, detach_draft_image, ConflictError,
+    delete_draft, save_hook_to_bank, get_hooks_bank,
     delete_hook_from_bank, save_idea_to_bank, get_ideas_bank, delete_idea_from_bank,
-    list_drafts_by_date, get_drafts_for_date,
-    save_insight_to_bank, get_insights_bank, get_insight, update_insight,
-    delete_insight_from_bank, seed_insights_if_empty,
-    save_social_proof, get_social_proof_bank, get_social_proof, update_social_proof,
-    delete_social_proof, seed_social_proof_if_empty,
-    COMPETITORS, POST_TYPES, save_competitor_post, get_competitor_posts,
+    save_hooks_bulk, save_ideas_bulk, record_bank_usage,
+    save_insight_to_bank, get_insights_bank, get_insight_categories, get_insight, update_insight,
+    delete_insight_from_bank,
+    save_social_proof, get_social_proof_bank, get_social_proof_categories, get_social_proof, update_social_proof,
+    delete_social_proof,
+    COMPETITORS, POST_TYPES, save_competitor_post,
     update_competitor_post, delete_competitor_post, get_competitor_names,
-    get_competitor_stats,
-    TREND_STATUSES, TREND_PLATFORMS, save_trending_topic, get_trending_topics,
+    TREND_STATUSES, TREND_PLATFORMS, save_trending_topic,
     get_trending_topic, update_trending_topic, delete_trending_topic,
-    get_trending_stats, convert_trend_to_idea,
+    convert_trend_to_idea,
 )
-from image_storage import save_image, delete_image, list_images, get_image, get_image_url
-from generate_post import generate_post_body, load_knowledge_base
-from generate_hooks import generate_hooks
-from generate_ideas import generate_ideas
+from image_storage import save_image, delete_image
+from generate_post import stream_post_body, load_knowledge_base
+from generate_hooks import stream_hooks, parse_hooks
+from generate_ideas import generate_ideas_async
+from analyze_competitor_post import analyze_post_async
 from post_to_linkedin import post_to_linkedin, check_token_validity
+from llm_metrics import get_usage_summary, get_recent_calls
+from llm_gateway import get_limits
+from llm_cache import stats as llm_cache_stats
+from database import dispose_async_engine, get_pool_stats
+from pagination import fetch_page, fetch_page_async
+import draft_storage_async
+import image_storage_async
+from storage_executor import get_storage_stats, run_storage, shutdown_storage_executor
+from search import SOURCES as SEARCH_SOURCES, search
+from job_queue import JobWorkerPool, enqueue_job, get_job, list_jobs
+import generation_jobs  # noqa: F401  (registers job handlers)
+import calendar_service
 
 load_dotenv()
 
 app = FastAPI(title="LinkedIn Content Creator")
 
-TEMPLATES_DIR = Path(__file__).parent / "templates"
-TEMPLATES_DIR.mkdir(exist_ok=True)
+# Optional directory of precompiled template bytecode (see precompile_templates)
+TEMPLATE_CACHE_DIR = os.getenv("TEMPLATE_CACHE_DIR", "")
 
 
 # =============================================================================
@@ -223,6 +237,7 @@ BASE_TEMPLATE = '''<!DOCTYPE html>
                 <a href="/trending" class="{{ 'active' if page == 'trending' else '' }}">Trending</a>
                 <a href="/competitors" class="{{ 'active' if page == 'competitors' else '' }}">Competitors</a>
                 <a href="/images" class="{{ 'active' if page == 'images' else '' }}">Images</a>
+                <a href="/search" class="{{ 'active' if page == 'search' else '' }}">Search</a>
                 <a href="/settings" class="{{ 'active' if page == 'settings' else '' }}">Settings</a>
             </nav>
         </div>
@@ -267,6 +282,27 @@ BASE_TEMPLATE = '''<!DOCTYPE html>
             });
             return hooks;
         }
+        async function loadMore(btn) {
+            // Fetch the next page of this view and append its items in place
+            btn.disabled = true;
+            const url = new URL(window.location.href);
+            url.searchParams.set('cursor', btn.dataset.cursor);
+            if (btn.dataset.offset) url.searchParams.set('offset', btn.dataset.offset);
+            url.searchParams.delete('message');
+            try {
+                const resp = await fetch(url);
+                if (!resp.ok) throw new Error(`HTTP ${resp.status}`);
+                const doc = new DOMParser().parseFromString(await resp.text(), 'text/html');
+                const incoming = doc.querySelector('[data-page-items]');
+                if (incoming) document.querySelector('[data-page-items]').append(...incoming.children);
+                const next = doc.querySelector('.load-more');
+                if (next) btn.replaceWith(document.importNode(next, true));
+                else btn.remove();
+            } catch (err) {
+                btn.disabled = false;
+                alert('Could not load more: ' + err.message);
+            }
+        }
     </script>
 </body>
 </html>'''
@@ -280,6 +316,7 @@ HOME_CONTENT = '''{% extends "base.html" %}
         <input type="text" name="topic" placeholder="e.g., Why AI won't replace coaches" required value="{{ topic or '' }}">
         <label>Additional Context (optional)</label>
         <textarea name="context" rows="2" placeholder="Any specific angle, story, or points to include...">{{ context or '' }}</textarea>
+        <label style="font-weight: normal;"><input type="checkbox" name="fresh" value="1" style="width: auto;"> Fresh variations (skip cache)</label>
         <button type="submit" class="btn btn-primary">Generate Ideas from Knowledge Base</button>
     </form>
 </div>
@@ -311,6 +348,7 @@ HOME_CONTENT = '''{% extends "base.html" %}
         </div>
         {% endfor %}
 
+        <label style="font-weight: normal; margin-top: 15px;"><input type="checkbox" name="fresh" value="1" style="width: auto;"> Fresh variations (skip cache)</label>
         <div style="margin-top: 20px; display: flex; gap: 10px;">
             <button type="submit" class="btn btn-primary">Generate Hooks from Highlighted Ideas</button>
             <button type="button" class="btn btn-secondary" onclick="saveAllIdeas('{{ topic }}')">Save All Highlighted to Ideas Bank</button>
@@ -320,6 +358,12 @@ HOME_CONTENT = '''{% extends "base.html" %}
 {% endif %}
 
 {% if hook_groups %}
+<div class="card" id="draft-stream" style="display: none;">
+    <h2>Writing Drafts</h2>
+    <p class="draft-stream-status count" style="margin-bottom: 15px;">Starting...</p>
+    <div class="draft-stream-list"></div>
+</div>
+
 <form action="/create-drafts" method="POST" id="create-drafts-form">
     <input type="hidden" name="topic" value="{{ topic }}">
 
@@ -388,18 +432,23 @@ async function saveAllIdeas(topic) {
         return;
     }
 
+    const ideas = [];
     for (const item of items) {
         const idea = item.querySelector('input[type="text"]').value.trim();
         const angle = item.querySelector('input[type="hidden"]').value;
-        if (idea) {
-            await fetch('/api/save-idea', {
-                method: 'POST',
-                headers: {'Content-Type': 'application/json'},
-                body: JSON.stringify({idea, topic, angle})
-            });
-        }
+        if (idea) ideas.push({idea, angle});
+    }
+    const resp = await fetch('/api/save-ideas', {
+        method: 'POST',
+        headers: {'Content-Type': 'application/json'},
+        body: JSON.stringify({ideas, topic})
+    });
+    if (!resp.ok) {
+        alert('Failed to save ideas');
+        return;
     }
-    alert(`Saved ${items.length} ideas to bank`);
+    const data = await resp.json();
+    alert(`Saved ${data.ids.length} ideas to bank`);
 }
 
 document.getElementById('ideas-form')?.addEventListener('submit', function(e) {
@@ -490,17 +539,22 @@ async function saveAllHighlightedHooks(topic) {
         return;
     }
 
+    const hooks = [];
     for (const item of items) {
         const hook = item.querySelector('input[type="text"]').value.trim();
-        if (hook) {
-            await fetch('/api/save-hook', {
-                method: 'POST',
-                headers: {'Content-Type': 'application/json'},
-                body: JSON.stringify({hook, topic})
-            });
-        }
+        if (hook) hooks.push(hook);
+    }
+    const resp = await fetch('/api/save-hooks', {
+        method: 'POST',
+        headers: {'Content-Type': 'application/json'},
+        body: JSON.stringify({hooks, topic})
+    });
+    if (!resp.ok) {
+        alert('Failed to save hooks');
+        return;
     }
-    alert(`Saved ${items.length} hooks to bank`);
+    const data = await resp.json();
+    alert(`Saved ${data.ids.length} hooks to bank`);
 }
 
 document.getElementById('create-drafts-form')?.addEventListener('submit', function(e) {
@@ -520,7 +574,76 @@ document.getElementById('create-drafts-form')?.addEventListener('submit', functi
         hidden.value = '1';
         this.appendChild(hidden);
     });
+
+    // Stream drafts into the page as they are written (plain submit as fallback)
+    if (window.ReadableStream && window.TextDecoder) {
+        e.preventDefault();
+        streamDrafts(this);
+    }
 });
+
+async function streamDrafts(form) {
+    const panel = document.getElementById('draft-stream');
+    const status = panel.querySelector('.draft-stream-status');
+    panel.querySelector('.draft-stream-list').innerHTML = '';
+    panel.style.display = 'block';
+    panel.scrollIntoView({behavior: 'smooth'});
+    form.querySelectorAll('button[type="submit"]').forEach(b => b.disabled = true);
+
+    try {
+        const resp = await fetch('/api/drafts/stream', {method: 'POST', body: new FormData(form)});
+        if (!resp.ok) {
+            const data = await resp.json().catch(() => ({}));
+            status.textContent = 'Error: ' + (data.error || resp.status);
+            return;
+        }
+        status.textContent = 'Writing...';
+        const reader = resp.body.getReader();
+        const decoder = new TextDecoder();
+        let buffer = '';
+        while (true) {
+            const {value, done} = await reader.read();
+            if (done) break;
+            buffer += decoder.decode(value, {stream: true});
+            let sep;
+            while ((sep = buffer.indexOf('\\n\\n')) !== -1) {
+                const raw = buffer.slice(0, sep);
+                buffer = buffer.slice(sep + 2);
+                const event = (raw.match(/^event: (.*)$/m) || [])[1];
+                const data = (raw.match(/^data: (.*)$/m) || [])[1];
+                if (event && data) handleDraftEvent(event, JSON.parse(data));
+            }
+        }
+    } catch (err) {
+        status.textContent = 'Error: ' + err;
+    } finally {
+        form.querySelectorAll('button[type="submit"]').forEach(b => b.disabled = false);
+    }
+}
+
+function handleDraftEvent(event, data) {
+    const panel = document.getElementById('draft-stream');
+    const item = document.getElementById('draft-stream-' + data.index);
+    if (event === 'start') {
+        const el = document.createElement('div');
+        el.id = 'draft-stream-' + data.index;
+        el.style.cssText = 'border-left: 3px solid #0077b5; padding: 10px 15px; margin-bottom: 15px; background: #f9f9f9;';
+        el.innerHTML = '<div class="draft-stream-hook" style="font-weight: 600; margin-bottom: 8px;"></div>' +
+            '<div class="draft-stream-body" style="white-space: pre-wrap; font-size: 14px;"></div>' +
+            '<div class="draft-stream-meta count" style="margin-top: 8px;">Writing...</div>';
+        el.querySelector('.draft-stream-hook').textContent = data.hook;
+        panel.querySelector('.draft-stream-list').appendChild(el);
+    } else if (event === 'token' && item) {
+        item.querySelector('.draft-stream-body').textContent += data.text;
+    } else if (event === 'draft' && item) {
+        item.querySelector('.draft-stream-meta').innerHTML = 'Saved - <a href="' + data.url + '">Edit draft</a>';
+    } else if (event === 'error' && item) {
+        item.querySelector('.draft-stream-meta').textContent = 'Error: ' + data.error;
+    } else if (event === 'done') {
+        panel.querySelector('.draft-stream-status').innerHTML = `Created ${data.created} draft(s)` +
+            (data.failed ? `, ${data.failed} failed` : '') + ' - <a href="/drafts">View drafts</a>';
+    }
+}
 </script>
 {% endblock %}'''
 
@@ -529,6 +652,7 @@ DRAFTS_CONTENT = '''{% extends "base.html" %}
 <div class="card">
     <h2>Your Drafts</h2>
     {% if drafts %}
+        <div data-page-items>
         {% for draft in drafts %}
         <div class="draft-item">
             <div style="display: flex; justify-content: space-between; margin-bottom: 10px;">
@@ -555,6 +679,8 @@ DRAFTS_CONTENT = '''{% extends "base.html" %}
             </div>
         </div>
         {% endfor %}
+        </div>
+        {% if next_cursor %}<button type="button" class="btn btn-secondary load-more" data-cursor="{{ next_cursor }}" onclick="loadMore(this)">Load more</button>{% endif %}
     {% else %}
         <p style="color: #666;">No drafts yet. <a href="/">Create one</a></p>
     {% endif %}
@@ -566,6 +692,7 @@ SCHEDULED_CONTENT = '''{% extends "base.html" %}
 <div class="card">
     <h2>Scheduled Posts</h2>
     {% if drafts %}
+        <div data-page-items>
         {% for draft in drafts %}
         <div class="draft-item">
             <div style="display: flex; justify-content: space-between; margin-bottom: 10px;">
@@ -605,6 +732,8 @@ SCHEDULED_CONTENT = '''{% extends "base.html" %}
             </div>
         </div>
         {% endfor %}
+        </div>
+        {% if next_cursor %}<button type="button" class="btn btn-secondary load-more" data-cursor="{{ next_cursor }}" onclick="loadMore(this)">Load more</button>{% endif %}
     {% else %}
         <p style="color: #666;">No scheduled posts. <a href="/drafts">Move drafts here</a></p>
     {% endif %}
@@ -616,6 +745,7 @@ POSTED_CONTENT = '''{% extends "base.html" %}
 <div class="card">
     <h2>Posted</h2>
     {% if drafts %}
+        <div data-page-items>
         {% for draft in drafts %}
         <div class="draft-item">
             <div style="display: flex; justify-content: space-between; margin-bottom: 10px;">
@@ -668,6 +798,8 @@ POSTED_CONTENT = '''{% extends "base.html" %}
             </div>
         </div>
         {% endfor %}
+        </div>
+        {% if next_cursor %}<button type="button" class="btn btn-secondary load-more" data-cursor="{{ next_cursor }}" onclick="loadMore(this)">Load more</button>{% endif %}
     {% else %}
         <p style="color: #666;">No posted content yet.</p>
     {% endif %}
@@ -724,10 +856,16 @@ HOOKS_BANK_CONTENT = '''{% extends "base.html" %}
 {% block content %}
 <div class="card">
     <h2>Saved Hooks Bank</h2>
+    <p style="margin-bottom: 15px; font-size: 13px;">
+        Sort:
+        <a href="/hooks-bank" style="{{ 'font-weight: 600;' if sort != 'most_used' else '' }}">Newest</a> |
+        <a href="/hooks-bank?sort=most_used" style="{{ 'font-weight: 600;' if sort == 'most_used' else '' }}">Most used</a>
+    </p>
     {% if hooks %}
+        <div data-page-items>
         {% for hook in hooks %}
         <div class="hook-item">
-            <span class="hook-number">{{ loop.index }}.</span>
+            <span class="hook-number">{{ offset + loop.index }}.</span>
             <div style="flex: 1;">
                 <div>{{ hook.hook }}</div>
                 <small style="color: #888;">Topic: {{ hook.topic or 'General' }} | Used: {{ hook.used_count or 0 }} times</small>
@@ -739,6 +877,8 @@ HOOKS_BANK_CONTENT = '''{% extends "base.html" %}
             </div>
         </div>
         {% endfor %}
+        </div>
+        {% if next_cursor %}<button type="button" class="btn btn-secondary load-more" data-cursor="{{ next_cursor }}" data-offset="{{ offset + hooks|length }}" onclick="loadMore(this)">Load more</button>{% endif %}
     {% else %}
         <p style="color: #666;">No saved hooks yet. Generate hooks and save the best ones.</p>
     {% endif %}
@@ -757,6 +897,7 @@ EDIT_CONTENT = '''{% extends "base.html" %}
         <div class="card">
             <h2>Edit Draft</h2>
             <form action="/update/{{ draft.id }}" method="POST">
+                <input type="hidden" name="version" value="{{ draft.version }}">
                 <label>Hook</label>
                 {% if draft.hooks and draft.selected_hook is not none %}
                 <input type="text" name="hook" value="{{ draft.hooks[draft.selected_hook] }}">
@@ -806,7 +947,7 @@ EDIT_CONTENT = '''{% extends "base.html" %}
         <div class="card">
             <h2>Image Library <a href="/images" class="btn btn-secondary btn-sm" style="float:right;">Manage</a></h2>
             <p style="color: #666; font-size: 12px; margin-bottom: 10px;">Click to attach/detach from this draft.</p>
-            <div style="display: flex; flex-wrap: wrap; gap: 8px; margin-bottom: 10px;">
+            <div data-page-items style="display: flex; flex-wrap: wrap; gap: 8px; margin-bottom: 10px;">
                 {% for img in library_images %}
                 <img src="/api/images/{{ img.id }}/file"
                      class="library-thumb {{ 'attached' if img.id in attached_ids else '' }}"
@@ -816,6 +957,7 @@ EDIT_CONTENT = '''{% extends "base.html" %}
                      loading="lazy">
                 {% endfor %}
             </div>
+            {% if next_cursor %}<button type="button" class="btn btn-secondary load-more" data-cursor="{{ next_cursor }}" onclick="loadMore(this)">Load more</button>{% endif %}
             {% if not library_images %}<p style="color: #999; font-size: 13px;"><a href="/images">Upload images</a> to the library first.</p>{% endif %}
 
             <div style="border-top: 1px solid #eee; padding-top: 10px; margin-top: 5px;">
@@ -930,10 +1072,16 @@ IDEAS_BANK_CONTENT = '''{% extends "base.html" %}
 {% block content %}
 <div class="card">
     <h2>Saved Ideas Bank</h2>
+    <p style="margin-bottom: 15px; font-size: 13px;">
+        Sort:
+        <a href="/ideas-bank" style="{{ 'font-weight: 600;' if sort != 'most_used' else '' }}">Newest</a> |
+        <a href="/ideas-bank?sort=most_used" style="{{ 'font-weight: 600;' if sort == 'most_used' else '' }}">Most used</a>
+    </p>
     {% if ideas %}
+        <div data-page-items>
         {% for idea in ideas %}
         <div class="hook-item">
-            <span class="hook-number">{{ loop.index }}.</span>
+            <span class="hook-number">{{ offset + loop.index }}.</span>
             <div style="flex: 1;">
                 {% if idea.angle %}<span style="background: #e8f4f8; padding: 2px 6px; border-radius: 4px; font-size: 11px; margin-right: 8px;">{{ idea.angle }}</span>{% endif %}
                 <div>{{ idea.idea }}</div>
@@ -946,6 +1094,8 @@ IDEAS_BANK_CONTENT = '''{% extends "base.html" %}
             </div>
         </div>
         {% endfor %}
+        </div>
+        {% if next_cursor %}<button type="button" class="btn btn-secondary load-more" data-cursor="{{ next_cursor }}" data-offset="{{ offset + ideas|length }}" onclick="loadMore(this)">Load more</button>{% endif %}
     {% else %}
         <p style="color: #666;">No saved ideas yet. Generate ideas and save the best ones.</p>
     {% endif %}
@@ -993,6 +1143,7 @@ INSIGHTS_CONTENT = '''{% extends "base.html" %}
     </div>
 
     {% if insights %}
+        <div data-page-items>
         {% for insight in insights %}
         <div class="draft-item" id="insight-{{ insight.id }}">
             <div style="display: flex; justify-content: space-between; align-items: center; margin-bottom: 10px;">
@@ -1015,6 +1166,7 @@ INSIGHTS_CONTENT = '''{% extends "base.html" %}
 
             <div class="insight-edit-{{ insight.id }}" style="display: none;">
                 <form action="/insights/update/{{ insight.id }}" method="POST">
+                    <input type="hidden" name="version" value="{{ insight.version }}">
                     <label>Title</label>
                     <input type="text" name="title" value="{{ insight.title }}" required>
                     <label>Category</label>
@@ -1029,6 +1181,8 @@ INSIGHTS_CONTENT = '''{% extends "base.html" %}
             </div>
         </div>
         {% endfor %}
+        </div>
+        {% if next_cursor %}<button type="button" class="btn btn-secondary load-more" data-cursor="{{ next_cursor }}" onclick="loadMore(this)">Load more</button>{% endif %}
     {% else %}
         <p style="color: #666;">No insights yet. Add your first one above.</p>
     {% endif %}
@@ -1094,6 +1248,7 @@ RESULTS_CONTENT = '''{% extends "base.html" %}
     </div>
 
     {% if results %}
+        <div data-page-items>
         {% for result in results %}
         <div class="draft-item" id="result-{{ result.id }}" style="border-left: 4px solid {% if result.category == 'Revenue' %}#28a745{% elif result.category == 'Outreach' %}#0077b5{% elif result.category == 'Efficiency' %}#ffc107{% elif result.category == 'Credibility' %}#6f42c1{% else %}#6c757d{% endif %};">
             <div style="display: flex; justify-content: space-between; align-items: flex-start; margin-bottom: 10px;">
@@ -1121,6 +1276,7 @@ RESULTS_CONTENT = '''{% extends "base.html" %}
 
             <div class="result-edit-{{ result.id }}" style="display: none;">
                 <form action="/results/update/{{ result.id }}" method="POST">
+                    <input type="hidden" name="version" value="{{ result.version }}">
                     <label>Metric</label>
                     <input type="text" name="metric" value="{{ result.metric }}" required>
                     <label>Value</label>
@@ -1139,6 +1295,8 @@ RESULTS_CONTENT = '''{% extends "base.html" %}
             </div>
         </div>
         {% endfor %}
+        </div>
+        {% if next_cursor %}<button type="button" class="btn btn-secondary load-more" data-cursor="{{ next_cursor }}" onclick="loadMore(this)">Load more</button>{% endif %}
     {% else %}
         <p style="color: #666;">No results yet. Add your first one above.</p>
     {% endif %}
@@ -1282,6 +1440,7 @@ COMPETITORS_CONTENT = '''{% extends "base.html" %}
 
     {% if posts %}
         {% set colors = {'Aidan Collins': '#0077b5', 'Cameron Trew': '#28a745', 'Naim Ahmed': '#dc3545', 'Lara Acosta': '#6f42c1', 'Chase Dimond': '#fd7e14'} %}
+        <div data-page-items>
         {% for post in posts %}
         <div class="draft-item" id="post-{{ post.id }}" style="border-left: 4px solid {{ colors.get(post.competitor_name, '#6c757d') }};">
             <div style="display: flex; justify-content: space-between; align-items: flex-start; margin-bottom: 10px;">
@@ -1326,6 +1485,7 @@ COMPETITORS_CONTENT = '''{% extends "base.html" %}
 
             <div class="comp-edit-{{ post.id }}" style="display: none;">
                 <form action="/competitors/update/{{ post.id }}" method="POST">
+                    <input type="hidden" name="version" value="{{ post.version }}">
                     <label>Competitor</label>
                     <select name="competitor_name">
                         {% for name in competitor_names %}
@@ -1392,6 +1552,8 @@ COMPETITORS_CONTENT = '''{% extends "base.html" %}
             </div>
         </div>
         {% endfor %}
+        </div>
+        {% if next_cursor %}<button type="button" class="btn btn-secondary load-more" data-cursor="{{ next_cursor }}" onclick="loadMore(this)">Load more</button>{% endif %}
     {% else %}
         <p style="color: #666;">No competitor posts yet. Add your first one above.</p>
     {% endif %}
@@ -1479,7 +1641,7 @@ IMAGES_LIBRARY_CONTENT = '''{% extends "base.html" %}
         <p style="color: #666; font-size: 12px; margin-top: 5px;">Max 10MB per image. JPG, PNG, GIF, WebP supported.</p>
     </div>
 
-    <div id="library-grid" style="display: grid; grid-template-columns: repeat(auto-fill, minmax(180px, 1fr)); gap: 15px;">
+    <div id="library-grid" data-page-items style="display: grid; grid-template-columns: repeat(auto-fill, minmax(180px, 1fr)); gap: 15px;">
         {% for img in images %}
         <div class="library-image-card" data-id="{{ img.id }}" style="border: 1px solid #e0e0e0; border-radius: 8px; overflow: hidden; background: white;">
             <img src="/api/images/{{ img.id }}/file" style="width: 100%; height: 150px; object-fit: cover;" loading="lazy">
@@ -1491,6 +1653,7 @@ IMAGES_LIBRARY_CONTENT = '''{% extends "base.html" %}
         </div>
         {% endfor %}
     </div>
+    {% if next_cursor %}<button type="button" class="btn btn-secondary load-more" data-cursor="{{ next_cursor }}" onclick="loadMore(this)">Load more</button>{% endif %}
     {% if not images %}
     <p style="color: #999; text-align: center; padding: 40px;">No images uploaded yet.</p>
     {% endif %}
@@ -1559,6 +1722,8 @@ CALENDAR_CONTENT = '''{% extends "base.html" %}
     .calendar-day.other-month { background: #f5f5f5; color: #999; }
     .calendar-day.today { background: #e8f4f8; }
     .calendar-day.selected { background: #cce5ff; }
+    .calendar-week .calendar-day { min-height: 240px; }
+    .calendar-title { margin: 20px 0 10px; }
     .day-number { font-weight: 500; margin-bottom: 5px; }
     .day-posts { font-size: 11px; }
     .day-post { background: #0077b5; color: white; padding: 3px 5px; border-radius: 3px; margin-bottom: 3px; display: block; text-decoration: none; font-size: 10px; line-height: 1.3; }
@@ -1570,39 +1735,52 @@ CALENDAR_CONTENT = '''{% extends "base.html" %}
 
 <div class="card">
     <div class="calendar-nav">
-        <a href="/calendar?month={{ prev_month }}" class="btn btn-secondary">&larr; Prev</a>
-        <h2>{{ month_name }} {{ year }}</h2>
-        <a href="/calendar?month={{ next_month }}" class="btn btn-secondary">Next &rarr;</a>
-        <a href="/calendar" class="btn btn-primary" style="margin-left: auto;">Today</a>
+        {% if cal.view == 'week' %}
+        <a href="/calendar?view=week&date={{ cal.prev }}" class="btn btn-secondary">&larr; Prev</a>
+        <h2 id="calendar-heading">{{ cal.calendars[0].title }}</h2>
+        <a href="/calendar?view=week&date={{ cal.next }}" class="btn btn-secondary">Next &rarr;</a>
+        {% else %}
+        <a href="/calendar?month={{ cal.prev }}&months={{ cal.months }}" class="btn btn-secondary" id="calendar-prev" data-month="{{ cal.prev }}">&larr; Prev</a>
+        <h2 id="calendar-heading">{{ cal.calendars[0].title }}{% if cal.months > 1 %} - {{ cal.calendars[-1].title }}{% endif %}</h2>
+        <a href="/calendar?month={{ cal.next }}&months={{ cal.months }}" class="btn btn-secondary" id="calendar-next" data-month="{{ cal.next }}">Next &rarr;</a>
+        {% endif %}
+        <div style="margin-left: auto; display: flex; gap: 10px;">
+            <a href="/calendar?view=week&date={{ selected_date or (cal.first if cal.view == 'week' else cal.calendars[0].days[7].date) }}" class="btn btn-sm {{ 'btn-primary' if cal.view == 'week' else 'btn-secondary' }}">Week</a>
+            <a href="/calendar?month={{ cal.calendars[0].key[:7] }}" class="btn btn-sm {{ 'btn-primary' if cal.view == 'month' and cal.months == 1 else 'btn-secondary' }}">Month</a>
+            <a href="/calendar?month={{ cal.calendars[0].key[:7] }}&months=3" class="btn btn-sm {{ 'btn-primary' if cal.months == 3 else 'btn-secondary' }}">3 Months</a>
+            <a href="/calendar" class="btn btn-primary btn-sm">Today</a>
+        </div>
     </div>
 
-    <div class="calendar-grid">
-        <div class="calendar-header">Sun</div>
-        <div class="calendar-header">Mon</div>
-        <div class="calendar-header">Tue</div>
-        <div class="calendar-header">Wed</div>
-        <div class="calendar-header">Thu</div>
-        <div class="calendar-header">Fri</div>
-        <div class="calendar-header">Sat</div>
+    <div id="calendars">
+    {% for calendar in cal.calendars %}
+    {% if cal.months > 1 %}<h3 class="calendar-title">{{ calendar.title }}</h3>{% endif %}
+    <div class="calendar-grid {{ 'calendar-week' if cal.view == 'week' else '' }}">
+        {% for name in weekday_names %}
+        <div class="calendar-header">{{ name }}</div>
+        {% endfor %}
 
-        {% for day in calendar_days %}
+        {% set shown = 3 if cal.view == 'month' else 20 %}
+        {% for day in calendar.days %}
         <div class="calendar-day {{ 'other-month' if not day.current_month else '' }} {{ 'today' if day.is_today else '' }} {{ 'selected' if day.date == selected_date else '' }}"
              onclick="selectDate('{{ day.date }}')">
             <div class="day-number">{{ day.day }}</div>
             <div class="day-posts">
-                {% for post in day.posts[:3] %}
+                {% for post in day.posts[:shown] %}
                 <a href="/edit/{{ post.id }}" class="day-post status-{{ post.status }}" title="{{ post.content[:150] }}">
                     <div style="overflow:hidden;display:-webkit-box;-webkit-line-clamp:2;-webkit-box-orient:vertical;">{% if post.selected_hook is not none and post.hooks %}{{ post.hooks[post.selected_hook][:80] }}{% else %}{{ post.content.split('\n')[0][:80] }}{% endif %}</div>
                     {% if post.metrics and post.metrics.impressions is not none %}<div style="opacity:0.85;font-size:9px;margin-top:2px;">👁{{ post.metrics.impressions }} 👍{{ post.metrics.likes }} 💬{{ post.metrics.comments }}</div>{% endif %}
                 </a>
                 {% endfor %}
-                {% if day.posts|length > 3 %}
-                <span style="color: #666;">+{{ day.posts|length - 3 }} more</span>
+                {% if day.posts|length > shown %}
+                <span style="color: #666;">+{{ day.posts|length - shown }} more</span>
                 {% endif %}
             </div>
         </div>
         {% endfor %}
     </div>
+    {% endfor %}
+    </div>
 </div>
 
 {% if selected_date %}
@@ -1639,12 +1817,118 @@ CALENDAR_CONTENT = '''{% extends "base.html" %}
 {% endif %}
 
 <script>
+const WEEKDAYS = {{ weekday_names|tojson }};
+const calendarCache = {};
+
 function selectDate(date) {
-    window.location.href = '/calendar?month={{ year }}-{{ "%02d"|format(month) }}&date=' + date;
+    const params = new URLSearchParams(window.location.search);
+    params.set('date', date);
+    window.location.href = '/calendar?' + params.toString();
+}
+
+function escapeHtml(text) {
+    const div = document.createElement('div');
+    div.textContent = text == null ? '' : String(text);
+    return div.innerHTML;
+}
+
+function renderDay(day, selected) {
+    const classes = ['calendar-day', day.current_month ? '' : 'other-month', day.is_today ? 'today' : '', day.date === selected ? 'selected' : ''];
+    const posts = day.posts.slice(0, 3).map(post => {
+        const m = post.metrics;
+        const metrics = m && m.impressions != null
+            ? `<div style="opacity:0.85;font-size:9px;margin-top:2px;">👁${escapeHtml(m.impressions)} 👍${escapeHtml(m.likes)} 💬${escapeHtml(m.comments)}</div>` : '';
+        return `<a href="/edit/${escapeHtml(post.id)}" class="day-post status-${escapeHtml(post.status)}" title="${escapeHtml(post.title)}">`
+            + `<div style="overflow:hidden;display:-webkit-box;-webkit-line-clamp:2;-webkit-box-orient:vertical;">${escapeHtml(post.label)}</div>${metrics}</a>`;
+    }).join('');
+    const more = day.posts.length > 3 ? `<span style="color: #666;">+${day.posts.length - 3} more</span>` : '';
+    return `<div class="${classes.join(' ')}" onclick="selectDate('${day.date}')"><div class="day-number">${day.day}</div><div class="day-posts">${posts}${more}</div></div>`;
+}
+
+function renderCalendars(data) {
+    const selected = new URLSearchParams(window.location.search).get('date');
+    document.getElementById('calendars').innerHTML = data.calendars.map(calendar =>
+        (data.months > 1 ? `<h3 class="calendar-title">${escapeHtml(calendar.title)}</h3>` : '')
+        + '<div class="calendar-grid">'
+        + WEEKDAYS.map(name => `<div class="calendar-header">${name}</div>`).join('')
+        + calendar.days.map(day => renderDay(day, selected)).join('')
+        + '</div>'
+    ).join('');
+    const last = data.calendars[data.calendars.length - 1];
+    document.getElementById('calendar-heading').textContent =
+        data.calendars[0].title + (data.months > 1 ? ' - ' + last.title : '');
+    for (const [id, month] of [['calendar-prev', data.prev], ['calendar-next', data.next]]) {
+        const link = document.getElementById(id);
+        link.dataset.month = month;
+        link.href = `/calendar?month=${month}&months=${data.months}`;
+    }
+}
+
+async function showMonth(month, months, push) {
+    const url = `/api/calendar?month=${month}&months=${months}`;
+    if (!calendarCache[url]) {
+        const resp = await fetch(url);
+        if (!resp.ok) { window.location.href = `/calendar?month=${month}&months=${months}`; return; }
+        calendarCache[url] = await resp.json();
+    }
+    if (push) {
+        const params = new URLSearchParams(window.location.search);
+        params.set('month', month);
+        params.set('months', months);
+        history.pushState({month, months}, '', '/calendar?' + params.toString());
+    }
+    renderCalendars(calendarCache[url]);
+}
+
+// Month navigation swaps the grids in place from the JSON feed; the links still work without JS
+for (const id of ['calendar-prev', 'calendar-next']) {
+    const link = document.getElementById(id);
+    if (!link) continue;
+    link.addEventListener('click', event => {
+        event.preventDefault();
+        showMonth(link.dataset.month, {{ cal.months }}, true);
+    });
 }
+window.addEventListener('popstate', event => {
+    if (event.state) showMonth(event.state.month, event.state.months, false);
+    else window.location.reload();
+});
 </script>
 {% endblock %}'''
 
+SEARCH_CONTENT = '''{% extends "base.html" %}
+{% block content %}
+<div class="card">
+    <h2>Search</h2>
+    <form action="/search" method="GET">
+        <input type="text" name="q" placeholder="e.g., cold outreach" value="{{ q or '' }}" autofocus>
+        <div style="display: flex; gap: 15px; flex-wrap: wrap; margin-bottom: 10px;">
+            {% for kind, label in kind_labels.items() %}
+            <label style="font-weight: normal;"><input type="checkbox" name="kind" value="{{ kind }}" style="width: auto;" {{ 'checked' if kind in kinds else '' }}> {{ label }}</label>
+            {% endfor %}
+        </div>
+        <button type="submit" class="btn btn-primary">Search</button>
+    </form>
+</div>
+
+{% if q %}
+<div class="card">
+    <h2>{{ results|length }} result{{ '' if results|length == 1 else 's' }} for "{{ q }}"</h2>
+    {% for r in results %}
+    <div class="draft-item">
+        <div style="display: flex; justify-content: space-between; margin-bottom: 8px;">
+            <span style="background: #e8f4f8; padding: 2px 8px; border-radius: 4px; font-size: 12px;">{{ kind_labels[r.kind] }}</span>
+            <a href="{{ r.url }}" class="btn btn-secondary btn-sm">Open</a>
+        </div>
+        <div class="draft-preview">{{ r.snippet|safe }}</div>
+    </div>
+    {% else %}
+    <p style="color: #666;">No matches.</p>
+    {% endfor %}
+</div>
+{% endif %}
+{% endblock %}'''
+
 TRENDING_CONTENT = '''{% extends "base.html" %}
 {% block content %}
 <div class="card">
@@ -1698,6 +1982,7 @@ TRENDING_CONTENT = '''{% extends "base.html" %}
         </select>
     </div>
 
+    <div data-page-items>
     {% for topic in topics %}
     <div class="draft-item" style="border-left: 4px solid {% if topic.relevance_score and topic.relevance_score >= 8 %}#28a745{% elif topic.relevance_score and topic.relevance_score >= 5 %}#ffc107{% else %}#adb5bd{% endif %};">
         <div style="display: flex; justify-content: space-between; align-items: flex-start; margin-bottom: 10px;">
@@ -1767,6 +2052,8 @@ TRENDING_CONTENT = '''{% extends "base.html" %}
     {% else %}
     <p style="color: #666;">No trending topics yet. Click "Run Trend Scout" to discover what's hot.</p>
     {% endfor %}
+    </div>
+    {% if next_cursor %}<button type="button" class="btn btn-secondary load-more" data-cursor="{{ next_cursor }}" onclick="loadMore(this)">Load more</button>{% endif %}
 </div>
 
 <script>
@@ -1792,10 +2079,15 @@ async function runTrendScout() {
     btn.disabled = true;
     try {
         const resp = await fetch('/trending/scan', {method: 'POST'});
-        const data = await resp.json();
-        if (data.error) {
-            alert('Error: ' + data.error);
+        let job = await resp.json();
+        while (job.status === 'queued' || job.status === 'running') {
+            await new Promise(r => setTimeout(r, 2000));
+            job = await (await fetch(job.status_url || '/api/jobs/' + job.id)).json();
+        }
+        if (job.status === 'failed') {
+            alert('Error: ' + job.error);
         } else {
+            const data = job.result;
             window.location.href = '/trending?message=Found+' + data.topics_saved + '+trending+topics&msg_type=success&batch=' + data.batch_id;
         }
     } catch (e) {
@@ -1808,34 +2100,136 @@ async function runTrendScout() {
 </script>
 {% endblock %}'''
 
-# Write templates
-def setup_templates():
-    (TEMPLATES_DIR / "base.html").write_text(BASE_TEMPLATE, encoding="utf-8")
-    (TEMPLATES_DIR / "home.html").write_text(HOME_CONTENT, encoding="utf-8")
-    (TEMPLATES_DIR / "drafts.html").write_text(DRAFTS_CONTENT, encoding="utf-8")
-    (TEMPLATES_DIR / "scheduled.html").write_text(SCHEDULED_CONTENT, encoding="utf-8")
-    (TEMPLATES_DIR / "posted.html").write_text(POSTED_CONTENT, encoding="utf-8")
-    (TEMPLATES_DIR / "hooks_bank.html").write_text(HOOKS_BANK_CONTENT, encoding="utf-8")
-    (TEMPLATES_DIR / "ideas_bank.html").write_text(IDEAS_BANK_CONTENT, encoding="utf-8")
-    (TEMPLATES_DIR / "edit.html").write_text(EDIT_CONTENT, encoding="utf-8")
-    (TEMPLATES_DIR / "preview.html").write_text(PREVIEW_CONTENT, encoding="utf-8")
-    (TEMPLATES_DIR / "settings.html").write_text(SETTINGS_CONTENT, encoding="utf-8")
-    (TEMPLATES_DIR / "calendar.html").write_text(CALENDAR_CONTENT, encoding="utf-8")
-    (TEMPLATES_DIR / "images_library.html").write_text(IMAGES_LIBRARY_CONTENT, encoding="utf-8")
-    (TEMPLATES_DIR / "insights.html").write_text(INSIGHTS_CONTENT, encoding="utf-8")
-    (TEMPLATES_DIR / "results.html").write_text(RESULTS_CONTENT, encoding="utf-8")
-    (TEMPLATES_DIR / "competitors.html").write_text(COMPETITORS_CONTENT, encoding="utf-8")
-    (TEMPLATES_DIR / "trending.html").write_text(TRENDING_CONTENT, encoding="utf-8")
-
-# Initialize DB tables, migrate JSON data, seed insights
-from database import create_tables, migrate_json_to_db
-create_tables()
-migrate_json_to_db()
-seed_insights_if_empty()
-seed_social_proof_if_empty()
-
-setup_templates()
-templates = Jinja2Templates(directory=str(TEMPLATES_DIR))
+JOB_CONTENT = '''{% extends "base.html" %}
+{% block content %}
+<div class="card">
+    <h2>{{ title }}</h2>
+    {% if job.status == 'failed' %}
+    <div class="alert alert-error">Job failed: {{ job.error }}</div>
+    {% else %}
+    <p class="count" id="job-status" style="margin-bottom: 10px;">
+        {{ job.status|capitalize }} - {{ job.progress.done }}/{{ job.progress.total }} done
+    </p>
+    <div style="background: #eee; border-radius: 4px; height: 10px; overflow: hidden;">
+        <div id="job-bar" style="background: #0077b5; height: 100%; width: {{ (100 * job.progress.done / job.progress.total)|int if job.progress.total else 0 }}%;"></div>
+    </div>
+    <p style="margin-top: 15px; color: #666; font-size: 13px;">
+        This runs in the background - you can leave this page and come back to /jobs/{{ job.id }}.
+    </p>
+    {% endif %}
+</div>
+<script>
+async function pollJob() {
+    const resp = await fetch('/api/jobs/{{ job.id }}');
+    const job = await resp.json();
+    const done = job.progress.done, total = job.progress.total;
+    document.getElementById('job-status').textContent =
+        job.status.charAt(0).toUpperCase() + job.status.slice(1) + ' - ' + done + '/' + total + ' done';
+    document.getElementById('job-bar').style.width = (total ? Math.floor(100 * done / total) : 0) + '%';
+    if (job.status === 'completed' || job.status === 'failed') {
+        window.location.reload();
+    } else {
+        setTimeout(pollJob, 2000);
+    }
+}
+{% if job.status in ['queued', 'running'] %}setTimeout(pollJob, 2000);{% endif %}
+</script>
+{% endblock %}'''
+
+# Templates are served from memory: nothing is written to disk at startup,
+# so reloads and concurrent workers never race on template files
+TEMPLATE_SOURCES = {
+    "base.html": BASE_TEMPLATE,
+    "home.html": HOME_CONTENT,
+    "drafts.html": DRAFTS_CONTENT,
+    "scheduled.html": SCHEDULED_CONTENT,
+    "posted.html": POSTED_CONTENT,
+    "hooks_bank.html": HOOKS_BANK_CONTENT,
+    "ideas_bank.html": IDEAS_BANK_CONTENT,
+    "edit.html": EDIT_CONTENT,
+    "preview.html": PREVIEW_CONTENT,
+    "settings.html": SETTINGS_CONTENT,
+    "calendar.html": CALENDAR_CONTENT,
+    "images_library.html": IMAGES_LIBRARY_CONTENT,
+    "insights.html": INSIGHTS_CONTENT,
+    "results.html": RESULTS_CONTENT,
+    "competitors.html": COMPETITORS_CONTENT,
+    "trending.html": TRENDING_CONTENT,
+    "search.html": SEARCH_CONTENT,
+    "job.html": JOB_CONTENT,
+}
+
+
+class _ReadOnlyBytecodeCache(jinja2.FileSystemBytecodeCache):
+    """Loads precompiled bytecode but never writes, so workers don't touch the cache dir."""
+
+    def dump_bytecode(self, bucket):
+        pass
+
+
+def create_template_env(cache_dir: str = None) -> jinja2.Environment:
+    """
+    Jinja environment over TEMPLATE_SOURCES.
+
+    Args:
+        cache_dir: Directory filled by precompile_templates(). Bytecode found
+            there skips compiling; templates missing from it (or changed since)
+            are compiled in memory as usual.
+    """
+    bytecode_cache = None
+    if cache_dir and Path(cache_dir).is_dir():
+        bytecode_cache = _ReadOnlyBytecodeCache(cache_dir)
+    return jinja2.Environment(
+        loader=jinja2.DictLoader(TEMPLATE_SOURCES),
+        autoescape=True,
+        bytecode_cache=bytecode_cache,
+    )
+
+
+def precompile_templates(cache_dir: str) -> int:
+    """
+    Compile every template to bytecode in cache_dir (a build/deploy step).
+
+    Entries are keyed by template source checksum, so stale ones are simply
+    ignored. Returns the number of templates compiled.
+    """
+    Path(cache_dir).mkdir(parents=True, exist_ok=True)
+    env = jinja2.Environment(
+        loader=jinja2.DictLoader(TEMPLATE_SOURCES),
+        autoescape=True,
+        bytecode_cache=jinja2.FileSystemBytecodeCache(cache_dir),
+    )
+    for name in TEMPLATE_SOURCES:
+        env.get_template(name)
+    return len(TEMPLATE_SOURCES)
+
+
+# One schema version check; tables, JSON import and seed data are migrations.
+# `workflow.py serve` checks once before starting workers and sets WEB_SCHEMA_CHECKED.
+from migrations import ensure_schema
+if os.getenv("WEB_SCHEMA_CHECKED") != "1":
+    ensure_schema()
+
+templates = Jinja2Templates(env=create_template_env(TEMPLATE_CACHE_DIR))
+
+# Background workers for queued generation jobs (JOB_WORKERS=0 to run them elsewhere)
+job_workers = JobWorkerPool()
+
+
+@app.on_event("startup")
+def start_job_workers():
+    job_workers.start()
+
+
+@app.on_event("shutdown")
+def stop_job_workers():
+    job_workers.stop()
+    shutdown_storage_executor()
+
+
+@app.on_event("shutdown")
+async def close_async_engine():
+    await dispose_async_engine()
 
 
 # =============================================================================
@@ -1857,9 +2251,10 @@ async def home(request: Request, message: str = None, type: str = None):
 
 
 @app.post("/generate-ideas", response_class=HTMLResponse)
-async def generate_ideas_route(request: Request, topic: str = Form(...), context: str = Form("")):
+async def generate_ideas_route(request: Request, topic: str = Form(...), context: str = Form(""),
+                               fresh: bool = Form(False)):
     try:
-        ideas = generate_ideas(topic, context, num_ideas=15)
+        ideas = await generate_ideas_async(topic, context, num_ideas=15, fresh=fresh)
         return templates.TemplateResponse("home.html", {
             "request": request,
             "page": "home",
@@ -1886,9 +2281,6 @@ async def generate_ideas_route(request: Request, topic: str = Form(...), context
 
 @app.post("/generate-hooks-from-ideas", response_class=HTMLResponse)
 async def generate_hooks_from_ideas_route(request: Request):
-    import asyncio
-    from concurrent.futures import ThreadPoolExecutor
-
     form = await request.form()
     topic = form.get("topic", "")
 
@@ -1911,65 +2303,18 @@ async def generate_hooks_from_ideas_route(request: Request):
     if not selected_ideas:
         return RedirectResponse(url="/?message=No+ideas+selected&type=error", status_code=303)
 
-    # Generate 30 hooks for each idea in parallel
-    def generate_for_idea(idea_data):
-        try:
-            hooks = generate_hooks(topic, context=idea_data["idea"], num_hooks=30)
-            return {
-                "idea": idea_data["idea"],
-                "angle": idea_data["angle"],
-                "hooks": hooks
-            }
-        except Exception as e:
-            return {
-                "idea": idea_data["idea"],
-                "angle": idea_data["angle"],
-                "hooks": [],
-                "error": str(e)
-            }
-
-    try:
-        # Run hook generation in parallel using thread pool
-        loop = asyncio.get_event_loop()
-        with ThreadPoolExecutor(max_workers=len(selected_ideas)) as executor:
-            hook_groups = await asyncio.gather(*[
-                loop.run_in_executor(executor, generate_for_idea, idea)
-                for idea in selected_ideas
-            ])
-
-        total_hooks = sum(len(g["hooks"]) for g in hook_groups)
-
-        return templates.TemplateResponse("home.html", {
-            "request": request,
-            "page": "home",
-            "ideas": None,
-            "hooks": None,
-            "hook_groups": hook_groups,
-            "topic": topic,
-            "message": f"Generated {total_hooks} hooks across {len(hook_groups)} ideas",
-            "message_type": "success"
-        })
-    except Exception as e:
-        return templates.TemplateResponse("home.html", {
-            "request": request,
-            "page": "home",
-            "ideas": None,
-            "hooks": None,
-            "hook_groups": None,
-            "topic": topic,
-            "message": f"Error: {str(e)}",
-            "message_type": "error"
-        })
-
-
-@app.post("/create-drafts")
-async def create_drafts_route(request: Request):
-    import asyncio
-    from concurrent.futures import ThreadPoolExecutor
+    # Generate 30 hooks for each idea in a background job; the job page shows progress
+    job = await run_storage(enqueue_job, "hooks_from_ideas", {
+        "topic": topic,
+        "ideas": selected_ideas,
+        "num_hooks": 30,
+        "fresh": form.get("fresh") == "1",
+    })
+    return RedirectResponse(url=f"/jobs/{job['id']}", status_code=303)
 
-    form = await request.form()
-    topic = form.get("topic", "")
 
+def _collect_selected_hooks(form) -> list[dict]:
+    """Selected hooks (with their idea) from the create-drafts form."""
     # Collect ideas by group index
     ideas_by_group = {}
     for key, value in form.items():
@@ -1994,80 +2339,183 @@ async def create_drafts_route(request: Request):
                             "hook": hook_text.strip(),
                             "idea": idea_text
                         })
+    return selected_items
+
+
+def _draft_context(item: dict):
+    # Use both the idea and hook as context for body generation
+    return f"Idea/angle: {item['idea']}" if item['idea'] else None
+
+
+def _save_generated_draft(topic: str, item: dict, body: str) -> dict:
+    # Same draft shape as the create_drafts background job
+    draft = create_draft(
+        content=body,
+        hooks=[item['hook']],
+        selected_hook=0,
+        topic=f"{topic} - {item['idea'][:50]}..." if item['idea'] else topic
+    )
+    # Counted in the same storage call, so a client disconnect can't drop it
+    record_bank_usage(hooks=[item["hook"]], ideas=[item["idea"]])
+    return draft
+
+
+def _sse(event: str, data: dict) -> str:
+    """Format one server-sent event."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+@app.post("/create-drafts")
+async def create_drafts_route(request: Request):
+    form = await request.form()
+    topic = form.get("topic", "")
+    selected_items = _collect_selected_hooks(form)
 
     if not selected_items:
         return RedirectResponse(url="/?message=No+hooks+selected&type=error", status_code=303)
 
-    # Load knowledge base once
-    kb = load_knowledge_base()
+    # Generate drafts in a background job; the job page redirects to /drafts when done
+    job = await run_storage(enqueue_job, "create_drafts", {"topic": topic, "items": selected_items})
+    return RedirectResponse(url=f"/jobs/{job['id']}", status_code=303)
+
+
+@app.post("/api/drafts/stream")
+async def stream_drafts_route(request: Request):
+    """
+    Server-sent events version of /create-drafts.
+
+    All selected hooks are generated concurrently. Events:
+        start  {index, hook, idea}   - generation for an item began
+        token  {index, text}         - next chunk of that item's body
+        draft  {index, id, url}      - body finished and saved via create_draft
+        error  {index, error}        - that item failed
+        done   {created, failed}     - all items finished
+    """
+    form = await request.form()
+    topic = form.get("topic", "")
+    selected_items = _collect_selected_hooks(form)
 
-    # Generate drafts in parallel
-    def create_single_draft(item):
+    if not selected_items:
+        return JSONResponse({"error": "No hooks selected"}, status_code=400)
+
+    kb = await asyncio.to_thread(load_knowledge_base)
+    queue: asyncio.Queue = asyncio.Queue()
+
+    async def generate_item(index, item):
+        await queue.put(_sse("start", {"index": index, "hook": item["hook"], "idea": item["idea"]}))
         try:
-            # Use both the idea and hook as context for body generation
-            context = f"Idea/angle: {item['idea']}" if item['idea'] else None
-            body = generate_post_body(topic, item['hook'], kb, additional_context=context)
-            draft = create_draft(
-                content=body,
-                hooks=[item['hook']],
-                selected_hook=0,
-                topic=f"{topic} - {item['idea'][:50]}..." if item['idea'] else topic
-            )
-            return {"success": True, "draft": draft}
+            chunks = []
+            async for text in stream_post_body(topic, item['hook'], kb, additional_context=_draft_context(item)):
+                chunks.append(text)
+                await queue.put(_sse("token", {"index": index, "text": text}))
+            draft = await run_storage(_save_generated_draft, topic, item, "".join(chunks).strip())
+            await queue.put(_sse("draft", {"index": index, "id": draft["id"], "url": f"/edit/{draft['id']}"}))
+            return True
         except Exception as e:
-            return {"success": False, "error": str(e)}
+            await queue.put(_sse("error", {"index": index, "error": str(e)}))
+            return False
+
+    async def events():
+        tasks = [asyncio.create_task(generate_item(i, item)) for i, item in enumerate(selected_items)]
+        # Cancelled items become results rather than an exception nobody retrieves
+        finished = asyncio.gather(*tasks, return_exceptions=True)
+        finished.add_done_callback(lambda _: queue.put_nowait(None))
+        try:
+            while True:
+                message = await queue.get()
+                if message is None:
+                    break
+                yield message
+            results = finished.result()
+            yield _sse("done", {"created": sum(results), "failed": len(results) - sum(results)})
+        finally:
+            # Client disconnected: stop generating
+            for task in tasks:
+                task.cancel()
+
+    return StreamingResponse(events(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+
+@app.post("/api/hooks/stream")
+async def stream_hooks_route(topic: str = Form(...), context: str = Form(""), num_hooks: int = Form(30),
+                             fresh: bool = Form(False)):
+    """
+    Server-sent events version of hook generation.
+
+    Events: token {text} as the numbered list is written, then hooks {hooks}
+    with the parsed list (or error {error}).
+    """
+    async def events():
+        chunks = []
+        try:
+            async for text in stream_hooks(topic, context, num_hooks, fresh=fresh):
+                chunks.append(text)
+                yield _sse("token", {"text": text})
+            yield _sse("hooks", {"hooks": parse_hooks("".join(chunks), num_hooks)})
+        except Exception as e:
+            yield _sse("error", {"error": str(e)})
+
+    return StreamingResponse(events(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
 
+
+async def _page(fetch, cursor: str = None, limit: int = None, created_key: str = "created_at",
+                rank_key: str = None, **filters) -> dict:
+    """fetch_page() on the storage pool, with a malformed cursor (or unknown sort) reported as a 400."""
     try:
-        loop = asyncio.get_event_loop()
-        with ThreadPoolExecutor(max_workers=min(len(selected_items), 5)) as executor:
-            results = await asyncio.gather(*[
-                loop.run_in_executor(executor, create_single_draft, item)
-                for item in selected_items
-            ])
-
-        created_count = sum(1 for r in results if r["success"])
-        return RedirectResponse(
-            url=f"/drafts?message=Created+{created_count}+draft(s)&type=success",
-            status_code=303
-        )
-    except Exception as e:
-        return RedirectResponse(
-            url=f"/?message=Error:+{str(e)}&type=error",
-            status_code=303
-        )
+        return await run_storage(fetch_page, fetch, cursor, limit, created_key, rank_key, **filters)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+async def _page_async(fetch, cursor: str = None, limit: int = None, **filters) -> dict:
+    """_page() for an async list function (draft_storage_async, image_storage_async), awaited on the event loop."""
+    try:
+        return await fetch_page_async(fetch, cursor, limit, **filters)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+def _bank_rank_key(sort: str):
+    """Cursor rank field for a hooks/ideas bank sort."""
+    return "used_count" if sort == "most_used" else None
 
 
 @app.get("/drafts", response_class=HTMLResponse)
-async def drafts_page(request: Request, message: str = None, type: str = None):
-    drafts = list_drafts(status="draft")
+async def drafts_page(request: Request, cursor: str = None, message: str = None, type: str = None):
+    page = await _page(list_drafts, cursor, status="draft")
     return templates.TemplateResponse("drafts.html", {
         "request": request,
         "page": "drafts",
-        "drafts": drafts,
+        "drafts": page["items"],
+        "next_cursor": page["next_cursor"],
         "message": message,
         "message_type": type
     })
 
 
 @app.get("/scheduled", response_class=HTMLResponse)
-async def scheduled_page(request: Request, message: str = None, type: str = None):
-    drafts = list_drafts(status="scheduled")
+async def scheduled_page(request: Request, cursor: str = None, message: str = None, type: str = None):
+    page = await _page(list_drafts, cursor, status="scheduled")
     return templates.TemplateResponse("scheduled.html", {
         "request": request,
         "page": "scheduled",
-        "drafts": drafts,
+        "drafts": page["items"],
+        "next_cursor": page["next_cursor"],
         "message": message,
         "message_type": type
     })
 
 
 @app.get("/posted", response_class=HTMLResponse)
-async def posted_page(request: Request, message: str = None, type: str = None):
-    drafts = list_drafts(status="posted")
+async def posted_page(request: Request, cursor: str = None, message: str = None, type: str = None):
+    page = await _page(list_drafts, cursor, status="posted")
     return templates.TemplateResponse("posted.html", {
         "request": request,
         "page": "posted",
-        "drafts": drafts,
+        "drafts": page["items"],
+        "next_cursor": page["next_cursor"],
         "message": message,
         "message_type": type
     })
@@ -2078,16 +2526,13 @@ async def mark_status_route(draft_id: str, status: str):
     if status not in ["draft", "scheduled", "posted"]:
         return RedirectResponse(url="/drafts?message=Invalid+status&type=error", status_code=303)
 
-    draft = get_draft(draft_id)
-    if not draft:
-        return RedirectResponse(url="/drafts?message=Draft+not+found&type=error", status_code=303)
-
     updates = {"status": status}
     # Set posted_at when marking as posted
     if status == "posted":
         updates["posted_at"] = dt.now().isoformat()
 
-    update_draft(draft_id, **updates)
+    if not await run_storage(update_draft, draft_id, **updates):
+        return RedirectResponse(url="/drafts?message=Draft+not+found&type=error", status_code=303)
 
     # Redirect to the appropriate page based on the new status
     redirect_map = {
@@ -2102,12 +2547,16 @@ async def mark_status_route(draft_id: str, status: str):
 
 
 @app.get("/hooks-bank", response_class=HTMLResponse)
-async def hooks_bank_page(request: Request, message: str = None, type: str = None):
-    hooks = get_hooks_bank()
+async def hooks_bank_page(request: Request, sort: str = "newest", cursor: str = None, offset: int = 0,
+                  message: str = None, type: str = None):
+    page = await _page(get_hooks_bank, cursor, rank_key=_bank_rank_key(sort), sort=sort)
     return templates.TemplateResponse("hooks_bank.html", {
         "request": request,
         "page": "hooks-bank",
-        "hooks": hooks,
+        "hooks": page["items"],
+        "next_cursor": page["next_cursor"],
+        "offset": offset,
+        "sort": sort,
         "message": message,
         "message_type": type
     })
@@ -2122,7 +2571,7 @@ async def api_save_hook(request: Request):
     if not hook:
         raise HTTPException(status_code=400, detail="Hook is required")
 
-    entry = save_hook_to_bank(hook, topic)
+    entry = await run_storage(save_hook_to_bank, hook, topic)
     return JSONResponse({"success": True, "id": entry["id"]})
 
 
@@ -2136,17 +2585,53 @@ async def api_save_idea(request: Request):
     if not idea:
         raise HTTPException(status_code=400, detail="Idea is required")
 
-    entry = save_idea_to_bank(idea, topic, angle)
+    entry = await run_storage(save_idea_to_bank, idea, topic, angle)
     return JSONResponse({"success": True, "id": entry["id"]})
 
 
+@app.post("/api/save-hooks")
+async def api_save_hooks(request: Request):
+    """Save a batch of hooks in one transaction."""
+    data = await request.json()
+    topic = (data.get("topic") or "").strip()
+    hooks = [h.strip() for h in data.get("hooks", []) if isinstance(h, str) and h.strip()]
+
+    if not hooks:
+        raise HTTPException(status_code=400, detail="At least one hook is required")
+
+    entries = await run_storage(save_hooks_bulk, hooks, topic)
+    return JSONResponse({"success": True, "ids": [e["id"] for e in entries]})
+
+
+@app.post("/api/save-ideas")
+async def api_save_ideas(request: Request):
+    """Save a batch of ideas in one transaction."""
+    data = await request.json()
+    topic = (data.get("topic") or "").strip()
+    ideas = [
+        {"idea": i["idea"].strip(), "angle": (i.get("angle") or "").strip()}
+        for i in data.get("ideas", [])
+        if isinstance(i, dict) and isinstance(i.get("idea"), str) and i["idea"].strip()
+    ]
+
+    if not ideas:
+        raise HTTPException(status_code=400, detail="At least one idea is required")
+
+    entries = await run_storage(save_ideas_bulk, ideas, topic)
+    return JSONResponse({"success": True, "ids": [e["id"] for e in entries]})
+
+
 @app.get("/ideas-bank", response_class=HTMLResponse)
-async def ideas_bank_page(request: Request, message: str = None, type: str = None):
-    ideas = get_ideas_bank()
+async def ideas_bank_page(request: Request, sort: str = "newest", cursor: str = None, offset: int = 0,
+                  message: str = None, type: str = None):
+    page = await _page(get_ideas_bank, cursor, rank_key=_bank_rank_key(sort), sort=sort)
     return templates.TemplateResponse("ideas_bank.html", {
         "request": request,
         "page": "ideas-bank",
-        "ideas": ideas,
+        "ideas": page["items"],
+        "next_cursor": page["next_cursor"],
+        "offset": offset,
+        "sort": sort,
         "message": message,
         "message_type": type
     })
@@ -2154,13 +2639,13 @@ async def ideas_bank_page(request: Request, message: str = None, type: str = Non
 
 @app.post("/delete-saved-idea/{idea_id}")
 async def delete_saved_idea_route(idea_id: str):
-    delete_idea_from_bank(idea_id)
+    await run_storage(delete_idea_from_bank, idea_id)
     return RedirectResponse(url="/ideas-bank?message=Idea+deleted&type=success", status_code=303)
 
 
 @app.post("/delete-saved-hook/{hook_id}")
 async def delete_saved_hook_route(hook_id: str):
-    delete_hook_from_bank(hook_id)
+    await run_storage(delete_hook_from_bank, hook_id)
     return RedirectResponse(url="/hooks-bank?message=Hook+deleted&type=success", status_code=303)
 
 
@@ -2169,14 +2654,17 @@ async def delete_saved_hook_route(hook_id: str):
 # =============================================================================
 
 @app.get("/insights", response_class=HTMLResponse)
-async def insights_page(request: Request, category: str = None, message: str = None, type: str = None):
-    insights = get_insights_bank(category=category)
-    all_insights = get_insights_bank()
-    categories = sorted(set(i.get("category") for i in all_insights if i.get("category")))
+async def insights_page(request: Request, category: str = None, cursor: str = None,
+                        message: str = None, type: str = None):
+    page, categories = await asyncio.gather(
+        _page(get_insights_bank, cursor, category=category),
+        run_storage(get_insight_categories),
+    )
     return templates.TemplateResponse("insights.html", {
         "request": request,
         "page": "insights",
-        "insights": insights,
+        "insights": page["items"],
+        "next_cursor": page["next_cursor"],
         "categories": categories,
         "current_category": category,
         "message": message,
@@ -2186,19 +2674,23 @@ async def insights_page(request: Request, category: str = None, message: str = N
 
 @app.post("/insights/add")
 async def add_insight_route(title: str = Form(...), content: str = Form(...), category: str = Form("")):
-    save_insight_to_bank(title, content, category.strip() or None)
+    await run_storage(save_insight_to_bank, title, content, category.strip() or None)
     return RedirectResponse(url="/insights?message=Insight+added&type=success", status_code=303)
 
 
 @app.post("/insights/update/{insight_id}")
-async def update_insight_route(insight_id: str, title: str = Form(...), content: str = Form(...), category: str = Form("")):
-    update_insight(insight_id, title=title, content=content, category=category.strip() or None)
+async def update_insight_route(insight_id: str, title: str = Form(...), content: str = Form(...), category: str = Form(""),
+                               version: int = Form(None)):
+    try:
+        await run_storage(update_insight, insight_id, expected_version=version, title=title, content=content, category=category.strip() or None)
+    except ConflictError:
+        return RedirectResponse(url="/insights?message=This+insight+was+changed+by+someone+else+-+reapply+your+edits&type=error", status_code=303)
     return RedirectResponse(url="/insights?message=Insight+updated&type=success", status_code=303)
 
 
 @app.post("/insights/delete/{insight_id}")
 async def delete_insight_route(insight_id: str):
-    delete_insight_from_bank(insight_id)
+    await run_storage(delete_insight_from_bank, insight_id)
     return RedirectResponse(url="/insights?message=Insight+deleted&type=success", status_code=303)
 
 
@@ -2207,14 +2699,17 @@ async def delete_insight_route(insight_id: str):
 # =============================================================================
 
 @app.get("/results", response_class=HTMLResponse)
-async def results_page(request: Request, category: str = None, message: str = None, type: str = None):
-    results = get_social_proof_bank(category=category)
-    all_results = get_social_proof_bank()
-    categories = sorted(set(r.get("category") for r in all_results if r.get("category")))
+async def results_page(request: Request, category: str = None, cursor: str = None,
+                       message: str = None, type: str = None):
+    page, categories = await asyncio.gather(
+        _page(get_social_proof_bank, cursor, category=category),
+        run_storage(get_social_proof_categories),
+    )
     return templates.TemplateResponse("results.html", {
         "request": request,
         "page": "results",
-        "results": results,
+        "results": page["items"],
+        "next_cursor": page["next_cursor"],
         "categories": categories,
         "current_category": category,
         "message": message,
@@ -2230,7 +2725,8 @@ async def add_result_route(
     source: str = Form(""),
     context: str = Form("")
 ):
-    save_social_proof(
+    await run_storage(
+        save_social_proof,
         metric=metric,
         value=value,
         context=context.strip() or None,
@@ -2247,22 +2743,28 @@ async def update_result_route(
     value: str = Form(...),
     category: str = Form(""),
     source: str = Form(""),
-    context: str = Form("")
+    context: str = Form(""),
+    version: int = Form(None),
 ):
-    update_social_proof(
-        proof_id,
-        metric=metric,
-        value=value,
-        context=context.strip() or None,
-        source=source.strip() or None,
-        category=category.strip() or None,
-    )
+    try:
+        await run_storage(
+            update_social_proof,
+            proof_id,
+            expected_version=version,
+            metric=metric,
+            value=value,
+            context=context.strip() or None,
+            source=source.strip() or None,
+            category=category.strip() or None,
+        )
+    except ConflictError:
+        return RedirectResponse(url="/results?message=This+result+was+changed+by+someone+else+-+reapply+your+edits&type=error", status_code=303)
     return RedirectResponse(url="/results?message=Result+updated&type=success", status_code=303)
 
 
 @app.post("/results/delete/{proof_id}")
 async def delete_result_route(proof_id: str):
-    delete_social_proof(proof_id)
+    await run_storage(delete_social_proof, proof_id)
     return RedirectResponse(url="/results?message=Result+deleted&type=success", status_code=303)
 
 
@@ -2276,21 +2778,27 @@ async def competitors_page(
     competitor: str = None,
     type: str = None,
     performance: str = None,
+    cursor: str = None,
     message: str = None,
     msg_type: str = None,
 ):
-    posts = get_competitor_posts(
-        competitor_name=competitor or None,
-        post_type=type or None,
-        performance=performance or None,
+    page, stats = await asyncio.gather(
+        _page_async(
+            draft_storage_async.get_competitor_posts, cursor,
+            competitor_name=competitor or None,
+            post_type=type or None,
+            performance=performance or None,
+        ),
+        draft_storage_async.get_competitor_stats(),
     )
-    stats = get_competitor_stats()
+    competitor_names = get_competitor_names()
     return templates.TemplateResponse("competitors.html", {
         "request": request,
         "page": "competitors",
-        "posts": posts,
+        "posts": page["items"],
+        "next_cursor": page["next_cursor"],
         "stats": stats,
-        "competitor_names": get_competitor_names(),
+        "competitor_names": competitor_names,
         "post_types": POST_TYPES,
         "current_competitor": competitor,
         "current_type": type,
@@ -2300,6 +2808,15 @@ async def competitors_page(
     })
 
 
+@app.get("/api/competitors/stats")
+async def api_competitor_stats():
+    """Competitor post totals plus per-competitor engagement averages."""
+    stats, competitors = await asyncio.gather(
+        draft_storage_async.get_competitor_stats(), draft_storage_async.get_competitor_breakdown()
+    )
+    return JSONResponse({**stats, "competitors": competitors})
+
+
 @app.post("/competitors/add")
 async def add_competitor_post_route(
     competitor_name: str = Form(...),
@@ -2314,7 +2831,8 @@ async def add_competitor_post_route(
     performance: str = Form(""),
     notes: str = Form(""),
 ):
-    save_competitor_post(
+    await run_storage(
+        save_competitor_post,
         competitor_name=competitor_name,
         post_content=post_content,
         hook=hook.strip() or None,
@@ -2344,27 +2862,33 @@ async def update_competitor_post_route(
     reposts: str = Form(""),
     performance: str = Form(""),
     notes: str = Form(""),
+    version: int = Form(None),
 ):
-    update_competitor_post(
-        post_id,
-        competitor_name=competitor_name,
-        post_content=post_content,
-        hook=hook.strip() or None,
-        post_type=post_type.strip() or None,
-        post_url=post_url.strip() or None,
-        date_posted=date_posted.strip() or None,
-        likes=int(likes) if likes.strip() else None,
-        comments=int(comments) if comments.strip() else None,
-        reposts=int(reposts) if reposts.strip() else None,
-        performance=performance.strip() or None,
-        notes=notes.strip() or None,
-    )
+    try:
+        await run_storage(
+            update_competitor_post,
+            post_id,
+            expected_version=version,
+            competitor_name=competitor_name,
+            post_content=post_content,
+            hook=hook.strip() or None,
+            post_type=post_type.strip() or None,
+            post_url=post_url.strip() or None,
+            date_posted=date_posted.strip() or None,
+            likes=int(likes) if likes.strip() else None,
+            comments=int(comments) if comments.strip() else None,
+            reposts=int(reposts) if reposts.strip() else None,
+            performance=performance.strip() or None,
+            notes=notes.strip() or None,
+        )
+    except ConflictError:
+        return RedirectResponse(url="/competitors?message=This+post+was+changed+by+someone+else+-+reapply+your+edits&msg_type=error", status_code=303)
     return RedirectResponse(url="/competitors?message=Post+updated&msg_type=success", status_code=303)
 
 
 @app.post("/competitors/delete/{post_id}")
 async def delete_competitor_post_route(post_id: str):
-    delete_competitor_post(post_id)
+    await run_storage(delete_competitor_post, post_id)
     return RedirectResponse(url="/competitors?message=Post+deleted&msg_type=success", status_code=303)
 
 
@@ -2379,20 +2903,25 @@ async def trending_page(
     platform: str = None,
     min_relevance: str = None,
     batch: str = None,
+    cursor: str = None,
     message: str = None,
     msg_type: str = None,
 ):
-    topics = get_trending_topics(
-        status=status or None,
-        source_platform=platform or None,
-        min_relevance=int(min_relevance) if min_relevance else None,
-        batch_id=batch or None,
+    page, stats = await asyncio.gather(
+        _page_async(
+            draft_storage_async.get_trending_topics, cursor,
+            status=status or None,
+            source_platform=platform or None,
+            min_relevance=int(min_relevance) if min_relevance else None,
+            batch_id=batch or None,
+        ),
+        draft_storage_async.get_trending_stats(),
     )
-    stats = get_trending_stats()
     return templates.TemplateResponse("trending.html", {
         "request": request,
         "page": "trending",
-        "topics": topics,
+        "topics": page["items"],
+        "next_cursor": page["next_cursor"],
         "stats": stats,
         "statuses": TREND_STATUSES,
         "platforms": TREND_PLATFORMS,
@@ -2404,19 +2933,28 @@ async def trending_page(
     })
 
 
+@app.get("/api/trending/stats")
+async def api_trending_stats():
+    """Trending topic totals plus per-platform relevance histograms."""
+    stats, platforms = await asyncio.gather(
+        draft_storage_async.get_trending_stats(), draft_storage_async.get_trending_breakdown()
+    )
+    return JSONResponse({**stats, "platforms": platforms})
+
+
 @app.post("/trending/scan")
 async def trending_scan():
-    try:
-        from trend_scout import run_trend_scout
-        result = run_trend_scout()
-        return JSONResponse(result)
-    except Exception as e:
-        return JSONResponse({"error": str(e)}, status_code=500)
+    """Queue a trend scan; poll the returned status_url for progress and the result."""
+    job = await run_storage(enqueue_job, "trend_scout", {})
+    return JSONResponse(
+        {"job_id": job["id"], "status": job["status"], "status_url": f"/api/jobs/{job['id']}"},
+        status_code=202,
+    )
 
 
 @app.post("/trending/convert/{topic_id}")
 async def trending_convert(topic_id: str):
-    idea = convert_trend_to_idea(topic_id)
+    idea = await run_storage(convert_trend_to_idea, topic_id)
     if idea:
         return RedirectResponse(
             url="/trending?message=Converted+to+idea&msg_type=success", status_code=303
@@ -2428,7 +2966,7 @@ async def trending_convert(topic_id: str):
 
 @app.post("/trending/dismiss/{topic_id}")
 async def trending_dismiss(topic_id: str):
-    update_trending_topic(topic_id, status="dismissed")
+    await run_storage(update_trending_topic, topic_id, status="dismissed")
     return RedirectResponse(
         url="/trending?message=Topic+dismissed&msg_type=success", status_code=303
     )
@@ -2436,7 +2974,7 @@ async def trending_dismiss(topic_id: str):
 
 @app.post("/trending/update/{topic_id}")
 async def trending_update(topic_id: str, notes: str = Form("")):
-    update_trending_topic(topic_id, notes=notes.strip() or None)
+    await run_storage(update_trending_topic, topic_id, notes=notes.strip() or None)
     return RedirectResponse(
         url="/trending?message=Notes+updated&msg_type=success", status_code=303
     )
@@ -2444,7 +2982,7 @@ async def trending_update(topic_id: str, notes: str = Form("")):
 
 @app.post("/trending/delete/{topic_id}")
 async def trending_delete(topic_id: str):
-    delete_trending_topic(topic_id)
+    await run_storage(delete_trending_topic, topic_id)
     return RedirectResponse(
         url="/trending?message=Topic+deleted&msg_type=success", status_code=303
     )
@@ -2452,33 +2990,25 @@ async def trending_delete(topic_id: str):
 
 @app.post("/competitors/analyze")
 async def analyze_competitor_post_route(request: Request):
-    from analyze_competitor_post import analyze_post
     body = await request.json()
     post_content = body.get("post_content", "")
     if not post_content.strip():
         return JSONResponse({"error": "No content provided"}, status_code=400)
-    result = analyze_post(post_content)
+    result = await analyze_post_async(post_content)
     return JSONResponse(result)
 
 
 @app.get("/edit/{draft_id}", response_class=HTMLResponse)
-async def edit_page(request: Request, draft_id: str, message: str = None, type: str = None):
-    draft = get_draft(draft_id)
+async def edit_page(request: Request, draft_id: str, cursor: str = None, message: str = None, type: str = None):
+    # Library images, newest first; the rest load on demand
+    draft, attached_images, library = await asyncio.gather(
+        draft_storage_async.get_draft(draft_id),
+        image_storage_async.get_draft_images(draft_id),
+        _page_async(image_storage_async.list_images, cursor, created_key="uploaded_at"),
+    )
     if not draft:
         return RedirectResponse(url="/drafts?message=Draft+not+found&type=error", status_code=303)
-
-    # Get attached image IDs from draft
-    attached_ids = [img_ref.get("id") or img_ref for img_ref in draft.get("images", [])]
-
-    # Resolve attached images from library
-    attached_images = []
-    for aid in attached_ids:
-        img = get_image(aid) if isinstance(aid, str) else None
-        if img:
-            attached_images.append(img)
-
-    # All library images
-    library_images = list_images()
+    attached_ids = [img["id"] for img in attached_images]
 
     return templates.TemplateResponse("edit.html", {
         "request": request,
@@ -2486,43 +3016,39 @@ async def edit_page(request: Request, draft_id: str, message: str = None, type:
         "draft": draft,
         "attached_images": attached_images,
         "attached_ids": attached_ids,
-        "library_images": library_images,
+        "library_images": library["items"],
+        "next_cursor": library["next_cursor"],
         "message": message,
         "message_type": type
     })
 
 
 @app.post("/update/{draft_id}")
-async def update_route(draft_id: str, content: str = Form(...), hook: str = Form("")):
-    draft = get_draft(draft_id)
-    if not draft:
-        return RedirectResponse(url="/drafts?message=Draft+not+found&type=error", status_code=303)
-
+async def update_route(draft_id: str, content: str = Form(...), hook: str = Form(""), version: int = Form(None)):
     updates = {"content": content}
     if hook.strip():
         updates["hooks"] = [hook.strip()]
         updates["selected_hook"] = 0
 
-    update_draft(draft_id, **updates)
+    try:
+        updated = await run_storage(update_draft, draft_id, expected_version=version, **updates)
+    except ConflictError:
+        return RedirectResponse(url=f"/edit/{draft_id}?message=This+draft+was+changed+by+someone+else+-+reapply+your+edits&type=error", status_code=303)
+    if not updated:
+        return RedirectResponse(url="/drafts?message=Draft+not+found&type=error", status_code=303)
     return RedirectResponse(url="/drafts?message=Draft+updated&type=success", status_code=303)
 
 
 @app.get("/preview/{draft_id}", response_class=HTMLResponse)
 async def preview_page(request: Request, draft_id: str):
-    draft = get_draft(draft_id)
+    draft, final_content, attached_images = await asyncio.gather(
+        draft_storage_async.get_draft(draft_id),
+        draft_storage_async.get_final_post(draft_id),
+        image_storage_async.get_draft_images(draft_id),
+    )
     if not draft:
         return RedirectResponse(url="/drafts?message=Draft+not+found&type=error", status_code=303)
 
-    final_content = get_final_post(draft_id)
-
-    # Resolve attached images
-    attached_images = []
-    for img_ref in draft.get("images", []):
-        aid = img_ref.get("id") if isinstance(img_ref, dict) else img_ref
-        img = get_image(aid)
-        if img:
-            attached_images.append(img)
-
     return templates.TemplateResponse("preview.html", {
         "request": request,
         "page": "preview",
@@ -2534,24 +3060,20 @@ async def preview_page(request: Request, draft_id: str):
 
 @app.post("/post/{draft_id}")
 async def post_to_linkedin_route(draft_id: str):
-    draft = get_draft(draft_id)
+    draft, final_content, images = await asyncio.gather(
+        draft_storage_async.get_draft(draft_id),
+        draft_storage_async.get_final_post(draft_id),
+        image_storage_async.get_draft_images(draft_id),
+    )
     if not draft:
         return RedirectResponse(url="/drafts?message=Draft+not+found&type=error", status_code=303)
 
-    final_content = get_final_post(draft_id)
-
-    # Get image URLs from library
-    image_urls = []
-    for img_ref in draft.get("images", []):
-        aid = img_ref.get("id") if isinstance(img_ref, dict) else img_ref
-        url = get_image_url(aid)
-        if url:
-            image_urls.append(url)
+    image_urls = [img["url"] for img in images]
 
     try:
-        result = post_to_linkedin(final_content, image_urls if image_urls else None)
+        result = await asyncio.to_thread(post_to_linkedin, final_content, image_urls if image_urls else None)
         if result["success"]:
-            update_draft(draft_id, status="posted", posted_at=dt.now().isoformat())
+            await run_storage(update_draft, draft_id, status="posted", posted_at=dt.now().isoformat())
             return RedirectResponse(url="/drafts?message=Posted+successfully!&type=success", status_code=303)
         else:
             return RedirectResponse(
@@ -2567,13 +3089,52 @@ async def post_to_linkedin_route(draft_id: str):
 
 @app.post("/delete/{draft_id}")
 async def delete_route(draft_id: str):
-    delete_draft(draft_id)
+    await run_storage(delete_draft, draft_id)
     return RedirectResponse(url="/drafts?message=Draft+deleted&type=success", status_code=303)
 
 
+# =============================================================================
+# SEARCH ROUTES
+# =============================================================================
+
+SEARCH_KIND_LABELS = {
+    "draft": "Drafts",
+    "hook": "Hooks",
+    "idea": "Ideas",
+    "insight": "Insights",
+    "competitor_post": "Competitor Posts",
+}
+
+
+def _search(q: str, kinds: list[str], limit: int) -> list[dict]:
+    try:
+        return search(q, kinds=kinds, limit=limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@app.get("/search", response_class=HTMLResponse)
+async def search_page(request: Request, q: str = "", kind: list[str] = Query(None)):
+    results = await run_storage(_search, q, kind, 50) if q.strip() else []
+    return templates.TemplateResponse("search.html", {
+        "request": request,
+        "page": "search",
+        "q": q,
+        "kinds": kind or list(SEARCH_SOURCES),
+        "kind_labels": SEARCH_KIND_LABELS,
+        "results": results,
+    })
+
+
+@app.get("/api/search")
+async def api_search(q: str, kind: list[str] = Query(None), limit: int = 20):
+    """Ranked full-text matches: {"results": [{kind, id, rank, snippet, url}]}."""
+    return JSONResponse({"results": await run_storage(_search, q, kind, limit)})
+
+
 @app.get("/settings", response_class=HTMLResponse)
 async def settings_page(request: Request):
-    linkedin_status = check_token_validity()
+    linkedin_status = await asyncio.to_thread(check_token_validity)
     return templates.TemplateResponse("settings.html", {
         "request": request,
         "page": "settings",
@@ -2584,107 +3145,207 @@ async def settings_page(request: Request):
     })
 
 
+JOB_TITLES = {
+    "hooks_from_ideas": "Generating Hooks",
+    "create_drafts": "Writing Drafts",
+    "trend_scout": "Scanning for Trending Topics",
+}
+
+
+@app.get("/jobs/{job_id}", response_class=HTMLResponse)
+async def job_page(request: Request, job_id: str):
+    job = await run_storage(get_job, job_id)
+    if not job:
+        return RedirectResponse(url="/?message=Job+not+found&type=error", status_code=303)
+
+    if job["status"] == "completed":
+        result = job["result"] or {}
+        if job["kind"] == "hooks_from_ideas":
+            return templates.TemplateResponse("home.html", {
+                "request": request,
+                "page": "home",
+                "ideas": None,
+                "hooks": None,
+                "hook_groups": result.get("hook_groups", []),
+                "topic": result.get("topic", ""),
+                "message": f"Generated {result.get('total_hooks', 0)} hooks across {len(result.get('hook_groups', []))} ideas",
+                "message_type": "success"
+            })
+        if job["kind"] == "create_drafts":
+            return RedirectResponse(
+                url=f"/drafts?message=Created+{result.get('created', 0)}+draft(s)&type=success",
+                status_code=303
+            )
+        if job["kind"] == "trend_scout":
+            return RedirectResponse(
+                url=f"/trending?message=Found+{result.get('topics_saved', 0)}+trending+topics&msg_type=success&batch={result.get('batch_id', '')}",
+                status_code=303
+            )
+
+    return templates.TemplateResponse("job.html", {
+        "request": request,
+        "page": "home",
+        "job": job,
+        "title": JOB_TITLES.get(job["kind"], "Background Job"),
+    })
+
+
+@app.get("/api/jobs")
+async def api_list_jobs(status: str = None, kind: str = None, limit: int = 50):
+    return JSONResponse({"jobs": await run_storage(list_jobs, status=status, kind=kind, limit=limit)})
+
+
+@app.get("/api/jobs/{job_id}")
+async def api_job_status(job_id: str):
+    """Status and progress of a job (includes the result once completed)."""
+    job = await run_storage(get_job, job_id)
+    if not job:
+        return JSONResponse({"error": "Job not found"}, status_code=404)
+    return JSONResponse(job)
+
+
+@app.get("/api/jobs/{job_id}/result")
+async def api_job_result(job_id: str):
+    job = await run_storage(get_job, job_id)
+    if not job:
+        return JSONResponse({"error": "Job not found"}, status_code=404)
+    if job["status"] == "failed":
+        return JSONResponse({"error": job["error"], "status": "failed"}, status_code=500)
+    if job["status"] != "completed":
+        return JSONResponse({"status": job["status"], "progress": job["progress"]}, status_code=202)
+    return JSONResponse(job["result"])
+
+
+@app.get("/api/llm-usage")
+async def api_llm_usage(limit: int = 50):
+    """Token usage, cost and latency for Claude calls made by this process."""
+    return JSONResponse({
+        "summary": get_usage_summary(),
+        "recent_calls": get_recent_calls(limit),
+        "limits": get_limits(),
+        "response_cache": await run_storage(llm_cache_stats),
+    })
+
+
+# =============================================================================
+# PAGINATED LIST API
+# Each returns {"items": [...], "next_cursor": ...}; pass next_cursor back as
+# ?cursor= for the following page (null on the last page).
+# =============================================================================
+
+@app.get("/api/drafts")
+async def api_list_drafts(status: str = None, cursor: str = None, limit: int = None):
+    return JSONResponse(await _page(list_drafts, cursor, limit, status=status))
+
+
+@app.get("/api/hooks")
+async def api_list_hooks(topic: str = None, sort: str = "newest", cursor: str = None, limit: int = None):
+    return JSONResponse(await _page(get_hooks_bank, cursor, limit, rank_key=_bank_rank_key(sort), topic=topic, sort=sort))
+
+
+@app.get("/api/ideas")
+async def api_list_ideas(topic: str = None, sort: str = "newest", cursor: str = None, limit: int = None):
+    return JSONResponse(await _page(get_ideas_bank, cursor, limit, rank_key=_bank_rank_key(sort), topic=topic, sort=sort))
+
+
+@app.get("/api/insights")
+async def api_list_insights(category: str = None, cursor: str = None, limit: int = None):
+    return JSONResponse(await _page(get_insights_bank, cursor, limit, category=category))
+
+
+@app.get("/api/social-proof")
+async def api_list_social_proof(category: str = None, cursor: str = None, limit: int = None):
+    return JSONResponse(await _page(get_social_proof_bank, cursor, limit, category=category))
+
+
+@app.get("/api/competitor-posts")
+async def api_list_competitor_posts(
+    competitor: str = None,
+    type: str = None,
+    performance: str = None,
+    cursor: str = None,
+    limit: int = None,
+):
+    return JSONResponse(await _page_async(
+        draft_storage_async.get_competitor_posts, cursor, limit,
+        competitor_name=competitor, post_type=type, performance=performance,
+    ))
+
+
+@app.get("/api/trending-topics")
+async def api_list_trending_topics(
+    status: str = None,
+    platform: str = None,
+    min_relevance: int = None,
+    batch: str = None,
+    cursor: str = None,
+    limit: int = None,
+):
+    return JSONResponse(await _page_async(
+        draft_storage_async.get_trending_topics, cursor, limit,
+        status=status, source_platform=platform, min_relevance=min_relevance, batch_id=batch,
+    ))
+
+
+@app.get("/api/diagnostics/db-pool")
+async def api_db_pool():
+    """Connection pool occupancy and checkout/wait statistics for this process."""
+    return JSONResponse({**get_pool_stats(), "storage_executor": get_storage_stats()})
+
+
 # =============================================================================
 # CALENDAR ROUTES
 # =============================================================================
 
 @app.get("/calendar", response_class=HTMLResponse)
-async def calendar_page(request: Request, month: str = None, date: str = None):
+async def calendar_page(request: Request, month: str = None, date: str = None, view: str = "month",
+                        months: int = 1):
     """
     Calendar view showing posts by date.
 
     Args:
         month: Optional month in YYYY-MM format
         date: Optional selected date in YYYY-MM-DD format
+        view: "month" (months consecutive grids) or "week" (the week of date)
     """
-    from datetime import date as date_type
-
-    # Parse month or use current
-    today = date_type.today()
-    if month:
-        try:
-            parts = month.split("-")
-            year = int(parts[0])
-            month_num = int(parts[1])
-        except (ValueError, IndexError):
-            year = today.year
-            month_num = today.month
-    else:
-        year = today.year
-        month_num = today.month
-
-    # Get drafts for this month
-    month_drafts = list_drafts_by_date(year, month_num)
-
-    # Build calendar grid
-    cal_obj = cal.Calendar(firstweekday=6)  # Sunday first
-    calendar_days = []
-
-    for week in cal_obj.monthdatescalendar(year, month_num):
-        for day_date in week:
-            day_str = day_date.strftime("%Y-%m-%d")
-            # Get posts for this day
-            day_posts = []
-            for draft in month_drafts:
-                scheduled = draft.get("scheduled_time", "")
-                posted = draft.get("posted_at", "")
-                if scheduled and scheduled[:10] == day_str:
-                    day_posts.append(draft)
-                elif posted and posted[:10] == day_str:
-                    day_posts.append(draft)
-
-            calendar_days.append({
-                "day": day_date.day,
-                "date": day_str,
-                "current_month": day_date.month == month_num,
-                "is_today": day_date == today,
-                "posts": day_posts
-            })
-
-    # Get posts for selected date
+    cal_view = await calendar_service.build_view(view, month, months, date)
     selected_posts = []
-    if date:
-        selected_posts = get_drafts_for_date(date)
-
-    # Calculate prev/next months
-    if month_num == 1:
-        prev_month = f"{year-1}-12"
-    else:
-        prev_month = f"{year}-{month_num-1:02d}"
-
-    if month_num == 12:
-        next_month = f"{year+1}-01"
-    else:
-        next_month = f"{year}-{month_num+1:02d}"
-
-    month_name = cal.month_name[month_num]
+    if calendar_service.parse_day(date):
+        selected_posts = await calendar_service.posts_for_day(cal_view, date)
 
     return templates.TemplateResponse("calendar.html", {
         "request": request,
         "page": "calendar",
-        "year": year,
-        "month": month_num,
-        "month_name": month_name,
-        "calendar_days": calendar_days,
-        "prev_month": prev_month,
-        "next_month": next_month,
+        "cal": cal_view,
+        "weekday_names": WEEKDAY_NAMES,
         "selected_date": date,
         "selected_posts": selected_posts
     })
 
 
+WEEKDAY_NAMES = [cal.day_abbr[(calendar_service.FIRST_WEEKDAY + i) % 7] for i in range(7)]
+
+
+@app.get("/api/calendar")
+async def api_calendar(month: str = None, date: str = None, view: str = "month", months: int = 1):
+    """Calendar days and their posts as JSON, for navigating months without a page load."""
+    cal_view = await calendar_service.build_view(view, month, months, date)
+    return JSONResponse(calendar_service.feed(cal_view))
+
+
 # =============================================================================
 # IMAGE LIBRARY ROUTES
 # =============================================================================
 
 @app.get("/images", response_class=HTMLResponse)
-async def images_library_page(request: Request, message: str = None, type: str = None):
+async def images_library_page(request: Request, cursor: str = None, message: str = None, type: str = None):
     """Image library page."""
-    images = list_images()
+    page = await _page_async(image_storage_async.list_images, cursor, created_key="uploaded_at")
     return templates.TemplateResponse("images_library.html", {
         "request": request,
         "page": "images",
-        "images": images,
+        "images": page["items"],
+        "next_cursor": page["next_cursor"],
         "message": message,
         "message_type": type,
     })
@@ -2701,23 +3362,24 @@ async def api_upload_image(file: UploadFile = File(...)):
         raise HTTPException(status_code=400, detail="Image too large (max 10MB)")
 
     try:
-        image_meta = save_image(content, file.filename or "image.jpg")
+        image_meta = await run_storage(save_image, content, file.filename or "image.jpg")
         return JSONResponse({"success": True, "image": image_meta})
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 
 @app.get("/api/images")
-async def api_list_images():
-    """List all library images."""
-    return JSONResponse({"images": list_images()})
+async def api_list_images(cursor: str = None, limit: int = None):
+    """List library images, newest first; follow next_cursor for the next page."""
+    page = await _page_async(image_storage_async.list_images, cursor, limit, created_key="uploaded_at")
+    return JSONResponse({"images": page["items"], "next_cursor": page["next_cursor"]})
 
 
 @app.get("/api/images/{image_id}/file")
 async def api_serve_image(image_id: str):
     """Proxy an image from S3 to the browser."""
     from s3_storage import download_bytes
-    img = get_image(image_id)
+    img = await image_storage_async.get_image(image_id)
     if not img:
         raise HTTPException(status_code=404, detail="Image not found")
 
@@ -2729,7 +3391,7 @@ async def api_serve_image(image_id: str):
     content_type = content_types.get(ext, "image/jpeg")
 
     try:
-        data = download_bytes(img["s3_key"])
+        data = await run_storage(download_bytes, img["s3_key"])
     except Exception:
         raise HTTPException(status_code=502, detail="Failed to fetch image from storage")
 
@@ -2740,62 +3402,61 @@ async def api_serve_image(image_id: str):
     )
 
 
+@app.get("/api/images/{image_id}/drafts")
+async def api_image_drafts(image_id: str):
+    """Drafts that use a library image."""
+    if not await image_storage_async.get_image(image_id):
+        raise HTTPException(status_code=404, detail="Image not found")
+    return JSONResponse({"drafts": await image_storage_async.get_image_drafts(image_id)})
+
+
 @app.delete("/api/images/{image_id}")
 async def api_delete_image(image_id: str):
-    """Delete an image from the library."""
-    deleted = delete_image(image_id)
+    """Delete an image from the library, detaching it from any drafts."""
+    detached = [d["id"] for d in await image_storage_async.get_image_drafts(image_id)]
+    deleted = await run_storage(delete_image, image_id)
     if not deleted:
         raise HTTPException(status_code=404, detail="Image not found")
-    return JSONResponse({"success": True})
+    return JSONResponse({"success": True, "detached_from": detached})
 
 
 @app.post("/api/drafts/{draft_id}/attach-image/{image_id}")
 async def attach_image_to_draft(draft_id: str, image_id: str):
     """Attach a library image to a draft."""
-    draft = get_draft(draft_id)
-    if not draft:
-        raise HTTPException(status_code=404, detail="Draft not found")
-
-    img = get_image(image_id)
+    img = await image_storage_async.get_image(image_id)
     if not img:
         raise HTTPException(status_code=404, detail="Image not found in library")
 
-    images = draft.get("images", [])
-    # Don't double-attach
-    existing_ids = {
-        (ref.get("id") if isinstance(ref, dict) else ref) for ref in images
-    }
-    if image_id not in existing_ids:
-        images.append({"id": image_id})
-        update_draft(draft_id, images=images)
-
+    if not await run_storage(attach_draft_image, draft_id, image_id):
+        raise HTTPException(status_code=404, detail="Draft not found")
     return JSONResponse({"success": True})
 
 
 @app.delete("/api/drafts/{draft_id}/attach-image/{image_id}")
 async def detach_image_from_draft(draft_id: str, image_id: str):
     """Detach a library image from a draft."""
-    draft = get_draft(draft_id)
-    if not draft:
+    if not await run_storage(detach_draft_image, draft_id, image_id):
         raise HTTPException(status_code=404, detail="Draft not found")
+    return JSONResponse({"success": True})
 
-    images = draft.get("images", [])
-    images = [
-        ref for ref in images
-        if (ref.get("id") if isinstance(ref, dict) else ref) != image_id
-    ]
-    update_draft(draft_id, images=images)
 
-    return JSONResponse({"success": True})
+async def _save_draft_fields(draft_id: str, version: int = None, **updates) -> JSONResponse:
+    """
+    Apply a JSON draft edit: 404 if the draft is gone, 409 if version is
+    stale. The response carries the new version for the next edit.
+    """
+    try:
+        draft = await run_storage(update_draft, draft_id, expected_version=version, **updates)
+    except ConflictError as e:
+        return JSONResponse({"error": str(e), "current_version": e.current_version}, status_code=409)
+    if not draft:
+        raise HTTPException(status_code=404, detail="Draft not found")
+    return JSONResponse({"success": True, "version": draft["version"]})
 
 
 @app.post("/api/drafts/{draft_id}/schedule")
 async def schedule_draft(request: Request, draft_id: str):
     """Set or update the scheduled time for a draft."""
-    draft = get_draft(draft_id)
-    if not draft:
-        raise HTTPException(status_code=404, detail="Draft not found")
-
     data = await request.json()
     scheduled_time = data.get("scheduled_time")
 
@@ -2803,31 +3464,26 @@ async def schedule_draft(request: Request, draft_id: str):
     if scheduled_time:
         updates["status"] = "scheduled"
 
-    update_draft(draft_id, **updates)
-    return JSONResponse({"success": True})
+    try:
+        return await _save_draft_fields(draft_id, data.get("version"), **updates)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid scheduled_time")
 
 
 @app.post("/api/drafts/{draft_id}/posted-date")
 async def set_posted_date(request: Request, draft_id: str):
     """Set or update the posted_at date for a draft."""
-    draft = get_draft(draft_id)
-    if not draft:
-        raise HTTPException(status_code=404, detail="Draft not found")
-
     data = await request.json()
-    posted_at = data.get("posted_at")
 
-    update_draft(draft_id, posted_at=posted_at)
-    return JSONResponse({"success": True})
+    try:
+        return await _save_draft_fields(draft_id, data.get("version"), posted_at=data.get("posted_at"))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid posted_at")
 
 
 @app.post("/api/drafts/{draft_id}/metrics")
 async def set_metrics(request: Request, draft_id: str):
     """Set or update engagement metrics for a posted draft."""
-    draft = get_draft(draft_id)
-    if not draft:
-        raise HTTPException(status_code=404, detail="Draft not found")
-
     data = await request.json()
     metrics = {
         "impressions": data.get("impressions"),
@@ -2835,11 +3491,11 @@ async def set_metrics(request: Request, draft_id: str):
         "comments": data.get("comments"),
     }
 
-    update_draft(draft_id, metrics=metrics)
-    return JSONResponse({"success": True})
+    return await _save_draft_fields(draft_id, data.get("version"), metrics=metrics)
 
 
 def main():
+    """Development server: one process with auto-reload (production: `workflow.py serve`)."""
     os.chdir(Path(__file__).parent)
     print("Starting LinkedIn Content Creator...")
     print("Open http://localhost:5000 in your browser")
@@ -11,8 +11,13 @@ OTHER COMMANDS:
     python workflow.py list                   # List all drafts
     python workflow.py view <id>              # View a specific draft
     python workflow.py delete <id>            # Delete a draft
-    python workflow.py ui                     # Start the web UI
+    python workflow.py extract-kb             # Pre-extract knowledge base PDFs
+    python workflow.py worker                 # Run background generation jobs
+    python workflow.py migrate                # Apply database schema migrations
+    python workflow.py ui                     # Start the web UI (development, auto-reload)
+    python workflow.py serve --workers 4      # Start the web UI for production
 """
+import os
 import sys
 import argparse
 from pathlib import Path
@@ -59,7 +64,8 @@ def cmd_hooks(args):
 
 def cmd_draft(args):
     """Step 2: Select a hook and generate the post body."""
-    from generate_post import generate_post_body, load_knowledge_base
+    from generate_post import generate_post_body
+    from knowledge_base import get_knowledge_base
     from draft_storage import get_draft, update_draft
 
     draft = get_draft(args.id)
@@ -82,7 +88,7 @@ def cmd_draft(args):
     print(f"Selected hook {args.hook.upper()}: {selected_hook}")
     print(f"\nGenerating post body...")
 
-    kb = load_knowledge_base()
+    kb = get_knowledge_base()
     body = generate_post_body(topic, selected_hook, kb)
 
     # Update draft with body and selected hook
@@ -195,12 +201,108 @@ def cmd_post(args):
         print(f"\nFailed: {result.get('error', 'Unknown error')}")
 
 
+def cmd_extract_kb(args):
+    """Extract knowledge base PDFs into the content-hashed text store."""
+    from pdf_text_store import extract_client_pdfs
+
+    artifacts = extract_client_pdfs(args.client, force=args.force)
+    if not artifacts:
+        print(f"No PDFs found for client '{args.client}'.")
+        return
+
+    for artifact in artifacts:
+        status = "reused" if artifact['reused'] else "extracted"
+        name = Path(artifact['source']).name
+        print(f"  {status:<10} {name} ({artifact['page_count']} pages, {artifact['sha256'][:12]})")
+
+
+def cmd_worker(args):
+    """Process queued background jobs (hooks, drafts, trend scans)."""
+    import time
+    from migrations import ensure_schema
+    from job_queue import JobWorkerPool, recover_stale_jobs, run_pending_jobs
+    import generation_jobs  # noqa: F401  (registers job handlers)
+
+    ensure_schema()
+
+    if args.once:
+        recover_stale_jobs()
+        processed = run_pending_jobs(worker_id="cli")
+        print(f"Processed {processed} job(s)")
+        return
+
+    pool = JobWorkerPool(num_workers=args.workers)
+    pool.start()
+    print(f"Job worker running with {args.workers} thread(s). Ctrl+C to stop.")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        print("Stopping - unfinished jobs will resume on next start...")
+        pool.stop()
+
+
+def cmd_migrate(args):
+    """Apply pending database schema migrations."""
+    from migrations import LATEST_VERSION, current_version, migrate, migration_status
+
+    if args.status:
+        for m in migration_status():
+            state = f"applied {m['applied_at'][:19]}" if m['applied_at'] else "pending"
+            print(f"  {m['version']:>3}  {m['name']:<35} {state}")
+        return
+
+    before = current_version()
+    applied = migrate(target=args.target)
+    if not applied:
+        print(f"Schema is up to date (version {before}).")
+        return
+    for m in applied:
+        print(f"  applied {m.version:>3}  {m.name}")
+    print(f"Schema at version {current_version()} (latest {LATEST_VERSION}).")
+
+
 def cmd_ui(args):
     """Start the web UI."""
     from web_ui import main
     main()
 
 
+def cmd_serve(args):
+    """Start the web UI for production: several uvicorn workers, no reloader."""
+    import uvicorn
+    from migrations import ensure_schema
+
+    # Once per deployment, not once per worker: schema check/migrations and
+    # template bytecode. Workers inherit the environment set here.
+    version = ensure_schema()
+    os.environ['WEB_SCHEMA_CHECKED'] = '1'
+
+    from web_ui import precompile_templates
+    cache_dir = args.template_cache or os.getenv('TEMPLATE_CACHE_DIR') or str(
+        Path(__file__).parent.parent / '.tmp' / 'template_cache')
+    count = precompile_templates(cache_dir)
+    os.environ['TEMPLATE_CACHE_DIR'] = cache_dir
+
+    print(f"Schema version {version}, {count} templates precompiled to {cache_dir}")
+    print(f"Serving on http://{args.host}:{args.port} with {args.workers} worker(s)")
+    uvicorn.run(
+        'web_ui:app',
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        reload=False,
+        timeout_keep_alive=args.keep_alive,
+        timeout_graceful_shutdown=args.graceful_timeout,
+        limit_concurrency=args.limit_concurrency,
+        backlog=args.backlog,
+        proxy_headers=True,
+        forwarded_allow_ips=args.forwarded_allow_ips,
+        log_level=args.log_level,
+        access_log=not args.no_access_log,
+    )
+
+
 def cmd_delete(args):
     """Delete a draft."""
     from draft_storage import delete_draft, get_draft
@@ -234,7 +336,11 @@ Other commands:
     %(prog)s list
     %(prog)s view abc123
     %(prog)s delete abc123
+    %(prog)s extract-kb
+    %(prog)s worker
+    %(prog)s migrate
     %(prog)s ui
+    %(prog)s serve --workers 4
         """
     )
 
@@ -277,11 +383,60 @@ Other commands:
                             help='Skip confirmation')
     del_parser.set_defaults(func=cmd_delete)
 
+    # Extract knowledge base PDFs
+    extract_parser = subparsers.add_parser('extract-kb', help='Pre-extract knowledge base PDFs to text')
+    extract_parser.add_argument('--client', default='Smiths', help='Client knowledge base folder')
+    extract_parser.add_argument('--force', action='store_true',
+                               help='Re-extract even if the PDF is unchanged')
+    extract_parser.set_defaults(func=cmd_extract_kb)
+
+    # Background job worker
+    worker_parser = subparsers.add_parser('worker', help='Run queued background jobs')
+    worker_parser.add_argument('--workers', type=int, default=2, help='Number of worker threads')
+    worker_parser.add_argument('--once', action='store_true',
+                               help='Process the current queue and exit')
+    worker_parser.set_defaults(func=cmd_worker)
+
+    # Schema migrations
+    migrate_parser = subparsers.add_parser('migrate', help='Apply database schema migrations')
+    migrate_parser.add_argument('--status', action='store_true',
+                               help='List applied and pending migrations')
+    migrate_parser.add_argument('--target', type=int, help='Migrate up to this version only')
+    migrate_parser.set_defaults(func=cmd_migrate)
+
     # Web UI
     ui_parser = subparsers.add_parser('ui', help='Start web UI')
     ui_parser.set_defaults(func=cmd_ui)
 
+    # Production web server
+    serve_parser = subparsers.add_parser('serve', help='Start web UI for production (multi-worker, no reload)')
+    serve_parser.add_argument('--host', default=os.getenv('HOST', '0.0.0.0'), help='Bind address')
+    serve_parser.add_argument('--port', type=int, default=int(os.getenv('PORT', '5000')), help='Bind port')
+    serve_parser.add_argument('--workers', type=int,
+                              default=int(os.getenv('WEB_CONCURRENCY', str(os.cpu_count() or 1))),
+                              help='Worker processes (default: $WEB_CONCURRENCY or CPU count)')
+    serve_parser.add_argument('--keep-alive', type=int, default=75,
+                              help='Seconds to hold idle keep-alive connections; keep above the '
+                                   'load balancer idle timeout (default: 75)')
+    serve_parser.add_argument('--graceful-timeout', type=int, default=30,
+                              help='Seconds to let in-flight requests finish on shutdown (default: 30)')
+    serve_parser.add_argument('--limit-concurrency', type=int,
+                              help='Per-worker connection cap before answering 503')
+    serve_parser.add_argument('--backlog', type=int, default=2048, help='Listen socket backlog')
+    serve_parser.add_argument('--forwarded-allow-ips', default=os.getenv('FORWARDED_ALLOW_IPS', '127.0.0.1'),
+                              help='Proxies trusted for X-Forwarded-* headers')
+    serve_parser.add_argument('--template-cache', help='Template bytecode directory (default: .tmp/template_cache)')
+    serve_parser.add_argument('--log-level', default='info',
+                              choices=['critical', 'error', 'warning', 'info', 'debug'])
+    serve_parser.add_argument('--no-access-log', action='store_true', help='Disable per-request access logs')
+    serve_parser.set_defaults(func=cmd_serve)
+
     args = parser.parse_args()
+
+    # One-shot commands don't need a pool of idle connections
+    if args.command not in ('ui', 'serve', 'worker'):
+        os.environ.setdefault('DB_NULL_POOL', '1')
+
     args.func(args)
 
 
@@ -0,0 +1,159 @@
+"""Tests for the calendar service: one range query per view, single-pass day buckets, week/multi-month views and the JSON feed."""
+import asyncio
+import sys
+from datetime import date
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+# Add execution dir to path so imports work
+sys.path.insert(0, str(Path(__file__).parent.parent / "execution"))
+
+from dotenv import load_dotenv
+load_dotenv(Path(__file__).parent.parent / ".env")
+
+import calendar_service
+from calendar_service import bucket_by_day, build_view, feed, month_view, parse_month, posts_for_day, week_view
+from database import SessionLocal, Draft, create_tables
+from draft_storage import create_draft, update_draft
+
+create_tables()
+
+TODAY = date(2026, 3, 18)
+
+
+@pytest.fixture(autouse=True)
+def clean_drafts():
+    with SessionLocal() as db:
+        db.query(Draft).delete()
+        db.commit()
+    yield
+
+
+@pytest.fixture
+def queries(monkeypatch):
+    """Count range queries made by the calendar service."""
+    calls = []
+    original = calendar_service.list_drafts_between
+
+    async def counting(start, end):
+        calls.append((start, end))
+        return await original(start, end)
+
+    async def second_query(day):
+        pytest.fail("second query")
+
+    monkeypatch.setattr(calendar_service, "list_drafts_between", counting)
+    monkeypatch.setattr(calendar_service, "get_drafts_for_date", second_query)
+    return calls
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def _scheduled(content: str, when: str, posted: str = None) -> dict:
+    draft = create_draft(content)
+    return update_draft(draft["id"], status="scheduled", scheduled_time=when, posted_at=posted)
+
+
+def _posts_by_day(view: dict) -> dict:
+    return {
+        day["date"]: [p["id"] for p in day["posts"]]
+        for calendar in view["calendars"] for day in calendar["days"] if day["posts"]
+    }
+
+
+class TestBucketing:
+    def test_draft_lands_on_scheduled_and_posted_days(self):
+        drafts = [
+            {"id": "a", "scheduled_time": "2026-03-01T09:00:00", "posted_at": "2026-03-02T10:00:00"},
+            {"id": "b", "scheduled_time": "2026-03-01T12:00:00", "posted_at": "2026-03-01T12:05:00"},
+            {"id": "c", "scheduled_time": None, "posted_at": None},
+        ]
+        buckets = bucket_by_day(drafts)
+        assert {day: [d["id"] for d in posts] for day, posts in buckets.items()} == {
+            "2026-03-01": ["a", "b"], "2026-03-02": ["a"],
+        }
+
+    def test_parse_month_falls_back_to_today(self):
+        assert parse_month("2025-11", TODAY) == (2025, 11)
+        for bad in (None, "", "2025", "2025-13", "nope"):
+            assert parse_month(bad, TODAY) == (2026, 3)
+
+
+class TestMonthView:
+    def test_one_query_covers_the_whole_grid(self, queries):
+        april = _scheduled("April", "2026-04-01T09:00:00")
+        edge = _scheduled("Edge", "2026-03-30T09:00:00")  # shown in April's first week
+        _scheduled("Outside", "2026-03-01T09:00:00")
+
+        view = run(month_view(2026, 4, today=TODAY))
+
+        assert len(queries) == 1
+        assert (view["first"], view["last"]) == ("2026-03-29", "2026-05-02")
+        assert _posts_by_day(view) == {"2026-03-30": [edge["id"]], "2026-04-01": [april["id"]]}
+        days = view["calendars"][0]["days"]
+        assert len(days) == 35 and not days[1]["current_month"] and days[3]["current_month"]
+
+    def test_selected_day_comes_from_buckets(self, queries):
+        draft = _scheduled("Body", "2026-03-05T09:00:00", posted="2026-03-06T08:00:00")
+        view = run(build_view(month="2026-03", today=TODAY))
+        assert [d["id"] for d in run(posts_for_day(view, "2026-03-06"))] == [draft["id"]]
+        assert run(posts_for_day(view, "2026-03-07")) == []
+        assert len(queries) == 1
+
+    def test_selected_day_outside_the_view_is_queried(self):
+        draft = _scheduled("Body", "2026-06-10T09:00:00")
+        view = run(build_view(month="2026-03", today=TODAY))
+        assert [d["id"] for d in run(posts_for_day(view, "2026-06-10"))] == [draft["id"]]
+
+    def test_multi_month(self, queries):
+        _scheduled("May", "2026-05-20T09:00:00")
+        view = run(build_view(month="2026-03", months=3, today=TODAY))
+        assert [c["title"] for c in view["calendars"]] == ["March 2026", "April 2026", "May 2026"]
+        assert (view["prev"], view["next"]) == ("2025-12", "2026-06")
+        assert "2026-05-20" in _posts_by_day(view)
+        assert len(queries) == 1
+
+    def test_months_is_capped(self):
+        assert len(run(build_view(month="2026-01", months=100, today=TODAY))["calendars"]) == calendar_service.MAX_MONTHS
+
+
+class TestWeekView:
+    def test_week_starts_on_sunday(self, queries):
+        draft = _scheduled("Body", "2026-03-18T09:00:00")
+        view = run(week_view(date(2026, 3, 18), today=TODAY))
+        days = view["calendars"][0]["days"]
+        assert [d["date"] for d in (days[0], days[-1])] == ["2026-03-15", "2026-03-21"]
+        assert (view["prev"], view["next"]) == ("2026-03-08", "2026-03-22")
+        assert [d["is_today"] for d in days].index(True) == 3
+        assert _posts_by_day(view) == {"2026-03-18": [draft["id"]]}
+        assert len(queries) == 1
+
+
+class TestCalendarRoutes:
+    @pytest.fixture
+    def client(self):
+        from web_ui import app
+        return TestClient(app)
+
+    def test_feed(self, client):
+        draft = _scheduled("First line\nrest", "2026-03-05T09:00:00")
+        data = client.get("/api/calendar?month=2026-03").json()
+        assert data["view"] == "month" and "buckets" not in data
+        [post] = [p for day in data["calendars"][0]["days"] for p in day["posts"]]
+        assert post["id"] == draft["id"] and post["label"] == "First line"
+
+    def test_feed_matches_service(self, client):
+        _scheduled("Body", "2026-03-05T09:00:00")
+        data = client.get("/api/calendar?view=week&date=2026-03-05").json()
+        assert data == feed(run(build_view("week", day="2026-03-05")))
+
+    def test_pages_render(self, client):
+        draft = _scheduled("Body", "2026-03-05T09:00:00")
+        for url in ("/calendar?month=2026-03&date=2026-03-05", "/calendar?month=2026-03&months=3",
+                    "/calendar?view=week&date=2026-03-05", "/calendar?month=bad&date=bad"):
+            assert client.get(url).status_code == 200
+        assert f"/edit/{draft['id']}" in client.get("/calendar?view=week&date=2026-03-05").text
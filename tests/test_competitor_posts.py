@@ -2,7 +2,7 @@
 import sys
 import os
 from pathlib import Path
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch, MagicMock, AsyncMock
 
 import pytest
 
@@ -20,7 +20,7 @@ load_dotenv(Path(__file__).parent.parent / ".env")
 from draft_storage import (
     COMPETITORS, POST_TYPES, save_competitor_post, get_competitor_posts,
     update_competitor_post, delete_competitor_post, get_competitor_names,
-    get_competitor_stats,
+    get_competitor_stats, get_competitor_breakdown,
 )
 
 
@@ -134,6 +134,22 @@ class TestCompetitorPostCRUD:
         delete_competitor_post(p2["id"])
         delete_competitor_post(p3["id"])
 
+    def test_breakdown_averages_engagement(self):
+        p1 = save_competitor_post(competitor_name="Breakdown Co", post_content="A", likes=10, comments=4,
+                                  reposts=1, performance="high")
+        p2 = save_competitor_post(competitor_name="Breakdown Co", post_content="B", likes=20, comments=None,
+                                  performance="low")
+
+        row = next(r for r in get_competitor_breakdown() if r["competitor_name"] == "Breakdown Co")
+        assert row["posts"] == 2
+        assert row["avg_likes"] == 15.0
+        assert row["avg_comments"] == 4.0  # NULLs are ignored
+        assert row["performance"] == {"high": 1, "medium": 0, "low": 1}
+
+        # Cleanup
+        delete_competitor_post(p1["id"])
+        delete_competitor_post(p2["id"])
+
     def test_update_nonexistent_returns_none(self):
         result = update_competitor_post("nonexistent-id", hook="test")
         assert result is None
@@ -144,7 +160,7 @@ class TestCompetitorPostCRUD:
 # =============================================================================
 
 class TestAnalyzeCompetitorPost:
-    @patch("analyze_competitor_post.Anthropic")
+    @patch("llm_gateway.get_client")
     def test_analyze_post_returns_structured(self, mock_anthropic_cls):
         mock_client = MagicMock()
         mock_anthropic_cls.return_value = mock_client
@@ -162,7 +178,7 @@ class TestAnalyzeCompetitorPost:
         assert result["post_type"] == "Contrarian"
         assert "bold" in result["notes"].lower() or len(result["notes"]) > 0
 
-    @patch("analyze_competitor_post.Anthropic")
+    @patch("llm_gateway.get_client")
     def test_analyze_post_handles_markdown_fences(self, mock_anthropic_cls):
         mock_client = MagicMock()
         mock_anthropic_cls.return_value = mock_client
@@ -179,7 +195,7 @@ class TestAnalyzeCompetitorPost:
         assert result["hook"] == "Test hook"
         assert result["post_type"] == "Story"
 
-    @patch("analyze_competitor_post.Anthropic")
+    @patch("llm_gateway.get_client")
     def test_analyze_post_handles_invalid_json(self, mock_anthropic_cls):
         mock_client = MagicMock()
         mock_anthropic_cls.return_value = mock_client
@@ -212,6 +228,11 @@ class TestCompetitorRoutes:
         assert resp.status_code == 200
         assert "Competitor Posts" in resp.text
 
+    def test_stats_api(self):
+        resp = client.get("/api/competitors/stats")
+        assert resp.status_code == 200
+        assert "total" in resp.json() and isinstance(resp.json()["competitors"], list)
+
     def test_add_and_delete_competitor_post(self):
         # Add
         resp = client.post("/competitors/add", data={
@@ -272,7 +293,7 @@ class TestCompetitorRoutes:
         resp = client.get("/competitors?competitor=Aidan+Collins&type=Story&performance=high")
         assert resp.status_code == 200
 
-    @patch("web_ui.analyze_post")
+    @patch("web_ui.analyze_post_async", new_callable=AsyncMock)
     def test_analyze_endpoint(self, mock_analyze):
         mock_analyze.return_value = {
             "hook": "AI hook",
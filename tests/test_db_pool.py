@@ -0,0 +1,106 @@
+"""Tests for the engine factory: pool configuration, NullPool and checkout statistics."""
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import NullPool, QueuePool
+
+# Add execution dir to path so imports work
+sys.path.insert(0, str(Path(__file__).parent.parent / "execution"))
+
+from dotenv import load_dotenv
+load_dotenv(Path(__file__).parent.parent / ".env")
+
+import database
+from database import PoolStats, make_async_engine, make_engine
+
+
+class TestMakeEngine:
+    def test_queue_pool_from_settings(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(database, "DB_POOL_SIZE", 3)
+        monkeypatch.setattr(database, "DB_POOL_RECYCLE", 60)
+        engine = make_engine(f"sqlite:///{tmp_path / 'pool.db'}", null_pool=False)
+
+        assert isinstance(engine.pool, QueuePool)
+        assert engine.pool.size() == 3
+        assert engine.pool._recycle == 60
+        assert engine.pool._pre_ping is True
+
+    def test_null_pool_for_cli(self, tmp_path):
+        engine = make_engine(f"sqlite:///{tmp_path / 'pool.db'}", null_pool=True)
+        assert isinstance(engine.pool, NullPool)
+
+    def test_postgres_statement_timeout(self, monkeypatch):
+        monkeypatch.setattr(database, "DB_STATEMENT_TIMEOUT_MS", 5000)
+        captured = {}
+        monkeypatch.setattr(database, "create_engine", lambda url, **kwargs: captured.update(kwargs))
+        make_engine("postgresql://user:pw@localhost/db", null_pool=True)
+        assert captured["connect_args"] == {"options": "-c statement_timeout=5000"}
+        assert captured["poolclass"] is NullPool
+
+
+class TestMakeAsyncEngine:
+    def test_own_pool_size_and_stats(self, tmp_path, monkeypatch):
+        pytest.importorskip("aiosqlite")
+        monkeypatch.setattr(database, "DB_ASYNC_POOL_SIZE", 2)
+        monkeypatch.setattr(database, "DB_ASYNC_MAX_OVERFLOW", 1)
+        stats = PoolStats()
+
+        async def use():
+            engine = make_async_engine(f"sqlite:///{tmp_path / 'pool.db'}", null_pool=False, stats=stats)
+            async with engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+            pool = engine.sync_engine.pool
+            await engine.dispose()
+            return pool
+
+        pool = asyncio.run(use())
+        assert isinstance(pool, database.InstrumentedAsyncQueuePool)
+        assert pool.size() == 2 and pool._max_overflow == 1
+        assert stats.snapshot()["checkouts"] == 1
+
+
+class TestPoolStats:
+    def test_checkouts_and_waits_are_counted(self, tmp_path):
+        stats = PoolStats()
+        engine = make_engine(f"sqlite:///{tmp_path / 'pool.db'}", null_pool=False, stats=stats)
+        for _ in range(3):
+            with engine.connect() as conn:
+                conn.execute(text("SELECT 1"))
+
+        snapshot = stats.snapshot()
+        assert snapshot["checkouts"] == 3
+        assert snapshot["checkins"] == 3
+        assert snapshot["connects"] == 1
+        assert snapshot["max_wait_ms"] >= 0
+
+    def test_exhausted_pool_records_timeout(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(database, "DB_POOL_SIZE", 1)
+        monkeypatch.setattr(database, "DB_MAX_OVERFLOW", 0)
+        monkeypatch.setattr(database, "DB_POOL_TIMEOUT", 0.05)
+        stats = PoolStats()
+        engine = make_engine(f"sqlite:///{tmp_path / 'pool.db'}", null_pool=False, stats=stats)
+
+        with engine.connect():
+            with pytest.raises(PoolTimeoutError):
+                engine.connect()
+
+        snapshot = stats.snapshot()
+        assert snapshot["timeouts"] == 1
+        assert snapshot["max_wait_ms"] >= 40
+
+
+class TestDiagnosticsEndpoint:
+    def test_pool_stats_endpoint(self):
+        from fastapi.testclient import TestClient
+        from web_ui import app
+
+        resp = TestClient(app).get("/api/diagnostics/db-pool")
+        assert resp.status_code == 200
+        data = resp.json()
+        assert data["pool_class"]
+        assert "checkouts" in data and "avg_wait_ms" in data
+        assert data["async"]["pool_size"] == database.DB_ASYNC_POOL_SIZE and "checkouts" in data["async"]
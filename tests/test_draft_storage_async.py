@@ -0,0 +1,199 @@
+"""Tests for the AsyncSession twins of draft and image storage reads: parity with the sync API, pagination, concurrent use, pool stats and engine lifetime."""
+import asyncio
+import sys
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("aiosqlite")
+
+# Add execution dir to path so imports work
+sys.path.insert(0, str(Path(__file__).parent.parent / "execution"))
+
+from dotenv import load_dotenv
+load_dotenv(Path(__file__).parent.parent / ".env")
+
+import database
+import draft_storage
+import draft_storage_async
+import image_storage
+import image_storage_async
+from database import SessionLocal, CompetitorPost, Draft, Image, TrendingTopic, create_tables, get_pool_stats
+from draft_storage import COMPETITORS
+from pagination import fetch_page, fetch_page_async
+
+create_tables()
+
+
+def run(coro):
+    """Run a coroutine on a fresh loop (its async engine is disposed as the loop shuts down)."""
+    return asyncio.run(coro)
+
+
+@pytest.fixture(autouse=True)
+def clean_tables():
+    with SessionLocal() as db:
+        for model in (Draft, CompetitorPost, TrendingTopic, Image):
+            db.query(model).delete()
+        db.commit()
+    yield
+
+
+class TestDrafts:
+    def test_get_matches_sync(self):
+        draft = draft_storage.create_draft("Body", hooks=["A", "B"], topic="t", selected_hook=1)
+        assert run(draft_storage_async.get_draft(draft["id"])) == draft_storage.get_draft(draft["id"])
+        assert run(draft_storage_async.get_draft("missing")) is None
+
+    def test_scheduled_drafts_by_day(self):
+        draft = draft_storage.create_draft("Body")
+        draft_storage.update_draft(draft["id"], status="scheduled", scheduled_time="2026-03-05T09:30:00")
+        assert [d["id"] for d in run(draft_storage_async.get_drafts_for_date("2026-03-05"))] == [draft["id"]]
+        assert run(draft_storage_async.list_drafts_between(datetime(2026, 4, 1), datetime(2026, 5, 1))) == []
+
+    def test_final_post(self):
+        draft = draft_storage.create_draft("Body", hooks=["Hook"], selected_hook=0)
+        assert run(draft_storage_async.get_final_post(draft["id"])) == "Hook\n\nBody"
+        assert run(draft_storage_async.get_final_post("missing")) is None
+
+
+class TestPagination:
+    def test_pages_match_sync(self):
+        for i in range(5):
+            draft_storage.save_competitor_post(COMPETITORS[0]["name"], f"Post {i}", post_type="story")
+
+        sync_pages, async_pages, cursor = [], [], None
+        while True:
+            page = fetch_page(draft_storage.get_competitor_posts, cursor, 2, post_type="story")
+            sync_pages.append(page)
+            cursor = page["next_cursor"]
+            if not cursor:
+                break
+        while True:
+            page = run(fetch_page_async(draft_storage_async.get_competitor_posts, cursor, 2, post_type="story"))
+            async_pages.append(page)
+            cursor = page["next_cursor"]
+            if not cursor:
+                break
+
+        assert async_pages == sync_pages
+        assert [len(p["items"]) for p in async_pages] == [2, 2, 1]
+
+    def test_bad_cursor_raises_value_error(self):
+        with pytest.raises(ValueError):
+            run(fetch_page_async(draft_storage_async.get_trending_topics, "not-a-cursor"))
+
+
+class TestStats:
+    @pytest.fixture
+    def posts(self):
+        names = [c["name"] for c in COMPETITORS[:2]]
+        draft_storage.save_competitor_post(names[0], "a", post_type="story", likes=10, performance="high")
+        draft_storage.save_competitor_post(names[0], "b", post_type="story", likes=20, performance="low")
+        draft_storage.save_competitor_post(names[1], "c", post_type="list", likes=5)
+        draft_storage.save_trending_topics_bulk([
+            {"topic": "x", "relevance_score": 8, "source_platform": "reddit"},
+            {"topic": "y", "relevance_score": 6, "source_platform": "web"},
+            {"topic": "z", "relevance_score": 8, "source_platform": "reddit"},
+        ])
+
+    def test_stats_match_sync(self, posts):
+        async def all_stats():
+            return await asyncio.gather(
+                draft_storage_async.get_competitor_stats(),
+                draft_storage_async.get_competitor_breakdown(),
+                draft_storage_async.get_trending_stats(),
+                draft_storage_async.get_trending_breakdown(),
+            )
+
+        assert run(all_stats()) == [
+            draft_storage.get_competitor_stats(),
+            draft_storage.get_competitor_breakdown(),
+            draft_storage.get_trending_stats(),
+            draft_storage.get_trending_breakdown(),
+        ]
+
+    def test_empty_stats(self):
+        assert run(draft_storage_async.get_competitor_stats()) == draft_storage.get_competitor_stats()
+        assert run(draft_storage_async.get_trending_stats())["total"] == 0
+
+
+class TestConcurrency:
+    def test_gathered_reads_share_the_pool(self):
+        drafts = [draft_storage.create_draft(f"Body {i}") for i in range(20)]
+
+        async def burst():
+            return await asyncio.gather(*(draft_storage_async.get_draft(d["id"]) for d in drafts))
+
+        before = get_pool_stats()["async"]["checkouts"]
+        assert [d["content"] for d in run(burst())] == [f"Body {i}" for i in range(20)]
+        assert get_pool_stats()["async"]["checkouts"] - before == 20
+
+
+class TestImages:
+    @pytest.fixture
+    def images(self):
+        with SessionLocal() as db:
+            for i in range(3):
+                db.add(Image(id=f"img{i}", original_name=f"img{i}.png", s3_key=f"library/img{i}.png",
+                             url=f"http://s3/img{i}.png", uploaded_at=datetime(2026, 1, 1, 0, i).isoformat()))
+            db.commit()
+        return ["img0", "img1", "img2"]
+
+    def test_reads_match_sync(self, images):
+        draft = draft_storage.create_draft("Body")
+        for image_id in ("img2", "img0"):
+            draft_storage.attach_draft_image(draft["id"], image_id)
+
+        async def reads():
+            return await asyncio.gather(
+                image_storage_async.get_image("img1"),
+                image_storage_async.list_images(),
+                image_storage_async.get_draft_images(draft["id"]),
+                image_storage_async.get_image_drafts("img0"),
+            )
+
+        assert run(reads()) == [
+            image_storage.get_image("img1"),
+            image_storage.list_images(),
+            image_storage.get_draft_images(draft["id"]),
+            image_storage.get_image_drafts("img0"),
+        ]
+        assert [img["id"] for img in image_storage.get_draft_images(draft["id"])] == ["img2", "img0"]
+        assert run(image_storage_async.get_image("missing")) is None
+
+    def test_pages_match_sync(self, images):
+        sync_page = fetch_page(image_storage.list_images, None, 2, created_key="uploaded_at")
+        async_page = run(fetch_page_async(image_storage_async.list_images, None, 2, created_key="uploaded_at"))
+        assert async_page == sync_page
+        assert [img["id"] for img in async_page["items"]] == ["img2", "img1"]
+
+        rest = run(fetch_page_async(image_storage_async.list_images, async_page["next_cursor"], 2,
+                                    created_key="uploaded_at"))
+        assert [img["id"] for img in rest["items"]] == ["img0"] and rest["next_cursor"] is None
+
+
+class TestEngineLifetime:
+    def test_closed_loops_leave_no_engines(self):
+        threads = threading.active_count()
+        for _ in range(5):
+            run(draft_storage_async.get_competitor_posts())
+
+        assert database._async_engines == {}
+        # aiosqlite's connection threads exit once their connection is closed
+        deadline = time.monotonic() + 2
+        while threading.active_count() > threads and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert threading.active_count() <= threads
+
+    def test_explicit_dispose(self):
+        async def use_and_dispose():
+            await draft_storage_async.get_competitor_posts()
+            assert asyncio.get_running_loop() in database._async_engines
+            await database.dispose_async_engine()
+            return dict(database._async_engines)
+
+        assert run(use_and_dispose()) == {}
@@ -0,0 +1,410 @@
+"""Tests for draft storage: typed timestamps, date range queries, timestamp migration, bulk inserts, versioned updates, usage counters and attached images."""
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import IntegrityError
+
+# Add execution dir to path so imports work
+sys.path.insert(0, str(Path(__file__).parent.parent / "execution"))
+
+from dotenv import load_dotenv
+load_dotenv(Path(__file__).parent.parent / ".env")
+
+from database import (
+    SessionLocal, Draft, Hook, Idea, Image, create_tables, engine,
+    add_version_columns, migrate_draft_images, migrate_draft_timestamps, parse_timestamp,
+)
+from draft_storage import (
+    create_draft, get_draft, update_draft, delete_draft,
+    attach_draft_image, detach_draft_image, update_insight, save_insight_to_bank, ConflictError,
+    increment_hook_usage, increment_idea_usage, record_bank_usage,
+    list_drafts_by_date, get_drafts_for_date,
+    create_drafts_bulk, save_hooks_bulk, save_ideas_bulk, get_hooks_bank, get_ideas_bank,
+)
+from image_storage import delete_image, get_draft_images, get_image_drafts
+
+create_tables()
+
+
+@pytest.fixture(autouse=True)
+def clean_drafts():
+    with SessionLocal() as db:
+        db.query(Draft).delete()
+        db.commit()
+    yield
+
+
+class TestParseTimestamp:
+    def test_parses_iso_and_datetime_local(self):
+        assert parse_timestamp("2024-03-05T09:30:00") == datetime(2024, 3, 5, 9, 30)
+        assert parse_timestamp("2024-03-05T09:30") == datetime(2024, 3, 5, 9, 30)
+
+    def test_empty_values_are_none(self):
+        assert parse_timestamp(None) is None
+        assert parse_timestamp("") is None
+
+    def test_invalid_value_raises(self):
+        with pytest.raises(ValueError):
+            parse_timestamp("next tuesday")
+
+
+class TestDraftTimestamps:
+    def test_dict_keeps_iso_strings(self):
+        draft = create_draft(content="Body")
+        assert isinstance(draft["created_at"], str)
+        assert datetime.fromisoformat(draft["created_at"])
+
+        updated = update_draft(draft["id"], scheduled_time="2024-03-05T09:30")
+        assert updated["scheduled_time"] == "2024-03-05T09:30:00"
+
+    def test_clearing_schedule(self):
+        draft = create_draft(content="Body")
+        update_draft(draft["id"], scheduled_time="2024-03-05T09:30")
+        assert update_draft(draft["id"], scheduled_time=None)["scheduled_time"] is None
+
+
+class TestDateQueries:
+    def _draft(self, **times):
+        draft = create_draft(content="Body")
+        return update_draft(draft["id"], **times)
+
+    def test_month_range_includes_scheduled_and_posted(self):
+        scheduled = self._draft(scheduled_time="2024-03-31T23:59")
+        posted = self._draft(posted_at="2024-03-01T00:00")
+        self._draft(scheduled_time="2024-04-01T00:00")
+        self._draft(posted_at="2024-02-29T23:59")
+
+        ids = {d["id"] for d in list_drafts_by_date(2024, 3)}
+        assert ids == {scheduled["id"], posted["id"]}
+
+    def test_december_wraps_to_next_year(self):
+        draft = self._draft(scheduled_time="2024-12-31T10:00")
+        self._draft(scheduled_time="2025-01-01T10:00")
+        assert [d["id"] for d in list_drafts_by_date(2024, 12)] == [draft["id"]]
+
+    def test_single_day(self):
+        draft = self._draft(scheduled_time="2024-03-05T09:30")
+        self._draft(scheduled_time="2024-03-06T00:00")
+        assert [d["id"] for d in get_drafts_for_date("2024-03-05")] == [draft["id"]]
+
+
+class TestTimestampMigration:
+    def test_legacy_iso_strings_are_converted(self):
+        if engine.dialect.name != "sqlite":
+            pytest.skip("legacy rows are inserted with SQLite's dynamic typing")
+        with engine.begin() as conn:
+            conn.execute(text(
+                "INSERT INTO drafts (id, content, status, scheduled_time, posted_at, created_at, updated_at) "
+                "VALUES ('legacy1', 'Body', 'scheduled', '2024-03-05T09:30:00', '', "
+                "'2024-03-01T08:00:00.123456', '2024-03-01T08:00:00')"
+            ))
+
+        migrate_draft_timestamps()
+        migrate_draft_timestamps()  # idempotent
+
+        draft = get_draft("legacy1")
+        assert draft["scheduled_time"] == "2024-03-05T09:30:00"
+        assert draft["posted_at"] is None
+        assert draft["created_at"] == "2024-03-01T08:00:00.123456"
+        assert [d["id"] for d in get_drafts_for_date("2024-03-05")] == ["legacy1"]
+        assert delete_draft("legacy1")
+
+    def test_space_separators_and_offsets_are_normalised(self):
+        if engine.dialect.name != "sqlite":
+            pytest.skip("legacy rows are inserted with SQLite's dynamic typing")
+        values = ("2024-03-05 09:30:00", "2024-03-05T09:30:00+00:00", "2024-03-01 08:00:00Z")
+        with engine.begin() as conn:
+            conn.execute(text(
+                "INSERT INTO drafts (id, content, status, scheduled_time, posted_at, created_at, updated_at) "
+                "VALUES ('legacy2', 'Body', 'posted', :scheduled, :posted, :created, '2024-03-01T08:00:00')"
+            ), dict(zip(("scheduled", "posted", "created"), values)))
+
+        migrate_draft_timestamps()
+        migrate_draft_timestamps()  # idempotent
+
+        draft = get_draft("legacy2")
+        expected = [parse_timestamp(v).isoformat() for v in values]
+        assert [draft["scheduled_time"], draft["posted_at"], draft["created_at"]] == expected
+        assert expected[0] == "2024-03-05T09:30:00"
+        assert delete_draft("legacy2")
+
+
+class TestBulkInserts:
+    def test_create_drafts_bulk_returns_rows_in_order(self):
+        drafts = create_drafts_bulk([
+            {"content": "First", "hooks": ["Hook"], "selected_hook": 0, "topic": "A"},
+            {"content": "Second"},
+        ])
+        assert [d["content"] for d in drafts] == ["First", "Second"]
+        assert drafts[0]["hooks"] == ["Hook"] and drafts[1]["hooks"] == []
+        assert get_draft(drafts[1]["id"])["status"] == "draft"
+
+    def test_failed_batch_saves_nothing(self):
+        with SessionLocal() as db:
+            before = db.query(Hook).count()
+        with pytest.raises(IntegrityError):
+            save_hooks_bulk(["Fine", None, "Also fine"])
+        with SessionLocal() as db:
+            assert db.query(Hook).count() == before
+
+    def test_save_hooks_and_ideas_bulk(self):
+        with SessionLocal() as db:
+            db.query(Hook).delete()
+            db.query(Idea).delete()
+            db.commit()
+
+        hooks = save_hooks_bulk([f"Hook {i}" for i in range(30)], topic="Outreach")
+        ideas = save_ideas_bulk([{"idea": "Idea", "angle": "Personal"}, {"idea": "Other"}], topic="Outreach")
+
+        assert [h["hook"] for h in hooks] == [f"Hook {i}" for i in range(30)]
+        assert len(get_hooks_bank("Outreach")) == 30
+        assert ideas[0]["angle"] == "Personal" and ideas[1]["angle"] is None
+        assert len(get_ideas_bank("Outreach")) == 2
+
+    def test_empty_batch_is_a_no_op(self):
+        assert save_hooks_bulk([]) == []
+
+
+class TestVersionedUpdates:
+    def test_each_update_bumps_version(self):
+        draft = create_draft(content="Body")
+        assert draft["version"] == 1
+        assert update_draft(draft["id"], content="Edited")["version"] == 2
+        assert update_draft(draft["id"], status="scheduled")["version"] == 3
+
+    def test_stale_version_conflicts(self):
+        draft = create_draft(content="Body")
+        update_draft(draft["id"], expected_version=1, content="First editor")
+
+        with pytest.raises(ConflictError) as exc:
+            update_draft(draft["id"], expected_version=1, content="Second editor")
+        assert exc.value.current_version == 2
+        assert get_draft(draft["id"])["content"] == "First editor"
+
+    def test_missing_row_is_none(self):
+        assert update_draft("missing", content="x") is None
+        assert update_draft("missing", expected_version=1, content="x") is None
+
+    def test_other_tables_are_versioned(self):
+        insight = save_insight_to_bank("Title", "Body")
+        assert update_insight(insight["id"], expected_version=1, title="New")["version"] == 2
+        with pytest.raises(ConflictError):
+            update_insight(insight["id"], expected_version=1, title="Stale")
+
+    def test_version_column_added_to_legacy_table(self, tmp_path, monkeypatch):
+        import database
+        from sqlalchemy import create_engine, inspect
+
+        legacy = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+        with legacy.begin() as conn:
+            conn.execute(text("CREATE TABLE insights (id VARCHAR PRIMARY KEY, title VARCHAR, content TEXT, "
+                              "category VARCHAR, created_at VARCHAR, updated_at VARCHAR)"))
+            conn.execute(text("INSERT INTO insights VALUES ('i1', 'T', 'C', NULL, '2024', '2024')"))
+        monkeypatch.setattr(database, "engine", legacy)
+
+        add_version_columns()
+        add_version_columns()  # idempotent
+
+        assert "version" in {c["name"] for c in inspect(legacy).get_columns("insights")}
+        with legacy.connect() as conn:
+            assert conn.execute(text("SELECT version FROM insights")).scalar() == 1
+
+
+class TestConflictRoutes:
+    @pytest.fixture
+    def client(self):
+        from fastapi.testclient import TestClient
+        from web_ui import app
+        return TestClient(app)
+
+    def test_stale_edit_form_redirects_with_error(self, client):
+        draft = create_draft(content="Body")
+        update_draft(draft["id"], content="Someone else")
+
+        resp = client.post(f"/update/{draft['id']}", data={"content": "Mine", "version": "1"}, follow_redirects=False)
+        assert resp.status_code == 303
+        assert resp.headers["location"].startswith(f"/edit/{draft['id']}?") and "type=error" in resp.headers["location"]
+        assert get_draft(draft["id"])["content"] == "Someone else"
+
+    def test_stale_json_edit_is_409(self, client):
+        draft = create_draft(content="Body")
+        resp = client.post(f"/api/drafts/{draft['id']}/metrics", json={"likes": 5, "version": 1})
+        assert resp.json() == {"success": True, "version": 2}
+
+        resp = client.post(f"/api/drafts/{draft['id']}/metrics", json={"likes": 6, "version": 1})
+        assert resp.status_code == 409
+        assert resp.json()["current_version"] == 2
+
+
+class TestUsageCounters:
+    @pytest.fixture(autouse=True)
+    def empty_banks(self):
+        with SessionLocal() as db:
+            db.query(Hook).delete()
+            db.query(Idea).delete()
+            db.commit()
+
+    def test_increment_by_id_counts_repeats(self):
+        a, b = save_hooks_bulk(["A", "B"])
+        assert increment_hook_usage([a["id"], b["id"], a["id"]]) == 2
+        assert increment_hook_usage(b["id"]) == 1
+        counts = {h["hook"]: h["used_count"] for h in get_hooks_bank()}
+        assert counts == {"A": 2, "B": 2}
+
+    def test_concurrent_increments_are_not_lost(self):
+        from concurrent.futures import ThreadPoolExecutor
+
+        idea = save_ideas_bulk([{"idea": "Shared"}])[0]
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            list(pool.map(lambda _: increment_idea_usage([idea["id"]]), range(20)))
+        assert get_ideas_bank()[0]["used_count"] == 20
+
+    def test_record_bank_usage_matches_text(self):
+        save_hooks_bulk(["Cold DMs are dead", "Unused hook"])
+        save_ideas_bulk([{"idea": "Outbound math"}])
+
+        updated = record_bank_usage(
+            hooks=["Cold DMs are dead", "Generated, not in bank", "Cold DMs are dead "],
+            ideas=["Outbound math", None],
+        )
+        assert updated == {"hooks": 1, "ideas": 1}
+        assert {h["hook"]: h["used_count"] for h in get_hooks_bank()} == {"Cold DMs are dead": 2, "Unused hook": 0}
+        assert get_ideas_bank()[0]["used_count"] == 1
+
+    def test_create_drafts_job_counts_only_saved_drafts(self, monkeypatch):
+        from generation_jobs import _create_draft_for_hook
+
+        def body(topic, hook, kb, additional_context=None):
+            if hook == "Failed":
+                raise RuntimeError("boom")
+            return "Body"
+
+        monkeypatch.setattr("generate_post.generate_post_body", body)
+        monkeypatch.setattr("generate_post.load_knowledge_base", lambda: {})
+        save_hooks_bulk(["Saved", "Failed"])
+        _create_draft_for_hook({}, {"hook": "Saved", "idea": ""}, "job1:0")
+        with pytest.raises(RuntimeError):
+            _create_draft_for_hook({}, {"hook": "Failed", "idea": ""}, "job1:1")
+        assert {h["hook"]: h["used_count"] for h in get_hooks_bank()} == {"Saved": 1, "Failed": 0}
+
+    def test_rerun_create_drafts_item_is_a_no_op(self, monkeypatch):
+        from generation_jobs import _create_draft_for_hook
+
+        bodies = []
+        monkeypatch.setattr("generate_post.generate_post_body",
+                            lambda *args, **kwargs: bodies.append(1) or "Body")
+        monkeypatch.setattr("generate_post.load_knowledge_base", lambda: {})
+        save_hooks_bulk(["Hook"])
+
+        first = _create_draft_for_hook({}, {"hook": "Hook", "idea": ""}, "job2:0")
+        again = _create_draft_for_hook({}, {"hook": "Hook", "idea": ""}, "job2:0")
+        other = _create_draft_for_hook({}, {"hook": "Hook", "idea": ""}, "job2:1")
+
+        assert again == first and other != first
+        assert len(bodies) == 2
+        assert get_hooks_bank()[0]["used_count"] == 2
+
+    def test_most_used_sort(self):
+        low, high, mid = save_hooks_bulk(["Low", "High", "Mid"])
+        increment_hook_usage([high["id"]] * 3 + [mid["id"]])
+        assert [h["hook"] for h in get_hooks_bank(sort="most_used")] == ["High", "Mid", "Low"]
+        with pytest.raises(ValueError):
+            get_hooks_bank(sort="popular")
+
+
+def _library_image(image_id):
+    with SessionLocal() as db:
+        db.add(Image(id=image_id, original_name=f"{image_id}.png", s3_key=f"library/{image_id}.png",
+                     url=f"http://s3/{image_id}.png", uploaded_at=datetime.now().isoformat()))
+        db.commit()
+
+
+class TestDraftImages:
+    @pytest.fixture(autouse=True)
+    def library(self, monkeypatch):
+        monkeypatch.setattr("image_storage.delete_object", lambda key: None)
+        with SessionLocal() as db:
+            db.query(Image).delete()
+            db.commit()
+        for image_id in ("img1", "img2", "img3"):
+            _library_image(image_id)
+
+    def test_attach_and_detach_keep_order(self):
+        draft = create_draft(content="Body")
+        for image_id in ("img2", "img1", "img2", "img3"):
+            attach_draft_image(draft["id"], image_id)
+        assert get_draft(draft["id"])["images"] == [{"id": "img2"}, {"id": "img1"}, {"id": "img3"}]
+
+        assert detach_draft_image(draft["id"], "img1")["images"] == [{"id": "img2"}, {"id": "img3"}]
+        assert [img["url"] for img in get_draft_images(draft["id"])] == ["http://s3/img2.png", "http://s3/img3.png"]
+
+    def test_missing_draft_or_image(self):
+        draft = create_draft(content="Body")
+        assert attach_draft_image("missing", "img1") is None
+        assert attach_draft_image(draft["id"], "not-in-library")["images"] == []
+        assert detach_draft_image("missing", "img1") is None
+
+    def test_reverse_lookup(self):
+        first, second = create_draft(content="First"), create_draft(content="Second")
+        attach_draft_image(first["id"], "img1")
+        attach_draft_image(second["id"], "img1")
+        assert {d["id"] for d in get_image_drafts("img1")} == {first["id"], second["id"]}
+        assert get_image_drafts("img2") == []
+
+    def test_deleting_either_side_removes_the_link(self):
+        draft = create_draft(content="Body")
+        attach_draft_image(draft["id"], "img1")
+        attach_draft_image(draft["id"], "img2")
+
+        assert delete_image("img1")
+        assert get_draft(draft["id"])["images"] == [{"id": "img2"}]
+
+        assert delete_draft(draft["id"])
+        assert get_image_drafts("img2") == []
+
+    def test_legacy_json_column_is_migrated(self, tmp_path, monkeypatch):
+        import database
+        from sqlalchemy import create_engine, inspect
+
+        legacy = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+        with legacy.begin() as conn:
+            conn.execute(text("CREATE TABLE images (id VARCHAR PRIMARY KEY, original_name VARCHAR, "
+                              "s3_key VARCHAR, url VARCHAR, uploaded_at VARCHAR)"))
+            conn.execute(text("CREATE TABLE drafts (id VARCHAR PRIMARY KEY, content TEXT, images JSON)"))
+            conn.execute(text("INSERT INTO images (id) VALUES ('a'), ('b')"))
+            conn.execute(text("""INSERT INTO drafts VALUES ('d1', 'x', '[{"id": "b"}, "a", {"id": "gone"}, "b"]'), """
+                              """('d2', 'y', NULL)"""))
+        monkeypatch.setattr(database, "engine", legacy)
+
+        migrate_draft_images()
+        migrate_draft_images()  # idempotent
+
+        assert "images" not in {c["name"] for c in inspect(legacy).get_columns("drafts")}
+        with legacy.connect() as conn:
+            links = conn.execute(text("SELECT draft_id, image_id, position FROM draft_images ORDER BY position")).all()
+        assert [tuple(link) for link in links] == [("d1", "b", 0), ("d1", "a", 1)]
+
+
+class TestDraftImageRoutes:
+    @pytest.fixture
+    def client(self, monkeypatch):
+        from fastapi.testclient import TestClient
+        from web_ui import app
+        monkeypatch.setattr("image_storage.delete_object", lambda key: None)
+        with SessionLocal() as db:
+            db.query(Image).delete()
+            db.commit()
+        _library_image("img1")
+        return TestClient(app)
+
+    def test_image_drafts_and_delete(self, client):
+        draft = create_draft(content="Body")
+        assert client.post(f"/api/drafts/{draft['id']}/attach-image/img1").json() == {"success": True}
+        assert [d["id"] for d in client.get("/api/images/img1/drafts").json()["drafts"]] == [draft["id"]]
+
+        assert client.delete("/api/images/img1").json() == {"success": True, "detached_from": [draft["id"]]}
+        assert get_draft(draft["id"])["images"] == []
+        assert client.get("/api/images/img1/drafts").status_code == 404
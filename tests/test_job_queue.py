@@ -0,0 +1,236 @@
+"""Tests for the durable job queue: claiming, progress, resume after restart, and job routes."""
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+# Add execution dir to path so imports work
+sys.path.insert(0, str(Path(__file__).parent.parent / "execution"))
+
+from dotenv import load_dotenv
+load_dotenv(Path(__file__).parent.parent / ".env")
+
+from database import SessionLocal, Draft, Job, create_tables
+import job_queue
+from job_queue import (
+    JobHandler, register_handler, enqueue_job, get_job, claim_next_job,
+    run_job, run_pending_jobs, recover_stale_jobs,
+)
+from draft_storage import create_draft, get_draft, delete_draft
+from generation_jobs import _item_draft_id
+
+create_tables()
+
+calls = []
+
+
+def _double(payload, item):
+    calls.append(item)
+    if item == payload.get("fail_on"):
+        raise ValueError(f"bad item {item}")
+    return item * 2
+
+
+register_handler("test_double", JobHandler(
+    items=lambda payload: payload["numbers"],
+    run_item=_double,
+    finalize=lambda payload, results: {"total": sum(r for r in results if isinstance(r, int))},
+    item_concurrency=1,
+))
+
+
+@pytest.fixture(autouse=True)
+def clean_jobs():
+    calls.clear()
+    with SessionLocal() as db:
+        db.query(Job).delete()
+        db.commit()
+    yield
+
+
+class TestJobQueue:
+    def test_enqueue_records_progress_total(self):
+        job = enqueue_job("test_double", {"numbers": [1, 2, 3]})
+        assert job["status"] == "queued"
+        assert job["progress"] == {"done": 0, "total": 3}
+
+    def test_unknown_kind_rejected(self):
+        with pytest.raises(ValueError):
+            enqueue_job("no_such_kind")
+
+    def test_run_pending_completes_job(self):
+        job = enqueue_job("test_double", {"numbers": [1, 2, 3]})
+        assert run_pending_jobs() == 1
+
+        done = get_job(job["id"])
+        assert done["status"] == "completed"
+        assert done["result"] == {"total": 12}
+        assert done["progress"] == {"done": 3, "total": 3}
+
+    def test_job_is_claimed_once(self):
+        enqueue_job("test_double", {"numbers": [1]})
+        assert claim_next_job("worker-a") is not None
+        assert claim_next_job("worker-b") is None
+
+    def test_item_error_recorded_without_failing_job(self):
+        job = enqueue_job("test_double", {"numbers": [1, 2], "fail_on": 2})
+        run_pending_jobs()
+
+        done = get_job(job["id"])
+        assert done["status"] == "completed"
+        assert done["result"] == {"total": 2}
+
+    def test_resume_runs_only_unfinished_items(self):
+        job = enqueue_job("test_double", {"numbers": [1, 2, 3, 4]})
+        claimed = claim_next_job("worker-a")
+
+        # Process stops after two items (e.g. reload); job goes back to the queue
+        state = {"n": 0}
+
+        def stop_after_two():
+            state["n"] += 1
+            return state["n"] > 2
+
+        assert run_job(claimed, should_stop=stop_after_two) == "queued"
+        assert get_job(job["id"])["progress"]["done"] == 2
+        assert calls == [1, 2]
+
+        run_pending_jobs()
+        done = get_job(job["id"])
+        assert done["status"] == "completed"
+        assert done["result"] == {"total": 20}
+        assert calls == [1, 2, 3, 4]
+        assert done["attempts"] == 2
+
+    def test_keyed_handler_gets_stable_item_keys(self):
+        keys = []
+        register_handler("test_keyed", JobHandler(
+            items=lambda payload: ["a", "b"],
+            run_item=lambda payload, item, key: keys.append(key) or item,
+            keyed=True,
+        ))
+        job = enqueue_job("test_keyed")
+        run_pending_jobs()
+        assert sorted(keys) == [f"{job['id']}:0", f"{job['id']}:1"]
+
+    def test_stale_running_job_is_requeued(self):
+        job = enqueue_job("test_double", {"numbers": [1]})
+        claim_next_job("crashed-worker")
+        with SessionLocal() as db:
+            db.query(Job).filter(Job.id == job["id"]).update({Job.heartbeat_at: "2000-01-01T00:00:00"})
+            db.commit()
+
+        assert recover_stale_jobs(stale_after=60) == 1
+        assert get_job(job["id"])["status"] == "queued"
+        run_pending_jobs()
+        assert get_job(job["id"])["status"] == "completed"
+
+    def test_fresh_running_job_is_not_requeued(self):
+        enqueue_job("test_double", {"numbers": [1]})
+        claim_next_job("live-worker")
+        assert recover_stale_jobs(stale_after=60) == 0
+
+    def test_worker_pool_processes_jobs(self):
+        job = enqueue_job("test_double", {"numbers": [5]})
+        pool = job_queue.JobWorkerPool(num_workers=1, poll_interval=0.05)
+        pool.start()
+        try:
+            for _ in range(100):
+                if get_job(job["id"])["status"] == "completed":
+                    break
+                import time
+                time.sleep(0.05)
+        finally:
+            pool.stop()
+        assert get_job(job["id"])["result"] == {"total": 10}
+
+
+# =============================================================================
+# ROUTE TESTS
+# =============================================================================
+
+from fastapi.testclient import TestClient
+from web_ui import app
+
+client = TestClient(app)
+
+
+class TestJobRoutes:
+    @patch("generate_hooks.generate_hooks", return_value=["Hook one", "Hook two"])
+    def test_hooks_from_ideas_runs_as_job(self, mock_hooks):
+        resp = client.post("/generate-hooks-from-ideas", data={
+            "topic": "Pricing",
+            "idea_0": "Discounting hurts",
+            "angle_0": "Opinion",
+            "selected_0": "1",
+        }, follow_redirects=False)
+        assert resp.status_code == 303
+        job_id = resp.headers["location"].rsplit("/", 1)[-1]
+
+        # Before the worker runs, the job page shows progress
+        assert "Generating Hooks" in client.get(f"/jobs/{job_id}").text
+
+        run_pending_jobs()
+        result = client.get(f"/api/jobs/{job_id}/result").json()
+        assert result["hook_groups"][0]["hooks"] == ["Hook one", "Hook two"]
+        assert result["total_hooks"] == 2
+
+    @patch("generate_post.generate_post_body", return_value="Generated body")
+    @patch("generate_post.load_knowledge_base", return_value={})
+    def test_create_drafts_runs_as_job(self, mock_kb, mock_body):
+        resp = client.post("/create-drafts", data={
+            "topic": "Pricing",
+            "idea_0": "Discounting hurts",
+            "hook_0_0": "Stop discounting.",
+            "selected_0_0": "1",
+        }, follow_redirects=False)
+        job_id = resp.headers["location"].rsplit("/", 1)[-1]
+
+        run_pending_jobs()
+        job = client.get(f"/api/jobs/{job_id}").json()
+        assert job["status"] == "completed"
+        assert job["result"]["created"] == 1
+
+        draft = get_draft(job["result"]["draft_ids"][0])
+        assert draft["content"] == "Generated body"
+        assert draft["hooks"] == ["Stop discounting."]
+        delete_draft(draft["id"])
+
+        # Completed job page forwards to the drafts list
+        resp = client.get(f"/jobs/{job_id}", follow_redirects=False)
+        assert resp.status_code == 303
+        assert resp.headers["location"].startswith("/drafts")
+
+    @patch("generate_post.generate_post_body", return_value="Rerun body")
+    @patch("generate_post.load_knowledge_base", return_value={})
+    def test_rerun_create_drafts_job_makes_no_duplicates(self, mock_kb, mock_body):
+        job = enqueue_job("create_drafts", {"topic": "Pricing", "items": [{"hook": "Hook", "idea": ""}]})
+        run_pending_jobs()
+
+        # Re-claimed as if the worker died before its item results were saved
+        job_queue._update_job(job["id"], status="queued", item_results={}, progress_done=0)
+        run_pending_jobs()
+
+        draft_ids = get_job(job["id"])["result"]["draft_ids"]
+        with SessionLocal() as db:
+            assert db.query(Draft).filter(Draft.content == "Rerun body").count() == 1
+        assert mock_body.call_count == 1
+        delete_draft(draft_ids[0])
+
+    @patch("generate_post.generate_post_body", return_value="Item body")
+    @patch("generate_post.load_knowledge_base", return_value={})
+    def test_item_ids_do_not_collide_with_short_ids(self, mock_kb, mock_body):
+        job = enqueue_job("create_drafts", {"topic": "Pricing", "items": [{"hook": "Hook", "idea": ""}]})
+        # An unrelated draft whose short random ID matches the start of the item's ID
+        other = create_draft("Other", draft_id=_item_draft_id(f"{job['id']}:0")[:8])
+        run_pending_jobs()
+
+        [draft_id] = get_job(job["id"])["result"]["draft_ids"]
+        assert draft_id != other["id"] and get_draft(draft_id)["content"] == "Item body"
+        assert mock_body.call_count == 1
+        delete_draft(draft_id)
+        delete_draft(other["id"])
+
+    def test_missing_job_returns_404(self):
+        assert client.get("/api/jobs/nope").status_code == 404
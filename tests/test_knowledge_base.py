@@ -0,0 +1,196 @@
+"""Tests for the knowledge base cache: per-client caching and file-change invalidation."""
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add execution dir to path so imports work
+sys.path.insert(0, str(Path(__file__).parent.parent / "execution"))
+
+from knowledge_base import KnowledgeBaseCache
+
+
+def _make_kb(root: Path, client: str = "Acme") -> Path:
+    kb_dir = root / client / "Written Posts"
+    kb_dir.mkdir(parents=True)
+    (kb_dir / "story.md").write_text("Origin story v1", encoding="utf-8")
+    (kb_dir / "posts.md").write_text("Best posts v1", encoding="utf-8")
+    return kb_dir
+
+
+DOCUMENTS = {"origin_story": "story.md", "best_posts": "posts.md", "templates": "missing.md"}
+
+
+class TestKnowledgeBaseCache:
+    def test_loads_documents_and_missing_files(self, tmp_path):
+        _make_kb(tmp_path)
+        cache = KnowledgeBaseCache(root=tmp_path)
+
+        kb = cache.get("Acme", DOCUMENTS)
+        assert kb["origin_story"] == "Origin story v1"
+        assert kb["best_posts"] == "Best posts v1"
+        assert kb["templates"] == ""
+
+    def test_second_lookup_is_served_from_cache(self, tmp_path):
+        _make_kb(tmp_path)
+        cache = KnowledgeBaseCache(root=tmp_path)
+
+        cache.get("Acme", DOCUMENTS)
+        reads_after_first = cache.reads
+        cache.get("Acme", DOCUMENTS)
+
+        assert cache.reads == reads_after_first
+        assert cache.hits == len(DOCUMENTS)
+
+    def test_only_changed_document_is_reread(self, tmp_path):
+        kb_dir = _make_kb(tmp_path)
+        cache = KnowledgeBaseCache(root=tmp_path)
+        cache.get("Acme", DOCUMENTS)
+        reads_before = cache.reads
+
+        story = kb_dir / "story.md"
+        story.write_text("Origin story v2 (longer)", encoding="utf-8")
+        stat = story.stat()
+        os.utime(story, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+        kb = cache.get("Acme", DOCUMENTS)
+        assert kb["origin_story"] == "Origin story v2 (longer)"
+        assert kb["best_posts"] == "Best posts v1"
+        assert cache.reads == reads_before + 1
+
+    def test_clients_are_cached_separately(self, tmp_path):
+        _make_kb(tmp_path, "Acme")
+        other = _make_kb(tmp_path, "Globex")
+        (other / "story.md").write_text("Globex story", encoding="utf-8")
+        cache = KnowledgeBaseCache(root=tmp_path)
+
+        assert cache.get("Acme", DOCUMENTS)["origin_story"] == "Origin story v1"
+        assert cache.get("Globex", DOCUMENTS)["origin_story"] == "Globex story"
+        assert cache.stats()["clients"] == ["Acme", "Globex"]
+
+    def test_invalidate_forces_reread(self, tmp_path):
+        _make_kb(tmp_path)
+        cache = KnowledgeBaseCache(root=tmp_path)
+        cache.get("Acme", DOCUMENTS)
+        reads_before = cache.reads
+
+        cache.invalidate("Acme")
+        cache.get("Acme", DOCUMENTS)
+        assert cache.reads == reads_before + len(DOCUMENTS)
+
+
+# =============================================================================
+# PDF TEXT STORE TESTS
+# =============================================================================
+
+import pdf_text_store
+from pdf_text_store import extract_pdf, read_artifact_page, read_artifact_text
+
+
+class TestPdfTextStore:
+    def _fake_pdf(self, tmp_path, content=b"%PDF-fake v1"):
+        pdf = tmp_path / "doc.pdf"
+        pdf.write_bytes(content)
+        return pdf
+
+    def test_extracts_pages_with_offsets(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(pdf_text_store, "iter_pdf_pages", lambda p: iter(["Page one", "Page two"]))
+        pdf = self._fake_pdf(tmp_path)
+
+        meta = extract_pdf(pdf, store_dir=tmp_path / "store")
+        assert meta["reused"] is False
+        assert meta["page_count"] == 2
+        assert read_artifact_text(meta) == "Page one\nPage two\n"
+        assert read_artifact_page(meta, 1) == "Page two"
+
+    def test_reuses_artifact_when_hash_unchanged(self, tmp_path, monkeypatch):
+        calls = []
+
+        def fake_pages(path):
+            calls.append(path)
+            return iter(["Only page"])
+
+        monkeypatch.setattr(pdf_text_store, "iter_pdf_pages", fake_pages)
+        pdf = self._fake_pdf(tmp_path)
+
+        first = extract_pdf(pdf, store_dir=tmp_path / "store")
+        second = extract_pdf(pdf, store_dir=tmp_path / "store")
+        assert second["reused"] is True
+        assert second["sha256"] == first["sha256"]
+        assert len(calls) == 1
+
+    def test_changed_pdf_is_reextracted(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(pdf_text_store, "iter_pdf_pages", lambda p: iter([p.read_bytes().decode()]))
+        pdf = self._fake_pdf(tmp_path)
+        first = extract_pdf(pdf, store_dir=tmp_path / "store")
+
+        pdf.write_bytes(b"%PDF-fake v2")
+        second = extract_pdf(pdf, store_dir=tmp_path / "store")
+        assert second["reused"] is False
+        assert second["sha256"] != first["sha256"]
+        assert read_artifact_text(second) == "%PDF-fake v2\n"
+
+    def test_failed_meta_write_keeps_previous_meta(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(pdf_text_store, "iter_pdf_pages", lambda p: iter(["Page"]))
+        pdf = self._fake_pdf(tmp_path)
+        store = tmp_path / "store"
+        first = extract_pdf(pdf, store_dir=store)
+        meta_path = store / f"{first['sha256']}.json"
+        before = meta_path.read_text()
+
+        def crash(*args, **kwargs):
+            raise OSError("disk full")
+
+        monkeypatch.setattr(pdf_text_store.json, "dump", crash)
+        with pytest.raises(OSError):
+            extract_pdf(pdf, store_dir=store, force=True)
+        assert meta_path.read_text() == before
+        assert sorted(p.suffix for p in store.iterdir()) == [".json", ".txt"]
+
+
+# =============================================================================
+# RETRIEVAL INDEX TESTS
+# =============================================================================
+
+from kb_retrieval import KnowledgeBaseIndex, chunk_text, normalize_text, select_chunks
+from prompt_builder import estimate_tokens
+
+
+class TestRetrievalIndex:
+    def test_normalize_collapses_pdf_word_breaks(self):
+        raw = "Outreach\n \nwithout\n \na\n \nsystem.\n \n \n \n2/\n \nLIKES"
+        assert normalize_text(raw) == "Outreach without a system.\n\n2/ LIKES"
+
+    def test_chunks_respect_size_limit(self):
+        text = "\n\n".join(f"Paragraph {i} " + "word " * 40 for i in range(20))
+        chunks = chunk_text(text, max_chars=500)
+        assert len(chunks) > 1
+        assert all(len(c) <= 500 for c in chunks)
+
+    def test_search_ranks_relevant_chunk_first(self):
+        index = KnowledgeBaseIndex(chunk_chars=20)
+        index.update({"ip": "Cold outreach on LinkedIn needs follow ups.\n\nMy favourite food is pizza."})
+
+        results = index.search("pizza")
+        assert "pizza" in results[0]["text"]
+        assert results[0]["score"] > results[1]["score"]
+
+    def test_select_chunks_stays_within_budget(self):
+        index = KnowledgeBaseIndex()
+        text = "\n\n".join(f"Outreach tip {i}. " + "detail " * 150 for i in range(6))
+        index.update({"ip": text})
+
+        excerpt = select_chunks(index, "outreach tip", "ip", budget_tokens=600)
+        assert excerpt
+        assert estimate_tokens(excerpt) <= 600
+
+    def test_only_changed_documents_are_reindexed(self, tmp_path):
+        path = tmp_path / "index.json"
+        index = KnowledgeBaseIndex(path)
+        assert sorted(index.update({"a": "alpha text", "b": "beta text"})) == ["a", "b"]
+        assert index.update({"a": "alpha text", "b": "beta text changed"}) == ["b"]
+
+        # Persisted index is reloaded without re-chunking unchanged documents
+        reloaded = KnowledgeBaseIndex(path)
+        assert reloaded.update({"a": "alpha text", "b": "beta text changed"}) == []
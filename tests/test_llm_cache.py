@@ -0,0 +1,150 @@
+"""Tests for the LLM response cache: keys, hits, bypass, TTL expiry and LRU eviction."""
+import asyncio
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+from unittest.mock import MagicMock, AsyncMock
+
+import pytest
+
+# Add execution dir to path so imports work
+sys.path.insert(0, str(Path(__file__).parent.parent / "execution"))
+
+from dotenv import load_dotenv
+load_dotenv(Path(__file__).parent.parent / ".env")
+
+from database import SessionLocal, LLMCacheEntry, create_tables
+import llm_cache
+import llm_gateway
+from llm_gateway import call_llm, call_llm_async, stream_llm_async
+from llm_metrics import get_usage_summary, reset_metrics
+
+create_tables()
+
+REQUEST = {
+    "model": "claude-sonnet-4-20250514",
+    "max_tokens": 100,
+    "system": [{"type": "text", "text": "You write hooks."}],
+    "messages": [{"role": "user", "content": "Topic: outreach"}],
+}
+
+
+def _response(text="cached text"):
+    response = MagicMock()
+    response.content = [MagicMock(text=text)]
+    response.stop_reason = "end_turn"
+    response.usage = MagicMock(input_tokens=10, output_tokens=5)
+    return response
+
+
+@pytest.fixture(autouse=True)
+def clean_cache(monkeypatch):
+    monkeypatch.setattr(llm_cache, "CACHE_ENABLED", True)
+    llm_cache.clear()
+    reset_metrics()
+    yield
+    llm_gateway.reset_client()
+    llm_gateway.set_async_client(None)
+
+
+@pytest.fixture
+def stub_client():
+    client = MagicMock()
+    client.messages.create.return_value = _response()
+    llm_gateway.set_client(client)
+    return client
+
+
+class TestCacheKey:
+    def test_same_request_same_key(self):
+        reordered = dict(reversed(list(REQUEST.items())))
+        assert llm_cache.cache_key(REQUEST) == llm_cache.cache_key(reordered)
+
+    def test_params_change_key(self):
+        assert llm_cache.cache_key(REQUEST) != llm_cache.cache_key({**REQUEST, "temperature": 1.0})
+        assert llm_cache.cache_key(REQUEST) != llm_cache.cache_key({**REQUEST, "model": "claude-3-5-haiku"})
+
+    def test_stream_flag_is_ignored(self):
+        assert llm_cache.cache_key(REQUEST) == llm_cache.cache_key({**REQUEST, "stream": True})
+
+
+class TestGatewayCaching:
+    def test_identical_request_is_served_from_cache(self, stub_client):
+        first = call_llm("generate_hooks", **REQUEST)
+        second = call_llm("generate_hooks", **REQUEST)
+
+        assert stub_client.messages.create.call_count == 1
+        assert second.content[0].text == first.content[0].text == "cached text"
+        assert second.cached is True
+        assert get_usage_summary()["total"]["response_cache_hits"] == 1
+
+    def test_bypass_always_calls_api(self, stub_client):
+        call_llm("generate_hooks", **REQUEST)
+        call_llm("generate_hooks", use_cache=False, **REQUEST)
+        assert stub_client.messages.create.call_count == 2
+
+    def test_disabled_by_default(self, stub_client, monkeypatch):
+        monkeypatch.setattr(llm_cache, "CACHE_ENABLED", False)
+        call_llm("generate_hooks", **REQUEST)
+        call_llm("generate_hooks", **REQUEST)
+        assert stub_client.messages.create.call_count == 2
+        assert llm_cache.stats()["entries"] == 0
+
+    def test_async_path_uses_cache(self):
+        client = MagicMock()
+        client.messages.create = AsyncMock(return_value=_response("async text"))
+        llm_gateway.set_async_client(client)
+
+        async def run():
+            await call_llm_async("generate_ideas", **REQUEST)
+            return await call_llm_async("generate_ideas", **REQUEST)
+
+        assert asyncio.run(run()).content[0].text == "async text"
+        assert client.messages.create.await_count == 1
+
+    def test_stream_replays_cached_text(self, stub_client):
+        call_llm("generate_hooks", **REQUEST)
+
+        async def run():
+            return [text async for text in stream_llm_async("generate_hooks", **REQUEST)]
+
+        assert asyncio.run(run()) == ["cached text"]
+        assert stub_client.messages.create.call_count == 1
+
+
+class TestExpiryAndEviction:
+    def test_stats_totals(self):
+        llm_cache.put("a", "n", "m", "A")
+        llm_cache.put("b", "n", "m", "Bee")
+        llm_cache.get("a")
+        llm_cache.get("a")
+        with SessionLocal() as db:
+            sizes = sum(e.size_bytes for e in db.query(LLMCacheEntry))
+        stats = llm_cache.stats()
+        assert (stats["entries"], stats["hits"], stats["size_bytes"]) == (2, 2, sizes)
+
+    def test_expired_entry_is_a_miss(self):
+        key = llm_cache.cache_key(REQUEST)
+        llm_cache.put(key, "generate_hooks", REQUEST["model"], "old")
+        with SessionLocal() as db:
+            db.get(LLMCacheEntry, key).expires_at = (datetime.now() - timedelta(seconds=1)).isoformat()
+            db.commit()
+
+        assert llm_cache.get(key) is None
+        assert llm_cache.stats()["entries"] == 0
+
+    def test_least_recently_used_is_evicted(self, monkeypatch):
+        monkeypatch.setattr(llm_cache, "CACHE_MAX_ENTRIES", 2)
+        llm_cache.put("a", "n", "m", "A")
+        llm_cache.put("b", "n", "m", "B")
+        with SessionLocal() as db:
+            # Make "a" older, then touch it so "b" becomes least recently used
+            db.get(LLMCacheEntry, "a").last_used_at = "2000-01-01T00:00:00"
+            db.get(LLMCacheEntry, "b").last_used_at = "2000-01-02T00:00:00"
+            db.commit()
+        assert llm_cache.get("a") is not None
+
+        llm_cache.put("c", "n", "m", "C")
+        assert llm_cache.get("b") is None
+        assert llm_cache.get("a") is not None
+        assert llm_cache.get("c") is not None
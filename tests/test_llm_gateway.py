@@ -0,0 +1,197 @@
+"""Tests for the LLM gateway: shared client, retries, rate limiting and concurrency caps."""
+import asyncio
+import sys
+import threading
+import time
+from pathlib import Path
+from unittest.mock import patch, MagicMock, AsyncMock
+
+import httpx
+import pytest
+from anthropic import BadRequestError, RateLimitError
+
+# Add execution dir to path so imports work
+sys.path.insert(0, str(Path(__file__).parent.parent / "execution"))
+
+import llm_gateway
+from llm_gateway import TokenBucket, backoff_delay, call_llm, call_llm_async, is_retryable
+
+
+def _api_error(cls, status, headers=None):
+    request = httpx.Request("POST", "https://api.anthropic.com/v1/messages")
+    response = httpx.Response(status, request=request, headers=headers or {})
+    return cls("error", response=response, body=None)
+
+
+def _ok_response():
+    response = MagicMock()
+    response.content = [MagicMock(text="ok")]
+    response.usage = MagicMock(input_tokens=10, output_tokens=5)
+    return response
+
+
+@pytest.fixture
+def stub_client():
+    client = MagicMock()
+    llm_gateway.set_client(client)
+    yield client
+    llm_gateway.reset_client()
+
+
+class TestTokenBucket:
+    def test_acquire_within_capacity_does_not_wait(self):
+        bucket = TokenBucket(60)
+        assert bucket.try_acquire(10) == 0.0
+        assert bucket.tokens == pytest.approx(50, abs=0.1)
+
+    def test_reports_wait_when_empty(self):
+        bucket = TokenBucket(60)  # 1 token per second
+        bucket.try_acquire(60)
+        wait = bucket.try_acquire(2)
+        assert 1.5 < wait <= 2.0
+
+    def test_oversized_request_is_clamped_to_capacity(self):
+        bucket = TokenBucket(100)
+        assert bucket.try_acquire(10_000) == 0.0
+
+
+class TestRetries:
+    def test_shared_client_is_reused(self):
+        llm_gateway.reset_client()
+        with patch("llm_gateway.Anthropic") as mock_cls:
+            assert llm_gateway.get_client() is llm_gateway.get_client()
+            assert mock_cls.call_count == 1
+        llm_gateway.reset_client()
+
+    def test_rate_limit_and_overload_are_retryable(self):
+        assert is_retryable(_api_error(RateLimitError, 429))
+        assert not is_retryable(_api_error(BadRequestError, 400))
+
+    def test_retry_after_header_is_respected(self):
+        error = _api_error(RateLimitError, 429, {"retry-after": "3"})
+        assert backoff_delay(0, error) == 3.0
+
+    def test_backoff_grows_and_is_capped(self):
+        assert all(backoff_delay(0) <= 1.0 for _ in range(20))
+        assert all(backoff_delay(20) <= llm_gateway.BACKOFF_MAX_SECONDS for _ in range(20))
+
+    @patch("llm_gateway.time.sleep")
+    def test_retries_429_then_succeeds(self, mock_sleep, stub_client):
+        stub_client.messages.create.side_effect = [
+            _api_error(RateLimitError, 429),
+            _api_error(RateLimitError, 429),
+            _ok_response(),
+        ]
+        response = call_llm("unit", model="m", max_tokens=10, messages=[])
+        assert response.content[0].text == "ok"
+        assert stub_client.messages.create.call_count == 3
+        assert mock_sleep.call_count == 2
+
+    @patch("llm_gateway.time.sleep")
+    def test_non_retryable_error_raises_immediately(self, mock_sleep, stub_client):
+        stub_client.messages.create.side_effect = _api_error(BadRequestError, 400)
+        with pytest.raises(BadRequestError):
+            call_llm("unit", model="m", max_tokens=10, messages=[])
+        assert stub_client.messages.create.call_count == 1
+        mock_sleep.assert_not_called()
+
+    @patch("llm_gateway.time.sleep")
+    def test_gives_up_after_max_retries(self, mock_sleep, stub_client):
+        stub_client.messages.create.side_effect = _api_error(RateLimitError, 429)
+        with pytest.raises(RateLimitError):
+            call_llm("unit", max_retries=2, model="m", max_tokens=10, messages=[])
+        assert stub_client.messages.create.call_count == 3
+
+
+class TestConcurrencyCap:
+    def test_in_flight_requests_never_exceed_limit(self, stub_client, monkeypatch):
+        monkeypatch.setattr(llm_gateway, "_semaphore", threading.BoundedSemaphore(2))
+        monkeypatch.setattr(llm_gateway, "_request_bucket", TokenBucket(10_000))
+        lock = threading.Lock()
+        state = {"active": 0, "peak": 0}
+
+        def slow_create(**kwargs):
+            with lock:
+                state["active"] += 1
+                state["peak"] = max(state["peak"], state["active"])
+            time.sleep(0.02)
+            with lock:
+                state["active"] -= 1
+            return _ok_response()
+
+        stub_client.messages.create.side_effect = slow_create
+        threads = [
+            threading.Thread(target=call_llm, args=("unit",), kwargs={"model": "m", "messages": []})
+            for _ in range(8)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert state["peak"] == 2
+        assert stub_client.messages.create.call_count == 8
+
+
+# =============================================================================
+# ASYNC PATH TESTS
+# =============================================================================
+
+@pytest.fixture
+def stub_async_client():
+    client = MagicMock()
+    client.messages.create = AsyncMock()
+    llm_gateway.set_async_client(client)
+    yield client
+    llm_gateway.set_async_client(None)
+
+
+class TestAsyncGateway:
+    def test_async_client_is_shared_per_loop(self):
+        async def get_twice():
+            return llm_gateway.get_async_client(), llm_gateway.get_async_client()
+
+        first, second = asyncio.run(get_twice())
+        assert first is second
+
+    def test_gather_is_capped_by_shared_semaphore(self, stub_async_client, monkeypatch):
+        monkeypatch.setattr(llm_gateway, "MAX_CONCURRENCY", 3)
+        monkeypatch.setattr(llm_gateway, "_request_bucket", TokenBucket(10_000))
+        state = {"active": 0, "peak": 0}
+
+        async def slow_create(**kwargs):
+            state["active"] += 1
+            state["peak"] = max(state["peak"], state["active"])
+            await asyncio.sleep(0.01)
+            state["active"] -= 1
+            return _ok_response()
+
+        stub_async_client.messages.create.side_effect = slow_create
+
+        async def fan_out():
+            return await asyncio.gather(*[
+                call_llm_async("unit", model="m", messages=[]) for _ in range(10)
+            ])
+
+        results = asyncio.run(fan_out())
+        assert len(results) == 10
+        assert state["peak"] == 3
+
+    @patch("llm_gateway.asyncio.sleep", new_callable=AsyncMock)
+    def test_async_retries_overload(self, mock_sleep, stub_async_client):
+        stub_async_client.messages.create.side_effect = [
+            _api_error(RateLimitError, 529),
+            _ok_response(),
+        ]
+        response = asyncio.run(call_llm_async("unit", model="m", messages=[]))
+        assert response.content[0].text == "ok"
+        assert mock_sleep.await_count == 1
+
+    def test_generate_hooks_async_parses_response(self, stub_async_client):
+        response = _ok_response()
+        response.content = [MagicMock(text="1. First hook\n2. Second hook")]
+        stub_async_client.messages.create.return_value = response
+
+        from generate_hooks import generate_hooks_async
+        hooks = asyncio.run(generate_hooks_async("Pricing", num_hooks=2))
+        assert hooks == ["First hook", "Second hook"]
@@ -0,0 +1,150 @@
+"""Tests for the schema migration runner: ordering, version tracking and the startup check."""
+import os
+import sqlite3
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add execution dir to path so imports work
+sys.path.insert(0, str(Path(__file__).parent.parent / "execution"))
+
+from dotenv import load_dotenv
+load_dotenv(Path(__file__).parent.parent / ".env")
+
+EXECUTION_DIR = Path(__file__).parent.parent / "execution"
+
+from database import SessionLocal, SchemaVersion
+import migrations
+from migrations import Migration, current_version, ensure_schema, migrate, migration_status
+
+
+# Tables as create_tables() made them before the migration framework existed
+BASELINE_SCHEMA = """
+CREATE TABLE drafts (
+    id VARCHAR PRIMARY KEY, content TEXT NOT NULL, hooks JSON, selected_hook INTEGER,
+    template_used VARCHAR, topic VARCHAR, status VARCHAR NOT NULL, scheduled_time VARCHAR,
+    posted_at VARCHAR, images JSON, metrics JSON, created_at VARCHAR NOT NULL, updated_at VARCHAR NOT NULL
+);
+CREATE TABLE hooks (
+    id VARCHAR PRIMARY KEY, hook TEXT NOT NULL, topic VARCHAR, created_at VARCHAR NOT NULL, used_count INTEGER
+);
+CREATE TABLE ideas (
+    id VARCHAR PRIMARY KEY, idea TEXT NOT NULL, topic VARCHAR, angle VARCHAR,
+    created_at VARCHAR NOT NULL, used_count INTEGER
+);
+CREATE TABLE insights (
+    id VARCHAR PRIMARY KEY, title VARCHAR NOT NULL, content TEXT NOT NULL, category VARCHAR,
+    created_at VARCHAR NOT NULL, updated_at VARCHAR NOT NULL
+);
+CREATE TABLE images (
+    id VARCHAR PRIMARY KEY, original_name VARCHAR NOT NULL, s3_key VARCHAR NOT NULL,
+    url VARCHAR NOT NULL, uploaded_at VARCHAR NOT NULL
+);
+CREATE TABLE social_proof (
+    id VARCHAR PRIMARY KEY, metric VARCHAR NOT NULL, value VARCHAR NOT NULL, context TEXT,
+    source VARCHAR, category VARCHAR, created_at VARCHAR NOT NULL, updated_at VARCHAR NOT NULL
+);
+CREATE TABLE competitor_posts (
+    id VARCHAR PRIMARY KEY, competitor_name VARCHAR NOT NULL, competitor_linkedin_url VARCHAR,
+    post_content TEXT NOT NULL, hook TEXT, post_type VARCHAR, post_url VARCHAR, likes INTEGER,
+    comments INTEGER, reposts INTEGER, performance VARCHAR, date_posted VARCHAR, notes TEXT,
+    created_at VARCHAR NOT NULL, updated_at VARCHAR NOT NULL
+);
+CREATE TABLE trending_topics (
+    id VARCHAR PRIMARY KEY, topic TEXT NOT NULL, summary TEXT, source_urls JSON, relevance_score INTEGER,
+    content_angles JSON, search_query VARCHAR, batch_id VARCHAR, status VARCHAR, source_platform VARCHAR,
+    created_at VARCHAR NOT NULL, updated_at VARCHAR NOT NULL, notes TEXT
+);
+INSERT INTO images VALUES ('img1', 'a.png', 'images/a.png', 'https://example.com/a.png', '2024-01-01T00:00:00');
+INSERT INTO drafts VALUES ('d1', 'Body', '["Hook"]', 0, NULL, NULL, 'scheduled', '2024-03-05T09:30:00', NULL,
+    '[{"id": "img1"}]', '{}', '2024-03-01T08:00:00', '2024-03-01T08:00:00');
+INSERT INTO hooks VALUES ('h1', 'Hook', NULL, '2024-03-01T08:00:00', NULL);
+"""
+
+
+@pytest.fixture(autouse=True)
+def migrated():
+    migrate()
+    yield
+
+
+class TestMigrations:
+    def test_all_migrations_recorded_in_order(self):
+        assert current_version() == migrations.LATEST_VERSION
+        versions = [m.version for m in migrations.MIGRATIONS]
+        assert versions == sorted(versions)
+        assert all(m["applied_at"] for m in migration_status())
+
+    def test_rerun_is_a_no_op(self):
+        assert migrate() == []
+
+    def test_new_migration_is_applied_once(self, monkeypatch):
+        calls = []
+        extra = Migration(migrations.LATEST_VERSION + 1, "test_extra", lambda: calls.append(1))
+        monkeypatch.setattr(migrations, "MIGRATIONS", migrations.MIGRATIONS + [extra])
+        monkeypatch.setattr(migrations, "LATEST_VERSION", extra.version)
+
+        assert [m.name for m in migrate()] == ["test_extra"]
+        assert migrate() == []
+        assert calls == [1]
+
+        with SessionLocal() as db:
+            db.query(SchemaVersion).filter(SchemaVersion.version == extra.version).delete()
+            db.commit()
+
+    def test_target_stops_early(self, monkeypatch):
+        calls = []
+        extra = [
+            Migration(migrations.LATEST_VERSION + 1, "first", lambda: calls.append("first")),
+            Migration(migrations.LATEST_VERSION + 2, "second", lambda: calls.append("second")),
+        ]
+        monkeypatch.setattr(migrations, "MIGRATIONS", migrations.MIGRATIONS + extra)
+
+        migrate(target=extra[0].version)
+        assert calls == ["first"]
+
+        with SessionLocal() as db:
+            db.query(SchemaVersion).filter(SchemaVersion.version >= extra[0].version).delete()
+            db.commit()
+
+
+class TestEnsureSchema:
+    def test_current_schema_runs_nothing(self, monkeypatch):
+        monkeypatch.setattr(migrations, "migrate", lambda *a, **k: pytest.fail("should not migrate"))
+        assert ensure_schema() == migrations.LATEST_VERSION
+
+    def test_stale_schema_without_auto_migrate_raises(self, monkeypatch):
+        extra = Migration(migrations.LATEST_VERSION + 1, "pending", lambda: None)
+        monkeypatch.setattr(migrations, "MIGRATIONS", migrations.MIGRATIONS + [extra])
+        monkeypatch.setattr(migrations, "LATEST_VERSION", extra.version)
+        monkeypatch.setattr(migrations, "AUTO_MIGRATE", False)
+
+        with pytest.raises(RuntimeError, match="workflow.py migrate"):
+            ensure_schema()
+
+
+class TestBaselineUpgrade:
+    def test_baseline_database_upgrades_to_latest(self, tmp_path):
+        path = tmp_path / "baseline.db"
+        with sqlite3.connect(path) as conn:
+            conn.executescript(BASELINE_SCHEMA)
+
+        # A separate process, so every module binds to the baseline database's engine
+        result = subprocess.run(
+            [sys.executable, "-c", "import migrations; migrations.migrate(); print(migrations.current_version())"],
+            cwd=EXECUTION_DIR, env={**os.environ, "DATABASE_URL": f"sqlite:///{path}"},
+            capture_output=True, text=True,
+        )
+        assert result.returncode == 0, result.stderr
+        assert int(result.stdout.split()[-1]) == migrations.LATEST_VERSION
+
+        with sqlite3.connect(path) as conn:
+            assert conn.execute("SELECT COUNT(*) FROM insights WHERE version = 1").fetchone()[0] > 0
+            assert conn.execute("SELECT COUNT(*) FROM social_proof WHERE version = 1").fetchone()[0] > 0
+            assert conn.execute("SELECT image_id FROM draft_images WHERE draft_id = 'd1'").fetchall() == [("img1",)]
+            assert conn.execute("SELECT scheduled_time, version FROM drafts").fetchall() == [
+                ("2024-03-05 09:30:00.000000", 1),
+            ]
+            assert conn.execute("SELECT used_count FROM hooks").fetchall() == [(0,)]
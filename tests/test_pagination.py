@@ -0,0 +1,129 @@
+"""Tests for keyset pagination: cursors, page boundaries, tie-breaking and the paginated endpoints."""
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add execution dir to path so imports work
+sys.path.insert(0, str(Path(__file__).parent.parent / "execution"))
+
+from dotenv import load_dotenv
+load_dotenv(Path(__file__).parent.parent / ".env")
+
+from database import SessionLocal, Draft, Hook, create_tables
+from draft_storage import create_drafts_bulk, list_drafts, save_hooks_bulk, get_hooks_bank, increment_hook_usage
+from pagination import decode_cursor, encode_cursor, fetch_page
+
+create_tables()
+
+
+@pytest.fixture(autouse=True)
+def clean_tables():
+    with SessionLocal() as db:
+        db.query(Draft).delete()
+        db.query(Hook).delete()
+        db.commit()
+    yield
+
+
+def _walk(fetch, limit, **filters):
+    """Follow next_cursor to the end, returning every page."""
+    pages, cursor = [], None
+    while True:
+        page = fetch_page(fetch, cursor, limit, **filters)
+        pages.append(page["items"])
+        cursor = page["next_cursor"]
+        if not cursor:
+            return pages
+
+
+class TestCursor:
+    def test_round_trip(self):
+        assert decode_cursor(encode_cursor("2024-03-05T09:30:00", "abc123")) == ("2024-03-05T09:30:00", "abc123")
+
+    @pytest.mark.parametrize("bad", ["not-a-cursor", "", encode_cursor("2024", "x")[:-3] + "!!"])
+    def test_malformed_cursor_raises(self, bad):
+        with pytest.raises(ValueError):
+            decode_cursor(bad)
+
+
+class TestKeysetPages:
+    def test_pages_cover_every_row_once(self):
+        hooks = save_hooks_bulk([f"Hook {i}" for i in range(7)])
+        pages = _walk(get_hooks_bank, limit=3)
+
+        assert [len(p) for p in pages] == [3, 3, 1]
+        ids = [h["id"] for page in pages for h in page]
+        assert sorted(ids) == sorted(h["id"] for h in hooks)
+
+    def test_identical_timestamps_are_split_by_id(self):
+        # Bulk-inserted rows share created_at, so the id alone orders them
+        save_hooks_bulk([f"Hook {i}" for i in range(5)])
+        ids = [h["id"] for page in _walk(get_hooks_bank, limit=2) for h in page]
+        assert ids == sorted(ids, reverse=True)
+        assert len(set(ids)) == 5
+
+    def test_filters_apply_across_pages(self):
+        save_hooks_bulk(["A1", "A2", "A3"], topic="Alpha")
+        save_hooks_bulk(["B1"], topic="Beta")
+        pages = _walk(get_hooks_bank, limit=2, topic="Alpha")
+        assert sorted(h["hook"] for page in pages for h in page) == ["A1", "A2", "A3"]
+
+    def test_datetime_column_drafts(self):
+        create_drafts_bulk([{"content": f"Draft {i}"} for i in range(5)])
+        pages = _walk(list_drafts, limit=2, status="draft")
+        assert [len(p) for p in pages] == [2, 2, 1]
+        assert len({d["id"] for page in pages for d in page}) == 5
+
+    def test_most_used_pages_by_rank_then_recency(self):
+        hooks = save_hooks_bulk([f"Hook {i}" for i in range(5)])
+        increment_hook_usage([hooks[3]["id"]] * 2 + [hooks[1]["id"]])
+
+        pages = _walk(get_hooks_bank, limit=2, rank_key="used_count", sort="most_used")
+        rows = [h for page in pages for h in page]
+        assert [h["used_count"] for h in rows] == [2, 1, 0, 0, 0]
+        assert len({h["id"] for h in rows}) == 5
+
+    def test_cursor_from_other_sort_is_rejected(self):
+        save_hooks_bulk(["A", "B"])
+        newest_cursor = fetch_page(get_hooks_bank, limit=1)["next_cursor"]
+        with pytest.raises(ValueError):
+            get_hooks_bank(cursor=newest_cursor, sort="most_used")
+
+    def test_unpaged_call_returns_everything(self):
+        save_hooks_bulk([f"Hook {i}" for i in range(4)])
+        assert len(get_hooks_bank()) == 4
+
+
+class TestPaginatedEndpoints:
+    @pytest.fixture
+    def client(self):
+        from fastapi.testclient import TestClient
+        from web_ui import app
+        return TestClient(app)
+
+    def test_json_endpoint_follows_cursor(self, client):
+        save_hooks_bulk([f"Hook {i}" for i in range(3)])
+        first = client.get("/api/hooks", params={"limit": 2}).json()
+        assert len(first["items"]) == 2 and first["next_cursor"]
+
+        second = client.get("/api/hooks", params={"limit": 2, "cursor": first["next_cursor"]}).json()
+        assert len(second["items"]) == 1 and second["next_cursor"] is None
+
+    def test_bad_cursor_is_400(self, client):
+        assert client.get("/api/drafts", params={"cursor": "garbage"}).status_code == 400
+        assert client.get("/hooks-bank", params={"cursor": "garbage"}).status_code == 400
+
+    def test_page_renders_load_more(self, client, monkeypatch):
+        monkeypatch.setattr("pagination.PAGE_SIZE", 2)
+        save_hooks_bulk([f"Hook {i}" for i in range(3)])
+
+        html = client.get("/hooks-bank").text
+        assert html.count('class="hook-item"') == 2
+        assert 'class="btn btn-secondary load-more"' in html
+
+        cursor = html.split('data-cursor="')[1].split('"')[0]
+        rest = client.get("/hooks-bank", params={"cursor": cursor, "offset": 2}).text
+        assert rest.count('class="hook-item"') == 1
+        assert '<span class="hook-number">3.</span>' in rest
+        assert 'class="btn btn-secondary load-more"' not in rest
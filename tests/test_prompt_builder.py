@@ -0,0 +1,211 @@
+"""Tests for token-budgeted prompt assembly and LLM usage accounting."""
+import sys
+from pathlib import Path
+from unittest.mock import patch, MagicMock
+
+import pytest
+
+# Add execution dir to path so imports work
+sys.path.insert(0, str(Path(__file__).parent.parent / "execution"))
+
+from dotenv import load_dotenv
+load_dotenv(Path(__file__).parent.parent / ".env")
+
+from prompt_builder import PromptSection, assemble_prompt, blocks_text, cached_blocks, estimate_tokens, truncate_to_tokens
+import llm_metrics
+
+
+# =============================================================================
+# TOKENIZER TESTS
+# =============================================================================
+
+class TestEstimateTokens:
+    def test_empty(self):
+        assert estimate_tokens("") == 0
+
+    def test_words_and_punctuation(self):
+        assert estimate_tokens("Hello, world!") == 4
+
+    def test_long_words_cost_more(self):
+        assert estimate_tokens("internationalization") > estimate_tokens("cat")
+
+    def test_truncate_respects_budget(self):
+        text = "\n".join(f"Line number {i} with some words." for i in range(200))
+        cut = truncate_to_tokens(text, 100)
+        assert estimate_tokens(cut) <= 100
+        assert text.startswith(cut)
+
+    def test_truncate_returns_short_text_unchanged(self):
+        assert truncate_to_tokens("short text", 100) == "short text"
+
+
+# =============================================================================
+# ASSEMBLY TESTS
+# =============================================================================
+
+class TestAssemblePrompt:
+    def test_everything_fits(self):
+        prompt = assemble_prompt([
+            PromptSection("task", "Write a post.", required=True),
+            PromptSection("kb", "Some context.", header="--- KB ---"),
+        ], budget_tokens=100)
+        assert prompt.text == "Write a post.\n\n--- KB ---\nSome context."
+        assert prompt.truncated == [] and prompt.dropped == []
+
+    def test_low_priority_section_truncated_first(self):
+        filler = " ".join(["word"] * 400)
+        prompt = assemble_prompt([
+            PromptSection("task", "Write a post.", required=True),
+            PromptSection("important", filler, priority=20),
+            PromptSection("optional", filler, priority=10),
+        ], budget_tokens=500)
+        assert prompt.tokens <= 500
+        assert "important" not in prompt.truncated
+        assert "optional" in prompt.truncated or "optional" in prompt.dropped
+
+    def test_required_sections_are_never_cut(self):
+        required = " ".join(["must"] * 50)
+        prompt = assemble_prompt([
+            PromptSection("task", required, required=True),
+            PromptSection("extra", "nice to have", priority=1),
+        ], budget_tokens=10)
+        assert required in prompt.text
+        assert prompt.dropped == ["extra"]
+
+    def test_sections_keep_display_order(self):
+        prompt = assemble_prompt([
+            PromptSection("first", "AAA", priority=1),
+            PromptSection("second", "BBB", priority=99),
+        ], budget_tokens=100)
+        assert prompt.text.index("AAA") < prompt.text.index("BBB")
+
+    def test_empty_sections_and_headers_omitted(self):
+        prompt = assemble_prompt([
+            PromptSection("task", "Go.", required=True),
+            PromptSection("context", "", header="--- CONTEXT ---"),
+        ], budget_tokens=100)
+        assert "CONTEXT" not in prompt.text
+
+
+# =============================================================================
+# USAGE ACCOUNTING TESTS
+# =============================================================================
+
+def _mock_response(text, input_tokens=120, output_tokens=30, cache_write=0, cache_read=0):
+    response = MagicMock()
+    response.content = [MagicMock(text=text)]
+    response.usage = MagicMock(
+        input_tokens=input_tokens,
+        output_tokens=output_tokens,
+        cache_creation_input_tokens=cache_write,
+        cache_read_input_tokens=cache_read,
+    )
+    return response
+
+
+class TestUsageAccounting:
+    def setup_method(self):
+        llm_metrics.reset_metrics()
+
+    def test_create_message_records_usage(self):
+        client = MagicMock()
+        client.messages.create.return_value = _mock_response("ok", 100, 20)
+
+        llm_metrics.create_message(client, "unit", estimated_input_tokens=90,
+                                   model="claude-sonnet-4-20250514", max_tokens=10, messages=[])
+
+        summary = llm_metrics.get_usage_summary()
+        assert summary["by_name"]["unit"]["calls"] == 1
+        assert summary["by_name"]["unit"]["input_tokens"] == 100
+        assert summary["by_name"]["unit"]["output_tokens"] == 20
+        assert summary["by_name"]["unit"]["estimated_input_tokens"] == 90
+        assert summary["total"]["cost_usd"] > 0
+
+    def test_failed_call_is_recorded(self):
+        client = MagicMock()
+        client.messages.create.side_effect = RuntimeError("boom")
+
+        with pytest.raises(RuntimeError):
+            llm_metrics.create_message(client, "unit", model="m", max_tokens=10, messages=[])
+
+        recent = llm_metrics.get_recent_calls()
+        assert recent[0]["error"] == "boom"
+
+    @patch("llm_gateway.get_client")
+    def test_generate_hooks_respects_budget_and_records_call(self, mock_get_client):
+        mock_client = MagicMock()
+        mock_get_client.return_value = mock_client
+        mock_client.messages.create.return_value = _mock_response("1. Hook one\n2. Hook two")
+
+        import generate_hooks
+        hooks = generate_hooks.generate_hooks("AI coaching", num_hooks=2)
+
+        assert hooks == ["Hook one", "Hook two"]
+        system = blocks_text(mock_client.messages.create.call_args.kwargs["system"])
+        assert estimate_tokens(system) <= generate_hooks.SYSTEM_TOKEN_BUDGET
+        assert llm_metrics.get_usage_summary()["by_name"]["generate_hooks"]["calls"] == 1
+
+
+# =============================================================================
+# PROMPT CACHING TESTS
+# =============================================================================
+
+class TestPromptCaching:
+    def setup_method(self):
+        llm_metrics.reset_metrics()
+
+    def test_cache_marker_on_last_block_only(self):
+        blocks = cached_blocks("instructions", "", "reference")
+        assert [b["text"] for b in blocks] == ["instructions", "reference"]
+        assert "cache_control" not in blocks[0]
+        assert blocks[1]["cache_control"] == {"type": "ephemeral"}
+
+    @patch("llm_gateway.get_client")
+    def test_hooks_prefix_is_identical_across_topics(self, mock_get_client):
+        mock_client = MagicMock()
+        mock_get_client.return_value = mock_client
+        mock_client.messages.create.side_effect = [
+            _mock_response("1. Hook", cache_write=5000),
+            _mock_response("1. Hook", cache_read=5000),
+        ]
+
+        import generate_hooks
+        generate_hooks.generate_hooks("AI coaching", num_hooks=1)
+        generate_hooks.generate_hooks("Cold outreach", num_hooks=1)
+
+        first, second = (c.kwargs for c in mock_client.messages.create.call_args_list)
+        assert first["system"] == second["system"]
+        assert first["system"][-1]["cache_control"] == {"type": "ephemeral"}
+        assert "Cold outreach" in second["messages"][0]["content"]
+        assert "Cold outreach" not in blocks_text(second["system"])
+
+        stats = llm_metrics.get_usage_summary()["by_name"]["generate_hooks"]
+        assert stats["cache_hits"] == 1
+        assert stats["cache_creation_input_tokens"] == 5000
+        assert stats["cache_read_input_tokens"] == 5000
+        assert llm_metrics.get_recent_calls()[0]["cache_hit"] is True
+
+    @patch("generate_post.retrieve_context")
+    @patch("llm_gateway.get_client")
+    def test_post_body_puts_topic_after_cached_kb(self, mock_get_client, mock_retrieve):
+        mock_client = MagicMock()
+        mock_get_client.return_value = mock_client
+        mock_client.messages.create.return_value = _mock_response("Body text")
+        mock_retrieve.return_value = {"ip_extraction": "IP excerpt", "origin_story": "", "templates": ""}
+        kb = {"best_posts": "Best post example", "ip_extraction": "", "origin_story": "", "templates": ""}
+
+        import generate_post
+        body = generate_post.generate_post_body("Pricing", "Stop discounting.", kb)
+
+        assert body == "Body text"
+        kwargs = mock_client.messages.create.call_args.kwargs
+        system = blocks_text(kwargs["system"])
+        assert "Best post example" in system
+        assert "Pricing" not in system
+        user = kwargs["messages"][0]["content"]
+        assert user.index("IP excerpt") < user.index("TOPIC: Pricing")
+
+    def test_cache_reads_are_priced_below_fresh_input(self):
+        fresh = llm_metrics.estimate_cost("claude-sonnet-4-20250514", 10_000, 0)
+        cached = llm_metrics.estimate_cost("claude-sonnet-4-20250514", 0, 0, cache_read_input_tokens=10_000)
+        assert cached < fresh
@@ -0,0 +1,99 @@
+"""Tests for full-text search: ranking, kinds, index sync triggers and the search endpoints."""
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add execution dir to path so imports work
+sys.path.insert(0, str(Path(__file__).parent.parent / "execution"))
+
+from dotenv import load_dotenv
+load_dotenv(Path(__file__).parent.parent / ".env")
+
+from database import SessionLocal, Draft, Hook, Idea, Insight, CompetitorPost, create_tables
+from draft_storage import (
+    create_draft, update_draft, delete_draft,
+    save_hooks_bulk, save_ideas_bulk, save_insight_to_bank, save_competitor_post,
+)
+from search import create_search_index, search
+
+create_tables()
+create_search_index()
+
+
+@pytest.fixture(autouse=True)
+def clean_tables():
+    with SessionLocal() as db:
+        for model in (Draft, Hook, Idea, Insight, CompetitorPost):
+            db.query(model).delete()
+        db.commit()
+    yield
+
+
+class TestSearch:
+    def test_finds_every_kind(self):
+        draft = create_draft(content="Why cold outreach still works in 2024")
+        hook = save_hooks_bulk(["Cold outreach is not dead"])[0]
+        idea = save_ideas_bulk([{"idea": "Outreach templates that get replies"}])[0]
+        insight = save_insight_to_bank("Reply rates", "Personalised outreach doubles replies")
+        post = save_competitor_post("Aidan Collins", "My outreach playbook")
+
+        results = search("outreach")
+        assert {(r["kind"], r["id"]) for r in results} == {
+            ("draft", draft["id"]), ("hook", hook["id"]), ("idea", idea["id"]),
+            ("insight", insight["id"]), ("competitor_post", post["id"]),
+        }
+        assert [r["rank"] for r in results] == sorted((r["rank"] for r in results), reverse=True)
+
+    def test_kinds_and_limit(self):
+        save_hooks_bulk([f"Outreach hook {i}" for i in range(5)])
+        create_draft(content="Outreach draft")
+
+        assert {r["kind"] for r in search("outreach", kinds=["hook"])} == {"hook"}
+        assert len(search("outreach", limit=2)) == 2
+        with pytest.raises(ValueError):
+            search("outreach", kinds=["tweets"])
+
+    def test_all_terms_must_match(self):
+        save_hooks_bulk(["Cold outreach tips", "Cold email tips"])
+        assert [r["kind"] for r in search("cold outreach")] == ["hook"]
+
+    def test_index_follows_updates_and_deletes(self):
+        draft = create_draft(content="Pricing strategy for coaches")
+        update_draft(draft["id"], content="Positioning strategy for coaches")
+        assert search("pricing") == []
+        assert [r["id"] for r in search("positioning")] == [draft["id"]]
+
+        delete_draft(draft["id"])
+        assert search("positioning") == []
+
+    def test_snippet_is_escaped_and_highlighted(self):
+        save_hooks_bulk(["<script>alert(1)</script> outreach"])
+        snippet = search("outreach")[0]["snippet"]
+        assert "<script>" not in snippet
+        assert "<mark>outreach</mark>" in snippet
+
+    def test_query_syntax_is_not_interpreted(self):
+        save_hooks_bulk(['The "AND" outreach (trick)'])
+        assert len(search('outreach" AND (')) == 1
+        assert search("   ") == []
+
+
+class TestSearchRoutes:
+    @pytest.fixture
+    def client(self):
+        from fastapi.testclient import TestClient
+        from web_ui import app
+        return TestClient(app)
+
+    def test_api_search(self, client):
+        hook = save_hooks_bulk(["Referral systems for agencies"])[0]
+        data = client.get("/api/search", params={"q": "referral", "kind": "hook"}).json()
+        assert [r["id"] for r in data["results"]] == [hook["id"]]
+        assert client.get("/api/search", params={"q": "x", "kind": "tweets"}).status_code == 400
+
+    def test_search_page(self, client):
+        create_draft(content="Referral systems for agencies")
+        html = client.get("/search", params={"q": "referral"}).text
+        assert "1 result for" in html
+        assert "<mark>Referral</mark>" in html
@@ -0,0 +1,57 @@
+"""Tests for the production `workflow.py serve` command."""
+import os
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+# Add execution dir to path so imports work
+sys.path.insert(0, str(Path(__file__).parent.parent / "execution"))
+
+from dotenv import load_dotenv
+load_dotenv(Path(__file__).parent.parent / ".env")
+
+import workflow
+from web_ui import TEMPLATE_SOURCES
+
+
+def _serve(*argv):
+    """Run `workflow.py serve` with uvicorn mocked; returns the mocks and the environment workers would inherit."""
+    # patch.dict restores os.environ, which cmd_serve writes to
+    with patch.object(sys, "argv", ["workflow.py", "serve", *argv]), \
+         patch.dict(os.environ), \
+         patch("uvicorn.run") as run, \
+         patch("migrations.ensure_schema", return_value=9) as ensure_schema:
+        workflow.main()
+        env = dict(os.environ)
+    return run, ensure_schema, env
+
+
+class TestServe:
+    def test_initializes_once_then_starts_workers(self, tmp_path, monkeypatch):
+        monkeypatch.delenv("WEB_SCHEMA_CHECKED", raising=False)
+        monkeypatch.delenv("TEMPLATE_CACHE_DIR", raising=False)
+        cache = tmp_path / "templates"
+
+        run, ensure_schema, env = _serve("--workers", "3", "--port", "8000", "--template-cache", str(cache))
+
+        ensure_schema.assert_called_once()
+        assert len(list(cache.iterdir())) == len(TEMPLATE_SOURCES)
+        # Workers inherit these and skip the schema check / use the bytecode
+        assert env["WEB_SCHEMA_CHECKED"] == "1"
+        assert env["TEMPLATE_CACHE_DIR"] == str(cache)
+        assert "WEB_SCHEMA_CHECKED" not in os.environ and "TEMPLATE_CACHE_DIR" not in os.environ
+
+        (app,), options = run.call_args
+        assert app == "web_ui:app"
+        assert options["workers"] == 3 and options["port"] == 8000
+        assert options["reload"] is False
+        assert options["timeout_keep_alive"] == 75 and options["timeout_graceful_shutdown"] == 30
+
+    def test_tuning_flags(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("WEB_CONCURRENCY", "5")
+        run, _, _ = _serve("--keep-alive", "120", "--graceful-timeout", "10", "--limit-concurrency", "200",
+                        "--no-access-log", "--template-cache", str(tmp_path))
+        options = run.call_args.kwargs
+        assert options["workers"] == 5
+        assert options["timeout_keep_alive"] == 120 and options["timeout_graceful_shutdown"] == 10
+        assert options["limit_concurrency"] == 200 and options["access_log"] is False
@@ -0,0 +1,99 @@
+"""Tests for the bounded storage executor and that async routes no longer block the event loop."""
+import asyncio
+import sys
+import threading
+import time
+from pathlib import Path
+
+import httpx
+import pytest
+
+# Add execution dir to path so imports work
+sys.path.insert(0, str(Path(__file__).parent.parent / "execution"))
+
+from dotenv import load_dotenv
+load_dotenv(Path(__file__).parent.parent / ".env")
+
+import storage_executor
+from storage_executor import get_storage_stats, run_storage, shutdown_storage_executor
+
+SLOW_QUERY = 0.3
+
+
+@pytest.fixture(autouse=True)
+def fresh_executor(monkeypatch):
+    shutdown_storage_executor()
+    monkeypatch.setattr(storage_executor, "STORAGE_THREADS", 4)
+    yield
+    shutdown_storage_executor()
+
+
+class TestRunStorage:
+    def test_runs_on_storage_threads(self):
+        name = asyncio.run(run_storage(lambda: threading.current_thread().name))
+        assert name.startswith("storage")
+
+    def test_passes_arguments_and_exceptions(self):
+        assert asyncio.run(run_storage(lambda a, b=0: a + b, 2, b=3)) == 5
+        with pytest.raises(KeyError):
+            asyncio.run(run_storage({}.__getitem__, "missing"))
+
+    def test_concurrency_is_bounded(self):
+        async def burst():
+            await asyncio.gather(*(run_storage(time.sleep, 0.05) for _ in range(12)))
+
+        before = get_storage_stats()["calls"]
+        asyncio.run(burst())
+        stats = get_storage_stats()
+        assert stats["calls"] - before == 12
+        assert stats["max_active"] <= 4 and stats["active"] == 0
+
+
+class TestRoutesDoNotSerialize:
+    def _slow_list(self, *args, **kwargs):
+        time.sleep(SLOW_QUERY)
+        return []
+
+    async def _get_all(self, paths):
+        from web_ui import app
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            started = time.perf_counter()
+            responses = await asyncio.gather(*(client.get(p) for p in paths))
+            return responses, time.perf_counter() - started
+
+    def test_slow_queries_overlap(self, monkeypatch):
+        monkeypatch.setattr("web_ui.list_drafts", self._slow_list)
+        monkeypatch.setattr("web_ui.get_hooks_bank", self._slow_list)
+
+        paths = ["/drafts", "/scheduled", "/posted", "/hooks-bank"]
+        responses, elapsed = asyncio.run(self._get_all(paths))
+
+        assert [r.status_code for r in responses] == [200] * 4
+        # Run on the event loop these took 4 x SLOW_QUERY back to back
+        assert elapsed < SLOW_QUERY * 2
+
+    def test_llm_usage_cache_stats_run_off_the_loop(self, monkeypatch):
+        monkeypatch.setattr("web_ui.llm_cache_stats", lambda: self._slow_list() or {})
+
+        responses, elapsed = asyncio.run(self._get_all(["/api/llm-usage"] * 2))
+
+        assert [r.status_code for r in responses] == [200] * 2
+        assert elapsed < SLOW_QUERY * 2
+
+    def test_event_loop_stays_responsive(self, monkeypatch):
+        monkeypatch.setattr("web_ui.list_drafts", self._slow_list)
+
+        async def probe():
+            from web_ui import app
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                slow = asyncio.create_task(client.get("/drafts"))
+                started = time.perf_counter()
+                await asyncio.sleep(0.05)  # the slow query is now in flight
+                await client.get("/api/llm-usage")
+                fast_elapsed = time.perf_counter() - started
+                await slow
+                return fast_elapsed
+
+        assert asyncio.run(probe()) < SLOW_QUERY / 2
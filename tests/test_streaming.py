@@ -0,0 +1,210 @@
+"""Tests for streaming generation: gateway stream, metrics, and the SSE endpoints."""
+import asyncio
+import json
+import sys
+import threading
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch, MagicMock, AsyncMock
+
+import pytest
+
+# Add execution dir to path so imports work
+sys.path.insert(0, str(Path(__file__).parent.parent / "execution"))
+
+from dotenv import load_dotenv
+load_dotenv(Path(__file__).parent.parent / ".env")
+
+import llm_gateway
+import llm_metrics
+from draft_storage import get_draft, delete_draft
+
+
+class _FakeStream:
+    """Async iterator of Anthropic-style stream events."""
+
+    def __init__(self, texts, input_tokens=100, output_tokens=20):
+        usage = SimpleNamespace(input_tokens=input_tokens, output_tokens=1,
+                                cache_creation_input_tokens=0, cache_read_input_tokens=0)
+        self.events = [SimpleNamespace(type="message_start", message=SimpleNamespace(usage=usage))]
+        self.events += [
+            SimpleNamespace(type="content_block_delta", delta=SimpleNamespace(type="text_delta", text=t))
+            for t in texts
+        ]
+        self.events.append(SimpleNamespace(type="message_delta", usage=SimpleNamespace(output_tokens=output_tokens)))
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for event in self.events:
+            yield event
+
+
+@pytest.fixture
+def stream_client():
+    client = MagicMock()
+    client.messages.create = AsyncMock()
+    llm_gateway.set_async_client(client)
+    llm_metrics.reset_metrics()
+    yield client
+    llm_gateway.set_async_client(None)
+
+
+def _collect(agen):
+    async def run():
+        return [item async for item in agen]
+    return asyncio.run(run())
+
+
+def _parse_sse(text):
+    events = []
+    for raw in text.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in raw.splitlines())
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+class TestStreamGateway:
+    def test_yields_text_deltas_and_records_usage(self, stream_client):
+        stream_client.messages.create.return_value = _FakeStream(["Hello", " world"])
+
+        chunks = _collect(llm_gateway.stream_llm_async("unit", model="m", messages=[]))
+
+        assert chunks == ["Hello", " world"]
+        assert stream_client.messages.create.call_args.kwargs["stream"] is True
+        call = llm_metrics.get_recent_calls()[0]
+        assert call["input_tokens"] == 100
+        assert call["output_tokens"] == 20
+        assert call["first_token_ms"] is not None
+
+    def test_stream_post_body(self, stream_client):
+        stream_client.messages.create.return_value = _FakeStream(["Body ", "text"])
+        kb = {"best_posts": "", "ip_extraction": "", "origin_story": "", "templates": ""}
+
+        from generate_post import stream_post_body
+        threads = []
+
+        def retrieve(*args):
+            threads.append(threading.current_thread())
+            return {"ip_extraction": "", "origin_story": "", "templates": ""}
+
+        with patch("generate_post.retrieve_context", retrieve):
+            chunks = _collect(stream_post_body("Pricing", "Stop discounting.", kb))
+        assert "".join(chunks) == "Body text"
+        # Retrieval runs on a worker thread, not the event loop's
+        assert threads and threads[0] is not threading.main_thread()
+
+
+from fastapi.testclient import TestClient
+from web_ui import app
+
+client = TestClient(app)
+
+
+class TestStreamingRoutes:
+    def test_drafts_stream_persists_each_draft(self):
+        async def fake_stream(topic, hook, kb=None, additional_context=None):
+            for word in ["Body", " for ", hook]:
+                yield word
+
+        form = {
+            "topic": "Pricing",
+            "idea_0": "Discounts",
+            "hook_0_0": "Hook A",
+            "hook_0_1": "Hook B",
+            "selected_0_0": "1",
+            "selected_0_1": "1",
+        }
+        with patch("web_ui.stream_post_body", fake_stream), \
+                patch("web_ui.load_knowledge_base", return_value={}):
+            resp = client.post("/api/drafts/stream", data=form)
+
+        assert resp.status_code == 200
+        assert resp.headers["content-type"].startswith("text/event-stream")
+        events = _parse_sse(resp.text)
+        kinds = [e for e, _ in events]
+        assert kinds.count("start") == 2
+        assert "token" in kinds
+        assert events[-1] == ("done", {"created": 2, "failed": 0})
+
+        saved = [data for event, data in events if event == "draft"]
+        for data in saved:
+            draft = get_draft(data["id"])
+            assert draft["content"].startswith("Body for Hook")
+            delete_draft(data["id"])
+
+    def test_usage_is_counted_for_drafts_saved_before_disconnect(self):
+        async def stream(topic, hook, kb=None, additional_context=None):
+            if hook == "Hook B":
+                await asyncio.Event().wait()  # still generating when the client leaves
+            yield "Body"
+
+        record_usage = MagicMock()
+        counted_when_sent = []
+
+        async def disconnect_after_first_draft():
+            from web_ui import app
+            body = b"topic=Pricing&idea_0=Discounts&hook_0_0=Hook+A&hook_0_1=Hook+B&selected_0_0=1&selected_0_1=1"
+            scope = {"type": "http", "http_version": "1.1", "method": "POST", "scheme": "http",
+                     "path": "/api/drafts/stream", "raw_path": b"/api/drafts/stream", "query_string": b"",
+                     "root_path": "", "server": ("test", 80), "client": ("test", 1234),
+                     "headers": [(b"content-type", b"application/x-www-form-urlencoded"),
+                                 (b"content-length", str(len(body)).encode())]}
+            requests = [{"type": "http.request", "body": body, "more_body": False}]
+            left, chunks = asyncio.Event(), []
+
+            async def receive():
+                if requests:
+                    return requests.pop()
+                await left.wait()
+                return {"type": "http.disconnect"}
+
+            async def send(message):
+                chunks.append(message.get("body", b""))
+                if b"event: draft" in message.get("body", b""):
+                    counted_when_sent.append(record_usage.call_count)
+                    left.set()
+
+            await asyncio.wait_for(app(scope, receive, send), timeout=5)
+            return _parse_sse(b"".join(chunks).decode())
+
+        with patch("web_ui.stream_post_body", stream), \
+                patch("web_ui.load_knowledge_base", return_value={}), \
+                patch("web_ui.record_bank_usage", record_usage):
+            events = asyncio.run(disconnect_after_first_draft())
+
+        [saved] = [data for event, data in events if event == "draft"]
+        # Counted with the draft, not in cleanup that a disconnect can cancel
+        assert counted_when_sent == [1]
+        record_usage.assert_called_once_with(hooks=["Hook A"], ideas=["Discounts"])
+        delete_draft(saved["id"])
+
+    def test_drafts_stream_requires_selection(self):
+        resp = client.post("/api/drafts/stream", data={"topic": "Pricing"})
+        assert resp.status_code == 400
+
+    def test_failed_item_reports_error(self):
+        async def failing_stream(topic, hook, kb=None, additional_context=None):
+            raise RuntimeError("overloaded")
+            yield  # pragma: no cover
+
+        form = {"topic": "Pricing", "hook_0_0": "Hook A", "selected_0_0": "1"}
+        with patch("web_ui.stream_post_body", failing_stream), \
+                patch("web_ui.load_knowledge_base", return_value={}):
+            resp = client.post("/api/drafts/stream", data=form)
+
+        events = _parse_sse(resp.text)
+        assert ("error", {"index": 0, "error": "overloaded"}) in events
+        assert events[-1] == ("done", {"created": 0, "failed": 1})
+
+    def test_hooks_stream(self):
+        async def fake_hooks(topic, context="", num_hooks=30, fresh=False):
+            for chunk in ["1. First", " hook\n2. Second hook"]:
+                yield chunk
+
+        with patch("web_ui.stream_hooks", fake_hooks):
+            resp = client.post("/api/hooks/stream", data={"topic": "Pricing", "num_hooks": "2"})
+
+        events = _parse_sse(resp.text)
+        assert events[-1] == ("hooks", {"hooks": ["First hook", "Second hook"]})
@@ -0,0 +1,42 @@
+"""Tests for the in-memory template environment and precompiled bytecode cache."""
+import sys
+from pathlib import Path
+
+# Add execution dir to path so imports work
+sys.path.insert(0, str(Path(__file__).parent.parent / "execution"))
+
+from dotenv import load_dotenv
+load_dotenv(Path(__file__).parent.parent / ".env")
+
+from web_ui import TEMPLATE_SOURCES, create_template_env, precompile_templates
+
+
+class TestTemplateEnv:
+    def test_every_template_compiles_from_memory(self):
+        env = create_template_env()
+        for name in TEMPLATE_SOURCES:
+            assert env.get_template(name).name == name
+
+    def test_precompile_writes_one_entry_per_template(self, tmp_path):
+        assert precompile_templates(str(tmp_path / "cache")) == len(TEMPLATE_SOURCES)
+        assert len(list((tmp_path / "cache").iterdir())) == len(TEMPLATE_SOURCES)
+
+    def test_cached_env_loads_bytecode_without_writing(self, tmp_path, monkeypatch):
+        cache = tmp_path / "cache"
+        precompile_templates(str(cache))
+        before = {p.name: p.stat().st_mtime_ns for p in cache.iterdir()}
+
+        env = create_template_env(str(cache))
+        monkeypatch.setattr(env, "_compile", lambda source, filename: _fail_compile(filename))
+        env.get_template("drafts.html")
+        assert {p.name: p.stat().st_mtime_ns for p in cache.iterdir()} == before
+
+    def test_missing_cache_dir_falls_back_to_compiling(self, tmp_path):
+        env = create_template_env(str(tmp_path / "never-built"))
+        assert env.bytecode_cache is None
+        assert env.get_template("base.html")
+        assert not (tmp_path / "never-built").exists()
+
+
+def _fail_compile(filename):
+    raise AssertionError(f"{filename} was compiled instead of loaded from the bytecode cache")
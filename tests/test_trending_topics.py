@@ -19,8 +19,8 @@ load_dotenv(Path(__file__).parent.parent / ".env")
 
 from draft_storage import (
     TREND_STATUSES, TREND_PLATFORMS,
-    save_trending_topic, get_trending_topics, get_trending_topic,
-    update_trending_topic, delete_trending_topic, get_trending_stats,
+    save_trending_topic, save_trending_topics_bulk, get_trending_topics, get_trending_topic,
+    update_trending_topic, delete_trending_topic, get_trending_stats, get_trending_breakdown,
     convert_trend_to_idea, get_ideas_bank, delete_idea_from_bank,
 )
 
@@ -93,6 +93,19 @@ class TestTrendingTopicCRUD:
         assert delete_trending_topic(topic["id"]) is True
         assert delete_trending_topic(topic["id"]) is False  # Already deleted
 
+    def test_save_bulk(self):
+        topics = save_trending_topics_bulk([
+            {"topic": "Bulk one", "relevance_score": 7, "source_platform": "reddit"},
+            {"topic": "Bulk two", "content_angles": ["Angle"], "source_platform": "web"},
+        ], batch_id="bulk-batch")
+        assert [t["topic"] for t in topics] == ["Bulk one", "Bulk two"]
+        assert all(t["batch_id"] == "bulk-batch" and t["status"] == "new" for t in topics)
+        assert len(get_trending_topics(batch_id="bulk-batch")) == 2
+
+        # Cleanup
+        for t in topics:
+            delete_trending_topic(t["id"])
+
     def test_get_nonexistent_returns_none(self):
         assert get_trending_topic("nonexistent-id") is None
 
@@ -168,6 +181,25 @@ class TestTrendingTopicCRUD:
         delete_trending_topic(t2["id"])
         delete_trending_topic(t3["id"])
 
+    def test_breakdown_histogram(self):
+        topics = [
+            save_trending_topic(topic="H1", relevance_score=8, source_platform="test-platform"),
+            save_trending_topic(topic="H2", relevance_score=8, source_platform="test-platform"),
+            save_trending_topic(topic="H3", relevance_score=5, source_platform="test-platform"),
+            save_trending_topic(topic="H4", source_platform="test-platform"),
+        ]
+        update_trending_topic(topics[0]["id"], status="reviewed")
+
+        row = next(r for r in get_trending_breakdown() if r["source_platform"] == "test-platform")
+        assert row["total"] == 4
+        assert row["new_count"] == 3
+        assert row["avg_relevance"] == 7.0
+        assert row["relevance_histogram"] == {5: 1, 8: 2}
+
+        # Cleanup
+        for t in topics:
+            delete_trending_topic(t["id"])
+
 
 class TestConvertTrendToIdea:
     def test_converts_and_marks_used(self):
@@ -257,7 +289,7 @@ class TestPerplexitySearch:
 # =============================================================================
 
 class TestICPScoring:
-    @patch("trend_scout.Anthropic")
+    @patch("llm_gateway.get_client")
     def test_score_and_extract_topics(self, mock_anthropic_cls):
         mock_client = MagicMock()
         mock_anthropic_cls.return_value = mock_client
@@ -281,7 +313,7 @@ class TestICPScoring:
         assert topics[0]["topic"] == "AI outreach debate"
         assert topics[0]["relevance_score"] == 9
 
-    @patch("trend_scout.Anthropic")
+    @patch("llm_gateway.get_client")
     def test_score_handles_markdown_fences(self, mock_anthropic_cls):
         mock_client = MagicMock()
         mock_anthropic_cls.return_value = mock_client
@@ -303,7 +335,7 @@ class TestICPScoring:
         assert len(topics) == 1
         assert topics[0]["topic"] == "Test"
 
-    @patch("trend_scout.Anthropic")
+    @patch("llm_gateway.get_client")
     def test_score_handles_invalid_json(self, mock_anthropic_cls):
         mock_client = MagicMock()
         mock_anthropic_cls.return_value = mock_client
@@ -351,6 +383,11 @@ class TestTrendingRoutes:
         assert resp.status_code == 200
         assert "Trending Topics" in resp.text
 
+    def test_stats_api(self):
+        resp = client.get("/api/trending/stats")
+        assert resp.status_code == 200
+        assert "total" in resp.json() and isinstance(resp.json()["platforms"], list)
+
     def test_trending_page_with_filters(self):
         resp = client.get("/trending?status=new&platform=reddit&min_relevance=8")
         assert resp.status_code == 200
@@ -421,6 +458,7 @@ class TestTrendingRoutes:
 
     @patch("trend_scout.run_trend_scout")
     def test_scan_route(self, mock_scout):
+        from job_queue import run_pending_jobs
         mock_scout.return_value = {
             "batch_id": "test-batch",
             "topics_found": 3,
@@ -428,17 +466,30 @@ class TestTrendingRoutes:
             "topics": [],
         }
 
+        # Scan is queued and returns immediately
         resp = client.post("/trending/scan")
-        assert resp.status_code == 200
-        data = resp.json()
-        assert data["batch_id"] == "test-batch"
-        assert data["topics_saved"] == 3
+        assert resp.status_code == 202
+        job_id = resp.json()["job_id"]
+        mock_scout.assert_not_called()
+
+        run_pending_jobs()
+
+        data = client.get(f"/api/jobs/{job_id}").json()
+        assert data["status"] == "completed"
+        assert data["result"]["batch_id"] == "test-batch"
+        assert data["result"]["topics_saved"] == 3
 
     @patch("trend_scout.run_trend_scout", side_effect=Exception("API key missing"))
     def test_scan_route_error(self, mock_scout):
+        from job_queue import run_pending_jobs
         resp = client.post("/trending/scan")
+        job_id = resp.json()["job_id"]
+
+        run_pending_jobs()
+
+        resp = client.get(f"/api/jobs/{job_id}/result")
         assert resp.status_code == 500
-        assert "error" in resp.json()
+        assert "API key missing" in resp.json()["error"]
 
     def test_trending_nav_link_present(self):
         resp = client.get("/trending")